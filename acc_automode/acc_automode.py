@@ -24,7 +24,7 @@ import logging
 import sys
 import time
 from pathlib import Path
-from typing import List, Optional
+from typing import Callable, List, Optional, Tuple
 
 # Add parent directory to path to import sensor communication modules
 sys.path.insert(0, str(Path(__file__).parent.parent / "Accelerometer_Auto_Mode"))
@@ -50,7 +50,11 @@ logger = logging.getLogger(__name__)
 # Constants from datasheet section 8.1.11
 DEFAULT_BAUD_RATE = 230400
 FLASH_BACKUP_TIMEOUT = 5.0
-BACKUP_POLL_INTERVAL = 0.1
+BACKUP_POLL_INTERVAL = 0.01
+# Power-On Start-Up Time (900ms) plus the NOT_READY wait
+READY_TIMEOUT = 0.9 + 5.0
+FILTER_TIMEOUT = 5.0
+STATUS_POLL_INTERVAL = 0.01
 
 # Fixed configuration values from section 8.1.11
 # These values are hardcoded - no user configuration needed
@@ -62,6 +66,43 @@ BURST_CTRL_L = 0x02  # COUNT_OUT=1
 BURST_CTRL_H = 0x47  # TEMP_OUT=1, ACCX_OUT=1, ACCY_OUT=1, ACCZ_OUT=1
 
 
+def poll_register(comm: SensorCommunication, window: int, address: int, mask: int,
+                  timeout: float, interval: float = STATUS_POLL_INTERVAL) -> bool:
+    """Poll a register until the masked bits read as 0.
+    
+    The window select and the read go out in one batch. Reads that fail or
+    do not echo the register address (the sensor is busy or still
+    streaming) count as not done yet.
+    
+    Args:
+        comm: Sensor communication object
+        window: Register window (0 or 1)
+        address: Register address
+        mask: Status bits that must clear
+        timeout: Maximum time to wait in seconds
+        interval: Delay between reads in seconds
+        
+    Returns:
+        True if the bits cleared before the timeout, False otherwise
+    """
+    deadline = time.time() + timeout
+    while True:
+        try:
+            # Response format: [address, MSByte, LSByte, 0x0D] = 4 bytes total
+            result = comm.send_commands([
+                [0, 0xFE, window, 0x0D],  # WINDOW_ID(L) write command
+                [4, address, 0x00, 0x0D],  # Register read command
+            ])
+            if len(result) >= 4 and result[0] == address and result[3] == 0x0D:
+                if ((result[1] << 8) | result[2]) & mask == 0:
+                    return True
+        except Exception as e:
+            logger.debug(f"Error polling register 0x{address:02X}: {e}")
+        if time.time() >= deadline:
+            return False
+        time.sleep(interval)
+
+
 def wait_for_ready(comm: SensorCommunication) -> bool:
     """Wait for sensor to be ready after power-on.
     
@@ -75,49 +116,11 @@ def wait_for_ready(comm: SensorCommunication) -> bool:
     """
     logger.info("Waiting for sensor to be ready...")
     
-    # Wait Power-On Start-Up Time (900ms from datasheet)
-    time.sleep(1.0)
-    
-    # Wait until NOT_READY bit goes to 0
-    # NOT_READY is GLOB_CMD[0x0A(W1)] bit[10]
-    start_time = time.time()
-    timeout = 5.0
-    
-    while time.time() - start_time < timeout:
-        try:
-            # Switch to Window 1
-            comm.send_commands([[0, 0xFE, 0x01, 0x0D]])  # WINDOW_ID(L) write command (WINDOW=1)
-            time.sleep(0.01)  # Small delay between commands
-            
-            # Read GLOB_CMD
-            # Response format: [0x0A, MSByte, LSByte, 0x0D] = 4 bytes total
-            result = comm.send_command([4, 0x0A, 0x00, 0x0D])  # GLOB_CMD read command (expect 4 bytes: addr, MSB, LSB, CR)
-            
-            if len(result) >= 4:
-                # Response format: [0x0A, MSByte, LSByte, 0x0D]
-                # result[0] = address (0x0A)
-                # result[1] = MSByte
-                # result[2] = LSByte
-                # result[3] = delimiter (0x0D)
-                glob_cmd_msb = result[1]
-                # NOT_READY is bit[10] in MSByte (bit[2] of MSByte)
-                not_ready = (glob_cmd_msb >> 2) & 0x01
-                
-                if not_ready == 0:
-                    logger.info("Sensor is ready (NOT_READY=0)")
-                    return True
-            elif len(result) >= 3:
-                # Try with 3 bytes (might not have delimiter)
-                glob_cmd_msb = result[1]
-                not_ready = (glob_cmd_msb >> 2) & 0x01
-                if not_ready == 0:
-                    logger.info("Sensor is ready (NOT_READY=0)")
-                    return True
-                    
-            time.sleep(0.1)
-        except Exception as e:
-            logger.debug(f"Error checking ready status: {e}")
-            time.sleep(0.1)
+    # NOT_READY is GLOB_CMD[0x0A(W1)] bit[10]. It is polled from the start,
+    # so the Power-On Start-Up Time (900ms) is only part of the timeout.
+    if poll_register(comm, 0x01, 0x0A, 0x0400, READY_TIMEOUT):
+        logger.info("Sensor is ready (NOT_READY=0)")
+        return True
     
     logger.warning("Timeout waiting for sensor to be ready")
     return False
@@ -137,13 +140,12 @@ def check_hardware_error(comm: SensorCommunication) -> bool:
     logger.info("Checking for hardware errors...")
     
     try:
-        # Switch to Window 0
-        comm.send_commands([[0, 0xFE, 0x00, 0x0D]])  # WINDOW_ID(L) write command (WINDOW=0)
-        time.sleep(0.01)  # Small delay between commands
-        
-        # Read DIAG_STAT
+        # Switch to Window 0 and read DIAG_STAT
         # Response format: [0x04, MSByte, LSByte, 0x0D] = 4 bytes total
-        result = comm.send_command([4, 0x04, 0x00, 0x0D])  # DIAG_STAT read command (expect 4 bytes: addr, MSB, LSB, CR)
+        result = comm.send_commands([
+            [0, 0xFE, 0x00, 0x0D],  # WINDOW_ID(L) write command (WINDOW=0)
+            [4, 0x04, 0x00, 0x0D],  # DIAG_STAT read command (expect 4 bytes: addr, MSB, LSB, CR)
+        ])
         
         if len(result) >= 4:
             # Response format: [0x04, MSByte, LSByte, 0x0D]
@@ -244,44 +246,10 @@ def wait_for_filter_setting(comm: SensorCommunication) -> bool:
     """
     logger.info("Waiting for filter setting to complete...")
     
-    start_time = time.time()
-    timeout = 5.0
-    
-    while time.time() - start_time < timeout:
-        try:
-            # Switch to Window 1
-            comm.send_commands([[0, 0xFE, 0x01, 0x0D]])  # Switch to Window 1
-            time.sleep(0.01)  # Small delay between commands
-            
-            # Read FILTER_CTRL register
-            # Response format: [0x06, MSByte, LSByte, 0x0D] = 4 bytes total
-            result = comm.send_command([4, 0x06, 0x00, 0x0D])  # Read FILTER_CTRL register (expect 4 bytes: addr, MSB, LSB, CR)
-            
-            if len(result) >= 4:
-                # Response format: [0x06, MSByte, LSByte, 0x0D]
-                # result[0] = address (0x06)
-                # result[1] = MSByte
-                # result[2] = LSByte
-                # result[3] = delimiter (0x0D)
-                filter_ctrl_lsb = result[2]
-                # FILTER_STAT is bit[5] in low byte
-                filter_stat = (filter_ctrl_lsb >> 5) & 0x01
-                
-                if filter_stat == 0:
-                    logger.info("Filter setting completed")
-                    return True
-            elif len(result) >= 3:
-                # Try with 3 bytes (might not have delimiter)
-                filter_ctrl_lsb = result[2]
-                filter_stat = (filter_ctrl_lsb >> 5) & 0x01
-                if filter_stat == 0:
-                    logger.info("Filter setting completed")
-                    return True
-                    
-            time.sleep(0.1)
-        except Exception as e:
-            logger.debug(f"Error checking filter status: {e}")
-            time.sleep(0.1)
+    # FILTER_STAT is FILTER_CTRL[0x06(W1)] bit[5]
+    if poll_register(comm, 0x01, 0x06, 0x0020, FILTER_TIMEOUT):
+        logger.info("Filter setting completed")
+        return True
     
     logger.warning("Timeout waiting for filter setting")
     return False
@@ -311,58 +279,20 @@ def flash_backup(comm: SensorCommunication) -> bool:
         ])
         
         # Step (b): Wait until flash backup has finished
+        # FLASH_BACKUP is GLOB_CMD[0x0A(W1)] bit[3]
         logger.info("Waiting for flash backup to complete...")
-        start_time = time.time()
-        flash_backup_cleared = False
-        
-        while time.time() - start_time < FLASH_BACKUP_TIMEOUT:
-            # Switch to Window 1
-            comm.send_commands([[0, 0xFE, 0x01, 0x0D]])  # Switch to Window 1
-            time.sleep(0.01)  # Small delay between commands
-            
-            # Read GLOB_CMD register
-            # Response format: [0x0A, MSByte, LSByte, 0x0D] = 4 bytes total
-            result = comm.send_command([4, 0x0A, 0x00, 0x0D])  # Read GLOB_CMD register (expect 4 bytes: addr, MSB, LSB, CR)
-            
-            if len(result) >= 4:
-                # Response format: [0x0A, MSByte, LSByte, 0x0D]
-                # result[0] = address (0x0A)
-                # result[1] = MSByte
-                # result[2] = LSByte
-                # result[3] = delimiter (0x0D)
-                glob_cmd_low = result[2]
-                # FLASH_BACKUP is bit[3] in low byte
-                flash_backup_bit = (glob_cmd_low >> 3) & 0x01
-                
-                if flash_backup_bit == 0:
-                    flash_backup_cleared = True
-                    logger.info("Flash backup completed")
-                    break
-            elif len(result) >= 3:
-                # Try with 3 bytes (might not have delimiter)
-                glob_cmd_low = result[2]
-                flash_backup_bit = (glob_cmd_low >> 3) & 0x01
-                if flash_backup_bit == 0:
-                    flash_backup_cleared = True
-                    logger.info("Flash backup completed")
-                    break
-                    
-            time.sleep(BACKUP_POLL_INTERVAL)
-        
-        if not flash_backup_cleared:
+        if not poll_register(comm, 0x01, 0x0A, 0x0008, FLASH_BACKUP_TIMEOUT, BACKUP_POLL_INTERVAL):
             logger.error("Flash backup timeout")
             return False
+        logger.info("Flash backup completed")
         
         # Step (c): Confirm the result by checking FLASH_BU_ERR
-        time.sleep(0.1)
-        
-        # Switch to Window 0
-        comm.send_commands([[0, 0xFE, 0x00, 0x0D]])  # Switch to Window 0
-        time.sleep(0.01)  # Small delay between commands
-        
-        # Read DIAG_STAT register
+        # Switch to Window 0 and read DIAG_STAT
         # Response format: [0x04, MSByte, LSByte, 0x0D] = 4 bytes total
-        result = comm.send_command([4, 0x04, 0x00, 0x0D])  # Read DIAG_STAT register (expect 4 bytes: addr, MSB, LSB, CR)
+        result = comm.send_commands([
+            [0, 0xFE, 0x00, 0x0D],  # Switch to Window 0
+            [4, 0x04, 0x00, 0x0D],  # Read DIAG_STAT register (expect 4 bytes: addr, MSB, LSB, CR)
+        ])
         
         if len(result) >= 4:
             # Response format: [0x04, MSByte, LSByte, 0x0D]
@@ -396,6 +326,16 @@ def flash_backup(comm: SensorCommunication) -> bool:
         return False
 
 
+def timed_step(timings: List[Tuple[str, float]], name: str, step: Callable[[SensorCommunication], bool],
+               comm: SensorCommunication) -> bool:
+    """Run one configuration step and record how long it took."""
+    start = time.perf_counter()
+    try:
+        return step(comm)
+    finally:
+        timings.append((name, time.perf_counter() - start))
+
+
 def configure_auto_mode(port: str, baud: int = DEFAULT_BAUD_RATE) -> bool:
     """Configure accelerometer in auto mode following section 8.1.11.
     
@@ -407,6 +347,7 @@ def configure_auto_mode(port: str, baud: int = DEFAULT_BAUD_RATE) -> bool:
         True if successful, False otherwise
     """
     comm: Optional[SensorCommunication] = None
+    timings: List[Tuple[str, float]] = []
     
     try:
         logger.info("=" * 64)
@@ -431,30 +372,36 @@ def configure_auto_mode(port: str, baud: int = DEFAULT_BAUD_RATE) -> bool:
         # Step 1: Power-on sequence (section 8.1.1)
         # Note: If sensor is already in auto mode, register reads may not work
         # So we make these checks lenient
-        if not wait_for_ready(comm):
+        if not timed_step(timings, "wait_for_ready", wait_for_ready, comm):
             logger.warning("Sensor may not be ready, continuing anyway...")
             logger.warning("This is normal if sensor is already in auto mode")
         
-        hardware_check = check_hardware_error(comm)
+        hardware_check = timed_step(timings, "hardware_check", check_hardware_error, comm)
         if not hardware_check:
             logger.warning("Could not verify hardware status (sensor may be in auto mode)")
             logger.warning("Continuing with configuration anyway...")
             # Don't abort - sensor might be in auto mode where register reads don't work
         
         # Step 2: Set registers (section 8.1.11 step a)
-        if not set_registers(comm):
+        if not timed_step(timings, "set_registers", set_registers, comm):
             logger.error("Failed to set registers")
             return False
         
         # Wait for filter setting to complete
-        if not wait_for_filter_setting(comm):
+        if not timed_step(timings, "filter", wait_for_filter_setting, comm):
             logger.warning("Filter setting may not have completed")
         
         # Step 3: Execute flash backup (section 8.1.11 step b)
-        if not flash_backup(comm):
+        if not timed_step(timings, "flash_backup", flash_backup, comm):
             logger.error("Flash backup failed")
             return False
         
+        logger.info(
+            "Configuration took %.3f s (%s)",
+            sum(seconds for _, seconds in timings),
+            ", ".join(f"{name} {seconds * 1000:.0f} ms" for name, seconds in timings),
+        )
+        
         logger.info("")
         logger.info("=" * 64)
         logger.info("Configuration completed successfully!")
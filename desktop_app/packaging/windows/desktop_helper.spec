@@ -31,6 +31,7 @@ datas = [
 hidden_imports = [
     "helper_app.controller",
     "helper_app.session",
+    "helper_app.legacy.sensor_transport",
     "helper_app.legacy.imu.sensor_config",
     "helper_app.legacy.imu.sensor_comm",
     "helper_app.legacy.vibration.sensor_config",
@@ -10,12 +10,14 @@ from urllib.parse import urlparse
 
 from fastapi import Depends, FastAPI, HTTPException, Request, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 
 from helper_app import version
 from helper_app.auth import TOKEN, verify_token
 from helper_app.config import HelperSettings
 from helper_app.controller import CommandResult, DetectionResult, SensorController, SensorType
 from helper_app.logging_utils import BroadcastHandler, LogBroadcaster
+from helper_app.metrics import load_capture_stats, render_prometheus, render_transport_prometheus
 from helper_app.session import SerialSession
 from helper_app.updater import DownloadResult, UpdateInfo, check_for_updates, download_update
 
@@ -136,6 +138,7 @@ def create_app(allowed_origins: Optional[List[str]] = None) -> FastAPI:
             "connected": session.is_connected(),
             "port": session.port,
             "baudRate": session.baudrate,
+            "transport": session.transport_metrics.snapshot(),
         }
         update = latest_update.get(key)
         if update:
@@ -201,6 +204,14 @@ def create_app(allowed_origins: Optional[List[str]] = None) -> FastAPI:
             "updatesDir": str(settings.updates_dir),
         }
 
+    @app.get("/metrics", response_class=PlainTextResponse)
+    async def capture_metrics(token: None = Depends(verify_token)) -> PlainTextResponse:
+        documents = await asyncio.to_thread(load_capture_stats, settings.capture_stats_dir)
+        transport = render_transport_prometheus(session.transport_metrics.snapshot())
+        return PlainTextResponse(
+            render_prometheus(documents) + transport, media_type="text/plain; version=0.0.4; charset=utf-8"
+        )
+
     @app.post("/connect")
     async def connect(payload: Dict[str, Any], token: None = Depends(verify_token)) -> Dict[str, Any]:
         port = payload.get("port")
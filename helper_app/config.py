@@ -14,6 +14,7 @@ DEFAULT_PORT: Final[int] = 7421
 DEFAULT_BAUD_RATE: Final[int] = 460_800
 DEFAULT_DATA_DIR: Final[Path] = Path.home() / ".zenith_helper"
 DEFAULT_UPDATES_DIR: Final[Path] = DEFAULT_DATA_DIR / "updates"
+DEFAULT_CAPTURE_STATS_DIR: Final[Path] = DEFAULT_DATA_DIR / "captures"
 DEFAULT_UPDATE_POLL_INTERVAL: Final[int] = 6 * 60 * 60  # 6 hours
 DEFAULT_ALLOWED_ORIGINS: Final[list[str]] = [
     "http://localhost:5173",
@@ -34,6 +35,7 @@ TOKEN_FILE: Final[Path] = Path.home() / ".zenith_helper_token"
 SUPABASE_URL_ENV: Final[str] = "ZENITH_SUPABASE_URL"
 SUPABASE_ANON_KEY_ENV: Final[str] = "ZENITH_SUPABASE_ANON_KEY"
 UPDATES_DIR_ENV: Final[str] = "ZENITH_HELPER_UPDATES_DIR"
+CAPTURE_STATS_DIR_ENV: Final[str] = "ZENITH_HELPER_CAPTURE_STATS_DIR"
 UPDATE_POLL_ENV: Final[str] = "ZENITH_HELPER_UPDATE_POLL_INTERVAL"
 ALLOWED_ORIGINS_ENV: Final[str] = "ZENITH_HELPER_ALLOWED_ORIGINS"
 
@@ -49,6 +51,7 @@ class HelperSettings:
     supabase_anon_key: str | None = None
     log_level: str = "INFO"
     updates_dir: Path = DEFAULT_UPDATES_DIR
+    capture_stats_dir: Path = DEFAULT_CAPTURE_STATS_DIR
     update_poll_interval: int = DEFAULT_UPDATE_POLL_INTERVAL
     allowed_origins: list[str] = field(default_factory=lambda: [origin for origin in DEFAULT_ALLOWED_ORIGINS])
 
@@ -57,6 +60,7 @@ class HelperSettings:
         """Create settings by reading environment variables."""
         load_dotenv()
         updates_dir = Path(os.getenv(UPDATES_DIR_ENV, str(DEFAULT_UPDATES_DIR))).expanduser()
+        capture_stats_dir = Path(os.getenv(CAPTURE_STATS_DIR_ENV, str(DEFAULT_CAPTURE_STATS_DIR))).expanduser()
         try:
             poll_interval = int(os.getenv(UPDATE_POLL_ENV, DEFAULT_UPDATE_POLL_INTERVAL))
         except ValueError:
@@ -76,6 +80,7 @@ class HelperSettings:
             supabase_anon_key=os.getenv(SUPABASE_ANON_KEY_ENV, DEFAULT_SUPABASE_ANON_KEY),
             log_level=os.getenv("ZENITH_HELPER_LOG_LEVEL", "INFO"),
             updates_dir=updates_dir,
+            capture_stats_dir=capture_stats_dir,
             update_poll_interval=poll_interval,
             allowed_origins=origins,
         )
@@ -6,17 +6,15 @@ import asyncio
 import logging
 import time
 from dataclasses import dataclass
-from typing import Any, Literal, Optional
+from typing import Any, Dict, Literal, Optional
 
 from helper_app.logging_utils import LogBroadcaster
 from helper_app.session import SerialSession
 
+from helper_app.legacy.sensor_transport import SensorCommunication
 from helper_app.legacy.vibration.sensor_config import SensorConfigurator as VibrationConfigurator
-from helper_app.legacy.vibration.sensor_comm import SensorCommunication as VibrationComm
 from helper_app.legacy.imu.sensor_config import SensorConfigurator as ImuConfigurator
-from helper_app.legacy.imu.sensor_comm import SensorCommunication as ImuComm
 from helper_app.legacy.accelerometer.accelerometer_sensor_config import AccelerometerConfigurator
-from helper_app.legacy.accelerometer.sensor_comm import SensorCommunication as AccelerometerComm
 
 SensorType = Literal["vibration", "imu", "accelerometer"]
 LOG = logging.getLogger(__name__)
@@ -38,6 +36,8 @@ class CommandResult:
     message: str
     requires_restart: bool = False
     warning: Optional[str] = None
+    # Seconds per configuration step, as recorded by the configurator
+    timings: Optional[Dict[str, float]] = None
 
 
 class SensorController:
@@ -59,6 +59,14 @@ class SensorController:
                 return " ".join(unique)
         return None
 
+    def _collect_timings(self, configurator: Any) -> Optional[Dict[str, float]]:
+        collector = getattr(configurator, "collect_timings", None)
+        if callable(collector):
+            timings = collector()
+            if timings:
+                return {name: round(seconds, 4) for name, seconds in timings.items()}
+        return None
+
     async def detect(self, sensor: SensorType) -> DetectionResult:
         loop = asyncio.get_running_loop()
         port = self._session.port
@@ -72,15 +80,12 @@ class SensorController:
 
         def _detect_with_fresh_connection():
             if sensor == "vibration":
-                comm_cls = VibrationComm
                 configurator_cls = VibrationConfigurator
             elif sensor == "imu":
-                comm_cls = ImuComm
                 configurator_cls = ImuConfigurator
             else:  # accelerometer
-                comm_cls = AccelerometerComm
                 configurator_cls = AccelerometerConfigurator
-            comm = comm_cls(port=port, baud=baud)
+            comm = SensorCommunication(port=port, baud=baud, metrics=self._session.transport_metrics)
             # Retry opening the port in case Windows hasn't released it yet
             max_retries = 3
             for attempt in range(max_retries):
@@ -131,21 +136,28 @@ class SensorController:
     async def configure(self, sensor: SensorType, **kwargs) -> CommandResult:
         def _run(comm, configurator_cls):
             configurator = configurator_cls(comm)
+            # Write every register and back up even if the sensor already matches
+            force = bool(kwargs.get("force", False))
             # Extract parameters based on sensor type
             if sensor == "imu":
                 sampling_rate = kwargs.get("sampling_rate", 125.0)
                 tap_value = kwargs.get("tap_value")
-                success = configurator.configure(sampling_rate=sampling_rate, tap_value=tap_value)
+                success = configurator.configure(sampling_rate=sampling_rate, tap_value=tap_value, force=force)
             elif sensor == "accelerometer":
                 sps_rate = kwargs.get("sps_rate", 200)  # Default 200 Sps
-                success = configurator.configure(sps_rate=sps_rate)
+                success = configurator.configure(sps_rate=sps_rate, force=force)
             else:  # vibration
                 output_type = kwargs.get("output_type", "displacement")  # Default to displacement
-                success = configurator.configure(output_type=output_type)
+                success = configurator.configure(output_type=output_type, force=force)
             warning = self._collect_warning(configurator)
+            timings = self._collect_timings(configurator)
             if not success:
-                return CommandResult(False, "Configuration failed. Check logs for details.", warning=warning)
-            return CommandResult(True, "Configuration completed successfully.", requires_restart=True, warning=warning)
+                return CommandResult(
+                    False, "Configuration failed. Check logs for details.", warning=warning, timings=timings
+                )
+            return CommandResult(
+                True, "Configuration completed successfully.", requires_restart=True, warning=warning, timings=timings
+            )
 
         try:
             LOG.info("Configure command requested for sensor=%s", sensor)
@@ -206,9 +218,12 @@ class SensorController:
             configurator = configurator_cls(comm)
             success = configurator.full_reset(persist_disable_auto=True)
             warning = self._collect_warning(configurator)
+            timings = self._collect_timings(configurator)
             if not success:
-                return CommandResult(False, "Full reset failed.", warning=warning)
-            return CommandResult(True, "Full reset completed successfully.", requires_restart=True, warning=warning)
+                return CommandResult(False, "Full reset failed.", warning=warning, timings=timings)
+            return CommandResult(
+                True, "Full reset completed successfully.", requires_restart=True, warning=warning, timings=timings
+            )
 
         try:
             LOG.info("Full reset command requested for sensor=%s", sensor)
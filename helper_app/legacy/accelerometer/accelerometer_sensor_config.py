@@ -11,15 +11,15 @@ Organization: Zenith Tek (https://zenithtek.in)
 import logging
 import sys
 import time
-from typing import Dict, List, Optional
+from typing import Callable, Container, Dict, List, Optional, Sequence, Tuple
 
 # Import sensor communication module
 try:
-    from sensor_comm import SensorCommunication
+    from sensor_comm import RegisterAccess, SensorCommunication
 except ImportError:
     # Try relative import if in package
     try:
-        from .sensor_comm import SensorCommunication
+        from .sensor_comm import RegisterAccess, SensorCommunication
     except ImportError:
         print("Error: Could not import sensor_comm module")
         sys.exit(1)
@@ -32,7 +32,13 @@ ORGANIZATION = "Zenith Tek (https://zenithtek.in)"
 
 # Constants
 FLASH_BACKUP_TIMEOUT = 5.0
-BACKUP_POLL_INTERVAL = 0.1
+BACKUP_POLL_INTERVAL = 0.01
+# Status bits are polled; these are the datasheet maxima plus margin
+MODE_SWITCH_TIMEOUT = 0.5
+# Software reset, datasheet maximum plus margin
+SOFT_RESET_TIMEOUT = 3.0
+FILTER_STAT_TIMEOUT = 2.0
+FLASH_RESET_TIMEOUT = 3.0
 
 # SPS Rate to SMPL_CTRL_H mapping (high byte value to write to 0x85)
 # Following acc_automode.py logic: direct high byte values
@@ -77,6 +83,13 @@ FIXED_SIG_CTRL = 0x0004   # Acceleration output (all axes), standard noise floor
 FIXED_BURST_CTRL_L = 0x02  # COUNT_OUT=1
 FIXED_BURST_CTRL_H = 0x47  # TEMP_OUT=1, ACCX_OUT=1, ACCY_OUT=1, ACCZ_OUT=1
 
+# Registers compared before configuring: DIAG_STAT (Window 0); SIG_CTRL,
+# SMPL_CTRL, FILTER_CTRL, UART_CTRL and BURST_CTRL (Window 1)
+SNAPSHOT_REGISTERS: Dict[int, Tuple[int, ...]] = {
+    0x00: (0x04,),
+    0x01: (0x00, 0x04, 0x06, 0x08, 0x0C),
+}
+
 # Product ID and Serial Number register addresses (Window 1)
 PROD_ID_REGISTERS = (0x6A, 0x6C, 0x6E, 0x70)
 SERIAL_REGISTERS = (0x74, 0x76, 0x78, 0x7A)
@@ -91,7 +104,9 @@ class AccelerometerConfigurator:
 
     def __init__(self, comm: SensorCommunication):
         self.comm = comm
+        self.registers = RegisterAccess(comm)
         self._warnings: List[str] = []
+        self._timings: List[Tuple[str, float]] = []
 
     def _add_warning(self, message: str) -> None:
         self._warnings.append(message)
@@ -101,6 +116,26 @@ class AccelerometerConfigurator:
         self._warnings.clear()
         return warnings
 
+    def collect_timings(self) -> Dict[str, float]:
+        """Return and clear the step timings (seconds) of the last operation."""
+        timings = dict(self._timings)
+        self._timings.clear()
+        return timings
+
+    def _timed(self, name: str, step: Callable, *args, **kwargs):
+        """Run one step and record how long it took."""
+        start = time.perf_counter()
+        try:
+            return step(*args, **kwargs)
+        finally:
+            self._timings.append((name, time.perf_counter() - start))
+
+    def _log_timings(self, operation: str) -> None:
+        """Log the recorded step timings and their total."""
+        total = sum(seconds for _, seconds in self._timings)
+        steps = ", ".join(f"{name} {seconds * 1000:.0f} ms" for name, seconds in self._timings)
+        logger.info("%s took %.3f s (%s)", operation, total, steps)
+
     def _write_commands(self, commands: List[List[int]]) -> None:
         """Send multiple commands to sensor."""
         self.comm.send_commands(commands)
@@ -108,40 +143,32 @@ class AccelerometerConfigurator:
     def reset_sensor(self) -> None:
         """Send reset commands to sensor to exit auto mode and enter configuration mode."""
         logger.info("Resetting sensor...")
+        # The window the sensor was left in is unknown; select it again
+        self.registers.invalidate()
         
         # Flush any streaming data first
         if hasattr(self.comm, "flush_input_buffer"):
-            for _ in range(10):
-                self.comm.flush_input_buffer()
-                time.sleep(0.02)
+            self.comm.flush_input_buffer()
         
         # Exit auto mode: Write "01" to MODE_CMD (MODE_CTRL [0x02(W0)], bit [9:8])
-        # First switch to Window 0, then write MODE_CTRL
-        # Command format: [0, address, data, 0x0D] (no response expected, so first byte is 0)
-        # Address 0x83 = 0x80 | 0x03 (write to MODE_CTRL high byte)
+        # MODE_CTRL high byte is at 0x03 (written as 0x83 = 0x80 | 0x03)
         # Data 0x02 sets bit[9:8] = 01 (Configuration mode)
-        self._write_commands([
-            [0, 0xFE, 0x00, 0x0D],  # Switch to Window 0 (WINDOW_ID register)
-            [0, 0x83, 0x02, 0x0D],  # MODE_CTRL(H) write: return to Configuration mode (bit[9:8]=01)
-        ])
-        time.sleep(0.5)
+        self.registers.write_byte(0x03, 0x02, 0x00)
+        # MODE_STAT (bit[10]) is set once streaming has stopped; reads garbled
+        # by burst data still in flight are flushed and retried
+        if not self.registers.wait_for_bits(0x02, 0x00, 0x0400, 0x0400, timeout=MODE_SWITCH_TIMEOUT):
+            logger.warning("MODE_STAT did not report configuration mode within %.1f s", MODE_SWITCH_TIMEOUT)
         
         # Also clear UART_AUTO to stop streaming
-        self._write_commands([
-            [0, 0xFE, 0x01, 0x0D],  # Switch to Window 1
-            [0, 0x88, 0x00, 0x0D],  # UART_CTRL(L): Clear UART_AUTO and AUTO_START
-        ])
-        time.sleep(0.2)
+        self.registers.write_byte(0x08, 0x00, 0x01)  # UART_CTRL(L): Clear UART_AUTO and AUTO_START
         
         # Flush again after stopping streaming
         if hasattr(self.comm, "flush_input_buffer"):
-            for _ in range(5):
-                self.comm.flush_input_buffer()
-                time.sleep(0.02)
+            self.comm.flush_input_buffer()
         
         logger.info("Sensor reset to configuration mode")
 
-    def _wait_for_filter_settle(self, timeout: float = 2.0) -> bool:
+    def _wait_for_filter_settle(self, timeout: float = FILTER_STAT_TIMEOUT) -> bool:
         """Wait for filter setting to complete.
         
         Args:
@@ -150,23 +177,8 @@ class AccelerometerConfigurator:
         Returns:
             True if filter setting completed, False if timeout
         """
-        start = time.time()
-        while time.time() - start < timeout:
-            try:
-                # Read FILTER_CTRL register (Window 1)
-                result = self.comm.send_commands([
-                    [0, 0xFE, 0x01, 0x0D],  # Switch to Window 1 (WINDOW_ID register)
-                    [4, 0x06, 0x00, 0x0D],  # Read FILTER_CTRL register (at 0x06, expect 4 bytes)
-                ])
-                if len(result) >= 4:
-                    filter_ctrl_low = result[-2]  # Low byte
-                    filter_stat = (filter_ctrl_low >> 5) & 0x01  # Bit[5] is FILTER_STAT
-                    if filter_stat == 0:  # Filter setting completed
-                        return True
-            except Exception as e:
-                logger.debug(f"Error checking filter status: {e}")
-            time.sleep(0.1)
-        return False
+        # FILTER_CTRL register (0x06, Window 1) bit[5] is FILTER_STAT
+        return self.registers.wait_for_bits(0x06, 0x01, 0x20, timeout=timeout)
 
     def set_output_rate(self, sps_rate: int) -> bool:
         """Set the data output rate (sampling rate).
@@ -186,12 +198,8 @@ class AccelerometerConfigurator:
             
             smpl_ctrl_h = SPS_TO_SMPL_CTRL_H[sps_rate]
             # SMPL_CTRL register is at 0x04-0x05 (Window 1)
-            # Write SMPL_CTRL_H directly to address 0x85 (following acc_automode.py)
-            # Address 0x85 = 0x80 | 0x05 (SMPL_CTRL high byte)
-            self._write_commands([
-                [0, 0xFE, 0x01, 0x0D],  # Switch to Window 1 (WINDOW_ID register)
-                [0, 0x85, smpl_ctrl_h, 0x0D],  # Write SMPL_CTRL(H) with rate value
-            ])
+            # Write SMPL_CTRL_H directly to address 0x05 (following acc_automode.py)
+            self.registers.write_byte(0x05, smpl_ctrl_h, 0x01)
             logger.info(f"Output rate set to {sps_rate} Sps (SMPL_CTRL_H=0x{smpl_ctrl_h:02X})")
             return True
         except Exception as e:
@@ -220,11 +228,7 @@ class AccelerometerConfigurator:
             filter_sel = FILTER_CUTOFF_512TAPS[cutoff_hz]
             # FILTER_CTRL register is at 0x06-0x07 (Window 1)
             # FILTER_SEL is in bits [3:0] of low byte
-            # Address 0x86 = 0x80 | 0x06 (FILTER_CTRL low byte)
-            self._write_commands([
-                [0, 0xFE, 0x01, 0x0D],  # Switch to Window 1 (WINDOW_ID register)
-                [0, 0x86, filter_sel & 0xFF, 0x0D],  # Write FILTER_CTRL(L) with FILTER_SEL
-            ])
+            self.registers.write_byte(0x06, filter_sel, 0x01)
             logger.info(f"Filter set to 512 taps, cutoff {cutoff_hz} Hz (for {sps_rate} Sps)")
             
             # Wait for filter setting to complete
@@ -237,32 +241,35 @@ class AccelerometerConfigurator:
             logger.error(f"Failed to set filter: {e}")
             return False
 
-    def set_fixed_configuration(self) -> bool:
+    def set_fixed_configuration(self, addresses: Optional[Container[int]] = None) -> bool:
         """Set fixed configuration values following acc_automode.py logic.
         
         Sets BURST_CTRL and UART_CTRL registers (matching acc_automode.py set_registers).
         Note: SIG_CTRL is not set in acc_automode.py, so we skip it to match exactly.
         
+        Args:
+            addresses: Byte addresses to write (0x08, 0x0C, 0x0D); all of them if None
+        
         Returns:
             True if successful, False otherwise
         """
         try:
             # Following acc_automode.py set_registers() function
             # All these registers are in Window 1
-            commands = [
-                [0, 0xFE, 0x01, 0x0D],  # Switch to Window 1 (WINDOW_ID register)
+            writes = [
                 # UART_CTRL(L) = 0x03 (UART Auto sampling=1, Auto start=1)
-                [0, 0x88, 0x03, 0x0D],  # UART_CTRL(L) write command
+                (0x08, 0x03, "UART_CTRL(L): UART_AUTO=1, AUTO_START=1"),
                 # BURST_CTRL(L) = 0x02 (COUNT_OUT=1)
-                [0, 0x8C, FIXED_BURST_CTRL_L, 0x0D],  # BURST_CTRL(L) write command
+                (0x0C, FIXED_BURST_CTRL_L, "BURST_CTRL(L): COUNT_OUT=1"),
                 # BURST_CTRL(H) = 0x47 (TEMP_OUT=1, ACCX_OUT=1, ACCY_OUT=1, ACCZ_OUT=1)
-                [0, 0x8D, FIXED_BURST_CTRL_H, 0x0D],  # BURST_CTRL(H) write command
+                (0x0D, FIXED_BURST_CTRL_H, "BURST_CTRL(H): TEMP_OUT=1, ACCX_OUT=1, ACCY_OUT=1, ACCZ_OUT=1"),
             ]
-            self._write_commands(commands)
+            if addresses is not None:
+                writes = [write for write in writes if write[0] in addresses]
+            self.registers.write_bytes([(address, value) for address, value, _ in writes], 0x01)
             logger.info("Fixed configuration set (following acc_automode.py):")
-            logger.info("  - UART_CTRL(L): UART_AUTO=1, AUTO_START=1")
-            logger.info("  - BURST_CTRL(L): COUNT_OUT=1")
-            logger.info("  - BURST_CTRL(H): TEMP_OUT=1, ACCX_OUT=1, ACCY_OUT=1, ACCZ_OUT=1")
+            for _, _, description in writes:
+                logger.info("  - %s", description)
             return True
         except Exception as e:
             logger.error(f"Failed to set fixed configuration: {e}")
@@ -287,111 +294,189 @@ class AccelerometerConfigurator:
             # FLASH_BACKUP is bit [3] of LOW byte (not high byte!)
             # Write 0x08 to GLOB_CMD(L) at address 0x8A (0x80 | 0x0A)
             logger.debug("Writing FLASH_BACKUP command to GLOB_CMD(L) at 0x8A")
-            self._write_commands([
-                [0, 0xFE, 0x01, 0x0D],  # Switch to Window 1 (WINDOW_ID register)
-                [0, 0x8A, 0x08, 0x0D],  # Set FLASH_BACKUP bit [3] in GLOB_CMD(L)
-            ])
+            self.registers.write_byte(0x0A, 0x08, 0x01)  # Set FLASH_BACKUP bit [3] in GLOB_CMD(L)
             
             # Step (b): Wait until flash backup has finished
             # Poll GLOB_CMD register (0x0A) until FLASH_BACKUP bit[3] goes to 0
             logger.debug("Polling GLOB_CMD register waiting for FLASH_BACKUP bit to clear...")
-            start = time.time()
-            flash_backup_cleared = False
-            
-            while time.time() - start < FLASH_BACKUP_TIMEOUT:
-                # Read GLOB_CMD register (0x0A in Window 1)
-                result = self.comm.send_commands([
-                    [0, 0xFE, 0x01, 0x0D],  # Switch to Window 1
-                    [4, 0x0A, 0x00, 0x0D],  # Read GLOB_CMD register (expect 4 bytes)
-                ])
-                
-                if len(result) >= 4:
-                    # Response format: [0x0A, MSByte, LSByte, 0x0D]
-                    glob_cmd_low = result[-2]  # Low byte
-                    # FLASH_BACKUP is bit[3] in low byte
-                    flash_backup_bit = (glob_cmd_low >> 3) & 0x01
-                    
-                    if flash_backup_bit == 0:
-                        flash_backup_cleared = True
-                        logger.info("FLASH_BACKUP bit cleared (backup operation complete)")
-                        break
-                    else:
-                        # Still in progress, continue polling
-                        time.sleep(BACKUP_POLL_INTERVAL)
-                else:
-                    time.sleep(BACKUP_POLL_INTERVAL)
-            
-            if not flash_backup_cleared:
+            # FLASH_BACKUP is bit[3] in low byte
+            if not self.registers.wait_for_bits(0x0A, 0x01, 0x08, timeout=FLASH_BACKUP_TIMEOUT,
+                                                interval=BACKUP_POLL_INTERVAL):
                 logger.error("Flash backup timeout: FLASH_BACKUP bit did not clear within timeout period")
                 return False
+            logger.info("FLASH_BACKUP bit cleared (backup operation complete)")
             
             # Step (c): Confirm the result by checking FLASH_BU_ERR
             # FLASH_BU_ERR is in DIAG_STAT[0x04(W0)] bit[0]
             logger.debug("Checking FLASH_BU_ERR in DIAG_STAT register...")
-            time.sleep(0.1)  # Small delay before checking error status
-            
-            result = self.comm.send_commands([
-                [0, 0xFE, 0x00, 0x0D],  # Switch to Window 0 (WINDOW_ID register)
-                [4, 0x04, 0x00, 0x0D],  # Read DIAG_STAT register (at 0x04, expect 4 bytes)
-            ])
             
-            if len(result) >= 4:
-                flash_bu_err = result[-2] & 0x01  # Bit [0] is FLASH_BU_ERR
-                if flash_bu_err == 0:
-                    logger.info("Flash backup completed successfully (FLASH_BU_ERR=0)")
-                    return True
-                else:
-                    logger.error("Flash backup failed: FLASH_BU_ERR=1 (error occurred)")
-                    return False
+            flash_bu_err = self.registers.read_word(0x04, 0x00) & 0x01  # DIAG_STAT bit [0] is FLASH_BU_ERR
+            if flash_bu_err == 0:
+                logger.info("Flash backup completed successfully (FLASH_BU_ERR=0)")
+                return True
             else:
-                logger.error("Failed to read DIAG_STAT register for FLASH_BU_ERR verification")
+                logger.error("Flash backup failed: FLASH_BU_ERR=1 (error occurred)")
                 return False
             
         except Exception as e:
             logger.error(f"Flash backup failed with exception: {e}")
             return False
 
-    def configure(self, sps_rate: int) -> bool:
+    def configuration_targets(self, sps_rate: int) -> Optional[List[Tuple[int, int, int, int]]]:
+        """Get the register settings configure() applies for an output rate.
+        
+        Args:
+            sps_rate: Samples per second (100, 200, 500, or 1000)
+            
+        Returns:
+            (window, byte address, value, mask) settings, or None if the rate is invalid
+        """
+        if sps_rate not in SPS_TO_SMPL_CTRL_H or sps_rate not in SPS_TO_FILTER_CUTOFF:
+            logger.error(f"Invalid SPS rate: {sps_rate}. Valid rates: {list(SPS_TO_SMPL_CTRL_H.keys())}")
+            return None
+        return [
+            (0x01, 0x08, 0x03, 0x03),  # UART_CTRL(L): UART_AUTO=1, AUTO_START=1
+            (0x01, 0x0C, FIXED_BURST_CTRL_L, 0xFF),  # BURST_CTRL(L)
+            (0x01, 0x0D, FIXED_BURST_CTRL_H, 0xFF),  # BURST_CTRL(H)
+            (0x01, 0x05, SPS_TO_SMPL_CTRL_H[sps_rate], 0xFF),  # SMPL_CTRL(H): DOUT_RATE
+            # FILTER_CTRL(L): FILTER_SEL bits [3:0] (bit [5] is FILTER_STAT)
+            (0x01, 0x06, FILTER_CUTOFF_512TAPS[SPS_TO_FILTER_CUTOFF[sps_rate]], 0x0F),
+        ]
+
+    def read_snapshot(self) -> Optional[Dict[Tuple[int, int], int]]:
+        """Read the registers configure() compares in one pipelined burst.
+        
+        Returns:
+            Register values keyed by (window, address), or None if the read failed
+        """
+        if hasattr(self.comm, "flush_input_buffer"):
+            self.comm.flush_input_buffer()
+        try:
+            snapshot = self.registers.read_snapshot(SNAPSHOT_REGISTERS)
+        except Exception:
+            logger.debug("Failed to read register snapshot", exc_info=True)
+            return None
+        logger.debug(
+            "Register snapshot: %s",
+            ", ".join(f"W{window}:0x{address:02X}=0x{value:04X}" for (window, address), value in snapshot.items()),
+        )
+        return snapshot
+
+    def _reload_from_flash(self) -> bool:
+        """Software reset so that the registers hold the flash contents.
+        
+        The UART reset spell leaves the registers as they are, so they can
+        differ from flash, e.g. after a flash backup that timed out. After
+        SOFT_RST the registers reload from flash; a sensor saved in Auto
+        Start comes back sampling and is switched to configuration mode.
+        
+        Returns:
+            True once the sensor is ready in configuration mode
+        """
+        self.registers.write_byte(0x0A, 0x80, 0x01)  # GLOB_CMD: SOFT_RST
+        # WINDOW_ID returns to 0 on reboot
+        self.registers.invalidate()
+        deadline = time.perf_counter() + SOFT_RESET_TIMEOUT
+        while True:
+            time.sleep(BACKUP_POLL_INTERVAL)
+            try:
+                # GLOB_CMD NOT_READY (bit 10) clears once the registers are loaded
+                if not self.registers.read_word(0x0A, 0x01) & 0x0400:
+                    break
+            except ValueError:
+                # Burst data garbles the response: rebooted into Auto Start
+                break
+            except TimeoutError:
+                pass
+            if time.perf_counter() >= deadline:
+                logger.warning("Sensor not ready %.1f s after software reset", SOFT_RESET_TIMEOUT)
+                return False
+
+        # MODE_CMD = configuration, then drop burst data still in flight
+        self.registers.write_byte(0x03, 0x02, 0x00)
+        time.sleep(BACKUP_POLL_INTERVAL)
+        self.comm.flush_input_buffer()
+        # MODE_STAT (bit 10) is set once the sensor is in configuration mode
+        if self.registers.wait_for_bits(0x02, 0x00, 0x0400, 0x0400, timeout=MODE_SWITCH_TIMEOUT):
+            return True
+        logger.warning("Sensor did not enter configuration mode after software reset")
+        return False
+
+    def plan_configuration(self, targets: Sequence[Tuple[int, int, int, int]]) -> Optional[List[Tuple[int, int, int]]]:
+        """Compare target settings with a register snapshot.
+        
+        The sensor is software reset first so that the registers hold the
+        flash contents; an empty plan means flash already has this configuration.
+        
+        Args:
+            targets: (window, byte address, value, mask) settings from configuration_targets()
+            
+        Returns:
+            (window, byte address, value) writes that differ, or None if the snapshot could not be read
+        """
+        if not self._reload_from_flash():
+            return None
+        snapshot = self.read_snapshot()
+        if snapshot is None:
+            return None
+        return self.registers.plan_writes(snapshot, targets)
+
+    def configure(self, sps_rate: int, force: bool = False) -> bool:
         """Configure accelerometer in UART Auto Start mode.
         
         Following acc_automode.py logic: set registers, wait for filter, flash backup.
+        Only the registers whose flash contents differ from the requested
+        configuration are written, and the flash backup is skipped when none do.
         
         Args:
             sps_rate: Samples per second (100, 200, 500, or 1000)
+            force: Write every register and back up to flash regardless
             
         Returns:
             True if successful, False otherwise
         """
+        self._timings.clear()
         try:
             logger.info(f"Configuring accelerometer for {sps_rate} Sps (following acc_automode.py logic)...")
-            
-            # Reset sensor to configuration mode
-            self.reset_sensor()
-            time.sleep(0.2)
-            
-            # Step 1: Set fixed configuration (BURST_CTRL, UART_CTRL)
-            # Following acc_automode.py set_registers() - sets UART_CTRL and BURST_CTRL first
-            if not self.set_fixed_configuration():
+            targets = self.configuration_targets(sps_rate)
+            if targets is None:
                 return False
-            time.sleep(0.1)
             
-            # Step 2: Set output rate (SMPL_CTRL_H)
-            # Following acc_automode.py - sets SMPL_CTRL_H
-            if not self.set_output_rate(sps_rate):
-                return False
-            time.sleep(0.1)
+            # Reset sensor to configuration mode (returns once MODE_STAT reports it)
+            self._timed("reset", self.reset_sensor)
             
-            # Step 3: Set filter (FILTER_CTRL_L)
-            # Following acc_automode.py - sets FILTER_CTRL_L and waits for filter setting
-            if not self.set_filter(sps_rate):
-                logger.warning("Filter setting may not have completed, continuing anyway...")
-            time.sleep(0.2)
+            # Compare with the flash contents; write everything if they cannot be read
+            writes = None if force else self._timed("plan", self.plan_configuration, targets)
+            if writes is None:
+                changed = {address for _, address, _, _ in targets}
+            else:
+                changed = {address for _, address, _ in writes}
             
-            # Step 4: Execute flash backup
-            # Following acc_automode.py flash_backup()
-            if not self.flash_backup():
-                return False
+            if changed:
+                # Step 1: Set fixed configuration (BURST_CTRL, UART_CTRL)
+                # Following acc_automode.py set_registers() - sets UART_CTRL and BURST_CTRL first
+                fixed = changed & {0x08, 0x0C, 0x0D}
+                if fixed and not self._timed("fixed_configuration", self.set_fixed_configuration, fixed):
+                    return False
+                
+                # Step 2: Set output rate (SMPL_CTRL_H)
+                # Following acc_automode.py - sets SMPL_CTRL_H
+                if 0x05 in changed and not self._timed("output_rate", self.set_output_rate, sps_rate):
+                    return False
+                
+                # Step 3: Set filter (FILTER_CTRL_L)
+                # Following acc_automode.py - sets FILTER_CTRL_L and waits for FILTER_STAT
+                if 0x06 in changed and not self._timed("filter", self.set_filter, sps_rate):
+                    logger.warning("Filter setting may not have completed, continuing anyway...")
+                
+                # Step 4: Execute flash backup
+                # Following acc_automode.py flash_backup()
+                if not self._timed("flash_backup", self.flash_backup):
+                    return False
+            else:
+                logger.info("Registers already match the requested configuration; flash backup skipped")
             
+            self._log_timings("Configuration")
             logger.info("Accelerometer configured successfully")
             logger.info("After power cycle or reset, sensor will automatically start transmitting data")
             logger.info(f"Configuration: {sps_rate} Sps, 512 taps, cutoff {SPS_TO_FILTER_CUTOFF[sps_rate]} Hz")
@@ -414,22 +499,17 @@ class AccelerometerConfigurator:
         try:
             logger.info("Exiting auto mode...")
             
-            # Reset sensor to configuration mode
+            # Reset sensor to configuration mode (returns once MODE_STAT reports it)
             self.reset_sensor()
-            time.sleep(0.3)  # Increased delay for mode transition
             
             # Verify we're in configuration mode by checking MODE_CTRL
             # MODE_CTRL is at 0x02 (Window 0), bit[9:8] = MODE_CMD
             # In configuration mode, MODE_CMD should be "00" or we just set it to "01"
-            verify_mode_result = self.comm.send_commands([
-                [0, 0xFE, 0x00, 0x0D],  # Switch to Window 0
-                [4, 0x02, 0x00, 0x0D],  # Read MODE_CTRL register (expect 4 bytes)
-            ])
-            
-            if len(verify_mode_result) >= 4:
-                mode_ctrl_high = verify_mode_result[-3]  # High byte
-                mode_ctrl_low = verify_mode_result[-2]  # Low byte
-                mode_ctrl = (mode_ctrl_high << 8) | mode_ctrl_low
+            try:
+                mode_ctrl = self.registers.read_word(0x02, 0x00)
+            except ValueError as exc:
+                logger.debug("Could not read MODE_CTRL: %s", exc)
+            else:
                 mode_cmd = (mode_ctrl >> 8) & 0x03  # Extract bits [9:8]
                 logger.debug(f"MODE_CTRL read: 0x{mode_ctrl:04X}, MODE_CMD: {mode_cmd}")
                 if mode_cmd != 0x01 and mode_cmd != 0x00:
@@ -439,18 +519,14 @@ class AccelerometerConfigurator:
             
             # Read current UART_CTRL to preserve baud rate setting
             # UART_CTRL is at 0x08-0x09 (Window 1)
-            # Response format: [0x08, MSB, LSB, 0x0D] = 4 bytes
-            result = self.comm.send_commands([
-                [0, 0xFE, 0x01, 0x0D],  # Switch to Window 1
-                [4, 0x08, 0x00, 0x0D],  # Read UART_CTRL register (expect 4 bytes)
-            ])
-            
-            if len(result) < 4:
-                logger.error("Failed to read UART_CTRL register (got %d bytes, expected 4)", len(result))
+            try:
+                uart_ctrl = self.registers.read_word(0x08, 0x01)
+            except ValueError as exc:
+                logger.error("Failed to read UART_CTRL register: %s", exc)
                 return False
             
-            uart_ctrl_high = result[-3]  # High byte: bit[9:8]=BAUD_RATE
-            uart_ctrl_low = result[-2]  # Low byte: bit[1]=AUTO_START, bit[0]=UART_AUTO
+            uart_ctrl_high = uart_ctrl >> 8  # High byte: bit[9:8]=BAUD_RATE
+            uart_ctrl_low = uart_ctrl & 0xFF  # Low byte: bit[1]=AUTO_START, bit[0]=UART_AUTO
             
             logger.debug(f"Current UART_CTRL(L): 0x{uart_ctrl_low:02X}, UART_CTRL(H): 0x{uart_ctrl_high:02X}")
             
@@ -459,57 +535,41 @@ class AccelerometerConfigurator:
             new_uart_ctrl_low = uart_ctrl_low & 0xFC  # Clear bits [1:0] = 11111100 mask
             
             # Write updated UART_CTRL(L) with AUTO_START and UART_AUTO disabled
-            self._write_commands([
-                [0, 0xFE, 0x01, 0x0D],  # Switch to Window 1
-                [0, 0x88, new_uart_ctrl_low, 0x0D],  # UART_CTRL(L): Clear AUTO_START and UART_AUTO
-            ])
+            self.registers.write_byte(0x08, new_uart_ctrl_low, 0x01)  # UART_CTRL(L): Clear AUTO_START and UART_AUTO
             logger.info(f"UART_CTRL(L) updated: 0x{uart_ctrl_low:02X} -> 0x{new_uart_ctrl_low:02X} (AUTO_START=0, UART_AUTO=0)")
             
             # Verify the write was successful
-            time.sleep(0.1)
-            verify_result = self.comm.send_commands([
-                [0, 0xFE, 0x01, 0x0D],  # Switch to Window 1
-                [4, 0x08, 0x00, 0x0D],  # Read UART_CTRL register to verify (expect 4 bytes)
-            ])
-            
-            if len(verify_result) >= 4:
-                verified_low = verify_result[-2]  # Low byte
-                
-                if verified_low & 0x03 != 0:  # Check if bits [1:0] are cleared
-                    logger.error(f"UART_CTRL verification failed: expected bits [1:0]=00, got 0x{verified_low:02X}")
-                    logger.error("Cannot proceed with flash backup if register write failed")
-                    return False
-                else:
-                    logger.info("UART_CTRL write verified successfully (AUTO_START=0, UART_AUTO=0)")
-            else:
-                logger.error("Failed to read UART_CTRL for verification (got %d bytes, expected 4)", len(verify_result))
+            try:
+                verified_low = self.registers.read_word(0x08, 0x01) & 0xFF  # Low byte
+            except ValueError as exc:
+                logger.error("Failed to read UART_CTRL for verification: %s", exc)
                 return False
             
+            if verified_low & 0x03 != 0:  # Check if bits [1:0] are cleared
+                logger.error(f"UART_CTRL verification failed: expected bits [1:0]=00, got 0x{verified_low:02X}")
+                logger.error("Cannot proceed with flash backup if register write failed")
+                return False
+            else:
+                logger.info("UART_CTRL write verified successfully (AUTO_START=0, UART_AUTO=0)")
+            
             if persist_disable_auto:
                 logger.info("Persisting configuration mode via flash backup...")
-                time.sleep(0.2)  # Delay before flash backup to ensure register write is complete
-                
+                # The UART_CTRL write was read back above, so it is complete
                 if not self.flash_backup():
                     logger.error("Failed to persist configuration mode")
                     return False
                 
                 # Verify again after flash backup that UART_CTRL is still cleared
-                time.sleep(0.2)
-                final_verify = self.comm.send_commands([
-                    [0, 0xFE, 0x01, 0x0D],  # Switch to Window 1
-                    [4, 0x08, 0x00, 0x0D],  # Read UART_CTRL register (expect 4 bytes)
-                ])
-                
-                if len(final_verify) >= 4:
-                    final_low = final_verify[-2]  # Low byte
-                    
+                try:
+                    final_low = self.registers.read_word(0x08, 0x01) & 0xFF  # Low byte
+                except ValueError as exc:
+                    logger.warning("Final verification: Could not read UART_CTRL: %s", exc)
+                else:
                     if final_low & 0x03 == 0:
                         logger.info("Final verification: UART_CTRL bits cleared correctly (AUTO_START=0, UART_AUTO=0)")
                     else:
                         logger.error(f"Final verification failed: UART_CTRL(L)=0x{final_low:02X} (bits [1:0] should be 00)")
                         return False
-                else:
-                    logger.warning("Final verification: Could not read UART_CTRL (got %d bytes, expected 4)", len(final_verify))
                 
                 logger.info("Configuration mode saved to flash (permanent)")
                 logger.info("Auto-start is now permanently disabled")
@@ -526,7 +586,6 @@ class AccelerometerConfigurator:
     def _enter_configuration_mode(self) -> None:
         """Ensure sensor is in configuration mode."""
         self.reset_sensor()
-        time.sleep(0.2)
 
     def _wait_until_ready(self, timeout: float = 1.0) -> bool:
         """Wait until sensor is ready (NOT_READY bit in GLOB_CMD is 0).
@@ -537,22 +596,8 @@ class AccelerometerConfigurator:
         Returns:
             True if sensor is ready, False if timeout
         """
-        start = time.time()
-        while time.time() - start < timeout:
-            try:
-                result = self.comm.send_commands([
-                    [0, 0xFE, 0x01, 0x0D],  # Switch to Window 1
-                    [4, 0x0A, 0x00, 0x0D],  # Read GLOB_CMD register (expect 4 bytes)
-                ])
-                if len(result) >= 4:
-                    glob_cmd_low = result[-2]  # Low byte
-                    not_ready = glob_cmd_low & 0x01  # Bit[0] is NOT_READY
-                    if not_ready == 0:
-                        return True
-            except Exception:
-                pass
-            time.sleep(0.05)
-        return False
+        # Bit[10] of GLOB_CMD is NOT_READY
+        return self.registers.wait_for_bits(0x0A, 0x01, 0x0400, timeout=timeout)
 
     def _read_word(self, address: int, window: int) -> Optional[int]:
         """Read a 16-bit word from a register.
@@ -564,24 +609,59 @@ class AccelerometerConfigurator:
         Returns:
             The 16-bit word value, or None if read failed
         """
-        commands = [
-            [0, 0xFE, window & 0xFF, 0x0D],
-            [4, address & 0xFF, 0x00, 0x0D],
-        ]
         if hasattr(self.comm, "flush_input_buffer"):
             self.comm.flush_input_buffer()
-        result = self.comm.send_commands(commands)
-        if len(result) < 4:
-            logger.error(
-                "Register read returned insufficient data for 0x%02X (got %s bytes: %s)",
-                address,
-                len(result),
-                " ".join(f"0x{byte:02X}" for byte in result) or "none",
-            )
+        try:
+            return self.registers.read_word(address, window)
+        except ValueError as exc:
+            logger.error("Register read returned unexpected data: %s", exc)
+            return None
+
+    def _read_words(self, addresses: Sequence[int], window: int) -> Optional[List[int]]:
+        """Read several registers of one window in one pipelined transaction.
+        
+        Args:
+            addresses: Register addresses (low byte)
+            window: Window number (0 or 1)
+            
+        Returns:
+            The 16-bit word values in address order, or None if any read failed
+        """
+        if hasattr(self.comm, "flush_input_buffer"):
+            self.comm.flush_input_buffer()
+        try:
+            return self.registers.read_words(addresses, window)
+        except Exception:
+            logger.debug("Failed to read registers %s", addresses, exc_info=True)
             return None
-        msb = result[-3]
-        lsb = result[-2]
-        return (msb << 8) | lsb
+
+    def _read_identity_words(self, registers: Sequence[int], name: str) -> Optional[List[int]]:
+        """Read identity registers one at a time, retrying each once.
+        
+        Args:
+            registers: Register addresses in window 1
+            name: Register group name for log messages
+            
+        Returns:
+            The 16-bit word values, or None if a register could not be read
+        """
+        words: List[int] = []
+        for reg in registers:
+            word = self._read_word(reg, 0x01)  # Window 1
+            if word is None:
+                logger.warning("Retrying %s register 0x%02X", name, reg)
+                # Re-enter configuration mode and flush buffer
+                if hasattr(self.comm, "flush_input_buffer"):
+                    self.comm.flush_input_buffer()
+                self._enter_configuration_mode()
+                time.sleep(0.1)
+                word = self._read_word(reg, 0x01)
+            if word is None:
+                logger.error("Failed to read %s register 0x%02X after retry", name, reg)
+                return None
+            words.append(word)
+            time.sleep(0.05)  # Small delay between reads
+        return words
 
     @staticmethod
     def _decode_ascii_words(words: List[int], little_endian: bool = True) -> str:
@@ -617,26 +697,20 @@ class AccelerometerConfigurator:
         # Ensure the sensor is in a clean configuration state before reading
         # This will stop any streaming and enter configuration mode
         self.reset_sensor()
-        time.sleep(0.3)
         self._enter_configuration_mode()
-        time.sleep(0.2)
         
-        product_words = []
-        for reg in PROD_ID_REGISTERS:
-            word = self._read_word(reg, 0x01)  # Window 1
-            if word is None:
-                logger.warning("Retrying product ID register 0x%02X", reg)
-                # Re-enter configuration mode and flush buffer
-                if hasattr(self.comm, "flush_input_buffer"):
-                    self.comm.flush_input_buffer()
-                self._enter_configuration_mode()
-                time.sleep(0.1)
-                word = self._read_word(reg, 0x01)
-            if word is None:
-                logger.error("Failed to read product ID register 0x%02X after retry", reg)
+        # All eight identity registers in one batch; fall back to reading
+        # them one at a time with retries if the batch comes back garbled
+        words = self._read_words(PROD_ID_REGISTERS + SERIAL_REGISTERS, 0x01)
+        if words is not None:
+            product_words = words[:len(PROD_ID_REGISTERS)]
+            serial_words: Optional[List[int]] = words[len(PROD_ID_REGISTERS):]
+        else:
+            logger.warning("Batched identity read failed, reading registers one at a time")
+            product_words = self._read_identity_words(PROD_ID_REGISTERS, "product ID")
+            if product_words is None:
                 return None
-            product_words.append(word)
-            time.sleep(0.05)  # Small delay between reads
+            serial_words = None
         
         logger.info(
             "Product ID raw words: %s",
@@ -645,22 +719,10 @@ class AccelerometerConfigurator:
         product_id_raw = self._decode_ascii_words(product_words, little_endian=True)
         product_id = PRODUCT_ID_ALIASES.get(product_id_raw, product_id_raw)
         
-        serial_words = []
-        for reg in SERIAL_REGISTERS:
-            word = self._read_word(reg, 0x01)  # Window 1
-            if word is None:
-                logger.warning("Retrying serial register 0x%02X", reg)
-                # Re-enter configuration mode and flush buffer
-                if hasattr(self.comm, "flush_input_buffer"):
-                    self.comm.flush_input_buffer()
-                self._enter_configuration_mode()
-                time.sleep(0.1)
-                word = self._read_word(reg, 0x01)
-            if word is None:
-                logger.error("Failed to read serial register 0x%02X after retry", reg)
+        if serial_words is None:
+            serial_words = self._read_identity_words(SERIAL_REGISTERS, "serial")
+            if serial_words is None:
                 return None
-            serial_words.append(word)
-            time.sleep(0.05)  # Small delay between reads
         
         logger.info(
             "Serial number raw words: %s",
@@ -669,7 +731,7 @@ class AccelerometerConfigurator:
         serial_number = self._decode_ascii_words(serial_words, little_endian=True)
         
         # Return to window 0 for safety
-        self._write_commands([[0, 0xFE, 0x00, 0x0D]])
+        self.registers.select_window(0x00)
         return {
             "product_id": product_id or "",
             "product_id_raw": product_id_raw or "",
@@ -699,22 +761,16 @@ class AccelerometerConfigurator:
             # If sensor is in auto mode, we might not be able to read registers
             # So we'll try to read, and if it fails, assume auto mode
             try:
-                result = self.comm.send_commands([
-                    [0, 0xFE, 0x01, 0x0D],  # Switch to Window 1
-                    [4, 0x08, 0x00, 0x0D],  # Read UART_CTRL register
-                ])
+                uart_ctrl = self.registers.read_word(0x08, 0x01)  # Read UART_CTRL register
+                uart_auto = uart_ctrl & 0x01  # Bit[0]
+                auto_start = (uart_ctrl >> 1) & 0x01  # Bit[1]
                 
-                if len(result) >= 4:
-                    uart_ctrl_low = result[-2]  # Low byte
-                    uart_auto = uart_ctrl_low & 0x01  # Bit[0]
-                    auto_start = (uart_ctrl_low >> 1) & 0x01  # Bit[1]
-                    
-                    if uart_auto == 1 and auto_start == 1:
-                        logger.info("Sensor is in auto mode (UART_AUTO=1, AUTO_START=1)")
-                        return True
-                    else:
-                        logger.info("Sensor is not in auto mode (UART_AUTO=%d, AUTO_START=%d)", uart_auto, auto_start)
-                        return False
+                if uart_auto == 1 and auto_start == 1:
+                    logger.info("Sensor is in auto mode (UART_AUTO=1, AUTO_START=1)")
+                    return True
+                else:
+                    logger.info("Sensor is not in auto mode (UART_AUTO=%d, AUTO_START=%d)", uart_auto, auto_start)
+                    return False
             except Exception as read_err:
                 logger.debug("Could not read UART_CTRL register (sensor may be streaming): %s", read_err)
             
@@ -737,29 +793,37 @@ class AccelerometerConfigurator:
         """
         logger.info("Starting full accelerometer reset (persist disable=%s)", persist_disable_auto)
         self._warnings.clear()
+        self._timings.clear()
         try:
             if persist_disable_auto:
                 logger.info("Clearing auto mode and persisting before proceeding with reset")
-                if not self.exit_auto_mode(persist_disable_auto=True):
+                if not self._timed("exit_auto", self.exit_auto_mode, persist_disable_auto=True):
                     return False
             
             # Reset sensor to configuration mode
-            self.reset_sensor()
-            time.sleep(0.2)
+            self._timed("reset", self.reset_sensor)
             
             # Perform flash reset (GLOB_CMD bit[2] = FLASH_RST)
             logger.info("Performing flash reset...")
-            self._write_commands([
-                [0, 0xFE, 0x01, 0x0D],  # Switch to Window 1
-                [0, 0x8A, 0x04, 0x0D],  # GLOB_CMD(L): Set FLASH_RST bit[2]
-            ])
-            
-            # Wait for flash reset to complete (up to 2 seconds based on datasheet)
-            time.sleep(2.0)
+            self._timed("flash_reset", self._flash_reset)
             
             logger.info("Accelerometer full reset sequence completed")
+            self._log_timings("Full reset")
             return True
         except Exception as exc:
             logger.error("Full reset sequence failed: %s", exc)
             return False
 
+    def _flash_reset(self) -> None:
+        """Restore the factory register defaults and wait for FLASH_RST to clear."""
+        self.registers.write_byte(0x0A, 0x04, 0x01)  # GLOB_CMD(L): Set FLASH_RST bit[2]
+        # Registers, WINDOW_ID included, return to their defaults
+        self.registers.invalidate()
+        
+        # FLASH_RST clears once the flash reset is complete
+        if not self.registers.wait_for_bits(0x0A, 0x01, 0x04, timeout=FLASH_RESET_TIMEOUT,
+                                            interval=BACKUP_POLL_INTERVAL):
+            message = "Flash reset did not report completion; power cycle the sensor before use."
+            logger.warning(message)
+            self._add_warning(message)
+
@@ -179,6 +179,7 @@ def configure_accelerometer(port: str, sps_rate: int, baud: int = DEFAULT_BAUD_R
         return False
     finally:
         if comm:
+            logger.info("Serial transport: %s", comm.metrics.summary())
             comm.close()
 
 
@@ -226,6 +227,7 @@ def exit_auto_mode(port: str, baud: int = DEFAULT_BAUD_RATE, persist_disable_aut
         return False
     finally:
         if comm:
+            logger.info("Serial transport: %s", comm.metrics.summary())
             comm.close()
 
 
@@ -130,6 +130,7 @@ def configure_sensor(port: str, baud: int) -> bool:
         return False
     finally:
         if comm:
+            logger.info("Serial transport: %s", comm.metrics.summary())
             comm.close()
 
 
@@ -181,6 +182,7 @@ def exit_auto_mode(port: str, baud: int, persist_disable_auto: bool) -> bool:
         return False
     finally:
         if comm:
+            logger.info("Serial transport: %s", comm.metrics.summary())
             comm.close()
 
 
@@ -247,6 +249,7 @@ def detect_sensor_identity(port: str, baud: int) -> bool:
         return False
     finally:
         if comm:
+            logger.info("Serial transport: %s", comm.metrics.summary())
             comm.close()
 
 
@@ -294,6 +297,7 @@ def reset_sensor_cli(port: str, baud: int) -> bool:
         return False
     finally:
         if comm:
+            logger.info("Serial transport: %s", comm.metrics.summary())
             comm.close()
 
 
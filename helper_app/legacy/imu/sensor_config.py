@@ -12,13 +12,13 @@ Organization: Zenith Tek (https://zenithtek.in)
 import logging
 import sys
 import time
-from typing import List, Optional
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
 
 try:
-    from sensor_comm import SensorCommunication
+    from sensor_comm import RegisterAccess, SensorCommunication
 except ImportError:  # pragma: no cover - fallback for package usage
     try:
-        from .sensor_comm import SensorCommunication
+        from .sensor_comm import RegisterAccess, SensorCommunication
     except ImportError as exc:  # pragma: no cover - fatal error path
         print("Error: Could not import sensor_comm module")
         raise exc
@@ -29,7 +29,19 @@ AUTHOR = "Jnana Phani A (https://phani.zenithtek.in)"
 ORGANIZATION = "Zenith Tek (https://zenithtek.in)"
 
 FLASH_BACKUP_TIMEOUT = 5.0
-BACKUP_POLL_INTERVAL = 0.1
+BACKUP_POLL_INTERVAL = 0.01
+# Status bits are polled; these are the datasheet maxima plus margin
+MODE_SWITCH_TIMEOUT = 0.5
+# Software reset, datasheet maximum plus margin
+SOFT_RESET_TIMEOUT = 3.0
+FILTER_STAT_TIMEOUT = 2.0
+
+# Registers compared before configuring: DIAG_STAT (window 0); SIG_CTRL,
+# SMPL_CTRL, FILTER_CTRL, UART_CTRL and BURST_CTRL1/2 (window 1)
+SNAPSHOT_REGISTERS = {
+    0x00: (0x04,),
+    0x01: (0x00, 0x04, 0x06, 0x08, 0x0C, 0x0E),
+}
 
 PROD_ID_REGISTERS = (0x6A, 0x6C, 0x6E, 0x70)
 SERIAL_REGISTERS = (0x74, 0x76, 0x78, 0x7A)
@@ -80,7 +92,9 @@ class SensorConfigurator:
 
     def __init__(self, comm: SensorCommunication):
         self.comm = comm
+        self.registers = RegisterAccess(comm)
         self._warnings: List[str] = []
+        self._timings: List[Tuple[str, float]] = []
 
     def _add_warning(self, message: str) -> None:
         self._warnings.append(message)
@@ -90,6 +104,24 @@ class SensorConfigurator:
         self._warnings.clear()
         return warnings
 
+    def collect_timings(self) -> Dict[str, float]:
+        """Return and clear the step timings (seconds) of the last operation."""
+        timings = dict(self._timings)
+        self._timings.clear()
+        return timings
+
+    def _timed(self, name: str, step: Callable, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return step(*args, **kwargs)
+        finally:
+            self._timings.append((name, time.perf_counter() - start))
+
+    def _log_timings(self, operation: str) -> None:
+        total = sum(seconds for _, seconds in self._timings)
+        steps = ", ".join(f"{name} {seconds * 1000:.0f} ms" for name, seconds in self._timings)
+        logger.info("%s took %.3f s (%s)", operation, total, steps)
+
     def _write_commands(self, commands: List[List[int]]) -> None:
         """Send a list of command frames to the IMU."""
         self.comm.send_commands(commands)
@@ -104,60 +136,32 @@ class SensorConfigurator:
             ]
         )
         logger.debug("IMU reset command sequence sent")
+        # The IMU may have been rebooting; select the window again
+        self.registers.invalidate()
         self._wait_until_ready()
 
     def _enter_configuration_mode(self) -> None:
         """Ensure the IMU is in configuration mode before register access."""
         if hasattr(self.comm, "flush_input_buffer"):
             self.comm.flush_input_buffer()
-        self._write_commands(
-            [
-                [0, 0xFE, 0x00, 0x0D],
-                [0, 0x83, 0x02, 0x0D],
-            ]
-        )
-        time.sleep(0.05)
-        self._write_commands(
-            [
-                [0, 0xFE, 0x01, 0x0D],
-                [0, 0x88, 0x00, 0x0D],
-            ]
-        )
-        time.sleep(0.05)
+        self.registers.write_byte(0x03, 0x02, 0x00)
+        self.registers.wait_for_bits(0x02, 0x00, 0x0400, 0x0400, timeout=MODE_SWITCH_TIMEOUT)  # MODE_STAT
+        self.registers.write_byte(0x08, 0x00, 0x01)
         self._wait_until_ready()
 
     def _wait_until_ready(self, timeout: float = 3.0) -> bool:
-        start = time.time()
-        while time.time() - start < timeout:
-            try:
-                if hasattr(self.comm, "flush_input_buffer"):
-                    self.comm.flush_input_buffer()
-                result = self.comm.send_commands(
-                    [
-                        [0, 0xFE, 0x01, 0x0D],
-                        [4, 0x0A, 0x00, 0x0D],
-                    ]
-                )
-                if len(result) >= 4:
-                    glob_cmd = (result[-3] << 8) | result[-2]
-                    if (glob_cmd & 0x0400) == 0:
-                        return True
-            except TimeoutError:
-                logger.debug("Waiting for IMU ready... (timeout)")
-            except Exception:
-                logger.debug("Transient error while waiting for ready", exc_info=True)
-            time.sleep(0.05)
+        if hasattr(self.comm, "flush_input_buffer"):
+            self.comm.flush_input_buffer()
+        if self.registers.wait_for_bits(0x0A, 0x01, 0x0400, timeout=timeout):  # GLOB_CMD NOT_READY
+            return True
         logger.warning("Timed out waiting for IMU ready state")
         return False
 
     def software_reset(self) -> bool:
         try:
-            self._write_commands(
-                [
-                    [0, 0xFE, 0x01, 0x0D],  # WINDOW = 1
-                    [0, 0x8A, 0x80, 0x0D],  # GLOB_CMD: SOFT_RST bit7
-                ]
-            )
+            self.registers.write_byte(0x0A, 0x80, 0x01)  # GLOB_CMD: SOFT_RST bit7
+            # WINDOW_ID returns to 0 on reboot
+            self.registers.invalidate()
             logger.info("Software reset command issued; waiting for reboot")
             if self._wait_until_ready(timeout=7.0):
                 return True
@@ -169,43 +173,18 @@ class SensorConfigurator:
 
     def flash_test(self) -> bool:
         try:
-            self._write_commands(
-                [
-                    [0, 0xFE, 0x01, 0x0D],
-                    [0, 0x83, 0x08, 0x0D],
-                ]
-            )
+            self.registers.write_byte(0x03, 0x08, 0x01)
             logger.info("Flash test command issued")
 
-            start = time.time()
-            while time.time() - start < FLASH_BACKUP_TIMEOUT:
-                result = self.comm.send_commands(
-                    [
-                        [0, 0xFE, 0x01, 0x0D],
-                        [4, 0x02, 0x00, 0x0D],
-                    ]
-                )
-                if len(result) >= 4:
-                    status = (result[-3] << 8) | result[-2]
-                    if (status & 0x0400) == 0:
-                        logger.debug("Flash test operation complete (MSC_CTRL=0x%04X)", status)
-                        break
-                time.sleep(BACKUP_POLL_INTERVAL)
-            else:
+            if not self.registers.wait_for_bits(0x02, 0x01, 0x0400, timeout=FLASH_BACKUP_TIMEOUT,
+                                                interval=BACKUP_POLL_INTERVAL):
                 logger.error("Flash test timeout")
                 return False
+            logger.debug("Flash test operation complete")
 
-            diag_result = self.comm.send_commands(
-                [
-                    [0, 0xFE, 0x00, 0x0D],
-                    [4, 0x04, 0x00, 0x0D],
-                ]
-            )
-            if len(diag_result) >= 4:
-                diag_low = diag_result[-2]
-                if diag_low & 0x04:
-                    logger.error("FLASH_ERR flag set after flash test")
-                    return False
+            if self.registers.read_word(0x04, 0x00) & 0x04:
+                logger.error("FLASH_ERR flag set after flash test")
+                return False
             self._wait_until_ready(timeout=2.0)
             logger.info("Flash test completed successfully")
             return True
@@ -219,50 +198,63 @@ class SensorConfigurator:
             persist_disable_auto,
         )
         self._warnings.clear()
+        self._timings.clear()
         try:
             if persist_disable_auto:
                 logger.info("Clearing auto mode and persisting before proceeding with reset")
-                if not self.exit_auto_mode(persist_disable_auto=True):
+                if not self._timed("exit_auto", self.exit_auto_mode, persist_disable_auto=True):
                     return False
             else:
-                self._write_commands([[0, 0xFE, 0x00, 0x0D]])
+                self.registers.select_window(0x00)
 
-            self.reset_sensor()
-            time.sleep(0.1)
+            # reset_sensor() waits for NOT_READY itself
+            self._timed("reset", self.reset_sensor)
 
-            if not self.flash_test():
+            if not self._timed("flash_test", self.flash_test):
                 logger.warning("Flash test reported an error; continuing with reset")
                 self._add_warning("Flash test reported an error; configuration may not persist after reset.")
 
-            if not self.software_reset():
+            if not self._timed("software_reset", self.software_reset):
                 return False
 
-            logger.info("IMU full reset sequence completed. Allowing reboot stabilization")
-            time.sleep(0.8)
+            logger.info("IMU full reset sequence completed")
+            self._log_timings("Full reset")
             return True
         except Exception as exc:  # pragma: no cover
             logger.error("Full reset sequence failed: %s", exc)
             return False
 
     def _read_word(self, address: int, window: int) -> Optional[int]:
-        commands = [
-            [0, 0xFE, window & 0xFF, 0x0D],
-            [4, address & 0xFF, 0x00, 0x0D],
-        ]
         if hasattr(self.comm, "flush_input_buffer"):
             self.comm.flush_input_buffer()
-        result = self.comm.send_commands(commands)
-        if len(result) < 4:
-            logger.error(
-                "Register read returned insufficient data for 0x%02X (got %s bytes: %s)",
-                address,
-                len(result),
-                " ".join(f"0x{byte:02X}" for byte in result) or "none",
-            )
+        try:
+            return self.registers.read_word(address, window)
+        except ValueError as exc:
+            logger.error("Register read returned unexpected data: %s", exc)
+            return None
+
+    def _read_words(self, addresses: Sequence[int], window: int) -> Optional[List[int]]:
+        if hasattr(self.comm, "flush_input_buffer"):
+            self.comm.flush_input_buffer()
+        try:
+            return self.registers.read_words(addresses, window)
+        except Exception:
+            logger.debug("Failed to read registers %s", addresses, exc_info=True)
             return None
-        msb = result[-3]
-        lsb = result[-2]
-        return (msb << 8) | lsb
+
+    def _read_identity_words(self, registers: Sequence[int], name: str) -> Optional[List[int]]:
+        words: List[int] = []
+        for reg in registers:
+            word = self._read_word(reg, 0x01)
+            if word is None and words:
+                logger.warning("Retrying %s register 0x%02X", name, reg)
+                self._enter_configuration_mode()
+                word = self._read_word(reg, 0x01)
+            if word is None:
+                logger.error("Failed to read %s register 0x%02X", name, reg)
+                return None
+            words.append(word)
+        return words
 
     @staticmethod
     def _decode_ascii_words(words: List[int], little_endian: bool = True) -> str:
@@ -302,9 +294,9 @@ class SensorConfigurator:
             for attempt in range(5):
                 try:
                     # Just read the register - don't send any commands that change state
+                    self.registers.select_window(0x00)
                     result = self.comm.send_commands(
                         [
-                            [0, 0xFE, 0x00, 0x0D],  # Select window 0
                             [4, 0x02, 0x00, 0x0D],  # Read MODE_CTRL register (address 0x02)
                         ]
                     )
@@ -395,17 +387,18 @@ class SensorConfigurator:
         self.reset_sensor()
         time.sleep(0.2)
         self._enter_configuration_mode()
-        product_words = []
-        for reg in PROD_ID_REGISTERS:
-            word = self._read_word(reg, 0x01)
-            if word is None and product_words:
-                logger.warning("Retrying product ID register 0x%02X", reg)
-                self._enter_configuration_mode()
-                word = self._read_word(reg, 0x01)
-            if word is None:
-                logger.error("Failed to read product ID register 0x%02X", reg)
+        # One batch for all identity registers; per-register reads with
+        # retries only if it comes back garbled
+        words = self._read_words(PROD_ID_REGISTERS + SERIAL_REGISTERS, 0x01)
+        if words is not None:
+            product_words = words[:len(PROD_ID_REGISTERS)]
+            serial_words: Optional[List[int]] = words[len(PROD_ID_REGISTERS):]
+        else:
+            logger.warning("Batched identity read failed, reading registers one at a time")
+            product_words = self._read_identity_words(PROD_ID_REGISTERS, "product ID")
+            if product_words is None:
                 return None
-            product_words.append(word)
+            serial_words = None
         logger.info(
             "Product ID raw words: %s",
             " ".join(f"0x{word:04X}" for word in product_words),
@@ -413,17 +406,10 @@ class SensorConfigurator:
         product_id = self._decode_ascii_words(product_words, little_endian=True)
         friendly_product_id = PRODUCT_ID_ALIASES.get(product_id, product_id)
 
-        serial_words = []
-        for reg in SERIAL_REGISTERS:
-            word = self._read_word(reg, 0x01)
-            if word is None and serial_words:
-                logger.warning("Retrying serial register 0x%02X", reg)
-                self._enter_configuration_mode()
-                word = self._read_word(reg, 0x01)
-            if word is None:
-                logger.error("Failed to read serial register 0x%02X", reg)
+        if serial_words is None:
+            serial_words = self._read_identity_words(SERIAL_REGISTERS, "serial")
+            if serial_words is None:
                 return None
-            serial_words.append(word)
         logger.info(
             "Serial number raw words: %s",
             " ".join(f"0x{word:04X}" for word in serial_words),
@@ -431,7 +417,7 @@ class SensorConfigurator:
         serial_number = self._decode_ascii_words(serial_words, little_endian=True)
 
         # Return to window 0 for safety
-        self._write_commands([[0, 0xFE, 0x00, 0x0D]])
+        self.registers.select_window(0x00)
         return {
             "product_id": friendly_product_id or "",
             "product_id_raw": product_id or "",
@@ -440,6 +426,68 @@ class SensorConfigurator:
             "serial_words": serial_words,
         }
 
+    def configuration_targets(
+        self, sampling_rate: float = DEFAULT_SAMPLING_RATE, tap_value: Optional[int] = None
+    ) -> Optional[List[Tuple[int, int, int, int]]]:
+        """
+        Resolve the sampling rate and TAP into register settings.
+        
+        Args:
+            sampling_rate: Sampling rate in SPS (samples per second). Must be one of the supported rates.
+            tap_value: Optional TAP value for the moving average filter. If None, uses minimum required TAP.
+        
+        Returns:
+            (window, byte address, value, mask) settings, or None if the sampling rate is unsupported.
+        """
+        # Validate and get sampling rate configuration
+        if sampling_rate not in SAMPLING_RATE_CONFIG:
+            supported_rates = sorted(SAMPLING_RATE_CONFIG.keys())
+            logger.error(
+                "Unsupported sampling rate: %.3f SPS. Supported rates: %s",
+                sampling_rate,
+                ", ".join(f"{r} SPS" if isinstance(r, int) else f"{r:.3f} SPS" for r in supported_rates),
+            )
+            return None
+        
+        dout_rate, min_tap = SAMPLING_RATE_CONFIG[sampling_rate]
+        
+        # Determine TAP value - always use TAP = 128 (0x07) as standard
+        if tap_value is None:
+            tap_value = 128  # Standard TAP value for all sampling rates
+        elif tap_value < min_tap:
+            logger.warning(
+                "TAP value %d is below minimum %d for %.3f SPS. Using minimum TAP value.",
+                tap_value, min_tap, sampling_rate
+            )
+            tap_value = min_tap
+        
+        # Validate TAP value is one of the supported values
+        supported_taps = [0, 2, 4, 8, 16, 32, 64, 128]
+        if tap_value not in supported_taps:
+            # Round to nearest supported value
+            closest_tap = min(supported_taps, key=lambda x: abs(x - tap_value))
+            logger.warning(
+                "TAP value %d is not a standard value. Using closest supported value: %d",
+                tap_value, closest_tap
+            )
+            tap_value = closest_tap
+        
+        # Convert TAP count to register value
+        tap_register = TAP_TO_REGISTER[tap_value]
+        
+        logger.info(
+            "Configuring IMU with sampling rate: %.3f SPS (DOUT_RATE=0x%02X), TAP=%d (register=0x%02X)",
+            sampling_rate, dout_rate, tap_value, tap_register
+        )
+        return [
+            (0x01, 0x05, dout_rate, 0xFF),  # SMPL_CTRL: DOUT_RATE in high byte
+            (0x01, 0x06, tap_register, 0x0F),  # TAP: moving average filter taps (0x07 = 128 taps)
+            (0x01, 0x08, 0x03, 0x03),  # UART_CTRL: UART_AUTO=1, AUTO_START=1
+            (0x01, 0x0C, 0x02, 0xFF),  # BURST_CTRL1: COUNT on, checksum off
+            (0x01, 0x0D, 0xF0, 0xFF),  # BURST_CTRL2: FLAG, TEMP, GYRO, ACCL on
+            (0x01, 0x0F, 0x70, 0xFF),  # BURST_CTRL4: 32-bit outputs
+        ]
+
     def configure_registers(self, sampling_rate: float = DEFAULT_SAMPLING_RATE, tap_value: Optional[int] = None) -> bool:
         """
         Write the IMU register settings for UART Auto Start.
@@ -451,115 +499,115 @@ class SensorConfigurator:
         Returns:
             True if configuration succeeded, False otherwise.
         """
+        targets = self.configuration_targets(sampling_rate=sampling_rate, tap_value=tap_value)
+        if targets is None:
+            return False
+        return self.write_settings([(window, address, value) for window, address, value, _ in targets])
+
+    def write_settings(self, writes: Sequence[Tuple[int, int, int]]) -> bool:
+        """Write (window, byte address, value) settings, waiting for FILTER_STAT after a filter change."""
         try:
-            # Validate and get sampling rate configuration
-            if sampling_rate not in SAMPLING_RATE_CONFIG:
-                supported_rates = sorted(SAMPLING_RATE_CONFIG.keys())
-                logger.error(
-                    "Unsupported sampling rate: %.3f SPS. Supported rates: %s",
-                    sampling_rate,
-                    ", ".join(f"{r} SPS" if isinstance(r, int) else f"{r:.3f} SPS" for r in supported_rates),
-                )
-                return False
-            
-            dout_rate, min_tap = SAMPLING_RATE_CONFIG[sampling_rate]
-            
-            # Determine TAP value - always use TAP = 128 (0x07) as standard
-            if tap_value is None:
-                tap_value = 128  # Standard TAP value for all sampling rates
-            elif tap_value < min_tap:
-                logger.warning(
-                    "TAP value %d is below minimum %d for %.3f SPS. Using minimum TAP value.",
-                    tap_value, min_tap, sampling_rate
-                )
-                tap_value = min_tap
-            
-            # Validate TAP value is one of the supported values
-            supported_taps = [0, 2, 4, 8, 16, 32, 64, 128]
-            if tap_value not in supported_taps:
-                # Round to nearest supported value
-                closest_tap = min(supported_taps, key=lambda x: abs(x - tap_value))
-                logger.warning(
-                    "TAP value %d is not a standard value. Using closest supported value: %d",
-                    tap_value, closest_tap
-                )
-                tap_value = closest_tap
-            
-            # Convert TAP count to register value
-            tap_register = TAP_TO_REGISTER[tap_value]
-            
-            logger.info(
-                "Configuring IMU with sampling rate: %.3f SPS (DOUT_RATE=0x%02X), TAP=%d (register=0x%02X)",
-                sampling_rate, dout_rate, tap_value, tap_register
-            )
-            
-            register_writes: List[List[int]] = [
-                [0, 0xFE, 0x01, 0x0D],  # WINDOW = 1
-                [0, 0x85, dout_rate, 0x0D],  # SMPL_CTRL: DOUT_RATE in high byte
-                [0, 0x86, tap_register, 0x0D],  # TAP: moving average filter taps (0x07 = 128 taps)
-                [0, 0x88, 0x03, 0x0D],  # UART_CTRL: UART_AUTO=1, AUTO_START=1
-                [0, 0x8C, 0x02, 0x0D],  # BURST_CTRL1: COUNT on, checksum off
-                [0, 0x8D, 0xF0, 0x0D],  # BURST_CTRL2: FLAG, TEMP, GYRO, ACCL on
-                [0, 0x8F, 0x70, 0x0D],  # BURST_CTRL4: 32-bit outputs
-            ]
-            self._write_commands(register_writes)
-            logger.info(
-                "IMU configuration registers programmed for UART Auto Start "
-                "(%.3f SPS, TAP=%d)",
-                sampling_rate, tap_value
-            )
+            # SMPL_CTRL and FILTER_CTRL first; the filter settles before the rest
+            filter_writes = [(address, value) for _, address, value in writes if address in (0x05, 0x06)]
+            other_writes = [(address, value) for _, address, value in writes if address not in (0x05, 0x06)]
+            if filter_writes:
+                self.registers.write_bytes(filter_writes, 0x01)
+            if any(address == 0x06 for address, _ in filter_writes):
+                # FILTER_STAT (FILTER_CTRL bit 5) clears once the new filter is set
+                if not self.registers.wait_for_bits(0x06, 0x01, 0x20, timeout=FILTER_STAT_TIMEOUT):
+                    logger.warning("FILTER_STAT still set after %.1f s; continuing", FILTER_STAT_TIMEOUT)
+            if other_writes:
+                self.registers.write_bytes(other_writes, 0x01)
+            logger.info("IMU configuration registers programmed for UART Auto Start (%d writes)", len(writes))
             return True
         except Exception as exc:  # pragma: no cover - serial runtime failure
             logger.error("Failed to configure IMU registers: %s", exc)
             return False
 
+    def read_snapshot(self) -> Optional[Dict[Tuple[int, int], int]]:
+        """Read the registers configure() compares in one pipelined burst; None if the read failed."""
+        if hasattr(self.comm, "flush_input_buffer"):
+            self.comm.flush_input_buffer()
+        try:
+            snapshot = self.registers.read_snapshot(SNAPSHOT_REGISTERS)
+        except Exception:
+            logger.debug("Failed to read register snapshot", exc_info=True)
+            return None
+        logger.debug(
+            "Register snapshot: %s",
+            ", ".join(f"W{window}:0x{address:02X}=0x{value:04X}" for (window, address), value in snapshot.items()),
+        )
+        return snapshot
+
+    def _reload_from_flash(self) -> bool:
+        """Software reset so the registers hold the flash contents, then enter configuration mode."""
+        # The UART reset spell leaves the registers as they are; SOFT_RST reloads them from flash
+        self.registers.write_byte(0x0A, 0x80, 0x01)  # GLOB_CMD: SOFT_RST
+        # WINDOW_ID returns to 0 on reboot
+        self.registers.invalidate()
+        deadline = time.perf_counter() + SOFT_RESET_TIMEOUT
+        while True:
+            time.sleep(BACKUP_POLL_INTERVAL)
+            try:
+                # GLOB_CMD NOT_READY (bit 10) clears once the registers are loaded
+                if not self.registers.read_word(0x0A, 0x01) & 0x0400:
+                    break
+            except ValueError:
+                # Burst data garbles the response: rebooted into Auto Start
+                break
+            except TimeoutError:
+                pass
+            if time.perf_counter() >= deadline:
+                logger.warning("IMU not ready %.1f s after software reset", SOFT_RESET_TIMEOUT)
+                return False
+
+        # MODE_CMD = configuration, then drop burst data still in flight
+        self.registers.write_byte(0x03, 0x02, 0x00)
+        time.sleep(BACKUP_POLL_INTERVAL)
+        self.comm.flush_input_buffer()
+        # MODE_STAT (bit 10) is set once the sensor is in configuration mode
+        if self.registers.wait_for_bits(0x02, 0x00, 0x0400, 0x0400, timeout=MODE_SWITCH_TIMEOUT):
+            return True
+        logger.warning("IMU did not enter configuration mode after software reset")
+        return False
+
+    def plan_configuration(self, targets: Sequence[Tuple[int, int, int, int]]) -> Optional[List[Tuple[int, int, int]]]:
+        """
+        Compare target settings with a register snapshot.
+        
+        The sensor is software reset first so that the registers hold the
+        flash contents; an empty plan means flash already has this configuration.
+        
+        Returns:
+            (window, byte address, value) writes that differ, or None if the snapshot could not be read.
+        """
+        if not self._reload_from_flash():
+            return None
+        snapshot = self.read_snapshot()
+        if snapshot is None:
+            return None
+        return self.registers.plan_writes(snapshot, targets)
+
     def flash_backup(self) -> bool:
         """Execute the flash backup flow (datasheet section 7.1.7)."""
         try:
             # (a) Send flash backup command (WINDOW=1, GLOB_CMD bit[3]).
-            self._write_commands(
-                [
-                    [0, 0xFE, 0x01, 0x0D],  # WINDOW = 1
-                    [0, 0x8A, 0x08, 0x0D],  # GLOB_CMD: FLASH_BACKUP = 1
-                ]
-            )
+            self.registers.write_byte(0x0A, 0x08, 0x01)  # GLOB_CMD: FLASH_BACKUP = 1
             logger.info("Flash backup command issued")
 
             # (b) Poll FLASH_BACKUP bit until it clears.
-            start_time = time.time()
-            while time.time() - start_time < FLASH_BACKUP_TIMEOUT:
-                result = self.comm.send_commands(
-                    [
-                        [0, 0xFE, 0x01, 0x0D],  # WINDOW = 1
-                        [4, 0x0A, 0x00, 0x0D],  # Read GLOB_CMD
-                    ]
-                )
-                if len(result) >= 4:
-                    glob_cmd_low = result[2]
-                    if (glob_cmd_low & 0b00001000) == 0:
-                        logger.debug("FLASH_BACKUP bit cleared")
-                        break
-                time.sleep(BACKUP_POLL_INTERVAL)
-            else:
+            if not self.registers.wait_for_bits(0x0A, 0x01, 0b00001000, timeout=FLASH_BACKUP_TIMEOUT,
+                                                interval=BACKUP_POLL_INTERVAL):
                 logger.error("Flash backup timeout waiting for FLASH_BACKUP bit to clear")
                 return False
+            logger.debug("FLASH_BACKUP bit cleared")
 
             # (c) Confirm result by reading FLASH_BU_ERR (DIAG_STAT bit[0]).
-            result = self.comm.send_commands(
-                [
-                    [0, 0xFE, 0x00, 0x0D],  # WINDOW = 0
-                    [4, 0x04, 0x00, 0x0D],  # Read DIAG_STAT
-                ]
-            )
-            if len(result) >= 4:
-                diag_stat_low = result[2]
-                if (diag_stat_low & 0b00000001) == 0:
-                    logger.info("Flash backup completed successfully")
-                    return True
-                logger.error("Flash backup error detected (FLASH_BU_ERR = 1)")
-                return False
-
-            logger.error("Failed to read DIAG_STAT for flash backup confirmation")
+            diag_stat = self.registers.read_word(0x04, 0x00)  # Read DIAG_STAT
+            if (diag_stat & 0b00000001) == 0:
+                logger.info("Flash backup completed successfully")
+                return True
+            logger.error("Flash backup error detected (FLASH_BU_ERR = 1)")
             return False
 
         except Exception as exc:  # pragma: no cover - serial runtime failure
@@ -572,30 +620,19 @@ class SensorConfigurator:
         try:
             logger.info("Requesting IMU to exit UART Auto Mode and return to configuration state")
             # (a) Switch WINDOW = 0 and command Configuration mode (MODE_CMD = 0b10).
-            self._write_commands(
-                [
-                    [0, 0xFE, 0x00, 0x0D],
-                    [0, 0x83, 0x02, 0x0D],
-                ]
-            )
-            time.sleep(0.05)
+            self.registers.write_byte(0x03, 0x02, 0x00)
+            self.registers.wait_for_bits(0x02, 0x00, 0x0400, 0x0400, timeout=MODE_SWITCH_TIMEOUT)
 
             # (b) Verify MODE_STAT indicates configuration mode.
-            result = self.comm.send_commands(
-                [
-                    [0, 0xFE, 0x00, 0x0D],
-                    [4, 0x02, 0x00, 0x0D],
-                ]
-            )
-
             mode_register = None
-            if len(result) < 4:
+            try:
+                mode_register = self.registers.read_word(0x02, 0x00)
+            except ValueError:
                 logger.warning(
                     "MODE_CTRL read response incomplete while verifying configuration mode; assuming config mode"
                 )
                 self._add_warning("MODE_CTRL read response incomplete while verifying configuration mode.")
             else:
-                mode_register = (result[-3] << 8) | result[-2]
                 if (mode_register & 0x0400) == 0:
                     logger.info("IMU reports configuration mode (MODE_CTRL=0x%04X)", mode_register)
                 else:
@@ -605,12 +642,7 @@ class SensorConfigurator:
                     )
 
             # (c) Clear UART_AUTO and AUTO_START bits so that auto mode stays disabled.
-            self._write_commands(
-                [
-                    [0, 0xFE, 0x01, 0x0D],
-                    [0, 0x88, 0x00, 0x0D],
-                ]
-            )
+            self.registers.write_byte(0x08, 0x00, 0x01)
             logger.info("UART_CTRL reset to disable UART_AUTO and AUTO_START (0x88 -> 0x00)")
 
             if persist_disable_auto:
@@ -624,60 +656,73 @@ class SensorConfigurator:
                     )
 
             try:
-                verify_result = self.comm.send_commands(
-                    [
-                        [0, 0xFE, 0x00, 0x0D],
-                        [4, 0x02, 0x00, 0x0D],
-                    ]
-                )
-                if len(verify_result) >= 4:
-                    final_mode = (verify_result[-3] << 8) | verify_result[-2]
-                    if (final_mode & 0x0400) == 0:
-                        logger.info("Final MODE_CTRL check indicates configuration mode (0x%04X)", final_mode)
-                    else:
-                        logger.info(
-                            "Post-clear MODE_CTRL still reports AUTO bit set (0x%04X); treating as transient since streaming has stopped.",
-                            final_mode,
-                        )
+                final_mode = self.registers.read_word(0x02, 0x00)
+                if (final_mode & 0x0400) == 0:
+                    logger.info("Final MODE_CTRL check indicates configuration mode (0x%04X)", final_mode)
                 else:
-                    logger.info("Final MODE_CTRL verification response incomplete; treating as transient.")
+                    logger.info(
+                        "Post-clear MODE_CTRL still reports AUTO bit set (0x%04X); treating as transient since streaming has stopped.",
+                        final_mode,
+                    )
+            except ValueError:
+                logger.info("Final MODE_CTRL verification response incomplete; treating as transient.")
             except Exception as exc:
                 logger.info("Failed to verify final MODE_CTRL state: %s", exc)
 
             # (d) Leave register window set to 0 for subsequent operations.
-            self._write_commands([[0, 0xFE, 0x00, 0x0D]])
+            self.registers.select_window(0x00)
             return True
 
         except Exception as exc:  # pragma: no cover - serial runtime failure
             logger.error("Failed to exit auto mode: %s", exc)
             return False
 
-    def configure(self, sampling_rate: float = DEFAULT_SAMPLING_RATE, tap_value: Optional[int] = None) -> bool:
+    def configure(
+        self, sampling_rate: float = DEFAULT_SAMPLING_RATE, tap_value: Optional[int] = None, force: bool = False
+    ) -> bool:
         """
         Perform the complete IMU Auto Start configuration sequence.
         
+        Only the registers whose flash contents differ from the requested
+        configuration are written, and the flash backup is skipped when none do.
+        
         Args:
             sampling_rate: Sampling rate in SPS (samples per second). Default is 125 SPS.
             tap_value: Optional TAP value for the moving average filter. If None, uses minimum required TAP.
+            force: Write every register and back up to flash regardless.
         
         Returns:
             True if configuration succeeded, False otherwise.
         """
         self._warnings.clear()
+        self._timings.clear()
         try:
-            self.reset_sensor()
+            self._timed("reset", self.reset_sensor)
 
-            if not self.configure_registers(sampling_rate=sampling_rate, tap_value=tap_value):
+            targets = self.configuration_targets(sampling_rate=sampling_rate, tap_value=tap_value)
+            if targets is None:
                 return False
 
-            if not self.flash_backup():
-                warning_message = (
-                    "Flash backup failed during configuration. Auto Start is enabled for this session, "
-                    "but the setting may not persist after power cycle."
-                )
-                logger.warning(warning_message)
-                self._add_warning(warning_message)
+            # Compare with the flash contents; write everything if they cannot be read
+            writes = None if force else self._timed("plan", self.plan_configuration, targets)
+            if writes is None:
+                writes = [(window, address, value) for window, address, value, _ in targets]
+
+            if writes:
+                if not self._timed("registers", self.write_settings, writes):
+                    return False
+
+                if not self._timed("flash_backup", self.flash_backup):
+                    warning_message = (
+                        "Flash backup failed during configuration. Auto Start is enabled for this session, "
+                        "but the setting may not persist after power cycle."
+                    )
+                    logger.warning(warning_message)
+                    self._add_warning(warning_message)
+            else:
+                logger.info("Registers already match the requested configuration; flash backup skipped")
 
+            self._log_timings("Configuration")
             logger.info("IMU configured for UART Auto Start mode")
             logger.info(
                 "After power cycle or reset, the IMU will automatically begin outputting sampling data"
@@ -0,0 +1,595 @@
+"""
+Sensor serial transport module.
+
+This module is the one serial transport of every sensor package: the
+vibration_auto_mode tools and the helper's legacy vibration, IMU and
+accelerometer packages import it through their sensor_comm modules, so
+a fix or optimization here applies to every sensor.
+
+- SensorCommunication sends command frames, optionally pipelined in
+  batches, and reads the responses into a preallocated buffer with
+  readinto()
+- RegisterAccess reads and writes registers, selecting a register
+  window only when it changes
+- TransportMetrics counts commands, bytes out and in, timeouts and
+  retries and keeps a round-trip latency histogram, e.g. for the
+  helper's /status and /metrics endpoints or a CLI summary line
+
+Author: Jnana Phani A (https://phani.zenithtek.in)
+Organization: Zenith Tek (https://zenithtek.in)
+"""
+
+import logging
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    from serial import Serial
+except ImportError:  # pragma: no cover - optional dependency check
+    Serial = None
+
+logger = logging.getLogger(__name__)
+
+# Constants
+DEFAULT_TIMEOUT = 3.0
+DEFAULT_READ_CHUNK_SIZE = 4096
+# Read commands sent back to back before their responses are collected
+DEFAULT_PIPELINE_DEPTH = 8
+# Delay between reads while polling a status register
+STATUS_POLL_INTERVAL = 0.01
+# Round-trip latency histogram upper bounds in seconds (inclusive, Prometheus "le")
+LATENCY_BUCKETS = (0.0005, 0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.5, 1.0)
+
+
+class TransportMetrics:
+    """Counters of the serial traffic of one or more SensorCommunication.
+
+    A round trip is one command and its response, or one pipelined batch
+    and all of its responses; its latency runs from the write to the last
+    response byte. Write-only commands count as commands and bytes out.
+    Counters are updated by the thread using the transport; snapshot()
+    may run on any thread.
+
+    Attributes:
+        commands: Command frames sent
+        round_trips: Writes whose responses were read
+        bytes_out: Bytes written
+        bytes_in: Response bytes read
+        timeouts: Reads that timed out
+        retries: Register reads repeated after a timeout or garbled response
+    """
+
+    def __init__(self, latency_buckets: Sequence[float] = LATENCY_BUCKETS):
+        """Initialize metrics.
+
+        Args:
+            latency_buckets: Increasing latency bucket upper bounds in seconds;
+                an overflow bucket is added
+        """
+        self.latency_buckets = tuple(latency_buckets)
+        if list(self.latency_buckets) != sorted(set(self.latency_buckets)):
+            raise ValueError(f"Latency buckets must be increasing: {latency_buckets}")
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Clear all counters."""
+        with self._lock:
+            self.commands = 0
+            self.round_trips = 0
+            self.bytes_out = 0
+            self.bytes_in = 0
+            self.timeouts = 0
+            self.retries = 0
+            self._latency_counts = [0] * (len(self.latency_buckets) + 1)
+            self._latency_sum = 0.0
+            self._latency_max = 0.0
+
+    def record_write(self, commands: int, size: int) -> None:
+        """Record command frames written in one write()."""
+        with self._lock:
+            self.commands += commands
+            self.bytes_out += size
+
+    def record_read(self, size: int) -> None:
+        """Record response bytes read."""
+        with self._lock:
+            self.bytes_in += size
+
+    def record_round_trip(self, seconds: float) -> None:
+        """Record the latency of a completed round trip."""
+        with self._lock:
+            self.round_trips += 1
+            self._latency_counts[bisect_left(self.latency_buckets, seconds)] += 1
+            self._latency_sum += seconds
+            if seconds > self._latency_max:
+                self._latency_max = seconds
+
+    def record_timeout(self) -> None:
+        """Record a read that timed out."""
+        with self._lock:
+            self.timeouts += 1
+
+    def record_retry(self) -> None:
+        """Record a register read repeated after a failed one."""
+        with self._lock:
+            self.retries += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get the metrics as a JSON serializable dict.
+
+        Returns:
+            Dict with the counters and 'latency_seconds', a histogram with
+            'buckets' ([upper bound, cumulative count] pairs, the last bound
+            "+Inf"), 'count', 'sum' and 'max'
+        """
+        with self._lock:
+            buckets = []
+            total = 0
+            for bound, count in zip(self.latency_buckets + ("+Inf",), self._latency_counts):
+                total += count
+                buckets.append([bound, total])
+            return {
+                'commands': self.commands,
+                'round_trips': self.round_trips,
+                'bytes_out': self.bytes_out,
+                'bytes_in': self.bytes_in,
+                'timeouts': self.timeouts,
+                'retries': self.retries,
+                'latency_seconds': {
+                    'buckets': buckets,
+                    'count': self.round_trips,
+                    'sum': self._latency_sum,
+                    'max': self._latency_max,
+                },
+            }
+
+    def summary(self) -> str:
+        """One-line summary for logs."""
+        with self._lock:
+            average = self._latency_sum / self.round_trips if self.round_trips else 0.0
+            return (
+                f"{self.commands} commands in {self.round_trips} round trips, "
+                f"{self.bytes_out} B out, {self.bytes_in} B in, "
+                f"latency avg {average * 1000:.1f} ms / max {self._latency_max * 1000:.1f} ms, "
+                f"{self.timeouts} timeouts, {self.retries} retries"
+            )
+
+
+class SensorCommunication:
+    """Low-level serial communication with sensor."""
+
+    def __init__(self, port: str, baud: int, timeout: float = DEFAULT_TIMEOUT,
+                 pipelined: bool = False, pipeline_depth: int = DEFAULT_PIPELINE_DEPTH,
+                 metrics: Optional[TransportMetrics] = None):
+        """Initialize communication.
+
+        Args:
+            port: Serial port path
+            baud: Baud rate
+            timeout: Communication timeout in seconds
+            pipelined: Batch command sequences (see transact()); only for
+                devices that accept commands closer than the datasheet's
+                tWRITERATE/tREADRATE
+            pipeline_depth: Maximum read commands in flight when pipelined
+            metrics: Metrics to record into, e.g. shared across reconnects;
+                a new TransportMetrics if None
+        """
+        if Serial is None:
+            raise ImportError("pyserial is not installed. Install it with: pip install pyserial")
+
+        self.port = port
+        self.baud = baud
+        self.timeout = timeout
+        self.pipelined = pipelined
+        self.pipeline_depth = max(1, pipeline_depth)
+        self.metrics = metrics if metrics is not None else TransportMetrics()
+        self.connection: Optional[Serial] = None
+        # Responses are read into this buffer; it only grows for larger reads
+        self._buffer = bytearray(DEFAULT_READ_CHUNK_SIZE)
+
+    def open(self) -> None:
+        """Open serial connection to the sensor."""
+        logger.debug(f"Opening connection: {self.port} at {self.baud} baud")
+        self.connection = Serial(self.port, self.baud, timeout=self.timeout)
+
+    def close(self) -> None:
+        """Close serial connection."""
+        if self.connection:
+            self.connection.close()
+            self.connection = None
+            logger.debug("Connection closed (%s)", self.metrics.summary())
+
+    def is_open(self) -> bool:
+        """Check if connection is open.
+
+        Returns:
+            bool: True if open, False otherwise
+        """
+        return self.connection is not None and self.connection.is_open
+
+    def flush_input_buffer(self) -> None:
+        """Clear any unread bytes from the serial input buffer."""
+        if not self.is_open() or not self.connection:
+            return
+        try:
+            # reset_input_buffer is available on pyserial Serial objects
+            flush = getattr(self.connection, "reset_input_buffer", None)
+            if not callable(flush):
+                # Fallback for older pyserial versions
+                flush = getattr(self.connection, "flushInput", None)
+            if callable(flush):
+                flush()
+        except Exception as exc:  # pragma: no cover - defensive
+            logger.debug("Failed to flush serial input buffer: %s", exc)
+
+    def send_command(self, command: List[int]) -> List[int]:
+        """Send a command and read response.
+
+        Args:
+            command: Command bytes [length, byte1, byte2, ..., 0x0D]
+
+        Returns:
+            Response bytes as list of integers
+
+        Raises:
+            RuntimeError: If connection is not open
+            TimeoutError: If the read times out
+        """
+        if not self.is_open():
+            raise RuntimeError("Connection not open")
+
+        # Send command (skip first byte which is expected response length)
+        start = time.perf_counter()
+        self._write(bytes(command[1:]), 1)
+
+        # Read response if expected
+        if command[0] <= 0:
+            return []
+        response = list(self._read_into(command[0]))
+        self.metrics.record_round_trip(time.perf_counter() - start)
+        return response
+
+    def read_bytes(self, length: int) -> bytes:
+        """Read specified number of bytes from serial port.
+
+        Args:
+            length: Number of bytes to read
+
+        Returns:
+            Bytes read from serial port
+
+        Raises:
+            RuntimeError: If connection is not open
+            TimeoutError: If read times out
+        """
+        if not self.is_open():
+            raise RuntimeError("Connection not open")
+        return bytes(self._read_into(length))
+
+    def send_commands(self, commands: List[List[int]]) -> List[int]:
+        """Send multiple commands.
+
+        Args:
+            commands: List of command byte lists
+
+        Returns:
+            Combined response bytes
+        """
+        result = []
+        for response in self.transact(commands):
+            result.extend(response)
+        return result
+
+    def transact(self, commands: List[List[int]]) -> List[List[int]]:
+        """Send multiple commands and return each command's response.
+
+        When pipelined, consecutive frames are coalesced into one write()
+        with up to pipeline_depth read commands, and the concatenated
+        responses are read in one go and split by the expected lengths.
+        The sensor answers commands in order, so the frames and responses
+        are the same as when sending one command at a time, with one USB
+        round trip per batch instead of one per read.
+
+        Pipelined frames go out back to back, about 65 us apart at
+        460.8 kbps and 33 us at 921.6 kbps, while the datasheet (Table 5.2,
+        tWRITERATE/tREADRATE) requires at least 200 us and 130 us between
+        commands. Pipelining is therefore off by default.
+
+        Args:
+            commands: List of command byte lists [length, byte1, ..., 0x0D]
+
+        Returns:
+            One response byte list per command (empty for writes)
+
+        Raises:
+            RuntimeError: If connection is not open
+            TimeoutError: If a read times out
+        """
+        if not self.pipelined:
+            responses = []
+            for command in commands:
+                logger.debug(f"Sending command: {command}")
+                responses.append(self.send_command(command))
+            return responses
+
+        if not self.is_open():
+            raise RuntimeError("Connection not open")
+        responses = []
+        for batch in self._pipeline_batches(commands):
+            logger.debug(f"Sending commands: {batch}")
+            start = time.perf_counter()
+            self._write(b''.join(bytes(command[1:]) for command in batch), len(batch))
+            lengths = [max(command[0], 0) for command in batch]
+            if not sum(lengths):
+                responses.extend([] for _ in batch)
+                continue
+            data = self._read_into(sum(lengths))
+            self.metrics.record_round_trip(time.perf_counter() - start)
+            position = 0
+            for length in lengths:
+                responses.append(list(data[position:position + length]))
+                position += length
+        return responses
+
+    def _write(self, data: bytes, commands: int) -> None:
+        self.connection.write(data)
+        self.connection.flush()
+        self.metrics.record_write(commands, len(data))
+
+    def _read_into(self, length: int) -> memoryview:
+        """Read exactly length bytes into the response buffer.
+
+        Returns:
+            View of the bytes read; valid until the next read
+
+        Raises:
+            TimeoutError: If the sensor stops sending before length bytes
+        """
+        if len(self._buffer) < length:
+            self._buffer = bytearray(length)
+        view = memoryview(self._buffer)[:length]
+        readinto = getattr(self.connection, "readinto", None)
+        position = 0
+        try:
+            while position < length:
+                chunk = view[position:position + DEFAULT_READ_CHUNK_SIZE]
+                if readinto is not None:
+                    received = readinto(chunk) or 0
+                else:
+                    data = self.connection.read(len(chunk))
+                    received = len(data)
+                    chunk[:received] = data
+                if received == 0:
+                    self.metrics.record_timeout()
+                    raise TimeoutError("Read timeout occurred")
+                position += received
+        finally:
+            self.metrics.record_read(position)
+        return view
+
+    def _pipeline_batches(self, commands: List[List[int]]) -> List[List[List[int]]]:
+        """Split commands into batches of at most pipeline_depth reads."""
+        batches = []
+        batch = []
+        reads = 0
+        for command in commands:
+            batch.append(command)
+            if command[0] > 0:
+                reads += 1
+                if reads == self.pipeline_depth:
+                    batches.append(batch)
+                    batch = []
+                    reads = 0
+        if batch:
+            batches.append(batch)
+        return batches
+
+
+class RegisterAccess:
+    """Register reads and writes that select a window only when it changes.
+
+    WINDOW_ID keeps its value until it is written again or the sensor
+    resets, so the window selected last is remembered and the
+    [0xFE, window, 0x0D] frame is only sent when an access needs another
+    one. Call invalidate() whenever the sensor may have reset or
+    something else may have written WINDOW_ID.
+    """
+
+    def __init__(self, comm: SensorCommunication):
+        """Initialize register access.
+
+        Args:
+            comm: Open sensor communication
+        """
+        self.comm = comm
+        self.window: Optional[int] = None
+
+    def invalidate(self) -> None:
+        """Forget the selected window so the next access selects it again."""
+        self.window = None
+
+    def select_window(self, window: int) -> None:
+        """Select a register window unless it is already selected."""
+        self._transact(window, [])
+
+    def read_word(self, address: int, window: int) -> int:
+        """Read a 16-bit register.
+
+        Args:
+            address: Register address
+            window: Register window (0 or 1)
+
+        Returns:
+            Register value
+
+        Raises:
+            RuntimeError: If connection is not open
+            TimeoutError: If the read times out
+            ValueError: If the response does not echo the register address
+        """
+        return self.read_words([address], window)[0]
+
+    def read_words(self, addresses: Sequence[int], window: int) -> List[int]:
+        """Read several registers of one window in one transaction.
+
+        Args:
+            addresses: Register addresses
+            window: Register window (0 or 1)
+
+        Returns:
+            Register values in address order
+
+        Raises:
+            RuntimeError: If connection is not open
+            TimeoutError: If a read times out
+            ValueError: If a response does not echo its register address
+        """
+        responses = self._transact(window, [[4, address & 0x7F, 0x00, 0x0D] for address in addresses])
+        words = []
+        for address, response in zip(addresses, responses):
+            # Each response echoes its address, so a lost or extra byte shows
+            if len(response) < 4 or response[0] != address & 0x7F or response[3] != 0x0D:
+                self.invalidate()
+                raise ValueError(f"Unexpected response for register 0x{address:02X}: {response}")
+            words.append((response[1] << 8) | response[2])
+        return words
+
+    def read_snapshot(self, layout: Dict[int, Sequence[int]]) -> Dict[Tuple[int, int], int]:
+        """Read registers of several windows in one pipelined transaction.
+
+        Args:
+            layout: Register addresses to read, per window
+
+        Returns:
+            Register values keyed by (window, address)
+
+        Raises:
+            RuntimeError: If connection is not open
+            TimeoutError: If a read times out
+            ValueError: If a response does not echo its register address
+        """
+        commands: List[List[int]] = []
+        keys: List[Tuple[int, int]] = []
+        window = self.window
+        for target, addresses in layout.items():
+            if not addresses:
+                continue
+            if target & 0xFF != window:
+                window = target & 0xFF
+                commands.append([0, 0xFE, window, 0x0D])
+                keys.append((window, -1))
+            for address in addresses:
+                commands.append([4, address & 0x7F, 0x00, 0x0D])
+                keys.append((window, address & 0x7F))
+        try:
+            responses = self.comm.transact(commands)
+        except Exception:
+            self.invalidate()
+            raise
+        self.window = window
+        snapshot: Dict[Tuple[int, int], int] = {}
+        for (window, address), response in zip(keys, responses):
+            if address < 0:
+                continue
+            if len(response) < 4 or response[0] != address or response[3] != 0x0D:
+                self.invalidate()
+                raise ValueError(f"Unexpected response for register 0x{address:02X}: {response}")
+            snapshot[(window, address)] = (response[1] << 8) | response[2]
+        return snapshot
+
+    @staticmethod
+    def plan_writes(snapshot: Dict[Tuple[int, int], int],
+                    targets: Sequence[Tuple[int, int, int, int]]) -> List[Tuple[int, int, int]]:
+        """Compare target register settings with a snapshot.
+
+        Args:
+            snapshot: Register values keyed by (window, address), as read by read_snapshot()
+            targets: (window, byte address, value, mask) settings; only the
+                bits in mask are compared, so status and read-only bits are ignored
+
+        Returns:
+            (window, byte address, value) writes for the settings that differ,
+            in target order. Bytes missing from the snapshot count as different.
+        """
+        writes = []
+        for window, address, value, mask in targets:
+            word = snapshot.get((window, address & 0x7E))
+            current = None if word is None else (word >> 8 if address & 0x01 else word) & 0xFF
+            if current is None or (current ^ value) & mask:
+                writes.append((window, address, value))
+        return writes
+
+    def wait_for_bits(self, address: int, window: int, mask: int, value: int = 0,
+                      timeout: float = 1.0, interval: float = STATUS_POLL_INTERVAL) -> bool:
+        """Poll a status register until the masked bits read as expected.
+
+        Reads that time out or come back garbled while the sensor is busy
+        count as not ready yet, so the datasheet maximum is only ever
+        reached as the timeout.
+
+        Args:
+            address: Register address
+            window: Register window (0 or 1)
+            mask: Bits to check
+            value: Expected value of the masked bits
+            timeout: Maximum time to wait in seconds
+            interval: Delay between reads in seconds
+
+        Returns:
+            True if the bits matched before the timeout
+
+        Raises:
+            RuntimeError: If connection is not open
+        """
+        deadline = time.perf_counter() + timeout
+        failed = False
+        while True:
+            if failed:
+                self.comm.metrics.record_retry()
+            try:
+                if self.read_word(address, window) & mask == value & mask:
+                    return True
+                failed = False
+            except (TimeoutError, ValueError):
+                # Drop the rest of a garbled response before reading again
+                self.comm.flush_input_buffer()
+                failed = True
+            if time.perf_counter() >= deadline:
+                return False
+            time.sleep(interval)
+
+    def write_byte(self, address: int, value: int, window: int) -> None:
+        """Write one register byte.
+
+        Args:
+            address: Register byte address (without the write flag)
+            value: Byte value
+            window: Register window (0 or 1)
+        """
+        self.write_bytes([(address, value)], window)
+
+    def write_bytes(self, writes: Sequence[Tuple[int, int]], window: int) -> None:
+        """Write several register bytes of one window in one transaction.
+
+        Args:
+            writes: (byte address, value) pairs, written in order
+            window: Register window (0 or 1)
+        """
+        self._transact(window, [[0, 0x80 | (address & 0x7F), value & 0xFF, 0x0D] for address, value in writes])
+
+    def _transact(self, window: int, commands: List[List[int]]) -> List[List[int]]:
+        window &= 0xFF
+        selected = window == self.window
+        if not selected:
+            commands = [[0, 0xFE, window, 0x0D]] + commands
+        try:
+            responses = self.comm.transact(commands)
+        except Exception:
+            # The window may or may not have been written
+            self.invalidate()
+            raise
+        self.window = window
+        return responses if selected else responses[1:]
@@ -157,6 +157,7 @@ def configure_sensor(port: str, baud: int) -> bool:
         return False
     finally:
         if comm:
+            logger.info("Serial transport: %s", comm.metrics.summary())
             comm.close()
 
 
@@ -222,6 +223,7 @@ def detect_sensor_identity(port: str, baud: int) -> bool:
         return False
     finally:
         if comm:
+            logger.info("Serial transport: %s", comm.metrics.summary())
             comm.close()
 
 
@@ -271,6 +273,7 @@ def exit_auto_mode_cli(port: str, baud: int, persist_disable_auto: bool) -> bool
         return False
     finally:
         if comm:
+            logger.info("Serial transport: %s", comm.metrics.summary())
             comm.close()
 
 
@@ -316,6 +319,7 @@ def reset_sensor_cli(port: str, baud: int) -> bool:
         return False
     finally:
         if comm:
+            logger.info("Serial transport: %s", comm.metrics.summary())
             comm.close()
 
 
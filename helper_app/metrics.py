@@ -0,0 +1,161 @@
+"""Prometheus text rendering of capture stats files and the serial transport metrics."""
+
+from __future__ import annotations
+
+import json
+import logging
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Tuple
+
+LOG = logging.getLogger(__name__)
+
+METRIC_PREFIX = "zenith_capture"
+TRANSPORT_METRIC_PREFIX = "zenith_serial"
+STATS_VERSION = 1
+
+# (stats key, metric name, type, help) for the scalar capture metrics
+SCALAR_METRICS: List[Tuple[str, str, str, str]] = [
+    ("bytes_read", "bytes_total", "counter", "Serial bytes received."),
+    ("bytes_per_second", "bytes_per_second", "gauge", "Serial bytes received per second."),
+    ("frames", "frames_total", "counter", "Packets framed and written."),
+    ("frames_per_second", "frames_per_second", "gauge", "Packets written per second."),
+    ("resync_bytes", "resync_bytes_total", "counter", "Bytes skipped while searching for a packet header."),
+    ("bad_frames", "bad_frames_total", "counter", "Packets dropped for a missing terminator."),
+    ("counter_gaps", "counter_gaps_total", "counter", "Packet counter discontinuities."),
+    ("lost_samples", "lost_samples_total", "counter", "Samples missing according to the packet counter."),
+    ("read_calls", "read_calls_total", "counter", "Serial read calls."),
+    ("empty_reads", "empty_reads_total", "counter", "Serial reads that timed out without data."),
+    ("uptime_seconds", "uptime_seconds", "gauge", "Seconds since the capture started."),
+]
+
+# (queue stats key, metric name, type, help)
+QUEUE_METRICS: List[Tuple[str, str, str, str]] = [
+    ("depth", "queue_depth", "gauge", "Items waiting in a capture queue."),
+    ("bytes", "queue_bytes", "gauge", "Bytes waiting in a capture queue."),
+    ("peak_bytes", "queue_peak_bytes", "gauge", "Highest bytes waiting in a capture queue."),
+    ("dropped_bytes", "queue_dropped_bytes_total", "counter", "Bytes dropped on queue overflow."),
+    ("blocked_seconds", "queue_blocked_seconds_total", "counter", "Seconds producers waited for queue space."),
+]
+
+# (transport snapshot key, metric name, type, help)
+TRANSPORT_METRICS: List[Tuple[str, str, str, str]] = [
+    ("commands", "commands_total", "counter", "Sensor command frames sent."),
+    ("round_trips", "round_trips_total", "counter", "Command writes whose responses were read."),
+    ("bytes_out", "bytes_out_total", "counter", "Command bytes written."),
+    ("bytes_in", "bytes_in_total", "counter", "Response bytes read."),
+    ("timeouts", "timeouts_total", "counter", "Response reads that timed out."),
+    ("retries", "retries_total", "counter", "Register reads repeated after a timeout or garbled response."),
+]
+
+HISTOGRAMS: List[Tuple[str, str, str]] = [
+    ("read_size_bytes", "read_size_bytes", "Bytes returned per serial read."),
+    ("write_latency_seconds", "write_latency_seconds", "Seconds to write one batch to disk."),
+]
+
+
+def load_capture_stats(stats_dir: Path) -> List[Dict[str, Any]]:
+    """Read every capture stats file in a directory, skipping unreadable ones."""
+    documents: List[Dict[str, Any]] = []
+    if not stats_dir.is_dir():
+        return documents
+    for path in sorted(stats_dir.glob("*.json")):
+        try:
+            document = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as exc:
+            LOG.warning("Skipping capture stats %s: %s", path, exc)
+            continue
+        if not isinstance(document, dict) or document.get("version") != STATS_VERSION:
+            LOG.warning("Skipping capture stats %s: unsupported format", path)
+            continue
+        document["source"] = path.stem
+        documents.append(document)
+    return documents
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(labels: Dict[str, Any]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def _number(value: Any) -> str:
+    if value == "+Inf":
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render_prometheus(documents: Iterable[Dict[str, Any]], now: float | None = None) -> str:
+    """Render capture stats documents in the Prometheus text exposition format."""
+    now = time.time() if now is None else now
+    samples: Dict[str, List[str]] = {}
+    meta: Dict[str, Tuple[str, str]] = {}
+
+    def add(name: str, kind: str, help_text: str, labels: Dict[str, Any], value: Any) -> None:
+        metric = f"{METRIC_PREFIX}_{name}"
+        meta.setdefault(metric, (kind, help_text))
+        samples.setdefault(metric, []).append(f"{metric}{_labels(labels)} {_number(value)}")
+
+    for document in documents:
+        running = 1 if document.get("status") == "running" else 0
+        updated = document.get("updated_unix")
+        for capture in document.get("captures", []):
+            labels = {"source": document.get("source", ""), "capture": capture.get("name", "")}
+            labels.update(capture.get("labels") or {})
+            add("running", "gauge", "1 while the capture process is publishing stats.", labels, running)
+            if updated is not None:
+                add("stats_age_seconds", "gauge", "Seconds since the stats file was updated.",
+                    labels, round(max(0.0, now - updated), 3))
+            for key, name, kind, help_text in SCALAR_METRICS:
+                value = capture.get(key)
+                if value is not None:
+                    add(name, kind, help_text, labels, value)
+            for queue, stats in (capture.get("queues") or {}).items():
+                for key, name, kind, help_text in QUEUE_METRICS:
+                    if key in stats:
+                        add(name, kind, help_text, dict(labels, queue=queue), stats[key])
+            for key, name, help_text in HISTOGRAMS:
+                histogram = capture.get(key)
+                if not histogram:
+                    continue
+                metric = f"{METRIC_PREFIX}_{name}"
+                meta.setdefault(metric, ("histogram", help_text))
+                lines = samples.setdefault(metric, [])
+                for bound, count in histogram["buckets"]:
+                    bucket_labels = dict(labels, le=_number(bound))
+                    lines.append(f"{metric}_bucket{_labels(bucket_labels)} {count}")
+                lines.append(f"{metric}_sum{_labels(labels)} {_number(histogram['sum'])}")
+                lines.append(f"{metric}_count{_labels(labels)} {histogram['count']}")
+
+    output: List[str] = []
+    for metric, lines in samples.items():
+        kind, help_text = meta[metric]
+        output.append(f"# HELP {metric} {help_text}")
+        output.append(f"# TYPE {metric} {kind}")
+        output.extend(lines)
+    return "\n".join(output) + "\n" if output else ""
+
+
+def render_transport_prometheus(snapshot: Dict[str, Any], labels: Dict[str, Any] | None = None) -> str:
+    """Render a TransportMetrics snapshot in the Prometheus text exposition format."""
+    labels = labels or {}
+    output: List[str] = []
+    for key, name, kind, help_text in TRANSPORT_METRICS:
+        metric = f"{TRANSPORT_METRIC_PREFIX}_{name}"
+        output.append(f"# HELP {metric} {help_text}")
+        output.append(f"# TYPE {metric} {kind}")
+        output.append(f"{metric}{_labels(labels)} {_number(snapshot.get(key, 0))}")
+    histogram = snapshot.get("latency_seconds")
+    if histogram:
+        metric = f"{TRANSPORT_METRIC_PREFIX}_latency_seconds"
+        output.append(f"# HELP {metric} Seconds from a command write to its last response byte.")
+        output.append(f"# TYPE {metric} histogram")
+        for bound, count in histogram["buckets"]:
+            output.append(f"{metric}_bucket{_labels(dict(labels, le=_number(bound)))} {count}")
+        output.append(f"{metric}_sum{_labels(labels)} {_number(histogram['sum'])}")
+        output.append(f"{metric}_count{_labels(labels)} {histogram['count']}")
+    return "\n".join(output) + "\n"
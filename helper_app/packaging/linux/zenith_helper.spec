@@ -35,6 +35,7 @@ hidden_imports = [
     "helper_app.logging_utils",
     "helper_app.session",
     "helper_app.updater",
+    "helper_app.legacy.sensor_transport",
     "helper_app.legacy.imu.sensor_config",
     "helper_app.legacy.imu.sensor_comm",
     "helper_app.legacy.vibration.sensor_config",
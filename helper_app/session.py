@@ -10,7 +10,7 @@ from typing import Callable, Optional, TypeVar
 
 from helper_app.config import HelperSettings
 from helper_app.legacy.vibration.platform_utils import PlatformUtils
-from helper_app.legacy.vibration.sensor_comm import SensorCommunication
+from helper_app.legacy.sensor_transport import SensorCommunication, TransportMetrics
 
 LOG = logging.getLogger(__name__)
 T = TypeVar("T")
@@ -24,6 +24,8 @@ class SerialSession:
         self._port: Optional[str] = None
         self._baud: int = self._settings.default_baud_rate
         self._comm: Optional[SensorCommunication] = None
+        # Kept across reconnects so the counters cover the helper's lifetime
+        self._transport_metrics = TransportMetrics()
         self._lock = asyncio.Lock()
         self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="serial-session")
         self._drain_stop = threading.Event()
@@ -69,6 +71,11 @@ class SerialSession:
     def baudrate(self) -> int:
         return self._baud
 
+    @property
+    def transport_metrics(self) -> TransportMetrics:
+        """Serial command metrics of every connection this session opened."""
+        return self._transport_metrics
+
     async def run(self, func: Callable[[SensorCommunication], T]) -> T:
         """Run a blocking operation using the live serial connection."""
         async with self._lock:
@@ -163,7 +170,7 @@ class SerialSession:
         loop = asyncio.get_running_loop()
         while attempts < self._open_retries:
             try:
-                self._comm = SensorCommunication(port=self._port, baud=self._baud)
+                self._comm = SensorCommunication(port=self._port, baud=self._baud, metrics=self._transport_metrics)
                 await loop.run_in_executor(self._executor, self._comm.open)
                 LOG.info("SerialSession: connected to %s @ %s baud (%s)", self._port, self._baud, reason)
                 self._start_drain_locked()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Parser Scaling Benchmark
+
+This script measures how VibrationDataParser scales with the number of
+worker processes. It builds a large raw CSV by repeating a bundled capture,
+parses it with 1, 2, 4, ... workers and checks that every run produces the
+same parsed and error counts as the serial path.
+
+Author: Jnana Phani A (https://phani.zenithtek.in)
+Organization: Zenith Tek (https://zenithtek.in)
+"""
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+try:
+    from parse_vibration_data import VibrationDataParser
+except ImportError:
+    print("Error: Could not import parse_vibration_data module")
+    sys.exit(1)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SOURCE = next(
+    iter(sorted(Path(__file__).parent.glob("vibration_collection_*/raw_data/*.csv"))), None
+)
+
+
+def build_input(source: Path, target: Path, repeat: int) -> int:
+    """Write ``repeat`` copies of ``source`` to ``target``.
+
+    Returns:
+        Size of the generated file in bytes
+    """
+    data = source.read_bytes()
+    if not data.endswith(b"\n"):
+        data += b"\n"
+    with open(target, 'wb') as f:
+        for _ in range(repeat):
+            f.write(data)
+    return target.stat().st_size
+
+
+def worker_counts(max_workers: int) -> List[int]:
+    """Get 1, 2, 4, ... up to and including max_workers."""
+    counts = []
+    n = 1
+    while n < max_workers:
+        counts.append(n)
+        n *= 2
+    counts.append(max_workers)
+    return counts
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark parse_vibration_data.py scaling with worker processes"
+    )
+    parser.add_argument('--source', type=str, default=str(DEFAULT_SOURCE) if DEFAULT_SOURCE else None,
+                        help='Raw CSV capture to repeat (default: first bundled capture)')
+    parser.add_argument('--repeat', type=int, default=40,
+                        help='Number of copies of the source capture (default: 40)')
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1,
+                        help='Largest worker count to measure (default: CPU count)')
+    args = parser.parse_args()
+
+    if not args.source:
+        parser.error("no source capture found; pass --source")
+
+    # Keep parser output quiet; results are printed as a table
+    logging.getLogger().setLevel(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        input_file = Path(tmp) / "benchmark_raw.csv"
+        size = build_input(Path(args.source), input_file, args.repeat)
+        print(f"Input: {size / 1e6:.1f} MB ({args.repeat} x {Path(args.source).name})")
+        print(f"{'workers':>8} {'seconds':>9} {'packets/s':>12} {'MB/s':>8} {'speedup':>8}")
+
+        baseline_time = None
+        baseline_counts = None
+        for workers in worker_counts(args.max_workers):
+            parser_obj = VibrationDataParser(str(input_file), str(Path(tmp) / "parsed.csv"),
+                                             workers=workers)
+            start = time.perf_counter()
+            counts = parser_obj.parse_file()
+            elapsed = time.perf_counter() - start
+
+            if baseline_time is None:
+                baseline_time, baseline_counts = elapsed, counts
+            elif counts != baseline_counts:
+                print(f"Count mismatch with {workers} workers: {counts} != {baseline_counts}")
+                sys.exit(1)
+
+            print(f"{workers:>8} {elapsed:>9.2f} {counts['parsed'] / elapsed:>12,.0f} "
+                  f"{size / 1e6 / elapsed:>8.1f} {baseline_time / elapsed:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
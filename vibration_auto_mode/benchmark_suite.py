@@ -0,0 +1,496 @@
+#!/usr/bin/env python3
+"""
+Offline Throughput Benchmark Suite
+
+This script measures the data path of the collection and parsing tools on
+deterministic synthetic packets (see synthetic_packets.py), so throughput
+regressions can be caught without a sensor attached:
+
+- per-packet parsers and the vectorized decoder
+- 19-byte checksum validation
+- the packet framer, the collect_data loop (framing, raw save, parse,
+  parsed save) and the same work through the threaded capture pipeline
+- hex CSV round trip (format + per-line and block parse)
+- raw and parsed file writers
+- serial read modes on a pseudo-terminal fed at 921.6 kbps: packets/s and
+  reader CPU while streaming and while idle (POSIX with pyserial only)
+
+Results are reported in packets/s and MB/s of packet data. Save a run with
+--json and compare later runs against it with --baseline.
+
+Author: Jnana Phani A (https://phani.zenithtek.in)
+Organization: Zenith Tek (https://zenithtek.in)
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+try:
+    from capture_pipeline import CapturePipeline
+    from capture_stream import decode_csv_block
+    from collect_raw_vibration_data import RawVibrationDataCollector
+    from output_writers import OUTPUT_EXTENSIONS, create_writer
+    from packet_decoder import checksum_mask, decode_packets, frames_from_buffer, to_columns
+    from packet_framer import PacketFramer
+    from parse_vibration_data import (
+        format_packet_as_csv,
+        get_fieldnames,
+        parse_csv_line_to_bytes,
+        parse_packet_13byte,
+        parse_packet_19byte,
+        verify_checksum_19byte,
+    )
+    from raw_capture import BinaryCaptureWriter
+    from serial_reader import BITS_PER_BYTE, READ_MODES, SerialReader
+    from synthetic_packets import generate_stream
+except ImportError as e:
+    print(f"Error: Could not import benchmark modules: {e}")
+    sys.exit(1)
+
+try:
+    from serial import Serial
+except ImportError:
+    Serial = None
+
+logger = logging.getLogger(__name__)
+
+# Defaults
+DEFAULT_PACKETS = 100000
+DEFAULT_REPEAT = 3
+DEFAULT_TOLERANCE = 0.25
+# Serial read size fed to the framing loop
+READ_CHUNK = 4096
+# Damage injected into the framing loop input
+NOISE_RATE = 0.001
+MISALIGN_RATE = 0.0005
+DROP_RATE = 0.001
+
+BAUD_FOR_SIZE = {13: 460800, 19: 921600}
+# Seconds per serial read mode run (streaming and idle)
+DEFAULT_SERIAL_SECONDS = 1.0
+# Sensor simulator write interval on the pseudo-terminal
+SERIAL_FEED_INTERVAL = 0.01
+
+
+def _time_best(func: Callable[[], None], repeat: int) -> float:
+    """Run ``func`` ``repeat`` times and return the best wall time in seconds."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+class BenchmarkSuite:
+    """Run the throughput benchmarks on synthetic data."""
+
+    def __init__(self, packets: int = DEFAULT_PACKETS, seed: int = 0,
+                 repeat: int = DEFAULT_REPEAT, workdir: Optional[Path] = None,
+                 serial_seconds: float = DEFAULT_SERIAL_SECONDS):
+        """
+        Initialize suite.
+
+        Args:
+            packets: Packets per benchmark
+            seed: Generator seed
+            repeat: Runs per benchmark (best time is reported)
+            workdir: Directory for files written by the writer benchmarks
+            serial_seconds: Duration of each serial read mode run
+        """
+        self.packets = packets
+        self.seed = seed
+        self.repeat = repeat
+        self.workdir = Path(workdir) if workdir else Path(tempfile.gettempdir())
+        self.serial_seconds = serial_seconds
+        self.results: Dict[str, Dict[str, float]] = {}
+        self._clean = {}
+        self._noisy = {}
+        for size in (13, 19):
+            self._clean[size], _ = generate_stream(packets, size, seed)
+            self._noisy[size], _ = generate_stream(
+                packets, size, seed, noise_rate=NOISE_RATE,
+                misalign_rate=MISALIGN_RATE, drop_rate=DROP_RATE
+            )
+
+    def _record(self, name: str, packets: int, nbytes: int, seconds: float) -> None:
+        self.results[name] = {
+            'packets': packets,
+            'bytes': nbytes,
+            'seconds': seconds,
+            'packets_per_s': packets / seconds if seconds > 0 else 0.0,
+            'mb_per_s': nbytes / 1e6 / seconds if seconds > 0 else 0.0,
+        }
+
+    def _packet_lists(self, size: int) -> List[List[int]]:
+        frames = frames_from_buffer(self._clean[size], size)
+        return frames.tolist()
+
+    # ------------------------------------------------------------------
+    # Benchmarks
+    # ------------------------------------------------------------------
+
+    def bench_parsers(self) -> None:
+        """Per-packet reference parsers vs the vectorized decoder."""
+        for size, parse_func in ((13, parse_packet_13byte), (19, parse_packet_19byte)):
+            data = self._clean[size]
+            packets = self._packet_lists(size)
+
+            def per_packet():
+                for packet in packets:
+                    parse_func(packet, "displacement")
+
+            def vectorized():
+                to_columns(decode_packets(data, size), "displacement")
+
+            self._record(f"parse_packet_{size}byte", len(packets), len(data),
+                         _time_best(per_packet, self.repeat))
+            self._record(f"decode_packets_{size}byte", len(packets), len(data),
+                         _time_best(vectorized, self.repeat))
+
+    def bench_checksum(self) -> None:
+        """19-byte CHECKSUM validation, per packet and vectorized."""
+        data = self._clean[19]
+        packets = self._packet_lists(19)
+        frames = frames_from_buffer(data, 19)
+
+        def per_packet():
+            for packet in packets:
+                verify_checksum_19byte(packet)
+
+        self._record("checksum_19byte", len(packets), len(data),
+                     _time_best(per_packet, self.repeat))
+        self._record("checksum_mask_19byte", len(packets), len(data),
+                     _time_best(lambda: checksum_mask(frames), self.repeat))
+
+    def bench_framing(self) -> None:
+        """The framer alone, the collect_data loop body and the threaded
+        capture pipeline on a damaged stream read in chunks."""
+        for size in (13, 19):
+            data = self._noisy[size]
+            chunks = [data[i:i + READ_CHUNK] for i in range(0, len(data), READ_CHUNK)]
+            framed = []
+
+            def frame():
+                framer = PacketFramer(size)
+                for chunk in chunks:
+                    framer.feed(chunk)
+                    for _ in framer.frames():
+                        pass
+                framed.append(framer.frame_count)
+
+            seconds = _time_best(frame, self.repeat)
+            self._record(f"packet_framer_{size}byte", framed[-1], len(data), seconds)
+
+        for size in (13, 19):
+            for raw_format in ("csv", "binary"):
+                data = self._noisy[size]
+                chunks = [data[i:i + READ_CHUNK] for i in range(0, len(data), READ_CHUNK)]
+                saved = []
+
+                def run():
+                    collector = RawVibrationDataCollector(
+                        "bench", BAUD_FOR_SIZE[size], str(self.workdir), raw_format=raw_format
+                    )
+                    collector.setup_files(self.workdir, self.workdir)
+                    try:
+                        for chunk in chunks:
+                            collector.process_data(chunk)
+                    finally:
+                        collector.close()
+                    saved.append(collector.raw_packet_count)
+
+                seconds = _time_best(run, self.repeat)
+                self._record(f"collect_framing_{size}byte_{raw_format}", saved[-1], len(data), seconds)
+
+        for size in (13, 19):
+            data = self._noisy[size]
+            saved = []
+
+            def run_pipeline():
+                chunks = [data[i:i + READ_CHUNK] for i in range(0, len(data), READ_CHUNK)]
+                chunks.reverse()
+                drained = threading.Event()
+
+                def read():
+                    if chunks:
+                        return chunks.pop()
+                    drained.set()
+                    time.sleep(0.001)
+                    return b''
+
+                collector = RawVibrationDataCollector("bench", BAUD_FOR_SIZE[size], str(self.workdir))
+                collector.setup_files(self.workdir, self.workdir)
+                try:
+                    pipeline = CapturePipeline(read, collector.frame_data, collector.write_batch).start()
+                    drained.wait()
+                    pipeline.stop()
+                    pipeline.raise_error()
+                finally:
+                    collector.close()
+                saved.append(collector.raw_packet_count)
+
+            seconds = _time_best(run_pipeline, self.repeat)
+            self._record(f"collect_pipeline_{size}byte_csv", saved[-1], len(data), seconds)
+
+    def bench_csv_round_trip(self) -> None:
+        """Hex CSV formatting and parsing of raw packets."""
+        for size in (13, 19):
+            packets = self._packet_lists(size)
+            lines = [format_packet_as_csv(packet, size) for packet in packets]
+            text = "".join(line + "\n" for line in lines).encode()
+            text_bytes = len(text)
+
+            def format_lines():
+                for packet in packets:
+                    format_packet_as_csv(packet, size)
+
+            def parse_lines():
+                for line in lines:
+                    parse_csv_line_to_bytes(line, size)
+
+            self._record(f"csv_format_{size}byte", len(packets), text_bytes,
+                         _time_best(format_lines, self.repeat))
+            self._record(f"csv_parse_{size}byte", len(packets), text_bytes,
+                         _time_best(parse_lines, self.repeat))
+            self._record(f"csv_block_decode_{size}byte", len(packets), text_bytes,
+                         _time_best(lambda: decode_csv_block(text, size), self.repeat))
+
+    def bench_writers(self) -> None:
+        """Raw binary writer and the parsed output writers."""
+        size = 13
+        data = self._clean[size]
+        decoded = decode_packets(data, size)
+        columns = to_columns(decoded, "displacement")
+        fieldnames = get_fieldnames(size, "displacement")
+        rows = [dict(zip(fieldnames, values)) for values in zip(*(columns[name].tolist()
+                                                                  for name in fieldnames))]
+
+        def write_binary():
+            with BinaryCaptureWriter(self.workdir / "bench_raw.bin", size) as writer:
+                writer.write_frames(data)
+
+        self._record("write_raw_binary", len(rows), len(data), _time_best(write_binary, self.repeat))
+
+        for fmt in OUTPUT_EXTENSIONS:
+            path = self.workdir / f"bench_parsed{OUTPUT_EXTENSIONS[fmt]}"
+            try:
+                create_writer(fmt, path, fieldnames).close()
+            except ImportError as e:
+                logger.warning(f"Skipping {fmt} writer: {e}")
+                continue
+
+            def write_rows():
+                with create_writer(fmt, path, fieldnames) as writer:
+                    for row in rows:
+                        writer.write_row(row)
+
+            def write_columns():
+                with create_writer(fmt, path, fieldnames) as writer:
+                    writer.write_columns(columns)
+
+            self._record(f"write_{fmt}_rows", len(rows), len(data), _time_best(write_rows, self.repeat))
+            self._record(f"write_{fmt}_columns", len(rows), len(data),
+                         _time_best(write_columns, self.repeat))
+
+    def _read_pty(self, mode: str, streaming: bool) -> None:
+        """Read a pseudo-terminal for serial_seconds with one read mode."""
+        size = 19
+        baud = BAUD_FOR_SIZE[size]
+        data = self._clean[size]
+        step = int(baud / BITS_PER_BYTE * SERIAL_FEED_INTERVAL)
+        master, slave = os.openpty()
+        os.set_blocking(master, False)
+        connection = Serial(os.ttyname(slave), baud, timeout=1.0)
+        os.close(slave)
+        stop = threading.Event()
+
+        def feed():
+            # Write the stream at the link rate, like the sensor would
+            position = 0
+            deadline = time.perf_counter()
+            while not stop.is_set():
+                if position + step > len(data):
+                    position = 0
+                try:
+                    os.write(master, data[position:position + step])
+                except BlockingIOError:
+                    pass  # reader fell behind; the pty buffer is full
+                position += step
+                deadline += SERIAL_FEED_INTERVAL
+                stop.wait(max(0.0, deadline - time.perf_counter()))
+
+        feeder = threading.Thread(target=feed, daemon=True)
+        if streaming:
+            feeder.start()
+        reader = SerialReader(connection, baud, mode=mode)
+        received = 0
+        try:
+            wall_start = time.perf_counter()
+            cpu_start = time.thread_time()
+            while time.perf_counter() - wall_start < self.serial_seconds:
+                received += len(reader.read())
+            cpu = time.thread_time() - cpu_start
+            wall = time.perf_counter() - wall_start
+        finally:
+            stop.set()
+            if streaming:
+                feeder.join()
+            reader.close()
+            connection.close()
+            os.close(master)
+
+        name = f"serial_{mode}_{'stream' if streaming else 'idle'}"
+        self._record(name, received // size, received, wall)
+        self.results[name]['cpu_percent'] = 100.0 * cpu / wall
+        self.results[name]['reads_per_s'] = reader.reads / wall
+
+    def bench_serial_read(self) -> None:
+        """Serial read modes on a pseudo-terminal: packets/s and reader CPU
+        while the simulated sensor streams at 921.6 kbps, and reader CPU
+        while the line is idle."""
+        if Serial is None or not hasattr(os, 'openpty'):
+            logger.warning("Skipping serial read benchmark (needs pyserial and a POSIX pty)")
+            return
+        for mode in READ_MODES:
+            for streaming in (True, False):
+                self._read_pty(mode, streaming)
+
+    def run(self, only: Optional[str] = None) -> Dict[str, Dict[str, float]]:
+        """
+        Run all benchmarks.
+
+        Args:
+            only: Run only benchmark groups whose name contains this string
+
+        Returns:
+            Results by benchmark name
+        """
+        groups = {
+            'parsers': self.bench_parsers,
+            'checksum': self.bench_checksum,
+            'framing': self.bench_framing,
+            'csv': self.bench_csv_round_trip,
+            'writers': self.bench_writers,
+            'serial': self.bench_serial_read,
+        }
+        for name, bench in groups.items():
+            if only and only not in name:
+                continue
+            bench()
+        return self.results
+
+
+def compare(results: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """
+    Compare results against a saved baseline.
+
+    Args:
+        results: Current results
+        baseline: Results loaded from a --json file
+        tolerance: Allowed fractional slowdown (0.25 = 25%)
+
+    Returns:
+        Descriptions of benchmarks slower than the baseline allows
+    """
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if not reference or not reference.get('packets_per_s'):
+            continue
+        ratio = result['packets_per_s'] / reference['packets_per_s']
+        if ratio < 1.0 - tolerance:
+            regressions.append(
+                f"{name}: {result['packets_per_s']:,.0f} packets/s vs "
+                f"{reference['packets_per_s']:,.0f} baseline ({ratio:.2f}x)"
+            )
+    return regressions
+
+
+def format_results(results: Dict) -> str:
+    """Format results as a table."""
+    lines = [f"{'benchmark':<32} {'packets':>9} {'seconds':>8} {'packets/s':>13} {'MB/s':>9} {'CPU %':>7}"]
+    for name, result in results.items():
+        cpu = f"{result['cpu_percent']:>7.1f}" if 'cpu_percent' in result else ""
+        lines.append(f"{name:<32} {result['packets']:>9} {result['seconds']:>8.3f} "
+                     f"{result['packets_per_s']:>13,.0f} {result['mb_per_s']:>9.1f} {cpu}".rstrip())
+    return "\n".join(lines)
+
+
+# ============================================================================
+# Main Function
+# ============================================================================
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(
+        description="Offline throughput benchmarks on synthetic M-A542VR1 packets",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Run all benchmarks
+  python benchmark_suite.py
+
+  # Save a baseline, then fail later runs that are more than 25% slower
+  python benchmark_suite.py --json baseline.json
+  python benchmark_suite.py --baseline baseline.json
+
+  # Only the framing loop, with more packets
+  python benchmark_suite.py --only framing --packets 500000
+
+  # CPU and throughput of the serial read modes, 5 seconds each
+  python benchmark_suite.py --only serial --serial-seconds 5
+        """
+    )
+    parser.add_argument('--packets', type=int, default=DEFAULT_PACKETS,
+                        help=f'Packets per benchmark (default: {DEFAULT_PACKETS})')
+    parser.add_argument('--seed', type=int, default=0, help='Generator seed (default: 0)')
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT,
+                        help=f'Runs per benchmark, best time is reported (default: {DEFAULT_REPEAT})')
+    parser.add_argument('--only', type=str, default=None,
+                        help='Run only groups containing this name '
+                             '(parsers, checksum, framing, csv, writers, serial)')
+    parser.add_argument('--serial-seconds', type=float, default=DEFAULT_SERIAL_SECONDS,
+                        help=f'Seconds per serial read mode run (default: {DEFAULT_SERIAL_SECONDS})')
+    parser.add_argument('--json', type=str, default=None, help='Save results as JSON')
+    parser.add_argument('--baseline', type=str, default=None,
+                        help='Compare against results saved with --json; exit 1 on regression')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help=f'Allowed slowdown vs baseline (default: {DEFAULT_TOLERANCE})')
+    args = parser.parse_args()
+
+    # Collector and writer logging would dominate the output
+    logging.getLogger().setLevel(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        suite = BenchmarkSuite(args.packets, args.seed, args.repeat, Path(tmp), args.serial_seconds)
+        results = suite.run(args.only)
+    print(format_results(results))
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print("\nThroughput regressions:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print("\nNo throughput regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,490 @@
+"""
+Capture pipeline module.
+
+This module runs live capture as three threads connected by bounded
+queues, so a slow disk or a GC pause in one stage does not stall the
+serial reads:
+
+    reader thread  -> read queue  -> parser thread -> write queue -> writer thread
+    (serial bytes)                   (framing and     (file output)
+                                      parsing)
+
+Both queues are bounded by the bytes they hold. The write queue always
+applies backpressure: a slow writer makes the parser wait, the read queue
+fills up and absorbs the stall. What happens when the read queue is full is
+the overflow policy:
+- "block": the reader waits (the OS serial buffer takes the bytes, and
+  overruns there if the stall lasts too long)
+- "drop-oldest": the oldest queued chunk is discarded
+- "drop-newest": the chunk just read is discarded
+
+Dropped chunks are counted; the framer resyncs on the next packet and the
+lost packets show up as counter gaps.
+
+For multi-port capture, several pipelines can share a WriterPool instead
+of running a writer thread each; the reader also stamps every read with
+the host monotonic clock so streams from different ports can be aligned.
+
+Author: Jnana Phani A (https://phani.zenithtek.in)
+Organization: Zenith Tek (https://zenithtek.in)
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Constants
+OVERFLOW_POLICIES = ("block", "drop-oldest", "drop-newest")
+DEFAULT_QUEUE_BYTES = 16 * 1024 * 1024  # ~3 minutes at 921.6 kbps
+IDLE_INTERVAL = 0.1  # seconds between writer idle calls
+# Returned by StageQueue.get() when the timeout passes with nothing queued
+TIMED_OUT = object()
+
+
+class StageQueue:
+    """FIFO between two pipeline stages, bounded by the bytes it holds.
+
+    A single item larger than the bound is still accepted when the queue
+    is empty. get() returns None once the queue is closed and drained, and
+    TIMED_OUT if its timeout passes first.
+
+    Attributes:
+        name: Queue name used in stats
+        max_bytes: Byte bound
+        overflow: Overflow policy (see OVERFLOW_POLICIES)
+        put_count / put_bytes: Items and bytes accepted
+        dropped_count / dropped_bytes: Items and bytes discarded on overflow
+        peak_bytes / peak_depth: High-water marks
+        blocked_seconds: Time producers spent waiting for space
+    """
+
+    def __init__(self, name: str, max_bytes: int = DEFAULT_QUEUE_BYTES, overflow: str = "block"):
+        """
+        Initialize queue.
+
+        Args:
+            name: Queue name used in stats
+            max_bytes: Byte bound
+            overflow: "block", "drop-oldest" or "drop-newest"
+        """
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unsupported overflow policy: {overflow}")
+        if max_bytes <= 0:
+            raise ValueError(f"Invalid queue size: {max_bytes}")
+        self.name = name
+        self.max_bytes = max_bytes
+        self.overflow = overflow
+        self._items = deque()
+        self._bytes = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self.put_count = 0
+        self.put_bytes = 0
+        self.dropped_count = 0
+        self.dropped_bytes = 0
+        self.peak_bytes = 0
+        self.peak_depth = 0
+        self.blocked_seconds = 0.0
+
+    @property
+    def depth(self) -> int:
+        """Items queued."""
+        return len(self._items)
+
+    @property
+    def queued_bytes(self) -> int:
+        """Bytes queued."""
+        return self._bytes
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def put(self, item: Any, size: int) -> bool:
+        """
+        Queue an item, applying the overflow policy when full.
+
+        Args:
+            item: Item to queue
+            size: Item size in bytes
+
+        Returns:
+            True if queued, False if dropped or the queue is closed
+        """
+        with self._cond:
+            if self._closed:
+                return False
+            if self._items and self._bytes + size > self.max_bytes:
+                if self.overflow == "block":
+                    started = time.monotonic()
+                    while (self._items and self._bytes + size > self.max_bytes
+                           and not self._closed):
+                        self._cond.wait()
+                    self.blocked_seconds += time.monotonic() - started
+                    if self._closed:
+                        return False
+                elif self.overflow == "drop-newest":
+                    self.dropped_count += 1
+                    self.dropped_bytes += size
+                    return False
+                else:
+                    while self._items and self._bytes + size > self.max_bytes:
+                        _, dropped = self._items.popleft()
+                        self._bytes -= dropped
+                        self.dropped_count += 1
+                        self.dropped_bytes += dropped
+            self._items.append((item, size))
+            self._bytes += size
+            self.put_count += 1
+            self.put_bytes += size
+            self.peak_bytes = max(self.peak_bytes, self._bytes)
+            self.peak_depth = max(self.peak_depth, len(self._items))
+            self._cond.notify_all()
+            return True
+
+    def get(self, timeout: Optional[float] = None) -> Any:
+        """
+        Wait for the next item.
+
+        Args:
+            timeout: Maximum wait in seconds (None waits)
+
+        Returns:
+            The oldest item, None once the queue is closed and empty, or
+            TIMED_OUT if nothing was queued within the timeout
+        """
+        with self._cond:
+            if timeout is not None:
+                deadline = time.monotonic() + timeout
+            while not self._items and not self._closed:
+                if timeout is None:
+                    self._cond.wait()
+                    continue
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return TIMED_OUT
+                self._cond.wait(remaining)
+            if not self._items:
+                return None
+            item, size = self._items.popleft()
+            self._bytes -= size
+            self._cond.notify_all()
+            return item
+
+    def close(self) -> None:
+        """Stop accepting items; get() drains what is queued."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get queue counters."""
+        return {
+            'depth': self.depth,
+            'bytes': self._bytes,
+            'peak_depth': self.peak_depth,
+            'peak_bytes': self.peak_bytes,
+            'put_count': self.put_count,
+            'put_bytes': self.put_bytes,
+            'dropped_count': self.dropped_count,
+            'dropped_bytes': self.dropped_bytes,
+            'blocked_seconds': self.blocked_seconds,
+        }
+
+
+def _drain_writes(queue: StageQueue, failed: Callable[[], bool],
+                  idle: Optional[Callable[[], None]] = None) -> None:
+    """Writer loop: run queued (write, frames, payload) items in order.
+
+    idle() runs about every IDLE_INTERVAL, also while nothing is queued.
+    """
+    next_idle = time.monotonic() + IDLE_INTERVAL
+    while True:
+        item = queue.get(IDLE_INTERVAL if idle is not None else None)
+        if item is None or failed():
+            break
+        if item is not TIMED_OUT:
+            write, frames, payload = item
+            write(frames, payload)
+        if idle is not None and time.monotonic() >= next_idle:
+            idle()
+            next_idle = time.monotonic() + IDLE_INTERVAL
+
+
+class WriterPool:
+    """Writer threads shared by several capture pipelines.
+
+    Each pipeline is bound to one writer thread (round robin), so its
+    batches are written in order while pipelines share the threads.
+
+    Usage::
+
+        pool = WriterPool(workers=2).start()
+        pipelines = [CapturePipeline(..., writer_pool=pool).start() for ...]
+        ...
+        for pipeline in pipelines:
+            pipeline.stop()
+        pool.stop()             # drains the write queues
+        pool.raise_error()
+    """
+
+    def __init__(self, workers: int = 2, queue_bytes: int = DEFAULT_QUEUE_BYTES):
+        """
+        Initialize pool.
+
+        Args:
+            workers: Writer threads
+            queue_bytes: Byte bound of each writer's queue
+        """
+        if workers < 1:
+            raise ValueError(f"Invalid writer count: {workers}")
+        self.queues = [StageQueue(f"write-{i}", queue_bytes, "block") for i in range(workers)]
+        self._idle = [[] for _ in range(workers)]
+        self._assigned = 0
+        self._threads = []
+        self.error: Optional[BaseException] = None
+
+    def assign(self, idle: Optional[Callable[[], Any]] = None) -> StageQueue:
+        """
+        Get the write queue for the next pipeline.
+
+        Args:
+            idle: Called on the pipeline's writer thread while idle (see CapturePipeline)
+
+        Returns:
+            The write queue
+        """
+        index = self._assigned % len(self.queues)
+        self._assigned += 1
+        if idle is not None:
+            self._idle[index].append(idle)
+        return self.queues[index]
+
+    def start(self) -> "WriterPool":
+        """Start the writer threads."""
+        if self._threads:
+            raise RuntimeError("Writer pool already started")
+        for queue, idle in zip(self.queues, self._idle):
+            thread = threading.Thread(target=self._run, args=(queue, idle),
+                                      name=f"capture-{queue.name}", daemon=True)
+            self._threads.append(thread)
+            thread.start()
+        return self
+
+    @property
+    def running(self) -> bool:
+        """True until stop() is called or a writer fails."""
+        return bool(self._threads) and self.error is None and not self.queues[0].closed
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Wait for queued batches to be written, then stop the threads.
+
+        Stop the pipelines feeding the pool first.
+
+        Args:
+            timeout: Maximum wait per thread in seconds (None waits)
+        """
+        for queue in self.queues:
+            queue.close()
+        for thread in self._threads:
+            thread.join(timeout)
+            if thread.is_alive():
+                logger.warning(f"{thread.name} did not stop within {timeout}s")
+
+    def raise_error(self) -> None:
+        """Re-raise a writer failure in the calling thread."""
+        if self.error is not None:
+            raise RuntimeError(f"Capture writer failed: {self.error}") from self.error
+
+    def stats(self) -> Dict[str, Any]:
+        """Get write queue counters."""
+        return {queue.name: queue.stats() for queue in self.queues}
+
+    def _run(self, queue: StageQueue, idle: List[Callable[[], Any]]) -> None:
+        def run_idle():
+            # Pipelines may be assigned while the thread runs
+            for callback in tuple(idle):
+                callback()
+
+        try:
+            _drain_writes(queue, lambda: self.error is not None, run_idle)
+        except Exception as e:
+            logger.error(f"Capture writer failed: {e}", exc_info=True)
+            if self.error is None:
+                self.error = e
+            for other in self.queues:
+                other.close()
+
+
+class CapturePipeline:
+    """Reader, parser and writer threads joined by bounded queues.
+
+    Usage::
+
+        pipeline = CapturePipeline(read, parse, write)
+        pipeline.start()
+        ...
+        pipeline.stop()         # drains both queues
+        pipeline.raise_error()  # re-raise a stage failure
+
+    Stages:
+        read() -> bytes: returns received bytes (b'' if none yet); must
+            return within a short timeout so stop() is noticed
+        parse(data) -> Optional[(frames, payload)]: frames and prepares
+            received bytes; None when no complete packet is ready. With
+            timestamped=True it is called as parse(data, monotonic_ns), the
+            host time.monotonic_ns() right after the read returned.
+        write(frames, payload): writes a prepared batch
+        idle(): optional; called on the writer thread about every
+            IDLE_INTERVAL, also while no batches arrive (e.g. for
+            FlushController.tick)
+
+    The write queue is sized by len(frames). With a writer_pool the write
+    stage runs on the pool's threads instead of a thread of its own.
+    """
+
+    def __init__(self, read: Callable[[], bytes],
+                 parse: Callable[..., Optional[Tuple[bytes, Any]]],
+                 write: Callable[[bytes, Any], Any],
+                 queue_bytes: int = DEFAULT_QUEUE_BYTES, overflow: str = "block",
+                 writer_pool: Optional[WriterPool] = None, timestamped: bool = False,
+                 name: str = "capture", idle: Optional[Callable[[], Any]] = None):
+        """
+        Initialize pipeline.
+
+        Args:
+            read: Reader stage
+            parse: Parser stage
+            write: Writer stage
+            queue_bytes: Byte bound of each queue
+            overflow: Read queue overflow policy (see OVERFLOW_POLICIES)
+            writer_pool: Shared writer threads (None: own writer thread)
+            timestamped: Pass the host read time to parse()
+            name: Thread name prefix
+            idle: Writer idle stage (None: none)
+        """
+        self._read = read
+        self._parse = parse
+        self._write = write
+        self._idle = idle
+        self.name = name
+        self.timestamped = timestamped
+        self.read_queue = StageQueue("read", queue_bytes, overflow)
+        self._owns_writer = writer_pool is None
+        if self._owns_writer:
+            # The parser always waits for the writer; the read queue absorbs it
+            self.write_queue = StageQueue("write", queue_bytes, "block")
+        else:
+            self.write_queue = writer_pool.assign(idle)
+        self._stop = threading.Event()
+        self._threads = []
+        self.error: Optional[BaseException] = None
+        self.error_stage: Optional[str] = None
+        self.read_calls = 0
+        self.read_bytes = 0
+        self.max_read_size = 0
+
+    def start(self) -> "CapturePipeline":
+        """Start the stage threads."""
+        if self._threads:
+            raise RuntimeError("Pipeline already started")
+        stages = [("parser", self._run_parser), ("reader", self._run_reader)]
+        if self._owns_writer:
+            stages.insert(0, ("writer", self._run_writer))
+        for stage, target in stages:
+            thread = threading.Thread(target=self._run_stage, args=(stage, target),
+                                      name=f"{self.name}-{stage}", daemon=True)
+            self._threads.append(thread)
+            thread.start()
+        return self
+
+    @property
+    def running(self) -> bool:
+        """True until stop() is called or a stage fails."""
+        return bool(self._threads) and not self._stop.is_set()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Stop reading, then wait for queued data to be parsed and written
+        (with a writer pool: handed to the pool).
+
+        Args:
+            timeout: Maximum wait per thread in seconds (None waits)
+        """
+        self._stop.set()
+        for thread in reversed(self._threads):
+            thread.join(timeout)
+            if thread.is_alive():
+                logger.warning(f"{thread.name} did not stop within {timeout}s")
+
+    def raise_error(self) -> None:
+        """Re-raise a stage failure in the calling thread."""
+        if self.error is not None:
+            raise RuntimeError(f"Capture {self.error_stage} stage failed: {self.error}") from self.error
+
+    def stats(self) -> Dict[str, Any]:
+        """Get reader and queue counters."""
+        return {
+            'read_calls': self.read_calls,
+            'read_bytes': self.read_bytes,
+            'max_read_size': self.max_read_size,
+            'read_queue': self.read_queue.stats(),
+            'write_queue': self.write_queue.stats(),
+        }
+
+    def _run_stage(self, stage: str, target: Callable[[], None]) -> None:
+        try:
+            target()
+        except Exception as e:
+            logger.error(f"Capture {stage} stage failed: {e}", exc_info=True)
+            if self.error is None:
+                self.error = e
+                self.error_stage = stage
+            self._stop.set()
+            self.read_queue.close()
+            if self._owns_writer:
+                self.write_queue.close()
+
+    def _run_reader(self) -> None:
+        try:
+            while not self._stop.is_set():
+                data = self._read()
+                if data:
+                    timestamp = time.monotonic_ns()
+                    size = len(data)
+                    self.read_calls += 1
+                    self.read_bytes += size
+                    if size > self.max_read_size:
+                        self.max_read_size = size
+                    self.read_queue.put((timestamp, data), size)
+        finally:
+            self.read_queue.close()
+
+    def _run_parser(self) -> None:
+        try:
+            while True:
+                item = self.read_queue.get()
+                if item is None or self.error is not None:
+                    break
+                timestamp, data = item
+                batch = self._parse(data, timestamp) if self.timestamped else self._parse(data)
+                if batch is None:
+                    continue
+                frames, payload = batch
+                if not self.write_queue.put((self._write, frames, payload), len(frames)):
+                    # Writer gone (failed elsewhere): stop reading
+                    logger.error(f"{self.name}: write queue closed, stopping capture")
+                    self._stop.set()
+                    self.read_queue.close()
+                    break
+        finally:
+            if self._owns_writer:
+                self.write_queue.close()
+
+    def _run_writer(self) -> None:
+        _drain_writes(self.write_queue, lambda: self.error is not None, self._idle)
@@ -0,0 +1,543 @@
+#!/usr/bin/env python3
+"""
+Capture replay module.
+
+This module plays a recorded raw capture (vibration_raw_Port_*.csv,
+binary .bin, .gz, .zip or segment manifest) back through a Linux
+pseudo-terminal, so the collectors and the helper's SerialSession read
+real field data without a sensor attached. Replay speed:
+
+- original rate (speed 1.0): packets leave at the sensor output rate
+  (300 Sps displacement, 3000 Sps velocity, or --sample-rate)
+- scaled rate (e.g. speed 10.0 for 10x)
+- flat-out (speed 0): as fast as the reader drains the pty
+
+The stream can be damaged on the way out, reproducibly for a given seed:
+noise bytes, truncated packets and dropped packets (as in
+synthetic_packets.generate_stream()), and periodic gaps where the line
+goes silent and the packets of that interval are lost.
+
+Bytes written by the host (e.g. configuration commands) are read and
+discarded. At a paced speed the replay behaves like the sensor: the
+stream does not wait for the host, and bytes the host does not read in
+time are lost (counted as overrun bytes) once a driver-sized backlog is
+full. Flat-out it waits for the reader instead.
+
+    with CaptureReplay("vibration_raw_Port_3.csv", speed=10) as replay:
+        connection = Serial(replay.port, 460800)
+        replay.start()
+        ...
+
+Usage:
+    python capture_replay.py raw_data/vibration_raw_Port_3.csv --speed 10 --link /tmp/ttyREPLAY0
+
+Author: Jnana Phani A (https://phani.zenithtek.in)
+Organization: Zenith Tek (https://zenithtek.in)
+"""
+
+import argparse
+import logging
+import os
+import select
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Union
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import fcntl
+    import termios
+    import tty
+except ImportError:  # Windows: no pseudo-terminals
+    tty = None
+
+try:
+    from capture_stream import PacketStream
+    from synthetic_packets import damage_frames
+except ImportError as e:
+    print(f"Error: Could not import capture modules: {e}")
+    sys.exit(1)
+
+logger = logging.getLogger(__name__)
+
+# Constants
+DEFAULT_OUTPUT_TYPE = "displacement"
+# RAW output rates of the M-A542VR1 (datasheet: velocity 3000 Sps, displacement 300 Sps)
+SAMPLE_RATES = {
+    "velocity": 3000.0,
+    "displacement": 300.0,
+}
+WRITE_INTERVAL = 0.005          # Seconds of paced output per pty write
+FLAT_OUT_WRITE_SIZE = 1 << 16   # Bytes per pty write when flat-out
+POLL_INTERVAL = 0.05
+READ_CHUNK = 4096
+DEFAULT_GAP_SECONDS = 0.5
+# Paced output queued while the host is slow to read. A pty only buffers
+# about 4 KB; serial drivers buffer more, so a blocking read() of a few KB
+# does not lose data on real hardware.
+BACKLOG_BYTES = 1 << 20
+# Seconds without progress after which unread output is given up
+DRAIN_TIMEOUT = 1.0
+# Empty pty polls in a row after which the host has read everything
+SETTLE_POLLS = 3
+SETTLE_INTERVAL = 0.02
+
+
+class CaptureReplay:
+    """Replay a raw capture on a pseudo-terminal.
+
+    The capture timeline is the packet index divided by the sample rate;
+    with repeat > 1 the passes follow each other on one timeline (the
+    packet counter jumps where the capture wraps around).
+
+    Attributes:
+        port: Slave device path to open with pyserial (or link, if given)
+        packet_size: Packet size of the capture (known after open())
+        sample_rate: Original output rate in Sps (known after open())
+        finished: Event set when the host has read the whole capture (or
+                  stopped reading for DRAIN_TIMEOUT)
+        stats: Replay counters
+    """
+
+    def __init__(self, path: Union[str, Path], speed: float = 1.0,
+                 sample_rate: Optional[float] = None, output_type: Optional[str] = None,
+                 packet_size: Optional[int] = None, repeat: int = 1,
+                 noise_rate: float = 0.0, misalign_rate: float = 0.0, drop_rate: float = 0.0,
+                 gap_every: Optional[float] = None, gap_seconds: float = DEFAULT_GAP_SECONDS,
+                 seed: int = 0, link: Optional[str] = None):
+        """
+        Initialize replay.
+
+        Args:
+            path: Capture file (CSV, binary, .gz, .zip or segment manifest)
+            speed: Replay speed relative to the original rate (0: flat-out)
+            sample_rate: Original rate in Sps (default: from output_type)
+            output_type: "displacement" or "velocity" (default: binary
+                         capture header, else displacement)
+            packet_size: Packet size of CSV sources (default: inferred)
+            repeat: Number of passes over the capture (0: until stopped)
+            noise_rate: Probability of a run of 1-8 noise bytes before a packet
+            misalign_rate: Probability that a packet is truncated
+            drop_rate: Probability that a packet is lost
+            gap_every: Capture seconds between silent gaps (default: no gaps)
+            gap_seconds: Capture seconds of each gap
+            seed: Random seed of the damage
+            link: Optional symlink to create for the slave device
+        """
+        if np is None:
+            raise ImportError("numpy is not installed. Install it with: pip install numpy")
+        if speed < 0:
+            raise ValueError(f"Invalid speed: {speed}")
+        if repeat < 0:
+            raise ValueError(f"Invalid repeat count: {repeat}")
+        for name, rate in (('noise', noise_rate), ('misalign', misalign_rate), ('drop', drop_rate)):
+            if not 0.0 <= rate <= 1.0:
+                raise ValueError(f"Invalid {name} rate: {rate}")
+        if gap_every is not None and not 0 < gap_seconds < gap_every:
+            raise ValueError(f"Gap length must be between 0 and {gap_every}s: {gap_seconds}")
+        if output_type is not None and output_type.lower() not in SAMPLE_RATES:
+            raise ValueError(f"Invalid output type: {output_type}")
+
+        self.path = Path(path)
+        self.speed = speed
+        self.output_type = output_type.lower() if output_type else None
+        self.sample_rate = sample_rate
+        self.packet_size = packet_size
+        self.repeat = repeat
+        self.noise_rate = noise_rate
+        self.misalign_rate = misalign_rate
+        self.drop_rate = drop_rate
+        self.gap_every = gap_every
+        self.gap_seconds = gap_seconds
+        self.seed = seed
+        self.link = link
+
+        self.finished = threading.Event()
+        self.stats = {
+            'passes': 0,
+            'packets_read': 0,
+            'packets_sent': 0,
+            'bytes_sent': 0,
+            'dropped_packets': 0,
+            'truncated_packets': 0,
+            'noise_bytes': 0,
+            'gaps': 0,
+            'gap_packets': 0,
+            'overrun_bytes': 0,
+            'host_bytes': 0,
+            'max_lag_seconds': 0.0,
+        }
+        self._stream: Optional[PacketStream] = None
+        self._first_batch = None
+        self._batches = None
+        self._in_gap = False
+        self._backlog = bytearray()
+        self._rng = np.random.default_rng(seed)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._master: Optional[int] = None
+        self._slave: Optional[int] = None
+        self.port: Optional[str] = None
+
+    def __enter__(self) -> "CaptureReplay":
+        return self.open()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    @property
+    def damaged(self) -> bool:
+        """True if noise, truncation or drops are injected."""
+        return bool(self.noise_rate or self.misalign_rate or self.drop_rate)
+
+    def open(self) -> "CaptureReplay":
+        """Read the start of the capture and create the pty (nothing is sent yet)."""
+        if tty is None or not hasattr(os, 'openpty'):
+            raise RuntimeError("Capture replay needs a POSIX pseudo-terminal")
+        if self._master is not None:
+            return self
+        self._stream = PacketStream(self.path, packet_size=self.packet_size)
+        batches = iter(self._stream)
+        self._first_batch = next(batches, None)
+        if self._first_batch is None:
+            raise ValueError(f"No packets in capture: {self.path}")
+        self._batches = batches
+        self.packet_size = self._stream.packet_size
+        if self.output_type is None:
+            self.output_type = self._stream.header.get('output_type', DEFAULT_OUTPUT_TYPE)
+        if self.sample_rate is None:
+            self.sample_rate = SAMPLE_RATES[self.output_type]
+
+        self._master, self._slave = os.openpty()
+        # Raw mode: no echo and no CR/LF translation of the 0x0D terminator.
+        # The slave stays open so the master survives host reconnects.
+        tty.setraw(self._slave)
+        os.set_blocking(self._master, False)
+        self.port = os.ttyname(self._slave)
+        if self.link:
+            if os.path.islink(self.link):
+                os.unlink(self.link)
+            os.symlink(self.port, self.link)
+            self.port = self.link
+        logger.debug(f"Replaying {self.path} on {self.port}")
+        return self
+
+    def start(self) -> "CaptureReplay":
+        """Start sending the capture."""
+        self.open()
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="capture-replay", daemon=True)
+            self._thread.start()
+        return self
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait until the whole capture has been sent and read."""
+        return self.finished.wait(timeout)
+
+    def stop(self) -> None:
+        """Stop sending and remove the pty."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        for fd in (self._master, self._slave):
+            if fd is not None:
+                os.close(fd)
+        self._master = self._slave = None
+        if self.link and os.path.islink(self.link):
+            os.unlink(self.link)
+
+    # Replay
+
+    def _passes(self):
+        """Yield packet batches of all passes."""
+        yield self._first_batch
+        yield from self._batches
+        self.stats['passes'] = 1
+        while not self.repeat or self.stats['passes'] < self.repeat:
+            yield from PacketStream(self.path, packet_size=self.packet_size)
+            self.stats['passes'] += 1
+
+    def _chunk_packets(self) -> int:
+        if not self.speed:
+            return max(1, FLAT_OUT_WRITE_SIZE // self.packet_size)
+        return max(1, int(round(self.sample_rate * self.speed * WRITE_INTERVAL)))
+
+    def _gap_mask(self, first: int, count: int):
+        """Mask of packets inside a silent gap, by capture time."""
+        # In whole packets, so gap edges do not depend on float rounding
+        every = max(1, int(round(self.gap_every * self.sample_rate)))
+        length = int(round(self.gap_seconds * self.sample_rate))
+        index = first + np.arange(count)
+        mask = (index >= every) & (index % every < length)
+        # Count gaps by their first packet, also across chunk boundaries
+        starts = np.diff(mask.astype(np.int8), prepend=np.int8(self._in_gap))
+        self.stats['gaps'] += int((starts == 1).sum())
+        self._in_gap = bool(mask[-1])
+        return mask
+
+    def _encode(self, frames, first: int) -> bytes:
+        """Apply gaps and damage to a chunk of packets."""
+        if self.gap_every is not None:
+            gap = self._gap_mask(first, len(frames))
+            self.stats['gap_packets'] += int(gap.sum())
+            frames = frames[~gap]
+        if not self.damaged:
+            self.stats['packets_sent'] += len(frames)
+            return frames.tobytes()
+        data, damage = damage_frames(frames, self._rng, self.noise_rate,
+                                     self.misalign_rate, self.drop_rate)
+        self.stats['packets_sent'] += damage['sent']
+        self.stats['dropped_packets'] += damage['dropped']
+        self.stats['truncated_packets'] += damage['truncated']
+        self.stats['noise_bytes'] += damage['noise_bytes']
+        return data
+
+    def _drain_host(self) -> None:
+        try:
+            while True:
+                data = os.read(self._master, READ_CHUNK)
+                if not data:
+                    return
+                self.stats['host_bytes'] += len(data)
+        except (BlockingIOError, OSError):
+            return
+
+    def _sleep_until(self, deadline: float) -> None:
+        """Wait for the schedule while discarding host input."""
+        while not self._stop.is_set():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            writers = [self._master] if self._backlog else []
+            readable, writable, _ = select.select([self._master], writers, [],
+                                                  min(remaining, POLL_INTERVAL))
+            if readable:
+                self._drain_host()
+            if writable:
+                self._flush_backlog()
+
+    def _flush_backlog(self) -> bool:
+        """Write as much of the backlog as the pty takes; True on progress."""
+        try:
+            written = os.write(self._master, self._backlog)
+        except BlockingIOError:
+            return False
+        del self._backlog[:written]
+        self.stats['bytes_sent'] += written
+        return written > 0
+
+    def _unread(self) -> int:
+        """Bytes sent but not yet read by the host.
+
+        FIONREAD only sees the line discipline's buffer, not bytes still
+        queued behind it, so callers wait for a few empty polls in a row.
+        """
+        count = fcntl.ioctl(self._slave, termios.FIONREAD, b'\0\0\0\0')
+        return len(self._backlog) + int.from_bytes(count, sys.byteorder)
+
+    def _finish(self) -> None:
+        """Wait for the host to read everything sent, or give up on it."""
+        pending = self._unread()
+        empty_polls = 0
+        last_progress = time.monotonic()
+        while empty_polls < SETTLE_POLLS and not self._stop.is_set():
+            if pending and time.monotonic() - last_progress > DRAIN_TIMEOUT:
+                self.stats['overrun_bytes'] += len(self._backlog)
+                self._backlog.clear()
+                return
+            writers = [self._master] if self._backlog else []
+            readable, writable, _ = select.select([self._master], writers, [], SETTLE_INTERVAL)
+            if readable:
+                self._drain_host()
+            if writable:
+                self._flush_backlog()
+            unread = self._unread()
+            empty_polls = 0 if unread else empty_polls + 1
+            if unread < pending:
+                last_progress = time.monotonic()
+            pending = unread
+
+    def _transmit(self, data: bytes) -> None:
+        """Write to the pty; paced output is lost when the host is not reading."""
+        if self.speed:
+            space = BACKLOG_BYTES - len(self._backlog)
+            if len(data) > space:
+                self.stats['overrun_bytes'] += len(data) - space
+                data = data[:space]
+            self._backlog += data
+            self._flush_backlog()
+            return
+        view = memoryview(data)
+        while view and not self._stop.is_set():
+            readable, writable, _ = select.select([self._master], [self._master], [], POLL_INTERVAL)
+            if readable:
+                self._drain_host()
+            if not writable:
+                continue
+            try:
+                written = os.write(self._master, view)
+            except BlockingIOError:
+                continue
+            view = view[written:]
+            self.stats['bytes_sent'] += written
+
+    def _run(self) -> None:
+        chunk = self._chunk_packets()
+        started = time.monotonic()
+        index = 0
+        for batch in self._passes():
+            self.stats['packets_read'] += len(batch)
+            for start in range(0, len(batch), chunk):
+                frames = batch[start:start + chunk]
+                if self.speed:
+                    due = started + index / (self.sample_rate * self.speed)
+                    self._sleep_until(due)
+                    lag = time.monotonic() - due
+                    self.stats['max_lag_seconds'] = max(self.stats['max_lag_seconds'], lag)
+                if self._stop.is_set():
+                    return
+                self._transmit(self._encode(frames, index))
+                index += len(frames)
+        if self.speed:
+            # The last chunk covers the rest of its interval
+            self._sleep_until(started + index / (self.sample_rate * self.speed))
+        self._finish()
+        self.finished.set()
+        logger.debug(f"Replay finished: {self.stats}")
+
+
+def main():
+    """Main entry point for capture replay."""
+    parser = argparse.ArgumentParser(
+        description='Replay a raw vibration capture on a pseudo-terminal',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Original rate (displacement captures: 300 Sps)
+  python capture_replay.py raw_data/vibration_raw_Port_3.csv --link /tmp/ttyREPLAY0
+
+  # 10x speed, velocity capture, with noise and a 0.5 s gap every 10 s
+  python capture_replay.py capture.bin --speed 10 --output-type velocity \\
+      --noise-rate 0.001 --gap-every 10
+
+  # Flat-out, three passes: throughput and resync benchmarking
+  python capture_replay.py vibration_collection_20251203_123533.zip --flat-out --repeat 3 --exit-when-done
+
+Then point a collector at the printed device, e.g.:
+  python collect_raw_vibration_data.py /tmp/ttyREPLAY0 --baud 460800 --duration 30
+        """
+    )
+    parser.add_argument('capture', help='Raw capture (CSV, .bin, .gz, .zip or segment manifest)')
+    parser.add_argument('--speed', type=float, default=1.0,
+                        help='Replay speed relative to the original rate (default: 1.0)')
+    parser.add_argument('--flat-out', action='store_true',
+                        help='Send as fast as the reader drains the port (same as --speed 0)')
+    parser.add_argument('--output-type', choices=sorted(SAMPLE_RATES),
+                        help='Output type of the capture (default: header, else displacement)')
+    parser.add_argument('--sample-rate', type=float,
+                        help='Original rate in Sps (default: 300 displacement, 3000 velocity)')
+    parser.add_argument('--packet-size', type=int, choices=[13, 19],
+                        help='Packet size of CSV captures (default: inferred)')
+    parser.add_argument('--repeat', type=int, default=1,
+                        help='Passes over the capture (0 = until Ctrl+C, default: 1)')
+    parser.add_argument('--noise-rate', type=float, default=0.0,
+                        help='Probability of noise bytes before a packet (default: 0)')
+    parser.add_argument('--misalign-rate', type=float, default=0.0,
+                        help='Probability that a packet is truncated (default: 0)')
+    parser.add_argument('--drop-rate', type=float, default=0.0,
+                        help='Probability that a packet is lost (default: 0)')
+    parser.add_argument('--gap-every', type=float,
+                        help='Capture seconds between silent gaps (default: no gaps)')
+    parser.add_argument('--gap-seconds', type=float, default=DEFAULT_GAP_SECONDS,
+                        help=f'Capture seconds of each gap (default: {DEFAULT_GAP_SECONDS})')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed of the damage (default: 0)')
+    parser.add_argument('--link', help='Create a symlink to the pty (e.g. /tmp/ttyREPLAY0)')
+    parser.add_argument('--start-delay', type=float, default=0.0,
+                        help='Seconds to wait before sending, to start the reader (default: 0)')
+    parser.add_argument('--exit-when-done', action='store_true',
+                        help='Remove the port once the capture is sent (default: keep it open until Ctrl+C)')
+    parser.add_argument('--verbose', '-v', action='store_true', help='Enable verbose logging')
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
+    if not hasattr(os, 'openpty'):
+        logger.error("Capture replay needs a POSIX pseudo-terminal (Linux or macOS)")
+        return 1
+    if not Path(args.capture).exists():
+        logger.error(f"Capture not found: {args.capture}")
+        return 1
+
+    try:
+        replay = CaptureReplay(
+            args.capture, speed=0.0 if args.flat_out else args.speed,
+            sample_rate=args.sample_rate, output_type=args.output_type,
+            packet_size=args.packet_size, repeat=args.repeat,
+            noise_rate=args.noise_rate, misalign_rate=args.misalign_rate,
+            drop_rate=args.drop_rate, gap_every=args.gap_every,
+            gap_seconds=args.gap_seconds, seed=args.seed, link=args.link,
+        ).open()
+    except (ImportError, ValueError) as e:
+        logger.error(str(e))
+        return 1
+
+    speed = f"{replay.speed:g}x" if replay.speed else "flat-out"
+    logger.info("=" * 60)
+    logger.info(f"Replaying {args.capture} on {replay.port}")
+    logger.info(f"Packets: {replay.packet_size} bytes, {replay.output_type} at "
+                f"{replay.sample_rate:g} Sps, speed: {speed}")
+    logger.info("Press Ctrl+C to stop")
+    logger.info("=" * 60)
+    start = time.monotonic()
+    elapsed = None
+    try:
+        time.sleep(args.start_delay)
+        start = time.monotonic()
+        replay.start()
+        while not replay.wait(0.2):
+            pass
+        elapsed = time.monotonic() - start
+        if not args.exit_when_done:
+            # Like a sensor that stopped sending: readers see silence, not a disconnect
+            logger.info("Capture sent; the port stays open until Ctrl+C")
+            while True:
+                time.sleep(0.2)
+    except KeyboardInterrupt:
+        logger.info("Stopping replay...")
+    finally:
+        replay.stop()
+
+    if elapsed is None:
+        elapsed = time.monotonic() - start
+    stats = replay.stats
+    logger.info("=" * 60)
+    logger.info("Replay summary:")
+    logger.info(f"  Passes completed: {stats['passes']}")
+    logger.info(f"  Packets read: {stats['packets_read']}, sent: {stats['packets_sent']} "
+                f"({stats['bytes_sent']} bytes in {elapsed:.2f}s)")
+    if elapsed > 0:
+        logger.info(f"  Throughput: {stats['packets_sent'] / elapsed:,.0f} packets/s, "
+                    f"{stats['bytes_sent'] / elapsed / 1e6:.2f} MB/s")
+    logger.info(f"  Injected: {stats['dropped_packets']} dropped, {stats['truncated_packets']} truncated, "
+                f"{stats['noise_bytes']} noise bytes, {stats['gaps']} gaps "
+                f"({stats['gap_packets']} packets)")
+    if replay.speed:
+        logger.info(f"  Max lag behind schedule: {stats['max_lag_seconds'] * 1000:.1f} ms")
+    logger.info(f"  Overrun bytes (host not reading): {stats['overrun_bytes']}")
+    logger.info(f"  Host bytes discarded: {stats['host_bytes']}")
+    logger.info("=" * 60)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
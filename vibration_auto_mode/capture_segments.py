@@ -0,0 +1,278 @@
+"""
+Capture segments module.
+
+This module splits long captures into segment files rotated by size or
+duration (vibration_raw_..._seg0001.csv, _seg0002, ...) and keeps a JSON
+manifest of the set next to the raw files. For every segment the manifest
+records the raw and parsed file, the packet range, the first and last
+packet counter, the time span and the file sizes. It is rewritten
+atomically whenever a segment opens or closes, so after a crash it lists
+every segment written so far (the last one with status "open").
+
+capture_stream.PacketStream opens a manifest as one logical stream.
+
+Author: Jnana Phani A (https://phani.zenithtek.in)
+Organization: Zenith Tek (https://zenithtek.in)
+"""
+
+import json
+import logging
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# Constants
+SEGMENTS_SUFFIX = ".segments.json"
+SEGMENTS_VERSION = 1
+SEGMENT_NAME_FORMAT = "_seg{index:04d}"
+
+# Byte offsets of the packet counter (13-byte: TEMP2_L bits [1:0], 19-byte: COUNT)
+COUNTER_OFFSETS = {
+    13: 2,
+    19: 14,
+}
+
+
+def is_segment_manifest(path: Union[str, Path]) -> bool:
+    """Check whether a path names a segment manifest."""
+    return str(path).endswith(SEGMENTS_SUFFIX)
+
+
+def packet_counter(packet: Union[bytes, bytearray, memoryview], packet_size: int) -> int:
+    """
+    Get the packet counter of one packet.
+
+    Args:
+        packet: Packet bytes
+        packet_size: Packet size (13 or 19 bytes)
+
+    Returns:
+        2-bit counter (13-byte) or 16-bit COUNT (19-byte)
+    """
+    offset = COUNTER_OFFSETS[packet_size]
+    if packet_size == 13:
+        return packet[offset] & 0b11
+    return (packet[offset] << 8) | packet[offset + 1]
+
+
+class RotationPolicy:
+    """When to start a new capture segment.
+
+    Attributes:
+        max_bytes: Raw bytes per segment (None: no size limit)
+        max_seconds: Seconds per segment (None: no time limit)
+    """
+
+    def __init__(self, max_bytes: Optional[int] = None, max_seconds: Optional[float] = None):
+        """
+        Initialize policy.
+
+        Args:
+            max_bytes: Raw bytes per segment (None: no size limit)
+            max_seconds: Seconds per segment (None: no time limit)
+        """
+        if max_bytes is not None and max_bytes <= 0:
+            raise ValueError(f"Invalid segment size: {max_bytes}")
+        if max_seconds is not None and max_seconds <= 0:
+            raise ValueError(f"Invalid segment duration: {max_seconds}")
+        self.max_bytes = max_bytes
+        self.max_seconds = max_seconds
+
+    @property
+    def enabled(self) -> bool:
+        """True if any limit is set."""
+        return self.max_bytes is not None or self.max_seconds is not None
+
+    def due(self, raw_bytes: int, started: float) -> bool:
+        """
+        Check whether the current segment is full.
+
+        Args:
+            raw_bytes: Raw bytes written to the segment
+            started: time.monotonic() when the segment was opened
+
+        Returns:
+            True if a new segment should be started
+        """
+        if self.max_bytes is not None and raw_bytes >= self.max_bytes:
+            return True
+        return self.max_seconds is not None and time.monotonic() - started >= self.max_seconds
+
+
+class SegmentManifest:
+    """Track the segments of one capture and write their manifest.
+
+    Usage::
+
+        manifest = SegmentManifest(path, {'packet_size': 19, ...})
+        manifest.open_segment(raw_path, parsed_path, first_packet=0)
+        manifest.record(frames)           # per written batch
+        manifest.close_segment()          # stats from the closed files
+    """
+
+    def __init__(self, path: Union[str, Path], settings: Dict):
+        """
+        Initialize manifest.
+
+        Args:
+            path: Manifest path (should end with SEGMENTS_SUFFIX)
+            settings: Capture settings; must include 'packet_size'
+        """
+        self.path = Path(path)
+        self.settings = dict(settings)
+        self.packet_size = int(settings['packet_size'])
+        self.segments: List[Dict] = []
+        self.raw_bytes = 0
+        self._started = 0.0
+        self._raw_path: Optional[Path] = None
+        self._parsed_path: Optional[Path] = None
+
+    @property
+    def current(self) -> Optional[Dict]:
+        """The open segment, if any."""
+        if self.segments and self.segments[-1]['status'] == "open":
+            return self.segments[-1]
+        return None
+
+    @property
+    def next_index(self) -> int:
+        """Index of the next segment (1-based)."""
+        return len(self.segments) + 1
+
+    def _relative(self, path: Optional[Path]) -> Optional[str]:
+        if path is None:
+            return None
+        return Path(os.path.relpath(path, self.path.parent)).as_posix()
+
+    def open_segment(self, raw_path: Path, parsed_path: Optional[Path], first_packet: int) -> Dict:
+        """
+        Start a segment and rewrite the manifest.
+
+        Args:
+            raw_path: Raw data file of the segment
+            parsed_path: Parsed data file of the segment
+            first_packet: Capture-wide index of the segment's first packet
+
+        Returns:
+            Segment entry
+        """
+        if self.current is not None:
+            raise RuntimeError("Previous segment is still open")
+        now = datetime.now()
+        segment = {
+            'index': self.next_index,
+            'status': "open",
+            'raw_file': self._relative(raw_path),
+            'parsed_file': self._relative(parsed_path),
+            'first_packet': first_packet,
+            'packet_count': 0,
+            'first_counter': None,
+            'last_counter': None,
+            'start_time': now.isoformat(timespec='milliseconds'),
+            'end_time': None,
+            'duration_seconds': 0.0,
+            'raw_bytes': 0,
+            'parsed_bytes': 0,
+        }
+        self.segments.append(segment)
+        self.raw_bytes = 0
+        self._started = time.monotonic()
+        self._raw_path = Path(raw_path)
+        self._parsed_path = Path(parsed_path) if parsed_path else None
+        self.write()
+        return segment
+
+    def record(self, frames: Union[bytes, bytearray, memoryview], raw_bytes: int) -> None:
+        """
+        Record a written batch in the open segment.
+
+        Args:
+            frames: Whole packets back to back
+            raw_bytes: Bytes written to the raw file for them
+        """
+        segment = self.current
+        size = self.packet_size
+        count = len(frames) // size
+        if segment is None or count == 0:
+            return
+        if segment['first_counter'] is None:
+            segment['first_counter'] = packet_counter(frames[:size], size)
+        segment['last_counter'] = packet_counter(frames[(count - 1) * size:count * size], size)
+        segment['packet_count'] += count
+        self.raw_bytes += raw_bytes
+
+    def due(self, policy: RotationPolicy) -> bool:
+        """Check the open segment against a rotation policy."""
+        return self.current is not None and policy.due(self.raw_bytes, self._started)
+
+    def close_segment(self) -> Optional[Dict]:
+        """
+        Finish the open segment (after its files are closed) and rewrite
+        the manifest.
+
+        Returns:
+            Closed segment entry, or None if no segment was open
+        """
+        segment = self.current
+        if segment is None:
+            return None
+        segment['status'] = "closed"
+        segment['end_time'] = datetime.now().isoformat(timespec='milliseconds')
+        segment['duration_seconds'] = round(time.monotonic() - self._started, 3)
+        for key, path in (('raw_bytes', self._raw_path), ('parsed_bytes', self._parsed_path)):
+            if path is not None and path.exists():
+                segment[key] = path.stat().st_size
+        self.write()
+        return segment
+
+    def write(self) -> None:
+        """Write the manifest atomically (temporary file + rename)."""
+        manifest = {
+            'version': SEGMENTS_VERSION,
+            'updated': datetime.now().isoformat(timespec='milliseconds'),
+            'settings': self.settings,
+            'packet_count': sum(segment['packet_count'] for segment in self.segments),
+            'segments': self.segments,
+        }
+        temp_file = self.path.with_name(self.path.name + ".tmp")
+        with open(temp_file, 'w') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(temp_file, self.path)
+
+
+def read_segment_manifest(path: Union[str, Path]) -> Dict:
+    """
+    Read a segment manifest.
+
+    Args:
+        path: Manifest path
+
+    Returns:
+        Manifest dict
+    """
+    with open(path, 'r') as f:
+        manifest = json.load(f)
+    if manifest.get('version') != SEGMENTS_VERSION:
+        raise ValueError(f"Unsupported segment manifest version: {manifest.get('version')}")
+    return manifest
+
+
+def segment_files(path: Union[str, Path], kind: str = "raw") -> List[Path]:
+    """
+    Get the files of a segmented capture in order.
+
+    Args:
+        path: Manifest path
+        kind: "raw" or "parsed"
+
+    Returns:
+        Absolute paths of the segment files
+    """
+    path = Path(path)
+    manifest = read_segment_manifest(path)
+    key = f"{kind}_file"
+    return [path.parent / segment[key] for segment in manifest['segments'] if segment.get(key)]
@@ -0,0 +1,344 @@
+"""
+Capture streaming module.
+
+This module provides generators that read raw vibration captures lazily
+and yield packets in fixed-size batches, so hours of data can be piped
+through analytics with constant memory and without temporary files.
+
+Supported sources:
+- hex CSV raw files (collector format)
+- binary raw captures (raw_capture.py format, memory-mapped)
+- gzip-compressed versions of either (.gz)
+- zip archives of collections (raw members are read in name order)
+- segment manifests of rotated captures (*.segments.json; segments are
+  read in order as one stream)
+
+Author: Jnana Phani A (https://phani.zenithtek.in)
+Organization: Zenith Tek (https://zenithtek.in)
+"""
+
+import gzip
+import io
+import logging
+import sys
+import zipfile
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, List, Optional, Union
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from capture_segments import is_segment_manifest, segment_files
+    from packet_decoder import checksum_mask, decode_frames, valid_frame_mask
+    from parse_vibration_data import CHECKSUM_POLICIES, CSV_LINE_LAYOUTS, parse_csv_line_to_bytes
+    from raw_capture import MAGIC, BinaryCaptureReader, is_binary_capture, read_stream_header
+except ImportError as e:
+    print(f"Error: Could not import capture modules: {e}")
+    sys.exit(1)
+
+logger = logging.getLogger(__name__)
+
+# Constants
+DEFAULT_BATCH_SIZE = 65536
+# Bytes of raw CSV text decoded per block
+CSV_BLOCK_SIZE = 1 << 20
+GZIP_MAGIC = b"\x1f\x8b"
+RAW_MEMBER_SUFFIXES = ('.csv', '.txt', '.bin')
+
+# Number of comma-separated fields per raw CSV line for each packet size
+CSV_FIELD_COUNTS = {
+    7: 13,
+    11: 19,
+}
+
+
+def infer_packet_size(line: str) -> Optional[int]:
+    """Infer packet size from a raw CSV line.
+
+    Args:
+        line: Raw CSV line
+
+    Returns:
+        13 or 19, or None if the line does not look like a packet
+    """
+    return CSV_FIELD_COUNTS.get(len(line.strip().split(',')))
+
+
+def decode_csv_block(data: bytes, packet_size: int) -> Optional[bytes]:
+    """Decode a block of well-formed raw CSV lines in one pass.
+
+    Every line must follow the collector's exact layout (LF or CRLF line
+    endings, the last line terminated too). The comma and newline columns
+    are checked with NumPy and all hex digits go through one
+    bytes.fromhex() call.
+
+    Args:
+        data: Whole raw CSV lines
+        packet_size: Packet size (13 or 19 bytes)
+
+    Returns:
+        Packet bytes back to back, or None if any line deviates (decode
+        those lines with parse_csv_line_to_bytes())
+    """
+    length, commas, _, _ = CSV_LINE_LAYOUTS[packet_size]
+    text = np.frombuffer(data, dtype=np.uint8)
+    for ending in (b"\n", b"\r\n"):
+        width = length + len(ending)
+        if len(data) % width:
+            continue
+        lines = text.reshape(-1, width)
+        if not (lines[:, commas] == ord(',')).all():
+            continue
+        if not (lines[:, length:] == np.frombuffer(ending, dtype=np.uint8)).all():
+            continue
+        hex_columns = np.setdiff1d(np.arange(length), commas)
+        try:
+            packets = bytes.fromhex(lines[:, hex_columns].tobytes().decode('ascii'))
+        except (UnicodeDecodeError, ValueError):
+            return None
+        # fromhex skips whitespace, so also check the decoded length
+        return packets if len(packets) == len(lines) * packet_size else None
+    return None
+
+
+class PacketStream:
+    """Iterate raw packets of a capture in fixed-size batches.
+
+    Iterating yields 2-D uint8 arrays of shape (n, packet_size) with
+    n <= batch_size. Frames are yielded as stored; use valid_frame_mask()
+    or iter_samples() to drop badly framed packets.
+
+    Attributes updated during iteration:
+        packet_size: Packet size of the current source
+        header: Binary capture header of the current source (or {})
+        source: Name of the current source
+        packet_count: Packets yielded so far
+        error_count: Raw CSV lines that could not be decoded
+    """
+
+    def __init__(self, path: Union[str, Path], batch_size: int = DEFAULT_BATCH_SIZE,
+                 packet_size: Optional[int] = None, members: Optional[List[str]] = None):
+        """Initialize stream.
+
+        Args:
+            path: Capture file (CSV, binary, .gz, .zip or segment manifest)
+            batch_size: Maximum packets per yielded batch
+            packet_size: Packet size of CSV sources (default: inferred)
+            members: Zip members to read (default: all raw data members)
+        """
+        if np is None:
+            raise ImportError("numpy is not installed. Install it with: pip install numpy")
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self.packet_size = packet_size
+        self.members = members
+        self.header: Dict = {}
+        self.source = ""
+        self.packet_count = 0
+        self.error_count = 0
+
+    def __iter__(self) -> Iterator:
+        if is_segment_manifest(self.path):
+            for path in segment_files(self.path):
+                if not path.exists():
+                    logger.warning(f"Missing capture segment: {path}")
+                    continue
+                yield from self._iter_file(path)
+            return
+        yield from self._iter_file(self.path)
+
+    def _iter_file(self, path: Path) -> Iterator:
+        if zipfile.is_zipfile(path):
+            yield from self._iter_zip(path)
+            return
+
+        with open(path, 'rb') as f:
+            is_gzip = f.read(len(GZIP_MAGIC)) == GZIP_MAGIC
+
+        self.source = str(path)
+        if is_gzip:
+            with gzip.open(path, 'rb') as stream:
+                yield from self._iter_stream(stream)
+        elif is_binary_capture(path):
+            yield from self._iter_mapped(path)
+        else:
+            with open(path, 'rb') as stream:
+                yield from self._iter_stream(stream)
+
+    def _iter_zip(self, path: Path) -> Iterator:
+        with zipfile.ZipFile(path) as archive:
+            names = self.members
+            if names is None:
+                files = [info.filename for info in archive.infolist() if not info.is_dir()]
+                names = sorted(
+                    name for name in files
+                    if '_raw' in Path(name).name and name.lower().endswith(RAW_MEMBER_SUFFIXES)
+                ) or sorted(files)
+            for name in names:
+                self.source = f"{path}:{name}"
+                with archive.open(name) as stream:
+                    yield from self._iter_stream(stream)
+
+    def _iter_mapped(self, path: Path) -> Iterator:
+        """Yield zero-copy slices of a memory-mapped binary capture."""
+        with BinaryCaptureReader(path) as reader:
+            self.header = reader.header
+            self.packet_size = reader.packet_size
+            frames = reader.frames
+            try:
+                for start in range(0, len(frames), self.batch_size):
+                    self.packet_count += len(frames[start:start + self.batch_size])
+                    yield frames[start:start + self.batch_size]
+            finally:
+                # Release the view so the reader can unmap the file
+                del frames
+
+    def _iter_stream(self, stream: BinaryIO) -> Iterator:
+        if not hasattr(stream, 'peek'):
+            stream = io.BufferedReader(stream)
+        if stream.peek(len(MAGIC))[:len(MAGIC)] == MAGIC:
+            yield from self._iter_binary_stream(stream)
+        else:
+            yield from self._iter_csv_stream(stream)
+
+    def _iter_binary_stream(self, stream: BinaryIO) -> Iterator:
+        self.header = read_stream_header(stream)
+        self.packet_size = int(self.header['packet_size'])
+        batch_bytes = self.batch_size * self.packet_size
+        while True:
+            data = stream.read(batch_bytes)
+            while data and len(data) < batch_bytes:
+                more = stream.read(batch_bytes - len(data))
+                if not more:
+                    break
+                data += more
+            count = len(data) // self.packet_size
+            if count == 0:
+                break
+            batch = np.frombuffer(data, dtype=np.uint8, count=count * self.packet_size)
+            self.packet_count += count
+            yield batch.reshape(count, self.packet_size)
+
+    def _iter_csv_stream(self, stream: BinaryIO) -> Iterator:
+        self.header = {}
+        packet_size = self.packet_size
+        pending = bytearray()
+        remainder = b""
+        while True:
+            block = stream.read(CSV_BLOCK_SIZE)
+            data = remainder + block
+            if block:
+                # Keep a trailing partial line for the next block
+                cut = data.rfind(b"\n") + 1
+                data, remainder = data[:cut], data[cut:]
+            else:
+                remainder = b""
+            if packet_size is None and data:
+                packet_size, data = self._infer_csv_packet_size(data)
+            if data:
+                packets = decode_csv_block(data, packet_size)
+                if packets is None:
+                    packets = self._decode_csv_lines(data, packet_size)
+                pending += packets
+            batch_bytes = self.batch_size * (packet_size or 1)
+            while packet_size and (len(pending) >= batch_bytes or (not block and pending)):
+                batch = bytes(pending[:batch_bytes])
+                del pending[:batch_bytes]
+                count = len(batch) // packet_size
+                self.packet_count += count
+                yield np.frombuffer(batch, dtype=np.uint8).reshape(count, packet_size)
+            if not block:
+                break
+
+    def _infer_csv_packet_size(self, data: bytes):
+        """Infer the packet size from the first decodable line of ``data``.
+
+        Returns:
+            Tuple of (packet size or None, data after the skipped lines)
+        """
+        position = 0
+        while position < len(data):
+            end = data.find(b"\n", position)
+            end = len(data) if end < 0 else end + 1
+            line = data[position:end].decode('utf-8', errors='replace')
+            packet_size = infer_packet_size(line)
+            if packet_size is not None:
+                self.packet_size = packet_size
+                return packet_size, data[position:]
+            self.error_count += 1
+            position = end
+        return None, b""
+
+    def _decode_csv_lines(self, data: bytes, packet_size: int) -> bytes:
+        """Decode raw CSV lines one at a time, counting undecodable lines."""
+        packets = bytearray()
+        # Universal newlines, as when reading the file in text mode
+        for line in io.StringIO(data.decode('utf-8', errors='replace'), newline=None):
+            packet = parse_csv_line_to_bytes(line, packet_size)
+            if packet is None:
+                self.error_count += 1
+                continue
+            packets += bytes(packet)
+        return bytes(packets)
+
+
+def iter_packets(path: Union[str, Path], batch_size: int = DEFAULT_BATCH_SIZE,
+                 packet_size: Optional[int] = None,
+                 members: Optional[List[str]] = None) -> Iterator:
+    """Iterate raw packets of a capture in batches.
+
+    Args:
+        path: Capture file (CSV, binary, .gz, .zip or segment manifest)
+        batch_size: Maximum packets per batch
+        packet_size: Packet size of CSV sources (default: inferred)
+        members: Zip members to read (default: all raw data members)
+
+    Yields:
+        2-D uint8 arrays of shape (n, packet_size)
+    """
+    return iter(PacketStream(path, batch_size, packet_size, members))
+
+
+def iter_samples(path: Union[str, Path], batch_size: int = DEFAULT_BATCH_SIZE,
+                 packet_size: Optional[int] = None,
+                 members: Optional[List[str]] = None,
+                 drop_invalid: bool = True, checksum: str = "drop") -> Iterator:
+    """Iterate decoded samples of a capture in batches.
+
+    With the default policies the samples are the rows of
+    VibrationDataParser and gap_analysis.analyze_capture().
+
+    Args:
+        path: Capture file (CSV, binary, .gz, .zip or segment manifest)
+        batch_size: Maximum packets per batch
+        packet_size: Packet size of CSV sources (default: inferred)
+        members: Zip members to read (default: all raw data members)
+        drop_invalid: Drop frames without 0x80 header / 0x0D terminator
+        checksum: Bad CHECKSUM handling for 19-byte packets: "drop",
+                  "flag" (adds a checksum_ok field) or "off"
+
+    Yields:
+        Structured arrays from packet_decoder.decode_frames()
+    """
+    checksum = checksum.lower()
+    if checksum not in CHECKSUM_POLICIES:
+        raise ValueError(f"Unsupported checksum policy: {checksum}")
+    for frames in PacketStream(path, batch_size, packet_size, members):
+        if drop_invalid:
+            frames = frames[valid_frame_mask(frames)]
+        if frames.shape[1] != 19 or checksum == "off":
+            yield decode_frames(frames, frames.shape[1])
+            continue
+        checksum_ok = checksum_mask(frames)
+        if checksum == "drop":
+            yield decode_frames(frames[checksum_ok], 19)
+            continue
+        samples = decode_frames(frames, 19)
+        flagged = np.empty(len(samples), dtype=samples.dtype.descr + [('checksum_ok', '?')])
+        for name in samples.dtype.names:
+            flagged[name] = samples[name]
+        flagged['checksum_ok'] = checksum_ok
+        yield flagged
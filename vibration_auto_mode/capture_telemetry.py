@@ -0,0 +1,324 @@
+"""
+Capture telemetry module.
+
+This module collects live capture health metrics and publishes them as a
+JSON stats file that is rewritten periodically (atomically), e.g. for the
+helper service's /metrics endpoint or a monitoring agent:
+
+- bytes and frames received, totals and per-second rates
+- resync bytes (skipped while searching for 0x80) and bad frames (0x80
+  without 0x0D terminator), counted apart
+- packet counter gaps and lost samples (needs numpy)
+- read and write queue depths, bytes, drops and blocked time
+- serial read size and write latency histograms
+
+CaptureTelemetry wraps the read and write stages of a CapturePipeline,
+so the capture code itself is unchanged:
+
+    telemetry = CaptureTelemetry("port4", 19, labels={'port': "COM4"})
+    pipeline = CapturePipeline(telemetry.wrap_read(reader.read), parse,
+                               telemetry.wrap_write(write))
+    telemetry.attach(framer=framer, pipeline=pipeline)
+    publisher = TelemetryPublisher(stats_path, [telemetry]).start()
+    ...
+    publisher.stop()
+
+Author: Jnana Phani A (https://phani.zenithtek.in)
+Organization: Zenith Tek (https://zenithtek.in)
+"""
+
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from bisect import bisect_left
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Union
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from gap_analysis import GapAnalyzer
+except ImportError as e:
+    print(f"Error: Could not import capture modules: {e}")
+    sys.exit(1)
+
+logger = logging.getLogger(__name__)
+
+# Constants
+STATS_FILE_NAME = "capture_stats.json"
+STATS_VERSION = 1
+DEFAULT_STATS_INTERVAL = 5.0
+# Histogram upper bounds (inclusive, Prometheus "le")
+WRITE_LATENCY_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0)
+READ_SIZE_BUCKETS = (16, 64, 256, 1024, 4096, 16384, 65536)
+
+
+class Histogram:
+    """Fixed-bucket histogram with Prometheus-style cumulative output."""
+
+    def __init__(self, bounds: Sequence[float]):
+        """
+        Initialize histogram.
+
+        Args:
+            bounds: Increasing bucket upper bounds; an overflow bucket is added
+        """
+        self.bounds = tuple(bounds)
+        if list(self.bounds) != sorted(set(self.bounds)):
+            raise ValueError(f"Histogram bounds must be increasing: {bounds}")
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        """Record one value."""
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def snapshot(self) -> Dict:
+        """
+        Get the histogram as a JSON serializable dict.
+
+        Returns:
+            Dict with 'buckets' ([upper bound, cumulative count] pairs, the
+            last bound "+Inf"), 'count', 'sum' and 'max'
+        """
+        buckets = []
+        total = 0
+        for bound, count in zip(self.bounds + ("+Inf",), self.counts):
+            total += count
+            buckets.append([bound, total])
+        return {'buckets': buckets, 'count': self.count, 'sum': self.sum, 'max': self.max}
+
+
+def _packet_counters(frames, packet_size: int):
+    """Packet counters of back-to-back frames as a numpy array."""
+    data = np.frombuffer(frames, dtype=np.uint8)
+    if packet_size == 13:
+        return data[2::13] & 0b11
+    return (data[14::19].astype(np.uint16) << 8) | data[15::19]
+
+
+class CaptureTelemetry:
+    """Live metrics of one capture (one serial port).
+
+    Read-stage counters are updated on the reader thread and write-stage
+    counters on the writer thread; snapshot() may run on any thread.
+
+    Attributes:
+        name: Capture name (e.g. "port4")
+        labels: Extra labels published with the metrics (e.g. port, baud)
+        read_sizes: Histogram of bytes per serial read
+        write_latency: Histogram of seconds per written batch
+    """
+
+    def __init__(self, name: str, packet_size: int, labels: Optional[Dict[str, str]] = None):
+        """
+        Initialize telemetry.
+
+        Args:
+            name: Capture name
+            packet_size: Packet size (13 or 19 bytes)
+            labels: Extra labels published with the metrics
+        """
+        self.name = name
+        self.packet_size = packet_size
+        self.labels = {key: str(value) for key, value in (labels or {}).items()}
+        self.read_sizes = Histogram(READ_SIZE_BUCKETS)
+        self.write_latency = Histogram(WRITE_LATENCY_BUCKETS)
+        self.read_calls = 0
+        self.empty_reads = 0
+        self.bytes_read = 0
+        self.frames_written = 0
+        self.batches_written = 0
+        self.framer = None
+        self.pipeline = None
+        # Counter gaps need numpy; reported as None without it
+        self.gaps = GapAnalyzer(packet_size) if np is not None else None
+        self._started = time.monotonic()
+        self._last_sample = (self._started, 0, 0)
+
+    def attach(self, framer=None, pipeline=None) -> "CaptureTelemetry":
+        """
+        Attach the framer (resync and bad frame counts) and the pipeline
+        (queue stats) of the capture.
+        """
+        if framer is not None:
+            self.framer = framer
+        if pipeline is not None:
+            self.pipeline = pipeline
+        return self
+
+    def wrap_read(self, read: Callable[[], bytes]) -> Callable[[], bytes]:
+        """Wrap a reader stage to count reads and read sizes."""
+        def instrumented_read() -> bytes:
+            data = read()
+            self.read_calls += 1
+            if data:
+                self.bytes_read += len(data)
+                self.read_sizes.observe(len(data))
+            else:
+                self.empty_reads += 1
+            return data
+        return instrumented_read
+
+    def wrap_write(self, write: Callable[[bytes, object], object]) -> Callable[[bytes, object], object]:
+        """Wrap a writer stage to time batches and track packet counters."""
+        def instrumented_write(frames: bytes, payload):
+            started = time.perf_counter()
+            result = write(frames, payload)
+            self.write_latency.observe(time.perf_counter() - started)
+            self.batches_written += 1
+            self.frames_written += len(frames) // self.packet_size
+            if self.gaps is not None and frames:
+                self.gaps.update(_packet_counters(frames, self.packet_size))
+            return result
+        return instrumented_write
+
+    def snapshot(self) -> Dict:
+        """
+        Get all metrics as a JSON serializable dict.
+
+        Rates cover the time since the previous snapshot.
+
+        Returns:
+            Metrics dict
+        """
+        now = time.monotonic()
+        bytes_read, frames = self.bytes_read, self.frames_written
+        last_time, last_bytes, last_frames = self._last_sample
+        self._last_sample = (now, bytes_read, frames)
+        window = now - last_time
+
+        stats = {
+            'name': self.name,
+            'labels': self.labels,
+            'packet_size': self.packet_size,
+            'uptime_seconds': round(now - self._started, 3),
+            'bytes_read': bytes_read,
+            'bytes_per_second': (bytes_read - last_bytes) / window if window > 0 else 0.0,
+            'frames': frames,
+            'frames_per_second': (frames - last_frames) / window if window > 0 else 0.0,
+            'resync_bytes': self.framer.resync_bytes if self.framer else None,
+            'bad_frames': self.framer.bad_frames if self.framer else None,
+            'counter_gaps': self.gaps.gap_count if self.gaps else None,
+            'lost_samples': self.gaps.lost_samples if self.gaps else None,
+            'read_calls': self.read_calls,
+            'empty_reads': self.empty_reads,
+            'batches_written': self.batches_written,
+            'read_size_bytes': self.read_sizes.snapshot(),
+            'write_latency_seconds': self.write_latency.snapshot(),
+            'queues': {},
+        }
+        if self.pipeline is not None:
+            stats['queues'] = {
+                'read': self.pipeline.read_queue.stats(),
+                'write': self.pipeline.write_queue.stats(),
+            }
+        return stats
+
+
+class TelemetryPublisher:
+    """Rewrite a JSON stats file for a set of captures periodically.
+
+    The file is replaced atomically (temporary file + rename), so readers
+    never see a partial document. Its 'status' is "running" while the
+    publisher runs and "stopped" after stop().
+    """
+
+    def __init__(self, path: Union[str, Path], sources: List[CaptureTelemetry],
+                 interval: float = DEFAULT_STATS_INTERVAL):
+        """
+        Initialize publisher.
+
+        Args:
+            path: Stats file path
+            sources: Captures to publish
+            interval: Seconds between updates
+        """
+        if interval <= 0:
+            raise ValueError(f"Invalid stats interval: {interval}")
+        self.path = Path(path)
+        self.sources = sources
+        self.interval = interval
+        self.write_count = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "TelemetryPublisher":
+        """Write the first stats file and start the update thread."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.write("running")
+        self._thread = threading.Thread(target=self._run, name="capture-telemetry", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the update thread and write the final stats."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.write("stopped")
+
+    def write(self, status: str = "running") -> Path:
+        """
+        Write the stats file now.
+
+        Args:
+            status: Capture status recorded in the file
+
+        Returns:
+            Stats file path
+        """
+        document = {
+            'version': STATS_VERSION,
+            'status': status,
+            'pid': os.getpid(),
+            'updated': datetime.now().isoformat(timespec='milliseconds'),
+            'updated_unix': time.time(),
+            'interval_seconds': self.interval,
+            'captures': [source.snapshot() for source in self.sources],
+        }
+        temp_file = self.path.with_name(self.path.name + ".tmp")
+        with open(temp_file, 'w') as f:
+            json.dump(document, f, indent=2)
+        os.replace(temp_file, self.path)
+        self.write_count += 1
+        return self.path
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.write()
+            except OSError as e:
+                # A full or unavailable disk must not stop the capture
+                logger.warning(f"Could not write capture stats: {e}")
+
+
+def read_stats(path: Union[str, Path]) -> Dict:
+    """
+    Read a capture stats file.
+
+    Args:
+        path: Stats file path
+
+    Returns:
+        Stats document
+    """
+    with open(path, 'r') as f:
+        document = json.load(f)
+    if document.get('version') != STATS_VERSION:
+        raise ValueError(f"Unsupported capture stats version: {document.get('version')}")
+    return document
@@ -12,12 +12,12 @@ Organization: Zenith Tek (https://zenithtek.in)
 import argparse
 # import csv  # COMMENTED OUT - No CSV file
 import logging
+import os
 import sys
 import time
-from collections import deque
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Tuple
 # from typing import Dict  # COMMENTED OUT - No parsing
 
 try:
@@ -26,6 +26,28 @@ except ImportError:
     print("Error: Could not import sensor_comm module")
     sys.exit(1)
 
+try:
+    from capture_pipeline import DEFAULT_QUEUE_BYTES, OVERFLOW_POLICIES, CapturePipeline
+    from capture_telemetry import (
+        DEFAULT_STATS_INTERVAL,
+        STATS_FILE_NAME,
+        CaptureTelemetry,
+        TelemetryPublisher,
+    )
+    from flush_policy import (
+        DEFAULT_FLUSH_BYTES,
+        DEFAULT_FLUSH_INTERVAL,
+        WRITE_BUFFER_SIZE,
+        FlushController,
+        FlushPolicy,
+        flush_marker_path,
+    )
+    from packet_framer import PacketFramer
+    from serial_reader import READ_MODES, SerialReader
+except ImportError as e:
+    print(f"Error: Could not import capture modules: {e}")
+    sys.exit(1)
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -188,7 +210,11 @@ logger = logging.getLogger(__name__)
 class DisplacementDataCollector:
     """Collect and save displacement data from sensor."""
     
-    def __init__(self, port: str, baud: int = 460800, output_dir: str = "data"):
+    def __init__(self, port: str, baud: int = 460800, output_dir: str = "data",
+                 queue_bytes: int = DEFAULT_QUEUE_BYTES, overflow: str = "block",
+                 flush_policy: Optional[FlushPolicy] = None, read_mode: str = "blocking",
+                 stats_path: Optional[str] = None,
+                 stats_interval: Optional[float] = DEFAULT_STATS_INTERVAL):
         """
         Initialize data collector.
         
@@ -196,11 +222,31 @@ class DisplacementDataCollector:
             port: Serial port path
             baud: Baud rate (460800 or 921600)
             output_dir: Directory to save CSV files
+            queue_bytes: Byte bound of each capture pipeline queue
+            overflow: Read queue overflow policy: "block", "drop-oldest"
+                      or "drop-newest"
+            flush_policy: When the raw file is flushed and fsynced
+                          (default: FlushPolicy())
+            read_mode: Serial read mode: "blocking", "select" or "poll"
+            stats_path: Capture stats JSON file (default: capture_stats.json
+                        in output_dir)
+            stats_interval: Seconds between stats file updates (None or 0:
+                            no stats file)
         """
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unsupported overflow policy: {overflow}")
         self.port = port
         self.baud = baud
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.queue_bytes = queue_bytes
+        self.overflow = overflow
+        self.flush_policy = flush_policy or FlushPolicy()
+        if read_mode not in READ_MODES:
+            raise ValueError(f"Unsupported read mode: {read_mode}")
+        self.read_mode = read_mode
+        self.stats_path = Path(stats_path) if stats_path else self.output_dir / STATS_FILE_NAME
+        self.stats_interval = stats_interval or None
         
         # Determine packet size based on baud rate
         if baud == 460800:
@@ -213,12 +259,19 @@ class DisplacementDataCollector:
             raise ValueError(f"Unsupported baud rate: {baud}. Use 460800 or 921600")
         
         self.comm: Optional[SensorCommunication] = None
+        self.framer = PacketFramer(self.packet_size)
+        self.pipeline: Optional[CapturePipeline] = None
+        self.flusher: Optional[FlushController] = None
         # self.csv_file = None  # COMMENTED OUT - No CSV file
         # self.csv_writer = None  # COMMENTED OUT - No CSV writer
         self.raw_file = None
         # self.packet_count = 0  # COMMENTED OUT - No parsed packets
         self.raw_packet_count = 0  # Total raw packets saved
         self.error_count = 0
+        # Live metrics; the capture stages are wrapped in collect_data()
+        self.telemetry = CaptureTelemetry(
+            "displacement", self.packet_size, labels={'port': port, 'baud': baud}
+        ).attach(framer=self.framer)
         
     def open(self):
         """Open serial connection."""
@@ -235,6 +288,10 @@ class DisplacementDataCollector:
         # if self.csv_file:  # COMMENTED OUT
         #     self.csv_file.close()
         #     self.csv_file = None
+        if self.flusher:
+            # Final flush and marker before the file is closed
+            self.flusher.close()
+            self.flusher = None
         if self.raw_file:
             self.raw_file.close()
             self.raw_file = None
@@ -260,7 +317,14 @@ class DisplacementDataCollector:
         raw_path = self.output_dir / raw_filename
         
         # Open raw data file (hex-encoded text format, no headers)
-        self.raw_file = open(raw_path, 'w')
+        self.raw_file = open(raw_path, 'w', buffering=WRITE_BUFFER_SIZE)
+        self.flusher = FlushController(
+            self.flush_policy, [self.raw_file],
+            marker_path=flush_marker_path(raw_path),
+            state=lambda: {'packet_size': self.packet_size,
+                           'raw_packets': self.raw_packet_count,
+                           'errors': self.error_count}
+        )
         
         # CSV file setup COMMENTED OUT
         # csv_path = self.output_dir / f"{base_name}_parsed.csv"
@@ -283,10 +347,88 @@ class DisplacementDataCollector:
         logger.info(f"Raw data file opened: {raw_path}")
         return raw_path
     
+    def frame_data(self, data: bytes) -> Optional[Tuple[bytes, str]]:
+        """
+        Frame received bytes and format complete packets as hex lines
+        (capture parser stage).
+        
+        Args:
+            data: Bytes received from the sensor
+        
+        Returns:
+            Tuple of (frames, hex text), or None if no packet is complete
+        """
+        self.framer.feed(data)
+        batches = [bytes(batch) for batch in self.framer.frames()]
+        self.error_count = self.framer.error_count
+        if not batches:
+            return None
+        frames = batches[0] if len(batches) == 1 else b''.join(batches)
+        size = self.packet_size
+        # Raw packet data only (hex bytes, no metadata)
+        text = ''.join(
+            f"{frames[i:i + size].hex(' ').upper()}\n"
+            for i in range(0, len(frames), size)
+        )
+        
+        # PARSING LOGIC COMMENTED OUT (per packet in frames)
+        # timestamp = datetime.now().isoformat()
+        # data = self.parse_func(packet)
+        # if data:
+        #     data['timestamp'] = timestamp
+        #     data['elapsed_time'] = elapsed
+        #     self.csv_writer.writerow(data)
+        #     self.csv_file.flush()
+        #     self.packet_count += 1
+        return frames, text
+    
+    def write_batch(self, frames: bytes, text: str) -> int:
+        """
+        Save formatted packets (capture writer stage).
+        
+        Args:
+            frames: Whole packets back to back
+            text: Hex lines from frame_data()
+        
+        Returns:
+            Number of packets saved
+        """
+        self.raw_file.write(text)
+        count = len(frames) // self.packet_size
+        self.raw_packet_count += count
+        # Flush when the flush policy says so
+        self.flusher.written(len(frames))
+        return count
+    
+    def flush_idle(self) -> None:
+        """Time-based flush while no data arrives (capture writer idle hook)."""
+        if self.flusher:
+            self.flusher.tick()
+    
+    def process_data(self, data: bytes) -> int:
+        """
+        Frame received bytes and save all complete packets.
+        
+        Single-threaded equivalent of the capture pipeline.
+        
+        Args:
+            data: Bytes received from the sensor
+        
+        Returns:
+            Number of packets saved
+        """
+        batch = self.frame_data(data)
+        if batch is None:
+            return 0
+        return self.write_batch(*batch)
+    
     def collect_data(self, duration: float, wait_init: float = 2.0):
         """
         Collect displacement data for specified duration.
         
+        Serial reads, framing and file output run on separate threads
+        joined by bounded queues (see capture_pipeline).
+        
         Args:
             duration: Collection duration in seconds
             wait_init: Wait time for sensor initialization (default 2.0s)
@@ -301,84 +443,89 @@ class DisplacementDataCollector:
         logger.info(f"Waiting {wait_init} seconds for sensor initialization...")
         time.sleep(wait_init)
         
-        buffer = deque()
         start_time = time.time()
         last_log_time = start_time
         
         logger.info("Collecting data...")
         logger.info("Press Ctrl+C to stop early")
         
+        reader = SerialReader(self.comm.connection, self.baud, mode=self.read_mode)
+        telemetry = self.telemetry
+        self.pipeline = CapturePipeline(
+            telemetry.wrap_read(reader.read), self.frame_data, telemetry.wrap_write(self.write_batch),
+            queue_bytes=self.queue_bytes, overflow=self.overflow,
+            # Time-based flushes also while the link is idle
+            idle=self.flush_idle
+        )
+        telemetry.attach(pipeline=self.pipeline)
+        publisher = None
+        if self.stats_interval:
+            publisher = TelemetryPublisher(self.stats_path, [telemetry], self.stats_interval).start()
+            logger.info(f"Capture stats: {self.stats_path} (every {self.stats_interval:g}s)")
+        self.pipeline.start()
         try:
-            while time.time() - start_time < duration:
+            while self.pipeline.running:
                 current_time = time.time()
                 elapsed = current_time - start_time
+                if elapsed >= duration:
+                    break
                 
-                # Read available bytes
-                if self.comm.connection.in_waiting > 0:
-                    new_data = self.comm.connection.read(self.comm.connection.in_waiting)
-                    buffer.extend(new_data)
-                
-                # Process complete packets
-                while len(buffer) >= self.packet_size:
-                    # Find packet start (0x80)
-                    if buffer[0] != 0x80:
-                        buffer.popleft()
-                        self.error_count += 1
-                        continue
-                    
-                    # Extract packet
-                    if len(buffer) >= self.packet_size:
-                        packet = [buffer.popleft() for _ in range(self.packet_size)]
-                        
-                        # Verify packet end
-                        if packet[-1] == 0x0D:
-                            # Save raw packet data (only hex bytes, no metadata)
-                            hex_bytes = ' '.join(f'{b:02X}' for b in packet)
-                            self.raw_file.write(f"{hex_bytes}\n")
-                            self.raw_file.flush()
-                            self.raw_packet_count += 1
-                            
-                            # PARSING LOGIC COMMENTED OUT
-                            # timestamp = datetime.now().isoformat()
-                            # data = self.parse_func(packet)
-                            # if data:
-                            #     data['timestamp'] = timestamp
-                            #     data['elapsed_time'] = elapsed
-                            #     self.csv_writer.writerow(data)
-                            #     self.csv_file.flush()
-                            #     self.packet_count += 1
-                            
-                            # Log progress every second
-                            if current_time - last_log_time >= 1.0:
-                                rate = self.raw_packet_count / elapsed if elapsed > 0 else 0
-                                logger.info(
-                                    f"Elapsed: {elapsed:.1f}s | "
-                                    f"Packets: {self.raw_packet_count} | "
-                                    f"Rate: {rate:.1f} pkt/s | "
-                                    f"Errors: {self.error_count}"
-                                )
-                                last_log_time = current_time
-                        else:
-                            # Packet corruption
-                            self.error_count += 1
-                    else:
-                        break
+                # Log progress every second
+                if current_time - last_log_time >= 1.0:
+                    rate = self.raw_packet_count / elapsed if elapsed > 0 else 0
+                    logger.info(
+                        f"Elapsed: {elapsed:.1f}s | "
+                        f"Packets: {self.raw_packet_count} | "
+                        f"Rate: {rate:.1f} pkt/s | "
+                        f"Resync: {self.framer.resync_bytes} B | "
+                        f"Bad frames: {self.framer.bad_frames} | "
+                        f"Queued: {self.pipeline.read_queue.queued_bytes // 1024} KB"
+                        f"/{self.pipeline.write_queue.queued_bytes // 1024} KB"
+                    )
+                    last_log_time = current_time
                 
-                # Small delay to prevent CPU spinning
-                time.sleep(0.001)
+                time.sleep(min(0.1, duration - elapsed))
         
         except KeyboardInterrupt:
             logger.info("\nCollection interrupted by user")
+        finally:
+            # Stop reading, then drain the queues to disk
+            self.pipeline.stop()
+            reader.close()
+            if publisher:
+                publisher.stop()
         
         total_time = time.time() - start_time
         logger.info("\n" + "="*60)
         logger.info("Collection Summary:")
         logger.info(f"  Total time: {total_time:.2f} seconds")
         logger.info(f"  Raw packets saved: {self.raw_packet_count}")
-        logger.info(f"  Errors: {self.error_count}")
+        logger.info(f"  Errors: {self.error_count} "
+                    f"({self.framer.resync_bytes} resync bytes, {self.framer.bad_frames} bad frames)")
+        if telemetry.gaps is not None:
+            logger.info(f"  Counter gaps: {telemetry.gaps.gap_count} "
+                        f"({telemetry.gaps.lost_samples} lost samples)")
         if total_time > 0:
             logger.info(f"  Average rate: {self.raw_packet_count/total_time:.2f} packets/second")
+        logger.info(f"  Serial reads: {reader.reads} ({reader.mode}), "
+                    f"timeouts: {reader.timeouts}")
+        read_queue = self.pipeline.read_queue
+        logger.info(f"  Queue peak: read {read_queue.peak_bytes // 1024} KB, "
+                    f"write {self.pipeline.write_queue.peak_bytes // 1024} KB")
+        latency = telemetry.write_latency
+        if latency.count:
+            logger.info(f"  Write latency: mean {latency.sum / latency.count * 1000:.2f} ms, "
+                        f"max {latency.max * 1000:.1f} ms over {latency.count} batches")
+        if read_queue.blocked_seconds:
+            logger.info(f"  Reader blocked: {read_queue.blocked_seconds:.2f} seconds")
+        if read_queue.dropped_count:
+            logger.warning(f"  Dropped on overflow: {read_queue.dropped_bytes} bytes "
+                           f"in {read_queue.dropped_count} reads ({self.overflow})")
+        logger.info(f"  Flushes: {self.flusher.flush_count} "
+                    f"(slowest {self.flusher.max_flush_seconds * 1000:.1f} ms), "
+                    f"fsyncs: {self.flusher.fsync_count}")
         logger.info("="*60)
+        self.pipeline.raise_error()
 
 
 # ============================================================================
@@ -400,6 +547,15 @@ Examples:
   
   # Collect data with custom output directory
   python collect_displacement_data.py COM3 --duration 120 --output-dir ./my_data
+  
+  # Buffer up to 64 MB between reader and writer, dropping old data if full
+  python collect_displacement_data.py COM3 --queue-mb 64 --overflow drop-oldest
+  
+  # Publish capture stats for monitoring every 2 seconds
+  python collect_displacement_data.py COM3 --stats-file ~/.zenith_helper/captures/com3.json --stats-interval 2
+  
+  # Flush every 5 seconds or 4 MB and fsync every 30 seconds
+  python collect_displacement_data.py COM3 --flush-interval 5 --flush-kb 4096 --fsync-interval 30
         """
     )
     
@@ -438,6 +594,67 @@ Examples:
              'Will create: <name>.txt'
     )
     
+    parser.add_argument(
+        '--queue-mb',
+        type=float,
+        default=DEFAULT_QUEUE_BYTES / (1024 * 1024),
+        help='Size of each capture queue in MB (default: %(default)g)'
+    )
+    
+    parser.add_argument(
+        '--overflow',
+        type=str,
+        default='block',
+        choices=list(OVERFLOW_POLICIES),
+        help='When the read queue is full: block the reader (backpressure), '
+             'or drop the oldest / newest data (default: block)'
+    )
+    
+    parser.add_argument(
+        '--read-mode',
+        type=str,
+        default='blocking',
+        choices=list(READ_MODES),
+        help='Serial reads: blocking reads with a short timeout, select on the '
+             'port (POSIX), or poll in_waiting every 1 ms (default: blocking)'
+    )
+    
+    parser.add_argument(
+        '--flush-interval',
+        type=float,
+        default=DEFAULT_FLUSH_INTERVAL,
+        help='Seconds between output file flushes (default: %(default)g)'
+    )
+    
+    parser.add_argument(
+        '--flush-kb',
+        type=int,
+        default=DEFAULT_FLUSH_BYTES // 1024,
+        help='Packet data in KB written between flushes (default: %(default)d)'
+    )
+    
+    parser.add_argument(
+        '--fsync-interval',
+        type=float,
+        default=None,
+        help='Seconds between fsyncs to disk, 0 for every flush (default: off)'
+    )
+    
+    parser.add_argument(
+        '--stats-file',
+        type=str,
+        default=None,
+        help='Capture stats JSON file, e.g. in the helper service stats directory '
+             '(default: capture_stats.json in the output directory)'
+    )
+    
+    parser.add_argument(
+        '--stats-interval',
+        type=float,
+        default=DEFAULT_STATS_INTERVAL,
+        help='Seconds between capture stats updates, 0 to disable (default: %(default)g)'
+    )
+    
     parser.add_argument(
         '--wait-init',
         type=float,
@@ -460,7 +677,13 @@ Examples:
     collector = DisplacementDataCollector(
         port=args.port,
         baud=args.baud,
-        output_dir=args.output_dir
+        output_dir=args.output_dir,
+        queue_bytes=int(args.queue_mb * 1024 * 1024),
+        overflow=args.overflow,
+        flush_policy=FlushPolicy(args.flush_interval, args.flush_kb * 1024, args.fsync_interval),
+        read_mode=args.read_mode,
+        stats_path=os.path.expanduser(args.stats_file) if args.stats_file else None,
+        stats_interval=args.stats_interval
     )
     
     try:
@@ -0,0 +1,703 @@
+#!/usr/bin/env python3
+"""
+Multi-Port Vibration Data Collection Script
+
+This script collects raw vibration data from several M-A542VR1 sensors in
+auto-start mode in one process. Every port gets its own serial reader and
+parser thread; file output runs on a small pool of shared writer threads.
+
+All ports write into one collection directory:
+
+    vibration_collection_<timestamp>/
+        manifest.json       ports, files, settings, per-port stats and
+                            the timebase anchor
+        raw_data/           raw file (or segments and their manifest),
+                            flush marker and timebase per port
+        parsed_data/        parsed file(s) per port
+
+Each port's timebase file maps packet indices to the host monotonic clock
+(time.monotonic_ns() right after the serial read that completed the
+packet). All ports share that clock, so streams can be aligned later by
+interpolating between timebase rows; the manifest records one
+monotonic/wall-clock pair to convert to absolute time.
+
+Author: Jnana Phani A (https://phani.zenithtek.in)
+Organization: Zenith Tek (https://zenithtek.in)
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Tuple
+
+try:
+    from collect_raw_vibration_data import SENSOR_MODEL, RawVibrationDataCollector, sensor_identity
+except ImportError:
+    print("Error: Could not import collect_raw_vibration_data module")
+    sys.exit(1)
+
+try:
+    from capture_pipeline import DEFAULT_QUEUE_BYTES, OVERFLOW_POLICIES, CapturePipeline, WriterPool
+    from capture_segments import RotationPolicy
+    from capture_telemetry import DEFAULT_STATS_INTERVAL, STATS_FILE_NAME, TelemetryPublisher
+    from flush_policy import (
+        DEFAULT_FLUSH_BYTES,
+        DEFAULT_FLUSH_INTERVAL,
+        WRITE_BUFFER_SIZE,
+        FlushPolicy,
+        flush_marker_path,
+    )
+    from serial_reader import READ_MODES, SerialReader
+except ImportError as e:
+    print(f"Error: Could not import capture modules: {e}")
+    sys.exit(1)
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Constants
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+TIMEBASE_PREFIX = "vibration_timebase_"
+TIMEBASE_HEADER = "packet_index,host_monotonic_ns\n"
+DEFAULT_WRITERS = 2
+
+
+def parse_port_spec(spec: str, default_baud: int) -> Tuple[str, int]:
+    """
+    Parse a PORT or PORT@BAUD argument.
+
+    Args:
+        spec: Port, optionally followed by @ and a baud rate
+        default_baud: Baud rate when none is given
+
+    Returns:
+        Tuple of (port, baud)
+    """
+    if '@' in spec:
+        port, baud = spec.rsplit('@', 1)
+        try:
+            return port, int(baud)
+        except ValueError:
+            raise ValueError(f"Invalid baud rate in port spec: {spec}")
+    return spec, default_baud
+
+
+class PortCapture:
+    """One port of a multi-port capture: collector, reader and pipeline."""
+
+    def __init__(self, collector: RawVibrationDataCollector):
+        """
+        Initialize port capture.
+
+        Args:
+            collector: Collector for this port (files set up by the owner)
+        """
+        self.collector = collector
+        self.reader: Optional[SerialReader] = None
+        self.pipeline: Optional[CapturePipeline] = None
+        self.raw_path: Optional[Path] = None
+        self.parsed_path: Optional[Path] = None
+        self.timebase_path: Optional[Path] = None
+        self.timebase_file = None
+        self.first_read_ns: Optional[int] = None
+        self.last_read_ns: Optional[int] = None
+
+    def open_timebase(self) -> Path:
+        """Create the timebase file next to the raw data file(s)."""
+        collector = self.collector
+        self.timebase_path = self.raw_path.with_name(f"{TIMEBASE_PREFIX}{collector.file_stem}.csv")
+        self.timebase_file = open(self.timebase_path, 'w', buffering=WRITE_BUFFER_SIZE)
+        self.timebase_file.write(TIMEBASE_HEADER)
+        # Flushed together with the raw and parsed files of every segment
+        collector.extra_outputs.append(self.timebase_file)
+        collector.flusher.outputs.append(self.timebase_file)
+        return self.timebase_path
+
+    def frame_data(self, data: bytes, timestamp: int):
+        """Parser stage: frame and parse, keeping the host read time."""
+        batch = self.collector.frame_data(data)
+        if batch is None:
+            return None
+        frames, rows = batch
+        return frames, (rows, timestamp)
+
+    def write_batch(self, frames: bytes, payload) -> int:
+        """Writer stage: save the batch and one timebase row."""
+        rows, timestamp = payload
+        count = self.collector.write_batch(frames, rows)
+        if self.first_read_ns is None:
+            self.first_read_ns = timestamp
+        self.last_read_ns = timestamp
+        # Host time of the read that completed the batch's last packet
+        self.timebase_file.write(f"{self.collector.raw_packet_count - 1},{timestamp}\n")
+        return count
+
+    def close(self) -> None:
+        """Close the collector (final flush) and the timebase file."""
+        self.collector.close()
+        if self.timebase_file:
+            self.timebase_file.close()
+            self.timebase_file = None
+
+    def stats(self) -> Dict:
+        """Get per-port counters."""
+        collector = self.collector
+        stats = {
+            'raw_packets': collector.raw_packet_count,
+            'parsed_rows': collector.parsed_packet_count,
+            'errors': collector.error_count,
+            'checksum_errors': collector.checksum_error_count,
+            'first_read_ns': self.first_read_ns,
+            'last_read_ns': self.last_read_ns,
+        }
+        if self.first_read_ns is not None and self.last_read_ns > self.first_read_ns:
+            span = (self.last_read_ns - self.first_read_ns) / 1e9
+            stats['packets_per_second'] = collector.raw_packet_count / span
+        if self.reader is not None:
+            stats['reader'] = self.reader.stats()
+        if self.pipeline is not None:
+            stats['read_bytes'] = self.pipeline.read_bytes
+            stats['read_queue'] = self.pipeline.read_queue.stats()
+        return stats
+
+
+class MultiPortCollector:
+    """Collect from several sensors into one collection directory."""
+
+    def __init__(self, ports: Sequence[Tuple[str, int]], output_base_dir: str = ".",
+                 output_type: str = "displacement", raw_format: str = "csv",
+                 parsed_format: str = "csv", checksum: str = "drop",
+                 queue_bytes: int = DEFAULT_QUEUE_BYTES, overflow: str = "block",
+                 flush_policy: Optional[FlushPolicy] = None, read_mode: str = "blocking",
+                 writers: int = DEFAULT_WRITERS, rotation: Optional[RotationPolicy] = None,
+                 stats_path: Optional[str] = None,
+                 stats_interval: Optional[float] = DEFAULT_STATS_INTERVAL,
+                 sensor_identities: Optional[Sequence[Dict[str, str]]] = None):
+        """
+        Initialize collector.
+
+        Args:
+            ports: (port, baud) pairs
+            output_base_dir: Base directory for the collection directory
+            output_type: "displacement" or "velocity"
+            raw_format: Raw data format, "csv" (hex text) or "binary"
+            parsed_format: Parsed data format, "csv", "npz" or "parquet"
+            checksum: Bad CHECKSUM handling for 19-byte packets
+            queue_bytes: Byte bound of each capture queue
+            overflow: Read queue overflow policy
+            flush_policy: When output files are flushed and fsynced
+            read_mode: Serial read mode: "blocking", "select" or "poll"
+            writers: Writer threads shared by all ports
+            rotation: Start new segment files by size or duration
+            stats_path: Capture stats JSON file for all ports (default:
+                        capture_stats.json in the collection directory)
+            stats_interval: Seconds between stats file updates (None or 0:
+                            no stats file)
+            sensor_identities: Sensor identity of each port, in port order,
+                               recorded in binary headers
+        """
+        if not ports:
+            raise ValueError("No ports given")
+        if sensor_identities is None:
+            sensor_identities = [{} for _ in ports]
+        if len(sensor_identities) != len(ports):
+            raise ValueError(f"Got {len(sensor_identities)} sensor identities for {len(ports)} ports")
+        names = [port for port, _ in ports]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Duplicate ports: {', '.join(names)}")
+        if read_mode not in READ_MODES:
+            raise ValueError(f"Unsupported read mode: {read_mode}")
+        self.output_base_dir = Path(output_base_dir)
+        self.queue_bytes = queue_bytes
+        self.overflow = overflow
+        self.read_mode = read_mode
+        self.writers = writers
+        self.stats_path = Path(stats_path) if stats_path else None
+        self.stats_interval = stats_interval or None
+        self.settings = {
+            'output_type': output_type.lower(),
+            'raw_format': raw_format.lower(),
+            'parsed_format': parsed_format.lower(),
+            'checksum': checksum.lower(),
+            'read_mode': read_mode,
+            'overflow': overflow,
+            'queue_bytes': queue_bytes,
+            'writers': writers,
+            'rotate_bytes': rotation.max_bytes if rotation else None,
+            'rotate_seconds': rotation.max_seconds if rotation else None,
+        }
+        self.captures = [
+            PortCapture(RawVibrationDataCollector(
+                port, baud, output_base_dir, output_type=output_type, raw_format=raw_format,
+                parsed_format=parsed_format, checksum=checksum, queue_bytes=queue_bytes,
+                overflow=overflow, flush_policy=flush_policy, read_mode=read_mode,
+                rotation=rotation, stats_interval=None, sensor_identity=identity
+            ))
+            for (port, baud), identity in zip(ports, sensor_identities)
+        ]
+        numbers = [capture.collector.port_number for capture in self.captures]
+        if len(set(numbers)) != len(numbers):
+            raise ValueError(f"Ports map to the same file names (port numbers {numbers})")
+        self.collection_dir: Optional[Path] = None
+        self.timebase_anchor: Dict[str, int] = {}
+        self.status = "created"
+        self.duration = 0.0
+
+    def open(self):
+        """Open all serial connections."""
+        for capture in self.captures:
+            capture.collector.open()
+
+    def close(self):
+        """Close all serial connections and files."""
+        for capture in self.captures:
+            capture.close()
+
+    def setup_output_directory(self) -> Path:
+        """
+        Create the collection directory and all port files.
+
+        Returns:
+            Collection directory
+        """
+        collection_timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.collection_dir = self.output_base_dir / f"vibration_collection_{collection_timestamp}"
+        raw_data_dir = self.collection_dir / "raw_data"
+        parsed_data_dir = self.collection_dir / "parsed_data"
+        raw_data_dir.mkdir(parents=True, exist_ok=True)
+        parsed_data_dir.mkdir(parents=True, exist_ok=True)
+        for capture in self.captures:
+            capture.raw_path, capture.parsed_path = capture.collector.setup_files(
+                raw_data_dir, parsed_data_dir
+            )
+            capture.open_timebase()
+        logger.info(f"Collection directory: {self.collection_dir}")
+        return self.collection_dir
+
+    def write_manifest(self) -> Path:
+        """Write the collection manifest atomically (temporary file + rename)."""
+        def relative(path: Path) -> str:
+            return path.relative_to(self.collection_dir).as_posix()
+
+        ports = []
+        for capture in self.captures:
+            collector = capture.collector
+            entry = {
+                'port': collector.port,
+                'port_number': collector.port_number,
+                'baud': collector.baud,
+                'packet_size': collector.packet_size,
+                'timebase_file': relative(capture.timebase_path),
+            }
+            if collector.segments:
+                # Files and flush markers are listed per segment
+                entry['segments_file'] = relative(collector.segments.path)
+            else:
+                entry.update({
+                    'raw_file': relative(capture.raw_path),
+                    'parsed_file': relative(capture.parsed_path),
+                    'flush_marker': relative(flush_marker_path(capture.raw_path)),
+                })
+            entry['stats'] = capture.stats()
+            ports.append(entry)
+        manifest = {
+            'version': MANIFEST_VERSION,
+            'status': self.status,
+            'updated': datetime.now().isoformat(timespec='milliseconds'),
+            'duration_seconds': self.duration,
+            'timebase': dict(self.timebase_anchor, clock='host monotonic', unit='ns'),
+            'settings': self.settings,
+            'ports': ports,
+        }
+        path = self.collection_dir / MANIFEST_NAME
+        temp_file = path.with_name(path.name + ".tmp")
+        with open(temp_file, 'w') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(temp_file, path)
+        return path
+
+    def _log_progress(self, elapsed: float) -> None:
+        for capture in self.captures:
+            collector = capture.collector
+            rate = collector.raw_packet_count / elapsed if elapsed > 0 else 0
+            logger.info(
+                f"Port {collector.port}: {collector.raw_packet_count} pkt | "
+                f"Rate: {rate:.1f} pkt/s | Resync: {collector.framer.resync_bytes} B | "
+                f"Bad frames: {collector.framer.bad_frames} | "
+                f"Queued: {capture.pipeline.read_queue.queued_bytes // 1024} KB"
+            )
+
+    def collect_data(self, duration: float, wait_init: float = 2.0):
+        """
+        Collect from all ports for the specified duration.
+
+        Args:
+            duration: Collection duration in seconds
+            wait_init: Wait time for sensor initialization (default 2.0s)
+        """
+        for capture in self.captures:
+            comm = capture.collector.comm
+            if not comm or not comm.is_open():
+                raise RuntimeError(f"Connection not open: {capture.collector.port}")
+        if self.collection_dir is None:
+            self.setup_output_directory()
+
+        logger.info(f"Starting data collection from {len(self.captures)} ports for {duration} seconds...")
+        logger.info(f"Waiting {wait_init} seconds for sensor initialization...")
+        time.sleep(wait_init)
+
+        # One monotonic/wall-clock pair converts every timebase row to absolute time
+        self.timebase_anchor = {'monotonic_ns': time.monotonic_ns(), 'unix_time_ns': time.time_ns()}
+        pool = WriterPool(self.writers, self.queue_bytes).start()
+        for capture in self.captures:
+            collector = capture.collector
+            telemetry = collector.telemetry
+            capture.reader = SerialReader(collector.comm.connection, collector.baud, mode=self.read_mode)
+            capture.pipeline = CapturePipeline(
+                telemetry.wrap_read(capture.reader.read), capture.frame_data,
+                telemetry.wrap_write(capture.write_batch),
+                queue_bytes=self.queue_bytes, overflow=self.overflow,
+                writer_pool=pool, timestamped=True, name=f"port-{collector.port_number}",
+                idle=collector.flush_idle
+            )
+            telemetry.attach(pipeline=capture.pipeline)
+        publisher = None
+        if self.stats_interval:
+            stats_path = self.stats_path or self.collection_dir / STATS_FILE_NAME
+            publisher = TelemetryPublisher(
+                stats_path, [capture.collector.telemetry for capture in self.captures],
+                self.stats_interval
+            ).start()
+            logger.info(f"Capture stats: {stats_path} (every {self.stats_interval:g}s)")
+        for capture in self.captures:
+            capture.pipeline.start()
+        self.status = "running"
+        self.write_manifest()
+
+        start_time = time.time()
+        last_log_time = start_time
+        logger.info("Collecting data...")
+        logger.info("Press Ctrl+C to stop early")
+
+        try:
+            while pool.running and all(capture.pipeline.running for capture in self.captures):
+                current_time = time.time()
+                elapsed = current_time - start_time
+                if elapsed >= duration:
+                    break
+                if current_time - last_log_time >= 1.0:
+                    self._log_progress(elapsed)
+                    last_log_time = current_time
+                time.sleep(min(0.1, duration - elapsed))
+
+        except KeyboardInterrupt:
+            logger.info("\nCollection interrupted by user")
+        finally:
+            # Stop reading, hand queued data to the writers, then drain them
+            for capture in self.captures:
+                capture.pipeline.stop()
+            pool.stop()
+            for capture in self.captures:
+                capture.reader.close()
+            if publisher:
+                publisher.stop()
+
+        self.duration = time.time() - start_time
+        failed = pool.error is not None or any(capture.pipeline.error for capture in self.captures)
+        self.status = "failed" if failed else "complete"
+
+        logger.info("\n" + "="*60)
+        logger.info("Collection Summary:")
+        logger.info(f"  Total time: {self.duration:.2f} seconds")
+        for capture in self.captures:
+            collector = capture.collector
+            stats = capture.stats()
+            logger.info(
+                f"  {collector.port} ({collector.baud} baud): "
+                f"{stats['raw_packets']} raw, {stats['parsed_rows']} parsed, "
+                f"{stats['errors']} errors"
+                + (f", {stats['checksum_errors']} checksum errors" if collector.packet_size == 19 else "")
+                + (f", {stats['packets_per_second']:.1f} packets/second"
+                   if 'packets_per_second' in stats else "")
+            )
+            dropped = capture.pipeline.read_queue.dropped_bytes
+            if dropped:
+                logger.warning(f"    Dropped on overflow: {dropped} bytes ({self.overflow})")
+        logger.info(f"  Manifest: {self.collection_dir / MANIFEST_NAME}")
+        logger.info("="*60)
+        # Final stats; flush markers are completed when the files are closed
+        self.write_manifest()
+
+        pool.raise_error()
+        for capture in self.captures:
+            capture.pipeline.raise_error()
+
+
+# ============================================================================
+# Main Function
+# ============================================================================
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(
+        description="Collect and parse raw vibration data from several M-A542VR1 sensors at once",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Collect from three sensors for 60 seconds
+  python collect_multi_port.py COM4 COM5 COM6 --duration 60
+
+  # Mixed baud rates: PORT@BAUD overrides --baud
+  python collect_multi_port.py /dev/ttyUSB0 /dev/ttyUSB1@921600 --duration 30
+
+  # Six sensors, binary raw files, four writer threads
+  python collect_multi_port.py COM3 COM4 COM5 COM6 COM7 COM8 --raw-format binary --writers 4
+
+  # Week-long capture in hourly segments
+  python collect_multi_port.py COM4 COM5 --duration 604800 --rotate-minutes 60
+
+  # Publish capture stats to the helper service stats directory
+  python collect_multi_port.py COM4 COM5 --stats-file ~/.zenith_helper/captures/line1.json
+        """
+    )
+
+    parser.add_argument(
+        'ports',
+        nargs='+',
+        help='Serial ports (e.g., COM4, /dev/ttyUSB0), optionally PORT@BAUD'
+    )
+
+    parser.add_argument(
+        '--baud',
+        type=int,
+        default=460800,
+        choices=[460800, 921600],
+        help='Baud rate of ports without @BAUD (default: 460800)'
+    )
+
+    parser.add_argument(
+        '--duration',
+        type=float,
+        default=10.0,
+        help='Collection duration in seconds (default: 10.0)'
+    )
+
+    parser.add_argument(
+        '--output-dir',
+        type=str,
+        default='.',
+        help='Base output directory (default: current directory)'
+    )
+
+    parser.add_argument(
+        '--output-type',
+        type=str,
+        default='displacement',
+        choices=['displacement', 'velocity'],
+        help='Output type: displacement or velocity (default: displacement)'
+    )
+
+    parser.add_argument(
+        '--raw-format',
+        type=str,
+        default='csv',
+        choices=['csv', 'binary'],
+        help='Raw data file format: hex csv or binary (default: csv)'
+    )
+
+    parser.add_argument(
+        '--sensor-model',
+        type=str,
+        default=SENSOR_MODEL,
+        help='Sensor model recorded in binary raw file headers (default: %(default)s)'
+    )
+
+    parser.add_argument(
+        '--serial-number',
+        nargs='+',
+        default=None,
+        help='Sensor serial numbers recorded in binary raw file headers, one per port in port order'
+    )
+
+    parser.add_argument(
+        '--parsed-format',
+        type=str,
+        default='csv',
+        choices=['csv', 'npz', 'parquet'],
+        help='Parsed data file format; npz/parquet are readable only once the capture '
+             'or segment ends (default: csv)'
+    )
+
+    parser.add_argument(
+        '--checksum',
+        type=str,
+        default='drop',
+        choices=['drop', 'flag', 'off'],
+        help='19-byte packets with a bad CHECKSUM: drop, flag or off (default: drop)'
+    )
+
+    parser.add_argument(
+        '--writers',
+        type=int,
+        default=DEFAULT_WRITERS,
+        help=f'Writer threads shared by all ports (default: {DEFAULT_WRITERS})'
+    )
+
+    parser.add_argument(
+        '--queue-mb',
+        type=float,
+        default=DEFAULT_QUEUE_BYTES / (1024 * 1024),
+        help='Size of each capture queue in MB (default: %(default)g)'
+    )
+
+    parser.add_argument(
+        '--overflow',
+        type=str,
+        default='block',
+        choices=list(OVERFLOW_POLICIES),
+        help='When a read queue is full: block the reader (backpressure), '
+             'or drop the oldest / newest data (default: block)'
+    )
+
+    parser.add_argument(
+        '--rotate-mb',
+        type=float,
+        default=None,
+        help='Start a new segment file when a raw file reaches this size in MB '
+             '(default: no size rotation)'
+    )
+
+    parser.add_argument(
+        '--rotate-minutes',
+        type=float,
+        default=None,
+        help='Start a new segment file after this many minutes (default: no time rotation)'
+    )
+
+    parser.add_argument(
+        '--read-mode',
+        type=str,
+        default='blocking',
+        choices=list(READ_MODES),
+        help='Serial reads: blocking reads with a short timeout, select on the '
+             'port (POSIX), or poll in_waiting every 1 ms (default: blocking)'
+    )
+
+    parser.add_argument(
+        '--flush-interval',
+        type=float,
+        default=DEFAULT_FLUSH_INTERVAL,
+        help='Seconds between output file flushes (default: %(default)g)'
+    )
+
+    parser.add_argument(
+        '--flush-kb',
+        type=int,
+        default=DEFAULT_FLUSH_BYTES // 1024,
+        help='Packet data in KB written between flushes (default: %(default)d)'
+    )
+
+    parser.add_argument(
+        '--fsync-interval',
+        type=float,
+        default=None,
+        help='Seconds between fsyncs to disk, 0 for every flush (default: off)'
+    )
+
+    parser.add_argument(
+        '--stats-file',
+        type=str,
+        default=None,
+        help='Capture stats JSON file for all ports, e.g. in the helper service stats '
+             'directory (default: capture_stats.json in the collection directory)'
+    )
+
+    parser.add_argument(
+        '--stats-interval',
+        type=float,
+        default=DEFAULT_STATS_INTERVAL,
+        help='Seconds between capture stats updates, 0 to disable (default: %(default)g)'
+    )
+
+    parser.add_argument(
+        '--wait-init',
+        type=float,
+        default=2.0,
+        help='Wait time for sensor initialization in seconds (default: 2.0)'
+    )
+
+    parser.add_argument(
+        '--verbose',
+        action='store_true',
+        help='Enable verbose logging'
+    )
+
+    args = parser.parse_args()
+
+    if args.verbose:
+        logging.getLogger().setLevel(logging.DEBUG)
+
+    try:
+        ports = [parse_port_spec(spec, args.baud) for spec in args.ports]
+        serial_numbers = args.serial_number or [None] * len(ports)
+        if len(serial_numbers) != len(ports):
+            raise ValueError(f"Got {len(serial_numbers)} serial numbers for {len(ports)} ports")
+        collector = MultiPortCollector(
+            ports,
+            output_base_dir=args.output_dir,
+            output_type=args.output_type,
+            raw_format=args.raw_format,
+            parsed_format=args.parsed_format,
+            checksum=args.checksum,
+            queue_bytes=int(args.queue_mb * 1024 * 1024),
+            overflow=args.overflow,
+            flush_policy=FlushPolicy(args.flush_interval, args.flush_kb * 1024, args.fsync_interval),
+            read_mode=args.read_mode,
+            writers=args.writers,
+            rotation=RotationPolicy(
+                int(args.rotate_mb * 1024 * 1024) if args.rotate_mb else None,
+                args.rotate_minutes * 60 if args.rotate_minutes else None
+            ),
+            stats_path=os.path.expanduser(args.stats_file) if args.stats_file else None,
+            stats_interval=args.stats_interval,
+            sensor_identities=[sensor_identity(args.sensor_model, serial)
+                               for serial in serial_numbers]
+        )
+    except ValueError as e:
+        logger.error(f"Error: {e}")
+        sys.exit(1)
+
+    try:
+        # Open all connections
+        collector.open()
+
+        # Collect data (files are set up in collect_data)
+        collector.collect_data(
+            duration=args.duration,
+            wait_init=args.wait_init
+        )
+
+        logger.info(f"\nData collection complete.")
+
+    except KeyboardInterrupt:
+        logger.info("\nInterrupted by user")
+        sys.exit(0)
+    except Exception as e:
+        logger.error(f"Error: {e}", exc_info=True)
+        sys.exit(1)
+    finally:
+        collector.close()
+
+
+if __name__ == "__main__":
+    main()
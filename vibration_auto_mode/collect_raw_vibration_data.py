@@ -11,14 +11,13 @@ Organization: Zenith Tek (https://zenithtek.in)
 """
 
 import argparse
-import csv
 import logging
+import os
 import sys
 import time
-from collections import deque
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 try:
     from sensor_comm import SensorCommunication
@@ -26,6 +25,32 @@ except ImportError:
     print("Error: Could not import sensor_comm module")
     sys.exit(1)
 
+try:
+    from capture_pipeline import DEFAULT_QUEUE_BYTES, OVERFLOW_POLICIES, CapturePipeline
+    from capture_segments import SEGMENT_NAME_FORMAT, SEGMENTS_SUFFIX, RotationPolicy, SegmentManifest
+    from capture_telemetry import (
+        DEFAULT_STATS_INTERVAL,
+        STATS_FILE_NAME,
+        CaptureTelemetry,
+        TelemetryPublisher,
+    )
+    from flush_policy import (
+        DEFAULT_FLUSH_BYTES,
+        DEFAULT_FLUSH_INTERVAL,
+        WRITE_BUFFER_SIZE,
+        FlushController,
+        FlushPolicy,
+        flush_marker_path,
+    )
+    from packet_framer import PacketFramer
+    from serial_reader import READ_MODES, SerialReader
+    from raw_capture import BINARY_EXTENSION, BinaryCaptureWriter
+    from output_writers import FLUSHABLE_FORMATS, OUTPUT_EXTENSIONS, create_writer
+    from parse_vibration_data import get_fieldnames, verify_checksum_19byte
+except ImportError as e:
+    print(f"Error: Could not import capture modules: {e}")
+    sys.exit(1)
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -33,6 +58,10 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Constants
+# Sensor model recorded in binary capture headers unless --sensor-model is given
+SENSOR_MODEL = "M-A542VR1"
+
 
 # ============================================================================
 # Parsing Functions (from datasheet and DISPLACEMENT_PARSING_GUIDE.md)
@@ -74,11 +103,37 @@ def to_dec24(b1: int, b2: int, b3: int) -> float:
     return (msb2 & 0b10) * -1 + (msb2 & 0b01) + dec / 2**22
 
 
+def sensor_identity(model: Optional[str] = SENSOR_MODEL,
+                    serial_number: Optional[str] = None) -> Dict[str, str]:
+    """
+    Build the sensor identity recorded in binary capture headers.
+    
+    PROD_ID and SERIAL_NUM cannot be read while the sensor is in UART
+    Auto sampling (datasheet Table 5.2), so they come from the command line.
+    
+    Args:
+        model: Product ID, e.g. "M-A542VR1"
+        serial_number: Serial number printed on the sensor
+    
+    Returns:
+        Dictionary with the given product_id and serial_number
+    """
+    identity = {'product_id': model, 'serial_number': serial_number}
+    return {key: value for key, value in identity.items() if value}
+
+
 class RawVibrationDataCollector:
     """Collect, parse and save raw vibration data from sensor."""
     
     def __init__(self, port: str, baud: int = 460800, output_base_dir: str = ".", 
-                 output_type: str = "displacement"):
+                 output_type: str = "displacement", raw_format: str = "csv",
+                 sensor_identity: Optional[Dict[str, str]] = None,
+                 parsed_format: str = "csv", checksum: str = "drop",
+                 queue_bytes: int = DEFAULT_QUEUE_BYTES, overflow: str = "block",
+                 flush_policy: Optional[FlushPolicy] = None, read_mode: str = "blocking",
+                 rotation: Optional[RotationPolicy] = None,
+                 stats_path: Optional[str] = None,
+                 stats_interval: Optional[float] = DEFAULT_STATS_INTERVAL):
         """
         Initialize data collector.
         
@@ -87,11 +142,54 @@ class RawVibrationDataCollector:
             baud: Baud rate (460800 or 921600)
             output_base_dir: Base directory for output files
             output_type: "displacement" or "velocity"
+            raw_format: Raw data format, "csv" (hex text) or "binary"
+            sensor_identity: Optional sensor identity recorded in binary headers
+            parsed_format: Parsed data format, "csv", "npz" or "parquet"
+            checksum: Bad CHECKSUM handling for 19-byte packets in the parsed
+                      output: "drop", "flag" or "off" (raw data keeps every frame)
+            queue_bytes: Byte bound of each capture pipeline queue
+            overflow: Read queue overflow policy: "block", "drop-oldest"
+                      or "drop-newest"
+            flush_policy: When output files are flushed and fsynced
+                          (default: FlushPolicy())
+            read_mode: Serial read mode: "blocking", "select" or "poll"
+            rotation: Start new raw/parsed segment files by size or duration
+                      (default: one file each for the whole run)
+            stats_path: Capture stats JSON file (default: capture_stats.json
+                        in the collection directory)
+            stats_interval: Seconds between stats file updates (None or 0:
+                            no stats file)
         """
         self.port = port
         self.baud = baud
         self.output_base_dir = Path(output_base_dir)
         self.output_type = output_type.lower()
+        self.raw_format = raw_format.lower()
+        if self.raw_format not in ("csv", "binary"):
+            raise ValueError(f"Unsupported raw format: {raw_format}. Use csv or binary")
+        self.sensor_identity = dict(sensor_identity or {})
+        self.parsed_format = parsed_format.lower()
+        if self.parsed_format not in OUTPUT_EXTENSIONS:
+            raise ValueError(f"Unsupported parsed format: {parsed_format}")
+        if self.parsed_format not in FLUSHABLE_FORMATS:
+            # The flush policy cannot make columnar files readable before close()
+            logger.warning(f"Parsed {self.parsed_format} files are readable only once closed "
+                           f"(end of capture or segment); after a crash, re-parse the raw file "
+                           f"with parse_vibration_data.py")
+        self.checksum = checksum.lower()
+        if self.checksum not in ("drop", "flag", "off"):
+            raise ValueError(f"Unsupported checksum policy: {checksum}")
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unsupported overflow policy: {overflow}")
+        self.queue_bytes = queue_bytes
+        self.overflow = overflow
+        self.flush_policy = flush_policy or FlushPolicy()
+        if read_mode not in READ_MODES:
+            raise ValueError(f"Unsupported read mode: {read_mode}")
+        self.read_mode = read_mode
+        self.rotation = rotation if rotation is not None and rotation.enabled else None
+        self.stats_path = Path(stats_path) if stats_path else None
+        self.stats_interval = stats_interval or None
         
         # Determine packet size based on baud rate
         if baud == 460800:
@@ -102,16 +200,29 @@ class RawVibrationDataCollector:
             raise ValueError(f"Unsupported baud rate: {baud}. Use 460800 or 921600")
         
         self.comm: Optional[SensorCommunication] = None
+        self.framer = PacketFramer(self.packet_size)
+        self.pipeline: Optional[CapturePipeline] = None
+        self.flusher: Optional[FlushController] = None
         self.raw_file = None
-        self.parsed_file = None
         self.parsed_writer = None
+        self.segments: Optional[SegmentManifest] = None
+        self.extra_outputs = []
+        self._file_dirs = None
+        self.file_stem = ""
+        self._rotate_pending = False
         self.raw_packet_count = 0
         self.parsed_packet_count = 0
         self.error_count = 0
+        self.checksum_error_count = 0
         
         # Extract port number from port string (e.g., "COM4" -> "4", "/dev/ttyUSB0" -> "0")
         port_num = self._extract_port_number(port)
         self.port_number = port_num
+        
+        # Live metrics; the capture stages are wrapped in collect_data()
+        self.telemetry = CaptureTelemetry(
+            f"port{port_num}", self.packet_size, labels={'port': port, 'baud': baud}
+        ).attach(framer=self.framer)
     
     def _extract_port_number(self, port: str) -> str:
         """Extract port number from port string."""
@@ -143,12 +254,7 @@ class RawVibrationDataCollector:
         if self.comm:
             self.comm.close()
             self.comm = None
-        if self.raw_file:
-            self.raw_file.close()
-            self.raw_file = None
-        if self.parsed_file:
-            self.parsed_file.close()
-            self.parsed_file = None
+        self._close_segment()
         logger.info("Connection and files closed")
     
     def setup_output_directory(self):
@@ -173,6 +279,10 @@ class RawVibrationDataCollector:
         """
         Setup raw and parsed data files for writing.
         
+        With rotation, the files are the first segment and a segment
+        manifest (vibration_raw_..._<timestamp>.segments.json) is written
+        to raw_data_dir.
+        
         Args:
             raw_data_dir: Directory for raw data files
             parsed_data_dir: Directory for parsed data files
@@ -184,54 +294,113 @@ class RawVibrationDataCollector:
         now = datetime.now()
         timestamp = now.strftime("%Y-%m-%d_%H-%M-%S")
         milliseconds = now.microsecond // 1000
+        self._file_dirs = (Path(raw_data_dir), Path(parsed_data_dir))
+        self.file_stem = f"Port_{self.port_number}_{timestamp}.{milliseconds:03d}"
+        
+        if self.rotation:
+            self.segments = SegmentManifest(
+                self._file_dirs[0] / f"vibration_raw_{self.file_stem}{SEGMENTS_SUFFIX}",
+                {
+                    'port': self.port,
+                    'baud': self.baud,
+                    'packet_size': self.packet_size,
+                    'output_type': self.output_type,
+                    'raw_format': self.raw_format,
+                    'parsed_format': self.parsed_format,
+                    'checksum': self.checksum,
+                    'rotate_bytes': self.rotation.max_bytes,
+                    'rotate_seconds': self.rotation.max_seconds,
+                }
+            )
+            logger.info(f"Segment manifest: {self.segments.path}")
+        return self._open_segment(now)
+    
+    def _open_segment(self, now: datetime):
+        """
+        Open the raw and parsed files of the next segment (or the only
+        files without rotation).
+        
+        Returns:
+            Tuple of (raw_path, parsed_path)
+        """
+        raw_data_dir, parsed_data_dir = self._file_dirs
+        segment = SEGMENT_NAME_FORMAT.format(index=self.segments.next_index) if self.segments else ""
         
         # Raw data filename
-        raw_filename = f"vibration_raw_Port_{self.port_number}_{timestamp}.{milliseconds:03d}.csv"
+        raw_extension = BINARY_EXTENSION if self.raw_format == "binary" else ".csv"
+        raw_filename = f"vibration_raw_{self.file_stem}{segment}{raw_extension}"
         raw_path = raw_data_dir / raw_filename
         
         # Parsed data filename
-        parsed_filename = f"vibration_parsed_Port_{self.port_number}_{timestamp}.{milliseconds:03d}.csv"
+        parsed_extension = OUTPUT_EXTENSIONS[self.parsed_format]
+        parsed_filename = f"vibration_parsed_{self.file_stem}{segment}{parsed_extension}"
         parsed_path = parsed_data_dir / parsed_filename
         
         # Open raw data file
-        self.raw_file = open(raw_path, 'w')
+        if self.raw_format == "binary":
+            sensor = {'port': self.port}
+            sensor.update(self.sensor_identity)
+            self.raw_file = BinaryCaptureWriter(
+                raw_path, self.packet_size, self.baud, self.output_type,
+                sensor=sensor, start_time=now, buffering=WRITE_BUFFER_SIZE
+            ).open()
+        else:
+            self.raw_file = open(raw_path, 'w', buffering=WRITE_BUFFER_SIZE)
         
-        # Open parsed data file
-        self.parsed_file = open(parsed_path, 'w', newline='')
+        # Setup writer for parsed data (same columns as the offline parser)
+        fieldnames = get_fieldnames(self.packet_size, self.output_type,
+                                    checksum_column=self.packet_size == 19 and self.checksum == "flag")
         
-        # Setup CSV writer for parsed data
-        if self.packet_size == 13:
-            if self.output_type == "displacement":
-                fieldnames = [
-                    'temperature', 'x_m', 'y_m', 'z_m',
-                    'x_mm', 'y_mm', 'z_mm', 'count', 'flag'
-                ]
-            else:  # velocity
-                fieldnames = [
-                    'temperature', 'x_ms', 'y_ms', 'z_ms',
-                    'x_mms', 'y_mms', 'z_mms', 'count', 'flag'
-                ]
-        else:  # 19-byte
-            if self.output_type == "displacement":
-                fieldnames = [
-                    'temperature', 'x_m', 'y_m', 'z_m',
-                    'x_mm', 'y_mm', 'z_mm', 'count',
-                    'nd_flag', 'ea_flag', 'checksum'
-                ]
-            else:  # velocity
-                fieldnames = [
-                    'temperature', 'x_ms', 'y_ms', 'z_ms',
-                    'x_mms', 'y_mms', 'z_mms', 'count',
-                    'nd_flag', 'ea_flag', 'checksum'
-                ]
-        
-        self.parsed_writer = csv.DictWriter(self.parsed_file, fieldnames=fieldnames)
-        self.parsed_writer.writeheader()
+        self.parsed_writer = create_writer(self.parsed_format, parsed_path, fieldnames,
+                                           buffering=WRITE_BUFFER_SIZE)
+        self.flusher = FlushController(
+            self.flush_policy, [self.raw_file, self.parsed_writer] + self.extra_outputs,
+            marker_path=flush_marker_path(raw_path), state=self._flush_state
+        )
+        if self.segments:
+            self.segments.open_segment(raw_path, parsed_path, self.raw_packet_count)
         
         logger.info(f"Raw data file opened: {raw_path}")
         logger.info(f"Parsed data file opened: {parsed_path}")
         return raw_path, parsed_path
     
+    def _close_segment(self):
+        """Flush and close the current files and finish their segment."""
+        if self.flusher:
+            # Final flush and marker before the files are closed
+            self.flusher.close()
+            self.flusher = None
+        if self.raw_file:
+            self.raw_file.close()
+            self.raw_file = None
+        if self.parsed_writer:
+            self.parsed_writer.close()
+            self.parsed_writer = None
+        if self.segments:
+            self.segments.close_segment()
+    
+    def rotate(self):
+        """
+        Close the current segment and open the next one.
+        
+        Returns:
+            Tuple of (raw_path, parsed_path) of the new segment
+        """
+        if not self.segments:
+            raise RuntimeError("Rotation is not enabled")
+        self._close_segment()
+        self._rotate_pending = False
+        return self._open_segment(datetime.now())
+    
+    def _flush_state(self) -> Dict:
+        """Counts recorded in the flush marker."""
+        return {
+            'packet_size': self.packet_size,
+            'raw_packets': self.raw_packet_count,
+            'parsed_rows': self.parsed_packet_count,
+            'errors': self.error_count,
+        }
+    
     def parse_packet(self, packet: List[int]) -> Optional[Dict]:
         """
         Parse packet according to datasheet specifications.
@@ -418,10 +587,157 @@ class RawVibrationDataCollector:
         
         return ','.join(hex_values)
     
+    def write_raw_frames(self, frames: bytes) -> int:
+        """
+        Write back-to-back packets to the raw data file in the configured format.
+        
+        Args:
+            frames: Whole packets
+        
+        Returns:
+            Bytes written to the raw file
+        """
+        if self.raw_format == "binary":
+            self.raw_file.write_frames(frames)
+            return len(frames)
+        size = self.packet_size
+        # Hex text is ASCII: characters written == bytes written
+        return self.raw_file.write(''.join(
+            f"{self.format_packet_as_csv(frames[i:i + size])}\n"
+            for i in range(0, len(frames), size)
+        ))
+    
+    def frame_data(self, data: bytes) -> Optional[Tuple[bytes, List[Dict]]]:
+        """
+        Frame received bytes and parse all complete packets (capture parser stage).
+        
+        Bytes before a packet header and packets without terminator are
+        counted as errors; an incomplete packet stays buffered for the
+        next call.
+        
+        Args:
+            data: Bytes received from the sensor
+        
+        Returns:
+            Tuple of (frames, parsed rows), or None if no packet is complete
+        """
+        self.framer.feed(data)
+        batches = [bytes(batch) for batch in self.framer.frames()]
+        self.error_count = self.framer.error_count
+        if not batches:
+            return None
+        frames = batches[0] if len(batches) == 1 else b''.join(batches)
+        return frames, self.parse_frames(frames)
+    
+    def process_data(self, data: bytes) -> int:
+        """
+        Frame received bytes, then save and parse all complete packets.
+        
+        Single-threaded equivalent of the capture pipeline.
+        
+        Args:
+            data: Bytes received from the sensor
+        
+        Returns:
+            Number of packets saved
+        """
+        batch = self.frame_data(data)
+        if batch is None:
+            return 0
+        return self.write_batch(*batch)
+    
+    def parse_frames(self, frames: bytes) -> List[Dict]:
+        """
+        Parse a batch of framed packets, applying the checksum policy.
+        
+        Args:
+            frames: Whole packets (0x80 ... 0x0D) back to back
+        
+        Returns:
+            Parsed rows to save
+        """
+        size = self.packet_size
+        verify = size == 19 and self.checksum != "off"
+        rows = []
+        for i in range(0, len(frames), size):
+            packet = frames[i:i + size]
+            parsed_data = self.parse_packet(packet)
+            if parsed_data and verify:
+                # Corrupt payload: counted apart from framing errors
+                checksum_ok = verify_checksum_19byte(packet)
+                if not checksum_ok:
+                    self.checksum_error_count += 1
+                    if self.checksum == "drop":
+                        parsed_data = None
+                if parsed_data and self.checksum == "flag":
+                    parsed_data['checksum_ok'] = checksum_ok
+            if parsed_data:
+                rows.append(parsed_data)
+            # else: parsing failed or bad checksum, raw data saved
+        return rows
+    
+    def write_batch(self, frames: bytes, rows: List[Dict]) -> int:
+        """
+        Save framed packets and their parsed rows (capture writer stage).
+        
+        Args:
+            frames: Whole packets back to back
+            rows: Parsed rows from parse_frames()
+        
+        Returns:
+            Number of packets saved
+        """
+        # Start the next segment once the current one is full
+        if self._rotate_pending:
+            self.rotate()
+        
+        # Save raw packet data
+        raw_bytes = self.write_raw_frames(frames)
+        count = len(frames) // self.packet_size
+        self.raw_packet_count += count
+        
+        # Save parsed data
+        for row in rows:
+            self.parsed_writer.write_row(row)
+        self.parsed_packet_count += len(rows)
+        
+        # Flush both files when the flush policy says so
+        self.flusher.written(len(frames))
+        
+        if self.segments:
+            self.segments.record(frames, raw_bytes)
+            # Rotate lazily so a stopped capture never leaves an empty segment
+            self._rotate_pending = self.segments.due(self.rotation)
+        return count
+    
+    def flush_idle(self) -> None:
+        """
+        Time-based flush while no data arrives (capture writer idle hook).
+        
+        Looks up the flusher on every call: rotation replaces it.
+        """
+        if self.flusher:
+            self.flusher.tick()
+    
+    def save_frames(self, frames: bytes) -> int:
+        """
+        Save a batch of framed packets to the raw file and parse them.
+        
+        Args:
+            frames: Whole packets (0x80 ... 0x0D) back to back
+        
+        Returns:
+            Number of packets saved
+        """
+        return self.write_batch(frames, self.parse_frames(frames))
+    
     def collect_data(self, duration: float, wait_init: float = 2.0):
         """
         Collect raw vibration data for specified duration.
         
+        Serial reads, framing/parsing and file output run on separate
+        threads joined by bounded queues (see capture_pipeline).
+        
         Args:
             duration: Collection duration in seconds
             wait_init: Wait time for sensor initialization (default 2.0s)
@@ -437,75 +753,61 @@ class RawVibrationDataCollector:
         logger.info(f"Waiting {wait_init} seconds for sensor initialization...")
         time.sleep(wait_init)
         
-        buffer = deque()
         start_time = time.time()
         last_log_time = start_time
         
         logger.info("Collecting data...")
         logger.info("Press Ctrl+C to stop early")
         
+        reader = SerialReader(self.comm.connection, self.baud, mode=self.read_mode)
+        telemetry = self.telemetry
+        self.pipeline = CapturePipeline(
+            telemetry.wrap_read(reader.read), self.frame_data, telemetry.wrap_write(self.write_batch),
+            queue_bytes=self.queue_bytes, overflow=self.overflow,
+            # Time-based flushes also while the link is idle
+            idle=self.flush_idle
+        )
+        telemetry.attach(pipeline=self.pipeline)
+        publisher = None
+        if self.stats_interval:
+            stats_path = self.stats_path or Path(os.path.commonpath(self._file_dirs)) / STATS_FILE_NAME
+            publisher = TelemetryPublisher(stats_path, [telemetry], self.stats_interval).start()
+            logger.info(f"Capture stats: {stats_path} (every {self.stats_interval:g}s)")
+        self.pipeline.start()
         try:
-            while time.time() - start_time < duration:
+            while self.pipeline.running:
                 current_time = time.time()
                 elapsed = current_time - start_time
+                if elapsed >= duration:
+                    break
                 
-                # Read available bytes
-                if self.comm.connection.in_waiting > 0:
-                    new_data = self.comm.connection.read(self.comm.connection.in_waiting)
-                    buffer.extend(new_data)
+                # Log progress every second
+                if current_time - last_log_time >= 1.0:
+                    rate = self.raw_packet_count / elapsed if elapsed > 0 else 0
+                    logger.info(
+                        f"Elapsed: {elapsed:.1f}s | "
+                        f"Raw: {self.raw_packet_count} | "
+                        f"Parsed: {self.parsed_packet_count} | "
+                        f"Rate: {rate:.1f} pkt/s | "
+                        f"Resync: {self.framer.resync_bytes} B | "
+                        f"Bad frames: {self.framer.bad_frames}"
+                        + (f" | Checksum errors: {self.checksum_error_count}"
+                           if self.packet_size == 19 else "")
+                        + f" | Queued: {self.pipeline.read_queue.queued_bytes // 1024} KB"
+                          f"/{self.pipeline.write_queue.queued_bytes // 1024} KB"
+                    )
+                    last_log_time = current_time
                 
-                # Process complete packets
-                while len(buffer) >= self.packet_size:
-                    # Find packet start (0x80)
-                    if buffer[0] != 0x80:
-                        buffer.popleft()
-                        self.error_count += 1
-                        continue
-                    
-                    # Extract packet
-                    if len(buffer) >= self.packet_size:
-                        packet = [buffer.popleft() for _ in range(self.packet_size)]
-                        
-                        # Verify packet end
-                        if packet[-1] == 0x0D:
-                            # Format and save raw packet data
-                            csv_line = self.format_packet_as_csv(packet)
-                            self.raw_file.write(f"{csv_line}\n")
-                            self.raw_file.flush()
-                            self.raw_packet_count += 1
-                            
-                            # Parse and save parsed data immediately
-                            parsed_data = self.parse_packet(packet)
-                            if parsed_data:
-                                self.parsed_writer.writerow(parsed_data)
-                                self.parsed_file.flush()
-                                self.parsed_packet_count += 1
-                            else:
-                                # Parsing failed but raw data saved
-                                pass
-                            
-                            # Log progress every second
-                            if current_time - last_log_time >= 1.0:
-                                rate = self.raw_packet_count / elapsed if elapsed > 0 else 0
-                                logger.info(
-                                    f"Elapsed: {elapsed:.1f}s | "
-                                    f"Raw: {self.raw_packet_count} | "
-                                    f"Parsed: {self.parsed_packet_count} | "
-                                    f"Rate: {rate:.1f} pkt/s | "
-                                    f"Errors: {self.error_count}"
-                                )
-                                last_log_time = current_time
-                        else:
-                            # Packet corruption
-                            self.error_count += 1
-                    else:
-                        break
-                
-                # Small delay to prevent CPU spinning
-                time.sleep(0.001)
+                time.sleep(min(0.1, duration - elapsed))
         
         except KeyboardInterrupt:
             logger.info("\nCollection interrupted by user")
+        finally:
+            # Stop reading, then drain the queues to disk
+            self.pipeline.stop()
+            reader.close()
+            if publisher:
+                publisher.stop()
         
         total_time = time.time() - start_time
         logger.info("\n" + "="*60)
@@ -513,10 +815,36 @@ class RawVibrationDataCollector:
         logger.info(f"  Total time: {total_time:.2f} seconds")
         logger.info(f"  Raw packets saved: {self.raw_packet_count}")
         logger.info(f"  Parsed packets saved: {self.parsed_packet_count}")
-        logger.info(f"  Errors: {self.error_count}")
+        logger.info(f"  Errors: {self.error_count} "
+                    f"({self.framer.resync_bytes} resync bytes, {self.framer.bad_frames} bad frames)")
+        if telemetry.gaps is not None:
+            logger.info(f"  Counter gaps: {telemetry.gaps.gap_count} "
+                        f"({telemetry.gaps.lost_samples} lost samples)")
+        if self.packet_size == 19:
+            logger.info(f"  Checksum errors: {self.checksum_error_count} ({self.checksum})")
         if total_time > 0:
             logger.info(f"  Average rate: {self.raw_packet_count/total_time:.2f} packets/second")
+        logger.info(f"  Serial reads: {reader.reads} ({reader.mode}), "
+                    f"timeouts: {reader.timeouts}")
+        read_queue = self.pipeline.read_queue
+        logger.info(f"  Queue peak: read {read_queue.peak_bytes // 1024} KB, "
+                    f"write {self.pipeline.write_queue.peak_bytes // 1024} KB")
+        latency = telemetry.write_latency
+        if latency.count:
+            logger.info(f"  Write latency: mean {latency.sum / latency.count * 1000:.2f} ms, "
+                        f"max {latency.max * 1000:.1f} ms over {latency.count} batches")
+        if read_queue.blocked_seconds:
+            logger.info(f"  Reader blocked: {read_queue.blocked_seconds:.2f} seconds")
+        if read_queue.dropped_count:
+            logger.warning(f"  Dropped on overflow: {read_queue.dropped_bytes} bytes "
+                           f"in {read_queue.dropped_count} reads ({self.overflow})")
+        logger.info(f"  Flushes: {self.flusher.flush_count} "
+                    f"(slowest {self.flusher.max_flush_seconds * 1000:.1f} ms), "
+                    f"fsyncs: {self.flusher.fsync_count}")
+        if self.segments:
+            logger.info(f"  Segments: {len(self.segments.segments)} ({self.segments.path.name})")
         logger.info("="*60)
+        self.pipeline.raise_error()
 
 
 # ============================================================================
@@ -541,6 +869,24 @@ Examples:
   
   # Collect data with custom output directory
   python collect_raw_vibration_data.py COM4 --duration 120 --output-dir ./my_data
+  
+  # Save raw packets in the compact binary format
+  python collect_raw_vibration_data.py COM4 --duration 60 --raw-format binary
+  
+  # Record the sensor serial number in the binary file header
+  python collect_raw_vibration_data.py COM4 --raw-format binary --serial-number P1PE0001
+  
+  # Buffer up to 64 MB between reader and writer, dropping old data if full
+  python collect_raw_vibration_data.py COM4 --queue-mb 64 --overflow drop-oldest
+  
+  # Start a new raw/parsed segment every 100 MB or 60 minutes
+  python collect_raw_vibration_data.py COM4 --duration 604800 --rotate-mb 100 --rotate-minutes 60
+  
+  # Publish capture stats for monitoring every 2 seconds
+  python collect_raw_vibration_data.py COM4 --stats-file ~/.zenith_helper/captures/com4.json --stats-interval 2
+  
+  # Flush every 5 seconds or 4 MB and fsync every 30 seconds
+  python collect_raw_vibration_data.py COM4 --flush-interval 5 --flush-kb 4096 --fsync-interval 30
         """
     )
     
@@ -579,6 +925,123 @@ Examples:
         help='Output type: displacement or velocity (default: displacement)'
     )
     
+    parser.add_argument(
+        '--raw-format',
+        type=str,
+        default='csv',
+        choices=['csv', 'binary'],
+        help='Raw data file format: hex csv or binary (default: csv)'
+    )
+    
+    parser.add_argument(
+        '--sensor-model',
+        type=str,
+        default=SENSOR_MODEL,
+        help='Sensor model recorded in binary raw file headers (default: %(default)s)'
+    )
+    
+    parser.add_argument(
+        '--serial-number',
+        type=str,
+        default=None,
+        help='Sensor serial number recorded in binary raw file headers'
+    )
+    
+    parser.add_argument(
+        '--parsed-format',
+        type=str,
+        default='csv',
+        choices=['csv', 'npz', 'parquet'],
+        help='Parsed data file format; npz/parquet store typed compressed columns '
+             '(parquet requires pyarrow) and are readable only once the capture or '
+             'segment ends (default: csv)'
+    )
+    
+    parser.add_argument(
+        '--checksum',
+        type=str,
+        default='drop',
+        choices=['drop', 'flag', 'off'],
+        help='19-byte packets with a bad CHECKSUM: drop from parsed output, flag '
+             'with a checksum_ok column, or off (default: drop)'
+    )
+    
+    parser.add_argument(
+        '--queue-mb',
+        type=float,
+        default=DEFAULT_QUEUE_BYTES / (1024 * 1024),
+        help='Size of each capture queue in MB (default: %(default)g)'
+    )
+    
+    parser.add_argument(
+        '--overflow',
+        type=str,
+        default='block',
+        choices=list(OVERFLOW_POLICIES),
+        help='When the read queue is full: block the reader (backpressure), '
+             'or drop the oldest / newest data (default: block)'
+    )
+    
+    parser.add_argument(
+        '--rotate-mb',
+        type=float,
+        default=None,
+        help='Start a new segment file when the raw file reaches this size in MB '
+             '(default: no size rotation)'
+    )
+    
+    parser.add_argument(
+        '--rotate-minutes',
+        type=float,
+        default=None,
+        help='Start a new segment file after this many minutes (default: no time rotation)'
+    )
+    
+    parser.add_argument(
+        '--read-mode',
+        type=str,
+        default='blocking',
+        choices=list(READ_MODES),
+        help='Serial reads: blocking reads with a short timeout, select on the '
+             'port (POSIX), or poll in_waiting every 1 ms (default: blocking)'
+    )
+    
+    parser.add_argument(
+        '--flush-interval',
+        type=float,
+        default=DEFAULT_FLUSH_INTERVAL,
+        help='Seconds between output file flushes (default: %(default)g)'
+    )
+    
+    parser.add_argument(
+        '--flush-kb',
+        type=int,
+        default=DEFAULT_FLUSH_BYTES // 1024,
+        help='Packet data in KB written between flushes (default: %(default)d)'
+    )
+    
+    parser.add_argument(
+        '--fsync-interval',
+        type=float,
+        default=None,
+        help='Seconds between fsyncs to disk, 0 for every flush (default: off)'
+    )
+    
+    parser.add_argument(
+        '--stats-file',
+        type=str,
+        default=None,
+        help='Capture stats JSON file, e.g. in the helper service stats directory '
+             '(default: capture_stats.json in the collection directory)'
+    )
+    
+    parser.add_argument(
+        '--stats-interval',
+        type=float,
+        default=DEFAULT_STATS_INTERVAL,
+        help='Seconds between capture stats updates, 0 to disable (default: %(default)g)'
+    )
+    
     parser.add_argument(
         '--wait-init',
         type=float,
@@ -602,7 +1065,21 @@ Examples:
         port=args.port,
         baud=args.baud,
         output_base_dir=args.output_dir,
-        output_type=args.output_type
+        output_type=args.output_type,
+        raw_format=args.raw_format,
+        sensor_identity=sensor_identity(args.sensor_model, args.serial_number),
+        parsed_format=args.parsed_format,
+        checksum=args.checksum,
+        queue_bytes=int(args.queue_mb * 1024 * 1024),
+        overflow=args.overflow,
+        flush_policy=FlushPolicy(args.flush_interval, args.flush_kb * 1024, args.fsync_interval),
+        read_mode=args.read_mode,
+        rotation=RotationPolicy(
+            int(args.rotate_mb * 1024 * 1024) if args.rotate_mb else None,
+            args.rotate_minutes * 60 if args.rotate_minutes else None
+        ),
+        stats_path=os.path.expanduser(args.stats_file) if args.stats_file else None,
+        stats_interval=args.stats_interval
     )
     
     try:
@@ -117,7 +117,7 @@ def validate_baud_rate(baud: int) -> bool:
     return baud in SUPPORTED_BAUD_RATES
 
 
-def configure_sensor(port: str, baud: int, output_type: str = "velocity") -> bool:
+def configure_sensor(port: str, baud: int, output_type: str = "velocity", force: bool = False) -> bool:
     comm: Optional[SensorCommunication] = None
     try:
         logger.info("=" * 64)
@@ -144,7 +144,7 @@ def configure_sensor(port: str, baud: int, output_type: str = "velocity") -> boo
         comm.open()
         
         configurator = SensorConfigurator(comm)
-        success = configurator.configure(output_type=output_type)
+        success = configurator.configure(output_type=output_type, force=force)
         
         if success:
             logger.info("=" * 64)
@@ -166,6 +166,7 @@ def configure_sensor(port: str, baud: int, output_type: str = "velocity") -> boo
         return False
     finally:
         if comm:
+            logger.info("Serial transport: %s", comm.metrics.summary())
             comm.close()
 
 
@@ -231,6 +232,7 @@ def detect_sensor_identity(port: str, baud: int) -> bool:
         return False
     finally:
         if comm:
+            logger.info("Serial transport: %s", comm.metrics.summary())
             comm.close()
 
 
@@ -280,6 +282,7 @@ def exit_auto_mode_cli(port: str, baud: int, persist_disable_auto: bool) -> bool
         return False
     finally:
         if comm:
+            logger.info("Serial transport: %s", comm.metrics.summary())
             comm.close()
 
 
@@ -325,6 +328,7 @@ def reset_sensor_cli(port: str, baud: int) -> bool:
         return False
     finally:
         if comm:
+            logger.info("Serial transport: %s", comm.metrics.summary())
             comm.close()
 
 
@@ -411,6 +415,11 @@ Examples:
         dest="output_type",
         help="Shorthand for --output-type displacement",
     )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Write every register and run the flash backup even if the sensor already matches",
+    )
     
     args = parser.parse_args()
     
@@ -450,7 +459,7 @@ Examples:
         return 1
     
     # Configure sensor
-    success = configure_sensor(args.port, args.baud, output_type=args.output_type)
+    success = configure_sensor(args.port, args.baud, output_type=args.output_type, force=args.force)
     return 0 if success else 1
 
 
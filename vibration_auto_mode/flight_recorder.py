@@ -0,0 +1,884 @@
+#!/usr/bin/env python3
+"""
+Flight Recorder Capture Script
+
+This script monitors an M-A542VR1 sensor in auto-start mode without
+writing the continuous stream to disk. The last seconds of decoded samples
+are kept in a fixed-size in-memory ring; when a trigger fires, the
+pre-trigger window from the ring and the post-trigger window that follows
+are written to one event file:
+
+- amplitude:   |axis| reaches a threshold (mm or mm/s)
+- rms:         moving RMS of an axis over a window reaches a threshold
+- temperature: temperature changes by a threshold (degC) within a window
+
+Triggers are re-armed once the post-trigger window is written (plus an
+optional hold-off), so a lasting fault produces a series of events rather
+than a continuous capture. Every event is listed in events.json:
+
+    vibration_events_<timestamp>/
+        events.json
+        event_0001_rms_z.csv
+        event_0002_temperature.csv
+
+Requires numpy.
+
+Author: Jnana Phani A (https://phani.zenithtek.in)
+Organization: Zenith Tek (https://zenithtek.in)
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from sensor_comm import SensorCommunication
+except ImportError:
+    print("Error: Could not import sensor_comm module")
+    sys.exit(1)
+
+try:
+    from capture_pipeline import DEFAULT_QUEUE_BYTES, OVERFLOW_POLICIES, CapturePipeline
+    from capture_telemetry import (
+        DEFAULT_STATS_INTERVAL,
+        STATS_FILE_NAME,
+        CaptureTelemetry,
+        TelemetryPublisher,
+    )
+    from output_writers import OUTPUT_EXTENSIONS, OUTPUT_FORMATS, create_writer
+    from packet_decoder import (
+        UNIT_SUFFIXES,
+        checksum_mask,
+        decode_frames,
+        frames_from_buffer,
+        packet_dtype,
+    )
+    from packet_framer import PacketFramer
+    from serial_reader import READ_MODES, SerialReader
+except ImportError as e:
+    print(f"Error: Could not import capture modules: {e}")
+    sys.exit(1)
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Constants
+TRIGGER_KINDS = ("amplitude", "rms", "temperature")
+AXES = ("x", "y", "z")
+# RAW output rates of the M-A542VR1 (datasheet: velocity 3000 Sps, displacement 300 Sps)
+SAMPLE_RATES = {
+    "velocity": 3000.0,
+    "displacement": 300.0,
+}
+DEFAULT_PRE_SECONDS = 10.0
+DEFAULT_POST_SECONDS = 5.0
+DEFAULT_TRIGGER_WINDOW = 1.0
+EVENTS_INDEX_NAME = "events.json"
+EVENTS_VERSION = 1
+# Axis values are decoded in m or m/s; thresholds are given in mm or mm/s
+MILLI_SCALE = 1000.0
+
+
+class Trigger:
+    """Threshold condition on decoded samples.
+
+    Attributes:
+        kind: "amplitude", "rms" or "temperature"
+        threshold: mm or mm/s (amplitude, rms), degC (temperature)
+        axes: Axes checked (amplitude, rms)
+        window: Seconds of the RMS window or the temperature change window
+    """
+
+    def __init__(self, kind: str, threshold: float, axes: Sequence[str] = AXES,
+                 window: float = DEFAULT_TRIGGER_WINDOW):
+        """
+        Initialize trigger.
+
+        Args:
+            kind: "amplitude", "rms" or "temperature"
+            threshold: Trigger level (mm or mm/s; degC for temperature)
+            axes: Axes to check (ignored for temperature)
+            window: RMS / temperature change window in seconds
+        """
+        if kind not in TRIGGER_KINDS:
+            raise ValueError(f"Unsupported trigger: {kind}. Use {', '.join(TRIGGER_KINDS)}")
+        if threshold <= 0:
+            raise ValueError(f"Invalid trigger threshold: {threshold}")
+        if window <= 0:
+            raise ValueError(f"Invalid trigger window: {window}")
+        for axis in axes:
+            if axis not in AXES:
+                raise ValueError(f"Invalid axis: {axis}. Use x, y or z")
+        self.kind = kind
+        self.threshold = threshold
+        self.axes = tuple(axes) if kind != "temperature" else ()
+        self.window = window
+
+    @classmethod
+    def parse(cls, spec: str, window: float = DEFAULT_TRIGGER_WINDOW) -> "Trigger":
+        """
+        Parse KIND[:AXES]:THRESHOLD, e.g. "rms:z:0.5", "amplitude:xy:2",
+        "temperature:3".
+
+        Args:
+            spec: Trigger spec
+            window: RMS / temperature change window in seconds
+
+        Returns:
+            Trigger
+        """
+        parts = spec.lower().split(':')
+        try:
+            if len(parts) == 2:
+                return cls(parts[0], float(parts[1]), window=window)
+            if len(parts) == 3 and parts[0] != "temperature":
+                return cls(parts[0], float(parts[2]), axes=tuple(parts[1]), window=window)
+        except ValueError as e:
+            raise ValueError(f"Invalid trigger spec '{spec}': {e}")
+        raise ValueError(f"Invalid trigger spec '{spec}'. Use KIND[:AXES]:THRESHOLD")
+
+    @property
+    def name(self) -> str:
+        """Short name used in event file names (e.g. "rms_z")."""
+        return f"{self.kind}_{''.join(self.axes)}" if self.axes else self.kind
+
+    def window_samples(self, sample_rate: float) -> int:
+        """Samples in the trigger window."""
+        return max(1, int(round(self.window * sample_rate)))
+
+    def history_samples(self, sample_rate: float) -> int:
+        """Samples before the checked ones that find() needs."""
+        if self.kind == "amplitude":
+            return 0
+        if self.kind == "rms":
+            return self.window_samples(sample_rate) - 1
+        return self.window_samples(sample_rate)
+
+    def find(self, samples, history, sample_rate: float) -> Optional[Tuple[int, str, float]]:
+        """
+        Find the first sample that fires the trigger.
+
+        Args:
+            samples: Decoded samples to check
+            history: Decoded samples immediately before them (ring tail)
+            sample_rate: Samples per second
+
+        Returns:
+            Tuple of (index into samples, field, value) or None
+        """
+        if not len(samples):
+            return None
+        if self.kind == "temperature":
+            return self._first_hit(self._temperature_change(samples, history, sample_rate),
+                                   "temperature")
+        best = None
+        for axis in self.axes:
+            if self.kind == "amplitude":
+                values = np.abs(samples[axis]) * MILLI_SCALE
+            else:
+                values = self._moving_rms(samples[axis], history[axis], sample_rate)
+            hit = self._first_hit(values, axis)
+            if hit is not None and (best is None or hit[0] < best[0]):
+                best = hit
+        return best
+
+    def _first_hit(self, values, field: str) -> Optional[Tuple[int, str, float]]:
+        hits = np.flatnonzero(values >= self.threshold)
+        if not len(hits):
+            return None
+        index = int(hits[0])
+        return index, field, float(values[index])
+
+    def _moving_rms(self, values, history, sample_rate: float):
+        """RMS in mm (mm/s) of the window ending at each sample; 0 until the window is full."""
+        n = self.window_samples(sample_rate)
+        history = history[len(history) - min(len(history), n - 1):]
+        sequence = np.concatenate((history, values)) * MILLI_SCALE
+        sums = np.concatenate(([0.0], np.cumsum(sequence * sequence)))
+        ends = np.arange(len(history), len(sequence)) + 1
+        starts = ends - n
+        rms = np.zeros(len(values))
+        full = starts >= 0
+        window_sums = np.maximum(sums[ends[full]] - sums[starts[full]], 0.0)
+        rms[full] = np.sqrt(window_sums / n)
+        return rms
+
+    def _temperature_change(self, samples, history, sample_rate: float):
+        """Absolute temperature change over the window ending at each sample."""
+        n = self.window_samples(sample_rate)
+        history = history['temperature'][len(history) - min(len(history), n):]
+        sequence = np.concatenate((history, samples['temperature']))
+        positions = np.arange(len(history), len(sequence))
+        change = np.zeros(len(samples))
+        full = positions >= n
+        change[full] = np.abs(sequence[positions[full]] - sequence[positions[full] - n])
+        return change
+
+
+class SampleRing:
+    """Fixed-size ring of the most recent decoded samples."""
+
+    def __init__(self, dtype, capacity: int):
+        """
+        Initialize ring.
+
+        Args:
+            dtype: Structured dtype of the samples
+            capacity: Samples kept
+        """
+        if capacity < 1:
+            raise ValueError(f"Invalid ring capacity: {capacity}")
+        self.capacity = capacity
+        self._buffer = np.zeros(capacity, dtype=dtype)
+        self._end = 0       # next write position
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def extend(self, samples) -> None:
+        """Append samples, overwriting the oldest."""
+        count = len(samples)
+        if count >= self.capacity:
+            self._buffer[:] = samples[count - self.capacity:]
+            self._end = 0
+            self._size = self.capacity
+            return
+        first = min(count, self.capacity - self._end)
+        self._buffer[self._end:self._end + first] = samples[:first]
+        self._buffer[:count - first] = samples[first:]
+        self._end = (self._end + count) % self.capacity
+        self._size = min(self.capacity, self._size + count)
+
+    def last(self, count: int):
+        """
+        Get the most recent samples in order (a copy).
+
+        Args:
+            count: Samples wanted (at most len(self))
+
+        Returns:
+            Structured array of min(count, len(self)) samples
+        """
+        count = min(count, self._size)
+        start = self._end - count
+        if start >= 0:
+            return self._buffer[start:self._end].copy()
+        return np.concatenate((self._buffer[start:], self._buffer[:self._end]))
+
+
+class FlightRecorder:
+    """Keep recent samples in a ring and dump the windows around trigger events.
+
+    Usage::
+
+        recorder = FlightRecorder(output_dir, 19, [Trigger("rms", 0.5, "z")])
+        recorder.feed(decode_frames(frames))    # per batch
+        ...
+        recorder.close()                        # writes a pending event
+    """
+
+    def __init__(self, output_dir, packet_size: int, triggers: Sequence[Trigger],
+                 output_type: str = "displacement", sample_rate: Optional[float] = None,
+                 pre_seconds: float = DEFAULT_PRE_SECONDS,
+                 post_seconds: float = DEFAULT_POST_SECONDS,
+                 holdoff_seconds: float = 0.0, output_format: str = "csv",
+                 max_events: Optional[int] = None):
+        """
+        Initialize recorder.
+
+        Args:
+            output_dir: Directory for event files and events.json
+            packet_size: Packet size (13 or 19 bytes)
+            triggers: Trigger conditions (any one starts an event)
+            output_type: "displacement" or "velocity" (column units)
+            sample_rate: Samples per second (default: RAW rate of output_type)
+            pre_seconds: Seconds before the trigger written per event
+            post_seconds: Seconds from the trigger on written per event
+            holdoff_seconds: Seconds after an event before triggers re-arm
+            output_format: Event file format, "csv", "npz" or "parquet"
+            max_events: Stop dumping after this many events (None: no limit)
+        """
+        if np is None:
+            raise ImportError("numpy is not installed. Install it with: pip install numpy")
+        if not triggers:
+            raise ValueError("No triggers given")
+        self.output_type = output_type.lower()
+        if self.output_type not in UNIT_SUFFIXES:
+            raise ValueError(f"Unsupported output type: {output_type}")
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unsupported output format: {output_format}")
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.packet_size = packet_size
+        self.triggers = list(triggers)
+        self.sample_rate = float(sample_rate or SAMPLE_RATES[self.output_type])
+        self.pre_samples = int(round(pre_seconds * self.sample_rate))
+        self.post_samples = max(1, int(round(post_seconds * self.sample_rate)))
+        self.holdoff_samples = int(round(holdoff_seconds * self.sample_rate))
+        self.output_format = output_format
+        self.max_events = max_events
+        self.settings = {
+            'packet_size': packet_size,
+            'output_type': self.output_type,
+            'sample_rate': self.sample_rate,
+            'pre_seconds': pre_seconds,
+            'post_seconds': post_seconds,
+            'holdoff_seconds': holdoff_seconds,
+            'triggers': [
+                {'kind': t.kind, 'axes': ''.join(t.axes), 'threshold': t.threshold, 'window': t.window}
+                for t in self.triggers
+            ],
+        }
+
+        history = max([self.pre_samples] + [t.history_samples(self.sample_rate) for t in self.triggers])
+        self.ring = SampleRing(packet_dtype(packet_size), max(1, history))
+        self.sample_count = 0
+        self.events: List[Dict] = []
+        self._pending: Optional[Dict] = None
+        self._armed_at = 0
+
+    @property
+    def triggered(self) -> bool:
+        """True while a post-trigger window is being collected."""
+        return self._pending is not None
+
+    def feed(self, samples) -> int:
+        """
+        Process the next batch of decoded samples.
+
+        Args:
+            samples: Structured array from decode_frames()
+
+        Returns:
+            Number of events written during this call
+        """
+        written = 0
+        base = self.sample_count
+        position = 0
+        total = len(samples)
+        while position < total:
+            if self._pending is not None:
+                pending = self._pending
+                take = min(total - position, self.post_samples - pending['collected'])
+                chunk = samples[position:position + take]
+                pending['parts'].append(chunk.copy())
+                pending['collected'] += take
+                self.ring.extend(chunk)
+                position += take
+                if pending['collected'] >= self.post_samples:
+                    self._write_event(complete=True)
+                    written += 1
+                continue
+
+            rest = samples[position:]
+            if self.max_events is not None and len(self.events) >= self.max_events:
+                self.ring.extend(rest)
+                break
+            # Triggers stay disarmed during the hold-off after an event
+            skip = min(len(rest), self._armed_at - (base + position))
+            if skip > 0:
+                self.ring.extend(rest[:skip])
+                position += skip
+                continue
+            hit = self._find(rest)
+            if hit is None:
+                self.ring.extend(rest)
+                break
+            index, trigger, field, value = hit
+            self.ring.extend(rest[:index])
+            self._pending = {
+                'trigger': trigger,
+                'field': field,
+                'value': value,
+                'sample_index': base + position + index,
+                'time': datetime.now(),
+                'pre': self.ring.last(self.pre_samples),
+                'parts': [],
+                'collected': 0,
+            }
+            logger.info(f"Trigger {trigger.name} fired: {field} = {value:.4g} "
+                        f"(threshold {trigger.threshold:g}) at sample {base + position + index}")
+            position += index
+        self.sample_count = base + total
+        return written
+
+    def close(self) -> None:
+        """Write an event whose post-trigger window is still incomplete and the final index."""
+        if self._pending is not None:
+            self._write_event(complete=False)
+        else:
+            self.write_index()
+
+    def _find(self, samples) -> Optional[Tuple[int, Trigger, str, float]]:
+        best = None
+        for trigger in self.triggers:
+            history = self.ring.last(trigger.history_samples(self.sample_rate))
+            hit = trigger.find(samples, history, self.sample_rate)
+            if hit is not None and (best is None or hit[0] < best[0]):
+                best = (hit[0], trigger, hit[1], hit[2])
+        return best
+
+    def _columns(self, samples, trigger_index: int, first_index: int) -> Tuple[List[str], Dict]:
+        base_unit = UNIT_SUFFIXES[self.output_type][0]
+        indices = np.arange(first_index, first_index + len(samples))
+        columns = {
+            'sample_index': indices,
+            'time_s': (indices - trigger_index) / self.sample_rate,
+            'temperature': samples['temperature'],
+        }
+        for axis in AXES:
+            columns[f"{axis}_{base_unit}"] = samples[axis]
+        for name in samples.dtype.names:
+            if name not in columns and name not in AXES:
+                columns[name] = samples[name]
+        return list(columns), columns
+
+    def _write_event(self, complete: bool) -> Dict:
+        pending = self._pending
+        self._pending = None
+        trigger = pending['trigger']
+        samples = np.concatenate([pending['pre']] + pending['parts'])
+        trigger_index = pending['sample_index']
+        first_index = trigger_index - len(pending['pre'])
+
+        number = len(self.events) + 1
+        path = self.output_dir / f"event_{number:04d}_{trigger.name}{OUTPUT_EXTENSIONS[self.output_format]}"
+        fieldnames, columns = self._columns(samples, trigger_index, first_index)
+        with create_writer(self.output_format, path, fieldnames) as writer:
+            writer.write_columns(columns)
+
+        event = {
+            'index': number,
+            'file': path.name,
+            'trigger': trigger.kind,
+            'field': pending['field'],
+            'value': pending['value'],
+            'threshold': trigger.threshold,
+            'time': pending['time'].isoformat(timespec='milliseconds'),
+            'trigger_sample': trigger_index,
+            'first_sample': first_index,
+            'pre_samples': len(pending['pre']),
+            'post_samples': pending['collected'],
+            'complete': complete,
+        }
+        self.events.append(event)
+        self._armed_at = trigger_index + pending['collected'] + self.holdoff_samples
+        self.write_index()
+        logger.info(f"Event {number} written: {path.name} ({len(samples)} samples)")
+        return event
+
+    def write_index(self) -> Path:
+        """Write events.json atomically (temporary file + rename)."""
+        index = {
+            'version': EVENTS_VERSION,
+            'updated': datetime.now().isoformat(timespec='milliseconds'),
+            'settings': self.settings,
+            'samples_seen': self.sample_count,
+            'events': self.events,
+        }
+        path = self.output_dir / EVENTS_INDEX_NAME
+        temp_file = path.with_name(path.name + ".tmp")
+        with open(temp_file, 'w') as f:
+            json.dump(index, f, indent=2)
+        os.replace(temp_file, path)
+        return path
+
+
+class FlightRecorderCollector:
+    """Capture from the sensor into a FlightRecorder (no continuous files)."""
+
+    def __init__(self, port: str, baud: int, recorder_options: Dict,
+                 output_base_dir: str = ".", checksum: str = "drop",
+                 queue_bytes: int = DEFAULT_QUEUE_BYTES, overflow: str = "block",
+                 read_mode: str = "blocking", stats_interval: Optional[float] = DEFAULT_STATS_INTERVAL):
+        """
+        Initialize collector.
+
+        Args:
+            port: Serial port path
+            baud: Baud rate (460800 or 921600)
+            recorder_options: FlightRecorder keyword arguments (triggers,
+                              output_type, pre_seconds, ...)
+            output_base_dir: Base directory for the events directory
+            checksum: 19-byte packets with a bad CHECKSUM: "drop" or "off"
+            queue_bytes: Byte bound of each capture pipeline queue
+            overflow: Read queue overflow policy
+            read_mode: Serial read mode: "blocking", "select" or "poll"
+            stats_interval: Seconds between capture stats updates (None or 0: off)
+        """
+        if baud == 460800:
+            self.packet_size = 13
+        elif baud == 921600:
+            self.packet_size = 19
+        else:
+            raise ValueError(f"Unsupported baud rate: {baud}. Use 460800 or 921600")
+        if checksum not in ("drop", "off"):
+            raise ValueError(f"Unsupported checksum policy: {checksum}")
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unsupported overflow policy: {overflow}")
+        if read_mode not in READ_MODES:
+            raise ValueError(f"Unsupported read mode: {read_mode}")
+        self.port = port
+        self.baud = baud
+        self.output_base_dir = Path(output_base_dir)
+        self.recorder_options = dict(recorder_options)
+        self.checksum = checksum
+        self.queue_bytes = queue_bytes
+        self.overflow = overflow
+        self.read_mode = read_mode
+        self.stats_interval = stats_interval or None
+        self.comm: Optional[SensorCommunication] = None
+        self.framer = PacketFramer(self.packet_size)
+        self.recorder: Optional[FlightRecorder] = None
+        self.telemetry = CaptureTelemetry(
+            "flight-recorder", self.packet_size, labels={'port': port, 'baud': baud}
+        ).attach(framer=self.framer)
+        self.checksum_error_count = 0
+
+    def open(self):
+        """Open serial connection."""
+        logger.info(f"Opening connection: {self.port} at {self.baud} baud")
+        self.comm = SensorCommunication(self.port, self.baud, timeout=1.0)
+        self.comm.open()
+        logger.info("Connection opened successfully")
+
+    def close(self):
+        """Close serial connection and write a pending event."""
+        if self.comm:
+            self.comm.close()
+            self.comm = None
+        if self.recorder:
+            self.recorder.close()
+        logger.info("Connection closed")
+
+    def setup_output_directory(self) -> Path:
+        """Create the events directory and the recorder."""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        events_dir = self.output_base_dir / f"vibration_events_{timestamp}"
+        self.recorder = FlightRecorder(events_dir, self.packet_size, **self.recorder_options)
+        logger.info(f"Events directory: {events_dir}")
+        return events_dir
+
+    def frame_data(self, data: bytes):
+        """Parser stage: frame and decode complete packets."""
+        self.framer.feed(data)
+        batches = [bytes(batch) for batch in self.framer.frames()]
+        if not batches:
+            return None
+        frames = batches[0] if len(batches) == 1 else b''.join(batches)
+        array = frames_from_buffer(frames, self.packet_size)
+        if self.packet_size == 19 and self.checksum == "drop":
+            mask = checksum_mask(array)
+            bad = len(mask) - int(np.count_nonzero(mask))
+            if bad:
+                self.checksum_error_count += bad
+                array = array[mask]
+        return frames, decode_frames(array, self.packet_size)
+
+    def write_batch(self, frames: bytes, samples) -> int:
+        """Writer stage: feed decoded samples to the recorder."""
+        return self.recorder.feed(samples)
+
+    def collect_data(self, duration: Optional[float], wait_init: float = 2.0):
+        """
+        Monitor the sensor and dump trigger events.
+
+        Args:
+            duration: Monitoring duration in seconds (None: until Ctrl+C)
+            wait_init: Wait time for sensor initialization (default 2.0s)
+        """
+        if not self.comm or not self.comm.is_open():
+            raise RuntimeError("Connection not open")
+        if self.recorder is None:
+            self.setup_output_directory()
+        recorder = self.recorder
+
+        logger.info(f"Waiting {wait_init} seconds for sensor initialization...")
+        time.sleep(wait_init)
+        logger.info(f"Monitoring {self.port}: ring of {recorder.ring.capacity} samples "
+                    f"({recorder.ring.capacity / recorder.sample_rate:g}s at {recorder.sample_rate:g} Sps), "
+                    f"triggers: {', '.join(t.name for t in recorder.triggers)}")
+        logger.info("Press Ctrl+C to stop")
+
+        reader = SerialReader(self.comm.connection, self.baud, mode=self.read_mode)
+        telemetry = self.telemetry
+        pipeline = CapturePipeline(
+            telemetry.wrap_read(reader.read), self.frame_data, telemetry.wrap_write(self.write_batch),
+            queue_bytes=self.queue_bytes, overflow=self.overflow, name="flight-recorder"
+        )
+        telemetry.attach(pipeline=pipeline)
+        publisher = None
+        if self.stats_interval:
+            publisher = TelemetryPublisher(recorder.output_dir / STATS_FILE_NAME, [telemetry],
+                                           self.stats_interval).start()
+        pipeline.start()
+        start_time = time.time()
+        last_log_time = start_time
+        try:
+            while pipeline.running:
+                current_time = time.time()
+                elapsed = current_time - start_time
+                if duration is not None and elapsed >= duration:
+                    break
+                if current_time - last_log_time >= 10.0:
+                    logger.info(f"Elapsed: {elapsed:.0f}s | Samples: {recorder.sample_count} | "
+                                f"Events: {len(recorder.events)}"
+                                + (" | Recording post-trigger window" if recorder.triggered else ""))
+                    last_log_time = current_time
+                time.sleep(0.1 if duration is None else min(0.1, duration - elapsed))
+        except KeyboardInterrupt:
+            logger.info("\nMonitoring interrupted by user")
+        finally:
+            pipeline.stop()
+            reader.close()
+            if publisher:
+                publisher.stop()
+
+        total_time = time.time() - start_time
+        logger.info("\n" + "="*60)
+        logger.info("Flight Recorder Summary:")
+        logger.info(f"  Total time: {total_time:.2f} seconds")
+        logger.info(f"  Samples monitored: {recorder.sample_count}")
+        logger.info(f"  Errors: {self.framer.error_count} "
+                    f"({self.framer.resync_bytes} resync bytes, {self.framer.bad_frames} bad frames)")
+        if self.packet_size == 19:
+            logger.info(f"  Checksum errors: {self.checksum_error_count} ({self.checksum})")
+        logger.info(f"  Events: {len(recorder.events)} ({recorder.output_dir / EVENTS_INDEX_NAME})")
+        logger.info("="*60)
+        pipeline.raise_error()
+
+
+# ============================================================================
+# Main Function
+# ============================================================================
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(
+        description="Monitor an M-A542VR1 sensor and save only the data around trigger events",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Keep 10 s before and 5 s after any |z| displacement above 0.5 mm
+  python flight_recorder.py COM4 --trigger amplitude:z:0.5
+
+  # Velocity RMS over 0.5 s above 2 mm/s on any axis, 30 s before, 10 s after
+  python flight_recorder.py /dev/ttyUSB0 --baud 921600 --output-type velocity \\
+      --trigger rms:2 --trigger-window 0.5 --pre 30 --post 10
+
+  # Amplitude or a 3 degC temperature jump within 1 s, for 24 hours
+  python flight_recorder.py COM4 --trigger amplitude:xy:1.0 --trigger temperature:3 --duration 86400
+        """
+    )
+
+    parser.add_argument(
+        'port',
+        help='Serial port path (e.g., COM4, /dev/ttyUSB0)'
+    )
+
+    parser.add_argument(
+        '--baud',
+        type=int,
+        default=460800,
+        choices=[460800, 921600],
+        help='Baud rate (default: 460800)'
+    )
+
+    parser.add_argument(
+        '--trigger',
+        action='append',
+        required=True,
+        help='Trigger KIND[:AXES]:THRESHOLD; KIND is amplitude or rms (mm or mm/s, '
+             'AXES e.g. z or xy, default all) or temperature (degC change). Repeatable'
+    )
+
+    parser.add_argument(
+        '--trigger-window',
+        type=float,
+        default=DEFAULT_TRIGGER_WINDOW,
+        help='RMS window / temperature change window in seconds (default: %(default)g)'
+    )
+
+    parser.add_argument(
+        '--pre',
+        type=float,
+        default=DEFAULT_PRE_SECONDS,
+        help='Seconds kept before each trigger (default: %(default)g)'
+    )
+
+    parser.add_argument(
+        '--post',
+        type=float,
+        default=DEFAULT_POST_SECONDS,
+        help='Seconds saved after each trigger (default: %(default)g)'
+    )
+
+    parser.add_argument(
+        '--holdoff',
+        type=float,
+        default=0.0,
+        help='Seconds after an event before triggers re-arm (default: 0)'
+    )
+
+    parser.add_argument(
+        '--max-events',
+        type=int,
+        default=None,
+        help='Stop saving events after this many (default: no limit)'
+    )
+
+    parser.add_argument(
+        '--output-type',
+        type=str,
+        default='displacement',
+        choices=['displacement', 'velocity'],
+        help='Sensor output type, sets units and the sample rate (default: displacement)'
+    )
+
+    parser.add_argument(
+        '--sample-rate',
+        type=float,
+        default=None,
+        help='Samples per second (default: 300 for displacement, 3000 for velocity)'
+    )
+
+    parser.add_argument(
+        '--event-format',
+        type=str,
+        default='csv',
+        choices=list(OUTPUT_FORMATS),
+        help='Event file format (parquet requires pyarrow) (default: csv)'
+    )
+
+    parser.add_argument(
+        '--checksum',
+        type=str,
+        default='drop',
+        choices=['drop', 'off'],
+        help='19-byte packets with a bad CHECKSUM: drop or keep (default: drop)'
+    )
+
+    parser.add_argument(
+        '--duration',
+        type=float,
+        default=None,
+        help='Monitoring duration in seconds (default: until Ctrl+C)'
+    )
+
+    parser.add_argument(
+        '--output-dir',
+        type=str,
+        default='.',
+        help='Base output directory (default: current directory)'
+    )
+
+    parser.add_argument(
+        '--queue-mb',
+        type=float,
+        default=DEFAULT_QUEUE_BYTES / (1024 * 1024),
+        help='Size of each capture queue in MB (default: %(default)g)'
+    )
+
+    parser.add_argument(
+        '--overflow',
+        type=str,
+        default='block',
+        choices=list(OVERFLOW_POLICIES),
+        help='When the read queue is full: block the reader (backpressure), '
+             'or drop the oldest / newest data (default: block)'
+    )
+
+    parser.add_argument(
+        '--read-mode',
+        type=str,
+        default='blocking',
+        choices=list(READ_MODES),
+        help='Serial reads: blocking reads with a short timeout, select on the '
+             'port (POSIX), or poll in_waiting every 1 ms (default: blocking)'
+    )
+
+    parser.add_argument(
+        '--stats-interval',
+        type=float,
+        default=DEFAULT_STATS_INTERVAL,
+        help='Seconds between capture stats updates, 0 to disable (default: %(default)g)'
+    )
+
+    parser.add_argument(
+        '--wait-init',
+        type=float,
+        default=2.0,
+        help='Wait time for sensor initialization in seconds (default: 2.0)'
+    )
+
+    parser.add_argument(
+        '--verbose',
+        action='store_true',
+        help='Enable verbose logging'
+    )
+
+    args = parser.parse_args()
+
+    if args.verbose:
+        logging.getLogger().setLevel(logging.DEBUG)
+
+    if np is None:
+        logger.error("numpy is not installed. Install it with: pip install numpy")
+        sys.exit(1)
+
+    try:
+        triggers = [Trigger.parse(spec, args.trigger_window) for spec in args.trigger]
+        collector = FlightRecorderCollector(
+            args.port,
+            args.baud,
+            recorder_options={
+                'triggers': triggers,
+                'output_type': args.output_type,
+                'sample_rate': args.sample_rate,
+                'pre_seconds': args.pre,
+                'post_seconds': args.post,
+                'holdoff_seconds': args.holdoff,
+                'output_format': args.event_format,
+                'max_events': args.max_events,
+            },
+            output_base_dir=args.output_dir,
+            checksum=args.checksum,
+            queue_bytes=int(args.queue_mb * 1024 * 1024),
+            overflow=args.overflow,
+            read_mode=args.read_mode,
+            stats_interval=args.stats_interval
+        )
+    except ValueError as e:
+        logger.error(f"Error: {e}")
+        sys.exit(1)
+
+    try:
+        collector.open()
+        collector.collect_data(duration=args.duration, wait_init=args.wait_init)
+    except KeyboardInterrupt:
+        logger.info("\nInterrupted by user")
+    except Exception as e:
+        logger.error(f"Error: {e}", exc_info=True)
+        sys.exit(1)
+    finally:
+        collector.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+"""
+Flush policy module.
+
+This module decides when captured data leaves the process. Instead of
+flushing every file after every packet, writes go into large buffers and
+are flushed when a byte or time threshold is reached; os.fsync() runs on
+its own, slower cadence (or never). The policy trades how much data a
+crash can lose against syscalls per second.
+
+After every flush a small JSON marker next to the raw data file records
+what has been flushed (packet and row counts, file sizes, whether it was
+fsynced). The marker is replaced atomically, so after a crash it always
+describes a consistent point the data files reached.
+
+Author: Jnana Phani A (https://phani.zenithtek.in)
+Organization: Zenith Tek (https://zenithtek.in)
+"""
+
+import json
+import logging
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Optional, Sequence, Union
+
+logger = logging.getLogger(__name__)
+
+# Constants
+FLUSH_MARKER_SUFFIX = ".flushed.json"
+FLUSH_MARKER_VERSION = 1
+DEFAULT_FLUSH_INTERVAL = 1.0  # seconds
+DEFAULT_FLUSH_BYTES = 1 << 20
+# Buffer size of capture output files
+WRITE_BUFFER_SIZE = 1 << 20
+
+
+class FlushPolicy:
+    """When to flush and fsync capture output.
+
+    Attributes:
+        interval: Seconds between flushes (None: no time limit)
+        max_bytes: Packet bytes written between flushes (None: no limit)
+        fsync_interval: Seconds between fsyncs (0: every flush, None: never)
+    """
+
+    def __init__(self, interval: Optional[float] = DEFAULT_FLUSH_INTERVAL,
+                 max_bytes: Optional[int] = DEFAULT_FLUSH_BYTES,
+                 fsync_interval: Optional[float] = None):
+        """
+        Initialize policy.
+
+        Args:
+            interval: Seconds between flushes (None: no time limit)
+            max_bytes: Packet bytes written between flushes (None: no limit)
+            fsync_interval: Seconds between fsyncs (0: every flush, None: never)
+        """
+        for name, value in (("interval", interval), ("max_bytes", max_bytes),
+                            ("fsync_interval", fsync_interval)):
+            if value is not None and value < 0:
+                raise ValueError(f"Invalid flush {name}: {value}")
+        self.interval = interval
+        self.max_bytes = max_bytes
+        self.fsync_interval = fsync_interval
+
+    def __repr__(self) -> str:
+        return (f"FlushPolicy(interval={self.interval}, max_bytes={self.max_bytes}, "
+                f"fsync_interval={self.fsync_interval})")
+
+
+def flush_marker_path(data_path: Union[str, Path]) -> Path:
+    """Get the flush marker path of a data file."""
+    data_path = Path(data_path)
+    return data_path.with_name(data_path.name + FLUSH_MARKER_SUFFIX)
+
+
+def read_flush_marker(data_path: Union[str, Path]) -> Optional[Dict]:
+    """
+    Read the flush marker of a data file.
+
+    Args:
+        data_path: Raw data file path
+
+    Returns:
+        Marker dict, or None if there is no readable marker
+    """
+    try:
+        with open(flush_marker_path(data_path)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _fileno(output) -> Optional[int]:
+    """File descriptor of an output object, if it has one."""
+    fileno = getattr(output, 'fileno', None)
+    if fileno is None:
+        return None
+    try:
+        return fileno()
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+class FlushController:
+    """Apply a FlushPolicy to a set of output files.
+
+    The owner reports packet bytes written with written() and calls tick()
+    while no data arrives, so the time limit also holds on an idle link;
+    the controller flushes (and fsyncs) all files when the policy says so
+    and then rewrites the flush marker. Not thread-safe: call it from the
+    thread that writes the files.
+
+    Attributes:
+        flush_count / fsync_count: Flushes and fsyncs done
+        max_flush_seconds: Slowest flush (including fsync and marker)
+    """
+
+    def __init__(self, policy: FlushPolicy, outputs: Sequence,
+                 marker_path: Optional[Union[str, Path]] = None,
+                 state: Optional[Callable[[], Dict]] = None):
+        """
+        Initialize controller.
+
+        Args:
+            policy: Flush policy
+            outputs: Objects with flush() (and fileno() for fsync)
+            marker_path: Flush marker file (None: no marker)
+            state: Returns counts recorded in the marker (e.g. packets)
+        """
+        self.policy = policy
+        self.outputs = [output for output in outputs if output is not None]
+        self.marker_path = Path(marker_path) if marker_path else None
+        self._state = state
+        self._pending_bytes = 0
+        now = time.monotonic()
+        self._last_flush = now
+        self._last_fsync = now
+        self.flush_count = 0
+        self.fsync_count = 0
+        self.max_flush_seconds = 0.0
+
+    def written(self, nbytes: int) -> bool:
+        """
+        Record written bytes and flush if the policy says so.
+
+        Args:
+            nbytes: Packet bytes just written
+
+        Returns:
+            True if a flush was done
+        """
+        self._pending_bytes += nbytes
+        return self.tick()
+
+    def tick(self) -> bool:
+        """
+        Flush unflushed bytes if the policy says so.
+
+        Call it regularly while no data is written (e.g. on read timeouts),
+        otherwise the last batch before a pause stays buffered.
+
+        Returns:
+            True if a flush was done
+        """
+        if not self._pending_bytes:
+            return False
+        policy = self.policy
+        if policy.max_bytes is not None and self._pending_bytes >= policy.max_bytes:
+            self.flush()
+            return True
+        if policy.interval is not None and time.monotonic() - self._last_flush >= policy.interval:
+            self.flush()
+            return True
+        return False
+
+    def flush(self, fsync: Optional[bool] = None, closed: bool = False) -> None:
+        """
+        Flush all outputs, fsync if due, and rewrite the flush marker.
+
+        Args:
+            fsync: Force (True) or skip (False) fsync (None: per policy)
+            closed: Record that the outputs are complete
+        """
+        started = time.monotonic()
+        for output in self.outputs:
+            output.flush()
+        if fsync is None:
+            interval = self.policy.fsync_interval
+            fsync = interval is not None and started - self._last_fsync >= interval
+        if fsync:
+            for output in self.outputs:
+                fd = _fileno(output)
+                if fd is not None:
+                    os.fsync(fd)
+            self._last_fsync = started
+            self.fsync_count += 1
+        if self.marker_path is not None:
+            self._write_marker(fsync, closed)
+        self._pending_bytes = 0
+        self._last_flush = time.monotonic()
+        self.flush_count += 1
+        self.max_flush_seconds = max(self.max_flush_seconds, self._last_flush - started)
+
+    def close(self) -> None:
+        """Final flush; fsyncs unless the policy never does."""
+        self.flush(fsync=self.policy.fsync_interval is not None, closed=True)
+
+    def _write_marker(self, fsynced: bool, closed: bool) -> None:
+        """Write the marker atomically (temporary file + rename)."""
+        marker = {
+            'version': FLUSH_MARKER_VERSION,
+            'flushed_at': datetime.now().isoformat(timespec='milliseconds'),
+            'fsynced': fsynced,
+            'closed': closed,
+        }
+        if self._state is not None:
+            marker.update(self._state())
+        sizes = {}
+        for output in self.outputs:
+            fd = _fileno(output)
+            path = getattr(output, 'path', None) or getattr(output, 'name', None)
+            if fd is not None and path is not None:
+                sizes[Path(str(path)).name] = os.fstat(fd).st_size
+        marker['file_sizes'] = sizes
+
+        temp_file = self.marker_path.with_name(self.marker_path.name + ".tmp")
+        with open(temp_file, 'w') as f:
+            json.dump(marker, f, indent=2)
+            if fsynced:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(temp_file, self.marker_path)
@@ -0,0 +1,369 @@
+"""
+Parsed data output writers.
+
+This module provides pluggable writers for parsed vibration samples:
+
+- csv:     text rows via csv.DictWriter (default, unchanged format)
+- npz:     typed, compressed NumPy column chunks (no extra dependency)
+- parquet: typed, compressed Parquet row groups (requires pyarrow)
+
+Columnar writers buffer at most one row group in memory and drop the
+millimetre columns (x_mm, x_mms, ...), which are exactly 1000 times the
+base-unit columns; the scale is recorded in the file metadata. Their
+files become readable only in close() (zip central directory, Parquet
+footer), so flush() does not make them survive a crash; live captures
+keep the raw file as the durable record.
+
+Author: Jnana Phani A (https://phani.zenithtek.in)
+Organization: Zenith Tek (https://zenithtek.in)
+"""
+
+import csv
+import json
+import logging
+import zipfile
+from pathlib import Path
+from typing import Dict, Iterator, List, Sequence, Union
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+logger = logging.getLogger(__name__)
+
+# Constants
+DEFAULT_ROW_GROUP_SIZE = 65536
+OUTPUT_FORMATS = ("csv", "npz", "parquet")
+# Formats whose flushed rows are readable before close()
+FLUSHABLE_FORMATS = ("csv",)
+OUTPUT_EXTENSIONS = {
+    "csv": ".csv",
+    "npz": ".npz",
+    "parquet": ".parquet",
+}
+
+# Storage type of each parsed column (anything else is float64)
+COLUMN_DTYPES = {
+    'count': 'u2',
+    'flag': 'u1',
+    'nd_flag': 'u1',
+    'ea_flag': 'u1',
+    'checksum': 'u2',
+    'checksum_ok': '?',
+}
+
+# Millimetre columns derived from base-unit columns (value = base * 1000)
+MILLI_COLUMNS = {
+    'x_mm': 'x_m', 'y_mm': 'y_m', 'z_mm': 'z_m',
+    'x_mms': 'x_ms', 'y_mms': 'y_ms', 'z_mms': 'z_ms',
+}
+MILLI_SCALE = 1000.0
+
+NPZ_METADATA_ENTRY = "metadata.json"
+
+
+class OutputWriter:
+    """Base class for parsed data writers."""
+
+    format_name = ""
+
+    def __init__(self, path: Union[str, Path], fieldnames: Sequence[str],
+                 row_group_size: int = DEFAULT_ROW_GROUP_SIZE):
+        """
+        Initialize writer.
+
+        Args:
+            path: Output file path
+            fieldnames: Parsed column names in output order
+            row_group_size: Rows buffered before a columnar chunk is written
+        """
+        self.path = Path(path)
+        self.fieldnames = list(fieldnames)
+        self.row_group_size = row_group_size
+        self.row_count = 0
+
+    def __enter__(self) -> "OutputWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def write_row(self, row: Dict) -> None:
+        """Write one parsed sample."""
+        raise NotImplementedError
+
+    def write_columns(self, columns: Dict[str, Sequence]) -> None:
+        """Write a batch of parsed samples given as equal-length columns."""
+        names = self.fieldnames
+        for values in zip(*(columns[name] for name in names)):
+            self.write_row(dict(zip(names, values)))
+
+    def flush(self) -> None:
+        """Flush written data to the OS.
+
+        Columnar writers do nothing here: pending row groups stay buffered
+        and the file is unreadable until close().
+        """
+
+    def close(self) -> None:
+        """Write pending data and close the file."""
+
+
+class CsvOutputWriter(OutputWriter):
+    """Write parsed samples as CSV rows."""
+
+    format_name = "csv"
+
+    def __init__(self, path: Union[str, Path], fieldnames: Sequence[str],
+                 row_group_size: int = DEFAULT_ROW_GROUP_SIZE, mode: str = 'w',
+                 header: bool = True, buffering: int = -1):
+        """
+        Initialize writer.
+
+        Args:
+            path: Output file path
+            fieldnames: Parsed column names in output order
+            row_group_size: Unused (rows are written immediately)
+            mode: File mode, 'w' to create or 'a' to append
+            header: Write the header row (only when creating)
+            buffering: Write buffer size in bytes (-1: default)
+        """
+        super().__init__(path, fieldnames, row_group_size)
+        self._file = open(self.path, mode, newline='', buffering=buffering)
+        self._writer = csv.DictWriter(self._file, fieldnames=self.fieldnames)
+        if mode == 'w' and header:
+            self._writer.writeheader()
+
+    @property
+    def file(self):
+        """Underlying text file."""
+        return self._file
+
+    def write_row(self, row: Dict) -> None:
+        self._writer.writerow(row)
+        self.row_count += 1
+
+    def write_columns(self, columns: Dict[str, Sequence]) -> None:
+        rows = zip(*(columns[name] for name in self.fieldnames))
+        writer = csv.writer(self._file)
+        for row in rows:
+            writer.writerow(row)
+            self.row_count += 1
+
+    def flush(self) -> None:
+        self._file.flush()
+
+    def fileno(self) -> int:
+        """File descriptor (e.g. for os.fsync)."""
+        return self._file.fileno()
+
+    def close(self) -> None:
+        if self._file:
+            self._file.close()
+            self._file = None
+
+
+class _ColumnarOutputWriter(OutputWriter):
+    """Buffer rows into bounded column chunks."""
+
+    def __init__(self, path: Union[str, Path], fieldnames: Sequence[str],
+                 row_group_size: int = DEFAULT_ROW_GROUP_SIZE):
+        if np is None:
+            raise ImportError("numpy is not installed. Install it with: pip install numpy")
+        super().__init__(path, fieldnames, row_group_size)
+        self.columns = [name for name in self.fieldnames if name not in MILLI_COLUMNS]
+        self.row_groups = 0
+        self._pending: Dict[str, List] = {name: [] for name in self.columns}
+        self._pending_rows = 0
+
+    def metadata(self) -> Dict:
+        """Describe stored columns and the dropped millimetre columns."""
+        return {
+            'fieldnames': self.fieldnames,
+            'columns': self.columns,
+            'derived_columns': {
+                name: {'source': MILLI_COLUMNS[name], 'scale': MILLI_SCALE}
+                for name in self.fieldnames if name in MILLI_COLUMNS
+            },
+        }
+
+    def write_row(self, row: Dict) -> None:
+        for name in self.columns:
+            self._pending[name].append(row[name])
+        self._pending_rows += 1
+        if self._pending_rows >= self.row_group_size:
+            self._flush_pending()
+
+    def write_columns(self, columns: Dict[str, Sequence]) -> None:
+        length = len(columns[self.columns[0]])
+        start = 0
+        while start < length:
+            take = min(self.row_group_size - self._pending_rows, length - start)
+            for name in self.columns:
+                self._pending[name].extend(columns[name][start:start + take])
+            self._pending_rows += take
+            start += take
+            if self._pending_rows >= self.row_group_size:
+                self._flush_pending()
+
+    def _flush_pending(self) -> None:
+        if not self._pending_rows:
+            return
+        group = {
+            name: np.asarray(values, dtype=COLUMN_DTYPES.get(name, 'f8'))
+            for name, values in self._pending.items()
+        }
+        self._write_group(group)
+        self.row_count += self._pending_rows
+        self.row_groups += 1
+        self._pending = {name: [] for name in self.columns}
+        self._pending_rows = 0
+
+    def _write_group(self, group: Dict[str, object]) -> None:
+        raise NotImplementedError
+
+
+class NpzOutputWriter(_ColumnarOutputWriter):
+    """Write parsed samples as compressed NumPy column chunks.
+
+    Each row group is stored as one ``<column>.<group>.npy`` entry per
+    column inside a deflate-compressed .npz archive; read it back with
+    load_npz_columns() or iter_npz_groups(). The central directory and
+    metadata are written by close(): a file that was never closed (crash,
+    power loss) cannot be read, including its completed row groups.
+    """
+
+    format_name = "npz"
+
+    def __init__(self, path: Union[str, Path], fieldnames: Sequence[str],
+                 row_group_size: int = DEFAULT_ROW_GROUP_SIZE):
+        super().__init__(path, fieldnames, row_group_size)
+        self._zip = zipfile.ZipFile(self.path, 'w', compression=zipfile.ZIP_DEFLATED)
+
+    def _write_group(self, group: Dict[str, object]) -> None:
+        for name, values in group.items():
+            with self._zip.open(f"{name}.{self.row_groups:06d}.npy", 'w', force_zip64=True) as entry:
+                np.lib.format.write_array(entry, values, allow_pickle=False)
+
+    def close(self) -> None:
+        if self._zip is None:
+            return
+        self._flush_pending()
+        metadata = self.metadata()
+        metadata.update({'row_groups': self.row_groups, 'rows': self.row_count})
+        self._zip.writestr(NPZ_METADATA_ENTRY, json.dumps(metadata))
+        self._zip.close()
+        self._zip = None
+
+
+class ParquetOutputWriter(_ColumnarOutputWriter):
+    """Write parsed samples as compressed Parquet row groups.
+
+    Like NpzOutputWriter, the file is readable only after close(), which
+    writes the Parquet footer.
+    """
+
+    format_name = "parquet"
+
+    def __init__(self, path: Union[str, Path], fieldnames: Sequence[str],
+                 row_group_size: int = DEFAULT_ROW_GROUP_SIZE, compression: str = "zstd"):
+        if pq is None:
+            raise ImportError("pyarrow is not installed. Install it with: pip install pyarrow")
+        super().__init__(path, fieldnames, row_group_size)
+        fields = [pa.field(name, pa.from_numpy_dtype(np.dtype(COLUMN_DTYPES.get(name, 'f8'))))
+                  for name in self.columns]
+        schema = pa.schema(fields, metadata={'vibration': json.dumps(self.metadata())})
+        self._writer = pq.ParquetWriter(str(self.path), schema, compression=compression)
+
+    def _write_group(self, group: Dict[str, object]) -> None:
+        table = pa.Table.from_arrays([group[name] for name in self.columns], names=self.columns)
+        self._writer.write_table(table)
+
+    def close(self) -> None:
+        if self._writer is None:
+            return
+        self._flush_pending()
+        self._writer.close()
+        self._writer = None
+
+
+def create_writer(output_format: str, path: Union[str, Path], fieldnames: Sequence[str],
+                  row_group_size: int = DEFAULT_ROW_GROUP_SIZE, buffering: int = -1) -> OutputWriter:
+    """
+    Create a parsed data writer.
+
+    Args:
+        output_format: "csv", "npz" or "parquet"
+        path: Output file path
+        fieldnames: Parsed column names in output order
+        row_group_size: Rows per columnar chunk
+        buffering: CSV write buffer size in bytes (-1: default)
+
+    Returns:
+        Opened OutputWriter
+    """
+    output_format = output_format.lower()
+    if output_format == "csv":
+        return CsvOutputWriter(path, fieldnames, row_group_size, buffering=buffering)
+    if output_format == "npz":
+        return NpzOutputWriter(path, fieldnames, row_group_size)
+    if output_format == "parquet":
+        return ParquetOutputWriter(path, fieldnames, row_group_size)
+    raise ValueError(f"Unsupported output format: {output_format}. Use {', '.join(OUTPUT_FORMATS)}")
+
+
+def iter_npz_groups(path: Union[str, Path]) -> Iterator[Dict[str, object]]:
+    """
+    Iterate row groups of an .npz output file.
+
+    Args:
+        path: File written by NpzOutputWriter
+
+    Yields:
+        Dictionary of column name to array, one per row group
+    """
+    if np is None:
+        raise ImportError("numpy is not installed. Install it with: pip install numpy")
+    with zipfile.ZipFile(path, 'r') as zf:
+        metadata = json.loads(zf.read(NPZ_METADATA_ENTRY))
+        for group in range(metadata['row_groups']):
+            columns = {}
+            for name in metadata['columns']:
+                with zf.open(f"{name}.{group:06d}.npy") as entry:
+                    columns[name] = np.lib.format.read_array(entry, allow_pickle=False)
+            yield columns
+
+
+def load_npz_columns(path: Union[str, Path], derived: bool = True) -> Dict[str, object]:
+    """
+    Load all columns of an .npz output file.
+
+    Args:
+        path: File written by NpzOutputWriter
+        derived: Recompute the dropped millimetre columns
+
+    Returns:
+        Dictionary of column name to array, in the original field order
+    """
+    with zipfile.ZipFile(path, 'r') as zf:
+        metadata = json.loads(zf.read(NPZ_METADATA_ENTRY))
+    groups = list(iter_npz_groups(path))
+    columns = {}
+    for name in metadata['fieldnames']:
+        if name in metadata['columns']:
+            if groups:
+                columns[name] = np.concatenate([group[name] for group in groups])
+            else:
+                columns[name] = np.empty(0, dtype=COLUMN_DTYPES.get(name, 'f8'))
+        elif derived:
+            info = metadata['derived_columns'][name]
+            columns[name] = columns[info['source']] * info['scale']
+    return columns
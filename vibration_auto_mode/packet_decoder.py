@@ -0,0 +1,254 @@
+"""
+Vectorized packet decoder module.
+
+This module decodes whole buffers of M-A542VR1 burst packets in one
+NumPy pass. The per-packet functions in parse_vibration_data.py remain the
+reference implementation; results produced here are bit-identical to them.
+
+Author: Jnana Phani A (https://phani.zenithtek.in)
+Organization: Zenith Tek (https://zenithtek.in)
+"""
+
+import logging
+from typing import Dict, Optional, Union
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+logger = logging.getLogger(__name__)
+
+# Constants
+PACKET_HEADER = 0x80
+PACKET_TERMINATOR = 0x0D
+SUPPORTED_PACKET_SIZES = (13, 19)
+
+# Temperature conversion (datasheet Table 1.3)
+TEMP2_SCALE = -0.9707008  # 8-bit format 2, 13-byte packets
+TEMP1_SCALE = -0.0037918  # 16-bit format 1, 19-byte packets
+TEMP_OFFSET = 34.987
+
+# Structured array layouts of decoded samples
+PACKET_13_DTYPE = [
+    ('temperature', 'f8'),
+    ('x', 'f8'),
+    ('y', 'f8'),
+    ('z', 'f8'),
+    ('count', 'u2'),
+    ('flag', 'u1'),
+]
+
+PACKET_19_DTYPE = [
+    ('temperature', 'f8'),
+    ('x', 'f8'),
+    ('y', 'f8'),
+    ('z', 'f8'),
+    ('count', 'u2'),
+    ('nd_flag', 'u1'),
+    ('ea_flag', 'u1'),
+    ('checksum', 'u2'),
+]
+
+# Byte offset of the X, Y and Z fields inside each packet
+AXIS_OFFSETS = {
+    13: (3, 6, 9),
+    19: (5, 8, 11),
+}
+
+# CHECKSUM terms of a 19-byte packet (datasheet Section 4.10): ND/EA, TEMP,
+# the lower 16 bits of each axis and COUNT are added as 16-bit words, the
+# upper byte of each axis as 8 bits
+CHECKSUM_WORD_OFFSETS = (1, 3, 6, 9, 12, 14)
+CHECKSUM_BYTE_OFFSETS = (5, 8, 11)
+
+# Column suffixes used by the CSV output (base unit, milli unit)
+UNIT_SUFFIXES = {
+    "displacement": ("m", "mm"),
+    "velocity": ("ms", "mms"),
+}
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError("numpy is not installed. Install it with: pip install numpy")
+
+
+def packet_dtype(packet_size: int):
+    """Get the structured dtype for decoded packets.
+
+    Args:
+        packet_size: Packet size (13 or 19 bytes)
+
+    Returns:
+        NumPy dtype of the decoded sample array
+    """
+    _require_numpy()
+    if packet_size == 13:
+        return np.dtype(PACKET_13_DTYPE)
+    if packet_size == 19:
+        return np.dtype(PACKET_19_DTYPE)
+    raise ValueError(f"Invalid packet size: {packet_size}. Use 13 or 19")
+
+
+def frames_from_buffer(data: Union[bytes, bytearray, memoryview], packet_size: int):
+    """View a contiguous byte buffer as an (N, packet_size) frame array.
+
+    The view shares memory with ``data`` (no copy). Trailing bytes that do
+    not form a complete packet are ignored.
+
+    Args:
+        data: Buffer holding back-to-back packets
+        packet_size: Packet size (13 or 19 bytes)
+
+    Returns:
+        2-D uint8 array with one packet per row
+    """
+    _require_numpy()
+    if packet_size not in SUPPORTED_PACKET_SIZES:
+        raise ValueError(f"Invalid packet size: {packet_size}. Use 13 or 19")
+    count = len(data) // packet_size
+    return np.frombuffer(data, dtype=np.uint8, count=count * packet_size).reshape(count, packet_size)
+
+
+def valid_frame_mask(frames):
+    """Get a mask of frames that start with 0x80 and end with 0x0D.
+
+    Args:
+        frames: 2-D uint8 frame array
+
+    Returns:
+        Boolean array, True for well-framed packets
+    """
+    return (frames[:, 0] == PACKET_HEADER) & (frames[:, -1] == PACKET_TERMINATOR)
+
+
+def checksum_19byte(frames):
+    """Calculate the CHECKSUM of every 19-byte frame.
+
+    Vectorized calculate_checksum_19byte(); bytes 16-18 are not read, so
+    this is also used to fill in the CHECKSUM of generated frames.
+
+    Args:
+        frames: 2-D uint8 array of 19-byte frames
+
+    Returns:
+        uint16 array with one checksum per frame
+    """
+    _require_numpy()
+    total = np.zeros(len(frames), dtype=np.uint32)
+    for offset in CHECKSUM_WORD_OFFSETS:
+        total += _uint16(frames, offset)
+    for offset in CHECKSUM_BYTE_OFFSETS:
+        total += frames[:, offset]
+    return (total & 0xFFFF).astype(np.uint16)
+
+
+def checksum_mask(frames):
+    """Get a mask of 19-byte frames whose CHECKSUM matches.
+
+    Vectorized verify_checksum_19byte().
+
+    Args:
+        frames: 2-D uint8 array of 19-byte frames
+
+    Returns:
+        Boolean array, True for frames with a valid checksum
+    """
+    return checksum_19byte(frames) == _uint16(frames, 16)
+
+
+def _dec24(frames, offset: int):
+    """Vectorized to_dec24() over the 3 bytes starting at ``offset``."""
+    b1 = frames[:, offset].astype(np.int64)
+    b2 = frames[:, offset + 1].astype(np.int64)
+    b3 = frames[:, offset + 2].astype(np.int64)
+    msb2 = (b1 & 0xC0) >> 6
+    dec = ((b1 & 0x3F) << 16) + (b2 << 8) + b3
+    # Same operation order as to_dec24 so results are bit-identical
+    return ((msb2 & 0b10) * -1 + (msb2 & 0b01)) + dec / 2**22
+
+
+def _uint16(frames, offset: int):
+    return (frames[:, offset].astype(np.uint16) << 8) | frames[:, offset + 1]
+
+
+def decode_frames(frames, packet_size: Optional[int] = None):
+    """Decode an (N, packet_size) frame array into a structured array.
+
+    Framing bytes are not checked; use valid_frame_mask() to filter first.
+
+    Args:
+        frames: 2-D uint8 frame array
+        packet_size: Packet size (default: frames.shape[1])
+
+    Returns:
+        Structured array with one decoded sample per frame
+    """
+    _require_numpy()
+    if packet_size is None:
+        packet_size = frames.shape[1]
+    out = np.empty(len(frames), dtype=packet_dtype(packet_size))
+
+    if packet_size == 13:
+        # TEMP2_H: 8-bit signed temperature; TEMP2_L: flags [7:2], counter [1:0]
+        out['temperature'] = frames[:, 1].view(np.int8) * TEMP2_SCALE + TEMP_OFFSET
+        out['flag'] = frames[:, 2] & 0b11111100
+        out['count'] = frames[:, 2] & 0b11
+    else:
+        out['nd_flag'] = frames[:, 1]
+        out['ea_flag'] = frames[:, 2]
+        out['temperature'] = _uint16(frames, 3).view(np.int16) * TEMP1_SCALE + TEMP_OFFSET
+        out['count'] = _uint16(frames, 14)
+        out['checksum'] = _uint16(frames, 16)
+
+    x_off, y_off, z_off = AXIS_OFFSETS[packet_size]
+    out['x'] = _dec24(frames, x_off)
+    out['y'] = _dec24(frames, y_off)
+    out['z'] = _dec24(frames, z_off)
+    return out
+
+
+def decode_packets(data: Union[bytes, bytearray, memoryview], packet_size: int,
+                   drop_invalid: bool = True):
+    """Decode a contiguous buffer of N packets in one vectorized pass.
+
+    Args:
+        data: Buffer holding back-to-back packets
+        packet_size: Packet size (13 or 19 bytes)
+        drop_invalid: Drop frames without 0x80 header / 0x0D terminator
+
+    Returns:
+        Structured array of decoded samples (see PACKET_13_DTYPE / PACKET_19_DTYPE)
+    """
+    frames = frames_from_buffer(data, packet_size)
+    if drop_invalid:
+        mask = valid_frame_mask(frames)
+        if not mask.all():
+            logger.debug("Dropping %d invalid frames", int(len(mask) - mask.sum()))
+            frames = frames[mask]
+    return decode_frames(frames, packet_size)
+
+
+def to_columns(decoded, output_type: str = "displacement") -> Dict[str, object]:
+    """Expand decoded samples into the parser's CSV columns.
+
+    Column names and order match parse_packet_13byte / parse_packet_19byte.
+
+    Args:
+        decoded: Structured array from decode_frames() / decode_packets()
+        output_type: "displacement" or "velocity"
+
+    Returns:
+        Ordered mapping of column name to array
+    """
+    unit, milli_unit = UNIT_SUFFIXES["displacement" if output_type.lower() == "displacement" else "velocity"]
+    columns = {'temperature': decoded['temperature']}
+    for axis in ('x', 'y', 'z'):
+        columns[f"{axis}_{unit}"] = decoded[axis]
+    for axis in ('x', 'y', 'z'):
+        columns[f"{axis}_{milli_unit}"] = decoded[axis] * 1000.0
+    for name in decoded.dtype.names:
+        if name not in columns and name not in ('x', 'y', 'z'):
+            columns[name] = decoded[name]
+    return columns
@@ -0,0 +1,179 @@
+"""
+Packet framer module.
+
+This module splits a received serial byte stream into M-A542VR1 burst
+packets (0x80 ... 0x0D). Received bytes go into a preallocated bytearray;
+frame boundaries are found with bytes.find() and strided slices, and
+aligned frames are returned in whole batches as zero-copy memoryviews.
+
+Error accounting matches the original per-byte collector loop exactly:
+- a byte that is not 0x80 where a packet should start is one resync error
+  (only counted once at least packet_size bytes are buffered)
+- a packet starting with 0x80 but not ending with 0x0D is one bad frame
+  error and its packet_size bytes are consumed
+
+Author: Jnana Phani A (https://phani.zenithtek.in)
+Organization: Zenith Tek (https://zenithtek.in)
+"""
+
+import logging
+from typing import Iterator, Union
+
+logger = logging.getLogger(__name__)
+
+# Constants
+PACKET_HEADER = 0x80
+PACKET_TERMINATOR = 0x0D
+DEFAULT_CAPACITY = 1 << 16
+# Frames checked per strided header/terminator slice
+CHECK_FRAMES = 256
+
+_HEADER_BYTE = bytes([PACKET_HEADER])
+_TERMINATOR_BYTE = bytes([PACKET_TERMINATOR])
+
+
+class PacketFramer:
+    """Frame packets from a byte stream held in a preallocated buffer.
+
+    Usage::
+
+        framer = PacketFramer(13)
+        framer.feed(serial_data)
+        for batch in framer.frames():
+            ...  # memoryview of len(batch) // 13 back-to-back packets
+
+    Batches are views into the internal buffer and are only valid until the
+    next feed() / reserve().
+
+    Attributes:
+        packet_size: Packet size in bytes
+        frame_count: Good frames returned so far
+        resync_bytes: Bytes skipped while searching for 0x80
+        bad_frames: Frames discarded for a missing 0x0D terminator
+    """
+
+    def __init__(self, packet_size: int, capacity: int = DEFAULT_CAPACITY):
+        """
+        Initialize framer.
+
+        Args:
+            packet_size: Packet size in bytes (13 or 19 for M-A542VR1)
+            capacity: Initial buffer size in bytes (grows if needed)
+        """
+        if packet_size < 2:
+            raise ValueError(f"Invalid packet size: {packet_size}")
+        self.packet_size = packet_size
+        self._buffer = bytearray(max(capacity, packet_size))
+        self._view = memoryview(self._buffer)
+        self._start = 0
+        self._end = 0
+        self.frame_count = 0
+        self.resync_bytes = 0
+        self.bad_frames = 0
+
+    @property
+    def error_count(self) -> int:
+        """Resync bytes plus bad frames (the collectors' error count)."""
+        return self.resync_bytes + self.bad_frames
+
+    @property
+    def buffered(self) -> int:
+        """Bytes received but not yet consumed."""
+        return self._end - self._start
+
+    def reserve(self, size: int) -> memoryview:
+        """
+        Get a writable view of at least ``size`` free bytes at the end of
+        the buffer, e.g. for ``serial.readinto()``. Call commit() with the
+        number of bytes actually written.
+
+        Args:
+            size: Bytes needed
+
+        Returns:
+            Writable memoryview of the free space
+        """
+        pending = self._end - self._start
+        if len(self._buffer) - self._end < size:
+            if len(self._buffer) - pending >= size:
+                # Move unconsumed bytes to the front (no reallocation)
+                self._buffer[:pending] = self._buffer[self._start:self._end]
+            else:
+                buffer = bytearray(max(2 * len(self._buffer), pending + size))
+                buffer[:pending] = self._buffer[self._start:self._end]
+                self._buffer = buffer
+                self._view = memoryview(buffer)
+            self._start, self._end = 0, pending
+        return self._view[self._end:]
+
+    def commit(self, count: int) -> None:
+        """
+        Mark ``count`` bytes written into the view from reserve() as received.
+
+        Args:
+            count: Bytes written
+        """
+        self._end += count
+
+    def feed(self, data: Union[bytes, bytearray, memoryview]) -> None:
+        """
+        Append received bytes.
+
+        Args:
+            data: Received bytes
+        """
+        size = len(data)
+        if size:
+            self.reserve(size)[:size] = data
+            self._end += size
+
+    def frames(self) -> Iterator[memoryview]:
+        """
+        Consume buffered bytes and yield batches of aligned frames.
+
+        Yields:
+            memoryview of n * packet_size bytes (n >= 1 good packets)
+        """
+        size = self.packet_size
+        buffer = self._buffer
+        pos, end = self._start, self._end
+        while end - pos >= size:
+            if buffer[pos] != PACKET_HEADER:
+                # Skip to the next 0x80 that still has a full packet behind it
+                limit = end - size + 1
+                found = buffer.find(_HEADER_BYTE, pos, limit)
+                if found < 0:
+                    self.resync_bytes += limit - pos
+                    pos = limit
+                    break
+                self.resync_bytes += found - pos
+                pos = found
+
+            # Extend over aligned frames, checking headers and terminators
+            # of up to CHECK_FRAMES frames per strided slice
+            batch_end = pos
+            while True:
+                count = min((end - batch_end) // size, CHECK_FRAMES)
+                if count == 0:
+                    break
+                stop = batch_end + count * size
+                headers = buffer[batch_end:stop:size]
+                terminators = buffer[batch_end + size - 1:stop:size]
+                good = min(count - len(headers.lstrip(_HEADER_BYTE)),
+                           count - len(terminators.lstrip(_TERMINATOR_BYTE)))
+                batch_end += good * size
+                if good < count:
+                    break
+
+            if batch_end > pos:
+                self._start = batch_end
+                self.frame_count += (batch_end - pos) // size
+                yield self._view[pos:batch_end]
+                pos = batch_end
+            else:
+                # 0x80 without 0x0D terminator: drop the whole packet
+                self.bad_frames += 1
+                pos += size
+        self._start = pos
+        if self._start == self._end:
+            self._start = self._end = 0
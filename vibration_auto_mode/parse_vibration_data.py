@@ -11,10 +11,17 @@ Organization: Zenith Tek (https://zenithtek.in)
 
 import argparse
 import csv
+import json
 import logging
+import os
+import shutil
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from operator import itemgetter
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Sequence
 
 # Configure logging
 logging.basicConfig(
@@ -64,10 +71,93 @@ def to_dec24(b1: int, b2: int, b3: int) -> float:
     return (msb2 & 0b10) * -1 + (msb2 & 0b01) + dec / 2**22
 
 
+# Field widths (in bytes) of each comma-separated hex value in raw CSV lines
+# 13-byte: ADDR, TEMP2_H, TEMP2_L, X(3), Y(3), Z(3), CR
+# 19-byte: ADDR, ND, EA, TEMP1_H, TEMP1_L, X(3), Y(3), Z(3), COUNT(2), CHECKSUM(2), CR
+PACKET_FIELD_LAYOUTS = {
+    13: (1, 1, 1, 3, 3, 3, 1),
+    19: (1, 1, 1, 1, 1, 3, 3, 3, 2, 2, 1),
+}
+
+
+def _csv_line_layout(packet_size: int) -> tuple:
+    """
+    Precompute the text layout of a well-formed raw CSV line.
+    
+    Returns:
+        Tuple of (line length without newline, comma positions,
+        itemgetter of the comma positions, expected separators)
+    """
+    positions = []
+    pos = 0
+    for width in PACKET_FIELD_LAYOUTS[packet_size]:
+        pos += 2 * width
+        positions.append(pos)
+        pos += 1
+    length = positions.pop()
+    return length, tuple(positions), itemgetter(*positions), (',',) * len(positions)
+
+
+# Fast path layouts of raw CSV lines for each packet size
+CSV_LINE_LAYOUTS = {size: _csv_line_layout(size) for size in PACKET_FIELD_LAYOUTS}
+
+
+def format_packet_as_csv(packet: Sequence[int], packet_size: int = 13) -> str:
+    """
+    Format packet bytes as a raw CSV line (without newline).
+    
+    This is the inverse of parse_csv_line_to_bytes() and produces the same
+    text as the collector's raw data files.
+    
+    Args:
+        packet: Packet bytes
+        packet_size: Packet size (13 or 19 bytes)
+    
+    Returns:
+        Comma-separated lowercase hex string
+    """
+    data = bytes(packet)
+    hex_values = []
+    pos = 0
+    for width in PACKET_FIELD_LAYOUTS[packet_size]:
+        hex_values.append(data[pos:pos + width].hex())
+        pos += width
+    return ','.join(hex_values)
+
+
 def parse_csv_line_to_bytes(line: str, packet_size: int = 13) -> Optional[List[int]]:
     """
     Parse a CSV line back into byte list.
     
+    Lines in the collector's exact layout are decoded in one bytes.fromhex()
+    call; anything else goes through the tolerant field-by-field parser.
+    
+    Args:
+        line: CSV line with comma-separated hex values
+        packet_size: Expected packet size (13 or 19 bytes)
+    
+    Returns:
+        List of bytes, or None if invalid
+    """
+    layout = CSV_LINE_LAYOUTS.get(packet_size)
+    if layout is not None:
+        text = line.strip()
+        length, _, commas, separators = layout
+        if len(text) == length and commas(text) == separators:
+            try:
+                packet = bytes.fromhex(text.replace(',', ''))
+            except ValueError:
+                packet = b''
+            # fromhex skips whitespace, so also check the decoded length
+            if len(packet) == packet_size:
+                return list(packet)
+    return _parse_csv_line_tolerant(line, packet_size)
+
+
+def _parse_csv_line_tolerant(line: str, packet_size: int = 13) -> Optional[List[int]]:
+    """
+    Parse a CSV line field by field (accepts any mix of 1, 2 and 3 byte fields).
+    
     Args:
         line: CSV line with comma-separated hex values
         packet_size: Expected packet size (13 or 19 bytes)
@@ -114,6 +204,44 @@ def parse_csv_line_to_bytes(line: str, packet_size: int = 13) -> Optional[List[i
         return None
 
 
+def calculate_checksum_19byte(packet: Sequence[int]) -> int:
+    """
+    Calculate the CHECKSUM of a 19-byte packet.
+    
+    Datasheet Section 4.10: ND/EA, TEMP, the lower 16 bits of each axis
+    and COUNT are added as 16-bit words, the upper byte of each axis is
+    added as 8 bits, and the sum is truncated to 16 bits.
+    
+    Args:
+        packet: 19-byte packet
+    
+    Returns:
+        16-bit checksum
+    """
+    total = (to_uint16(packet[1], packet[2])      # ND/EA
+             + to_uint16(packet[3], packet[4])    # TEMP
+             + packet[5] + to_uint16(packet[6], packet[7])     # X
+             + packet[8] + to_uint16(packet[9], packet[10])    # Y
+             + packet[11] + to_uint16(packet[12], packet[13])  # Z
+             + to_uint16(packet[14], packet[15]))  # COUNT
+    return total & 0xFFFF
+
+
+def verify_checksum_19byte(packet: Sequence[int]) -> bool:
+    """
+    Verify the CHECKSUM field of a 19-byte packet.
+    
+    Args:
+        packet: 19-byte packet
+    
+    Returns:
+        True if the received checksum matches the packet contents
+    """
+    if len(packet) != 19:
+        return False
+    return calculate_checksum_19byte(packet) == to_uint16(packet[16], packet[17])
+
+
 def parse_packet_13byte(packet: List[int], output_type: str = "displacement") -> Optional[Dict]:
     """
     Parse 13-byte packet at 460.8 kbps.
@@ -241,121 +369,691 @@ def parse_packet_19byte(packet: List[int], output_type: str = "displacement") ->
         return None
 
 
+def get_fieldnames(packet_size: int, output_type: str = "displacement",
+                   checksum_column: bool = False) -> List[str]:
+    """
+    Get parsed CSV column names.
+    
+    Args:
+        packet_size: Packet size (13 or 19 bytes)
+        output_type: "displacement" or "velocity"
+        checksum_column: Append the checksum_ok column (19-byte only)
+    
+    Returns:
+        List of column names in output order
+    """
+    if packet_size == 13:
+        if output_type.lower() == "displacement":
+            return [
+                'temperature', 'x_m', 'y_m', 'z_m', 
+                'x_mm', 'y_mm', 'z_mm', 'count', 'flag'
+            ]
+        else:  # velocity
+            return [
+                'temperature', 'x_ms', 'y_ms', 'z_ms',
+                'x_mms', 'y_mms', 'z_mms', 'count', 'flag'
+            ]
+    else:  # 19-byte
+        if output_type.lower() == "displacement":
+            fieldnames = [
+                'temperature', 'x_m', 'y_m', 'z_m',
+                'x_mm', 'y_mm', 'z_mm', 'count', 
+                'nd_flag', 'ea_flag', 'checksum'
+            ]
+        else:  # velocity
+            fieldnames = [
+                'temperature', 'x_ms', 'y_ms', 'z_ms',
+                'x_mms', 'y_mms', 'z_mms', 'count',
+                'nd_flag', 'ea_flag', 'checksum'
+            ]
+        if checksum_column:
+            fieldnames.append('checksum_ok')
+        return fieldnames
+
+
 # ============================================================================
 # Main Parser Class
 # ============================================================================
 
+# Number of chunks scheduled per worker (smooths out uneven chunks)
+CHUNKS_PER_WORKER = 4
+# Smallest byte range worth handing to a worker
+MIN_CHUNK_BYTES = 1 << 20
+# Number of parse errors logged individually
+MAX_LOGGED_ERRORS = 10
+# Handling of 19-byte packets with a bad CHECKSUM:
+# drop = exclude from output, flag = keep with checksum_ok column, off = no check
+CHECKSUM_POLICIES = ("drop", "flag", "off")
+# Packets per vectorized CHECKSUM check
+CHECKSUM_BATCH_SIZE = 8192
+# Incremental parsing: sidecar checkpoint next to the output file
+CHECKPOINT_SUFFIX = ".checkpoint.json"
+CHECKPOINT_VERSION = 1
+# Seconds between polls of the input file in follow mode
+FOLLOW_INTERVAL = 1.0
+
+
 class VibrationDataParser:
     """Parse raw vibration data CSV files."""
     
     def __init__(self, input_file: str, output_file: Optional[str] = None, 
-                 packet_size: int = 13, output_type: str = "displacement"):
+                 packet_size: int = 13, output_type: str = "displacement",
+                 workers: int = 1, output_format: str = "csv",
+                 gap_index: bool = False, checksum: str = "drop"):
         """
         Initialize parser.
         
         Args:
-            input_file: Path to input CSV file
+            input_file: Path to input raw file (hex CSV or binary capture)
             output_file: Path to output CSV file (auto-generated if None)
             packet_size: Packet size (13 or 19 bytes)
             output_type: "displacement" or "velocity"
+            workers: Number of parser processes (0 = one per CPU core)
+            output_format: Parsed data format: "csv", "npz" or "parquet"
+            gap_index: Run counter gap analysis and write <output>_gaps.csv
+            checksum: Bad CHECKSUM handling for 19-byte packets:
+                      "drop", "flag" or "off"
         """
+        from output_writers import OUTPUT_EXTENSIONS
+        
         self.input_file = Path(input_file)
         self.packet_size = packet_size
         self.output_type = output_type.lower()
+        self.output_format = output_format.lower()
+        if self.output_format not in OUTPUT_EXTENSIONS:
+            raise ValueError(f"Unsupported output format: {output_format}")
+        self.workers = workers if workers > 0 else (os.cpu_count() or 1)
+        self.gap_index = gap_index
+        self.checksum = checksum.lower()
+        if self.checksum not in CHECKSUM_POLICIES:
+            raise ValueError(f"Unsupported checksum policy: {checksum}")
+        self.gap_report: Optional[Dict] = None
+        self.parsed_count = 0
+        self.error_count = 0
+        self.checksum_error_count = 0
         
         if output_file:
             self.output_file = Path(output_file)
         else:
             # Generate output filename
             stem = self.input_file.stem.replace('_raw', '_parsed')
-            self.output_file = self.input_file.parent / f"{stem}.csv"
+            self.output_file = self.input_file.parent / f"{stem}{OUTPUT_EXTENSIONS[self.output_format]}"
+        self.checkpoint_file = self.output_file.with_name(self.output_file.name + CHECKPOINT_SUFFIX)
         
-        # Select parser function
+        self._set_packet_size(packet_size)
+    
+    def _set_packet_size(self, packet_size: int):
+        """Select parser function for the packet size."""
         if packet_size == 13:
             self.parse_func = parse_packet_13byte
         elif packet_size == 19:
             self.parse_func = parse_packet_19byte
         else:
             raise ValueError(f"Invalid packet size: {packet_size}. Use 13 or 19")
+        self.packet_size = packet_size
     
-    def parse_file(self):
-        """Parse the input CSV file and save to output CSV."""
-        if not self.input_file.exists():
-            raise FileNotFoundError(f"Input file not found: {self.input_file}")
+    def get_fieldnames(self) -> List[str]:
+        """Get output column names for the current settings."""
+        return get_fieldnames(self.packet_size, self.output_type,
+                              checksum_column=self.packet_size == 19 and self.checksum == "flag")
+    
+    def _iter_input_packets(self, start: int = 0, stop: Optional[int] = None):
+        """
+        Iterate packets of the input file.
         
-        logger.info(f"Parsing file: {self.input_file}")
-        logger.info(f"Output file: {self.output_file}")
-        logger.info(f"Packet size: {self.packet_size} bytes")
-        logger.info(f"Output type: {self.output_type}")
+        Args:
+            start: First packet index (binary) or byte offset (hex CSV)
+            stop: End packet index (binary) or byte offset (hex CSV);
+                  None reads to the end of the file
+        
+        Yields:
+            Tuple of (line/packet number counted from start, packet bytes or
+            None if undecodable)
+        """
+        from raw_capture import BinaryCaptureReader, is_binary_capture
+        
+        if is_binary_capture(self.input_file):
+            with BinaryCaptureReader(self.input_file) as reader:
+                for packet_num, packet in enumerate(reader.iter_packets(start, stop), 1):
+                    yield packet_num, packet
+        elif start == 0 and stop is None:
+            with open(self.input_file, 'r') as infile:
+                for line_num, line in enumerate(infile, 1):
+                    yield line_num, parse_csv_line_to_bytes(line, self.packet_size)
+        else:
+            # Byte range of whole lines (start/stop are line-aligned)
+            with open(self.input_file, 'rb') as infile:
+                infile.seek(start)
+                position = start
+                line_num = 0
+                while stop is None or position < stop:
+                    line = infile.readline()
+                    if not line:
+                        break
+                    position += len(line)
+                    line_num += 1
+                    text = line.decode('utf-8', errors='replace')
+                    yield line_num, parse_csv_line_to_bytes(text, self.packet_size)
+    
+    def _parse_packets(self, packets, writer, log_progress: bool = True,
+                       counts: Optional[List[int]] = None) -> Dict:
+        """
+        Parse packets and write rows.
         
+        Args:
+            packets: Iterable of (line number, packet or None)
+            writer: OutputWriter for parsed rows
+            log_progress: Log progress and individual errors
+            counts: Optional list that receives the counter of every written row
+        
+        Returns:
+            Dictionary with line, parsed, error and checksum error counts
+            and the first errors as (line number, message) tuples
+        """
         parsed_count = 0
         error_count = 0
+        checksum_error_count = 0
+        line_count = 0
+        first_errors = []
+        verify = self.packet_size == 19 and self.checksum != "off"
+        if verify:
+            packets = self._check_packets(packets)
+        else:
+            packets = ((line_num, packet, True) for line_num, packet in packets)
         
-        # Determine fieldnames based on packet size and output type
-        if self.packet_size == 13:
-            if self.output_type == "displacement":
-                fieldnames = [
-                    'temperature', 'x_m', 'y_m', 'z_m', 
-                    'x_mm', 'y_mm', 'z_mm', 'count', 'flag'
-                ]
-            else:  # velocity
-                fieldnames = [
-                    'temperature', 'x_ms', 'y_ms', 'z_ms',
-                    'x_mms', 'y_mms', 'z_mms', 'count', 'flag'
-                ]
-        else:  # 19-byte
-            if self.output_type == "displacement":
-                fieldnames = [
-                    'temperature', 'x_m', 'y_m', 'z_m',
-                    'x_mm', 'y_mm', 'z_mm', 'count', 
-                    'nd_flag', 'ea_flag', 'checksum'
-                ]
-            else:  # velocity
-                fieldnames = [
-                    'temperature', 'x_ms', 'y_ms', 'z_ms',
-                    'x_mms', 'y_mms', 'z_mms', 'count',
-                    'nd_flag', 'ea_flag', 'checksum'
-                ]
-        
-        with open(self.input_file, 'r') as infile, \
-             open(self.output_file, 'w', newline='') as outfile:
-            
-            writer = csv.DictWriter(outfile, fieldnames=fieldnames)
-            writer.writeheader()
-            
-            for line_num, line in enumerate(infile, 1):
-                # Parse CSV line to bytes
-                packet = parse_csv_line_to_bytes(line, self.packet_size)
-                
-                if packet is None:
-                    error_count += 1
-                    if error_count <= 10:  # Log first 10 errors
-                        logger.warning(f"Line {line_num}: Failed to parse")
-                    continue
-                
+        for line_num, packet, checksum_ok in packets:
+            line_count = line_num
+            if packet is None:
+                message = "Failed to parse"
+            else:
                 # Parse packet
                 data = self.parse_func(packet, self.output_type)
-                
-                if data is None:
-                    error_count += 1
-                    if error_count <= 10:  # Log first 10 errors
-                        logger.warning(f"Line {line_num}: Failed to parse packet")
+                if data is not None:
+                    # Checksum failures are counted apart from framing errors
+                    if verify:
+                        if not checksum_ok:
+                            checksum_error_count += 1
+                            if self.checksum == "drop":
+                                continue
+                        if self.checksum == "flag":
+                            data['checksum_ok'] = checksum_ok
+                    
+                    # Write parsed data
+                    writer.write_row(data)
+                    parsed_count += 1
+                    if counts is not None:
+                        counts.append(data['count'])
+                    
+                    # Progress update every 10000 lines
+                    if log_progress and parsed_count % 10000 == 0:
+                        logger.info(f"Parsed {parsed_count} packets...")
                     continue
+                message = "Failed to parse packet"
+            
+            error_count += 1
+            if error_count <= MAX_LOGGED_ERRORS:  # Log first 10 errors
+                first_errors.append((line_num, message))
+                if log_progress:
+                    logger.warning(f"Line {line_num}: {message}")
+        
+        return {
+            'lines': line_count,
+            'parsed': parsed_count,
+            'errors': error_count,
+            'checksum_errors': checksum_error_count,
+            'first_errors': first_errors,
+        }
+    
+    def _check_packets(self, packets):
+        """
+        Pair packets with their CHECKSUM result.
+        
+        Checks CHECKSUM_BATCH_SIZE packets at a time with
+        packet_decoder.checksum_mask(), or one by one without NumPy.
+        
+        Args:
+            packets: Iterable of (line number, packet or None)
+        
+        Yields:
+            Tuple of (line number, packet or None, checksum ok)
+        """
+        from packet_decoder import checksum_mask, frames_from_buffer, np
+        
+        if np is None:
+            for line_num, packet in packets:
+                yield line_num, packet, packet is not None and verify_checksum_19byte(packet)
+            return
+        
+        packets = iter(packets)
+        batch = list(islice(packets, CHECKSUM_BATCH_SIZE))
+        while batch:
+            checked = [i for i, (_, packet) in enumerate(batch)
+                       if packet is not None and len(packet) == 19]
+            results = [False] * len(batch)
+            if checked:
+                frames = frames_from_buffer(b''.join(bytes(batch[i][1]) for i in checked), 19)
+                for i, checksum_ok in zip(checked, checksum_mask(frames).tolist()):
+                    results[i] = checksum_ok
+            for (line_num, packet), checksum_ok in zip(batch, results):
+                yield line_num, packet, checksum_ok
+            batch = list(islice(packets, CHECKSUM_BATCH_SIZE))
+    
+    def _plan_chunks(self) -> List[tuple]:
+        """
+        Split the input into ranges aligned on line (hex CSV) or packet
+        (binary) boundaries.
+        
+        Returns:
+            List of (start, stop) ranges for _iter_input_packets()
+        """
+        from raw_capture import BinaryCaptureReader, is_binary_capture
+        
+        if is_binary_capture(self.input_file):
+            with BinaryCaptureReader(self.input_file) as reader:
+                total = reader.packet_count
+                total_bytes = total * reader.packet_size
+            unit = self.packet_size
+        else:
+            total = total_bytes = self.input_file.stat().st_size
+            unit = 1
+        
+        n_chunks = min(self.workers * CHUNKS_PER_WORKER,
+                       max(1, total_bytes // MIN_CHUNK_BYTES))
+        boundaries = [total * i // n_chunks for i in range(n_chunks)] + [total]
+        
+        if unit == 1:
+            # Move each inner boundary to the start of the next line
+            with open(self.input_file, 'rb') as infile:
+                for i in range(1, n_chunks):
+                    infile.seek(boundaries[i] - 1)
+                    infile.readline()
+                    boundaries[i] = min(infile.tell(), total)
+        
+        return [
+            (boundaries[i], boundaries[i + 1])
+            for i in range(n_chunks)
+            if boundaries[i] < boundaries[i + 1]
+        ]
+    
+    def _parse_parallel(self, fieldnames: List[str]) -> Dict:
+        """Parse input ranges in a process pool and stitch the output in order."""
+        from output_writers import create_writer, iter_npz_groups
+        
+        # CSV parts are concatenated as text; columnar parts are re-chunked
+        part_format = "csv" if self.output_format == "csv" else "npz"
+        chunks = self._plan_chunks()
+        logger.info(f"Parsing {len(chunks)} chunks with {self.workers} workers")
+        
+        tasks = []
+        for index, (start, stop) in enumerate(chunks):
+            tasks.append({
+                'input_file': str(self.input_file),
+                'part_file': str(self.output_file.with_name(f".{self.output_file.name}.part{index:04d}")),
+                'packet_size': self.packet_size,
+                'output_type': self.output_type,
+                'output_format': part_format,
+                'checksum': self.checksum,
+                'start': start,
+                'stop': stop,
+            })
+        
+        totals = {'lines': 0, 'parsed': 0, 'errors': 0, 'checksum_errors': 0}
+        logged_errors = 0
+        try:
+            with ProcessPoolExecutor(max_workers=self.workers) as executor, \
+                 create_writer(self.output_format, self.output_file, fieldnames) as writer:
                 
-                # Write parsed data
-                writer.writerow(data)
-                parsed_count += 1
-                
-                # Progress update every 10000 lines
-                if parsed_count % 10000 == 0:
-                    logger.info(f"Parsed {parsed_count} packets...")
+                # executor.map yields results in submission order
+                for task, result in zip(tasks, executor.map(_parse_chunk, tasks)):
+                    for line_num, message in result['first_errors']:
+                        if logged_errors >= MAX_LOGGED_ERRORS:
+                            break
+                        logged_errors += 1
+                        logger.warning(f"Line {totals['lines'] + line_num}: {message}")
+                    
+                    if part_format == "csv":
+                        with open(task['part_file'], 'r', newline='') as part:
+                            shutil.copyfileobj(part, writer.file)
+                    else:
+                        for group in iter_npz_groups(task['part_file']):
+                            writer.write_columns(group)
+                    
+                    totals['lines'] += result['lines']
+                    totals['parsed'] += result['parsed']
+                    totals['errors'] += result['errors']
+                    totals['checksum_errors'] += result['checksum_errors']
+                    logger.info(f"Parsed {totals['parsed']} packets...")
+        finally:
+            for task in tasks:
+                Path(task['part_file']).unlink(missing_ok=True)
+        
+        return totals
+    
+    def parse_file(self) -> Dict:
+        """
+        Parse the input raw file (hex CSV or binary) and save parsed data.
+        
+        Returns:
+            Dictionary with parsed and error counts
+        """
+        if not self.input_file.exists():
+            raise FileNotFoundError(f"Input file not found: {self.input_file}")
+        
+        self._apply_binary_header()
+        
+        logger.info(f"Parsing file: {self.input_file}")
+        logger.info(f"Output file: {self.output_file}")
+        logger.info(f"Packet size: {self.packet_size} bytes")
+        logger.info(f"Output type: {self.output_type}")
+        logger.info(f"Output format: {self.output_format}")
+        if self.packet_size == 19:
+            logger.info(f"Checksum policy: {self.checksum}")
+        
+        from output_writers import create_writer
+        
+        fieldnames = self.get_fieldnames()
+        
+        if self.workers > 1:
+            result = self._parse_parallel(fieldnames)
+        else:
+            with create_writer(self.output_format, self.output_file, fieldnames) as writer:
+                result = self._parse_packets(self._iter_input_packets(), writer)
+        
+        self.parsed_count = result['parsed']
+        self.error_count = result['errors']
+        self.checksum_error_count = result['checksum_errors']
+        
+        # The output was rewritten from scratch; a checkpoint would be stale
+        if self.checkpoint_file.exists():
+            self.checkpoint_file.unlink()
         
         logger.info("\n" + "="*60)
         logger.info("Parsing Summary:")
-        logger.info(f"  Parsed packets: {parsed_count}")
-        logger.info(f"  Errors: {error_count}")
+        logger.info(f"  Parsed packets: {self.parsed_count}")
+        logger.info(f"  Errors: {self.error_count}")
+        if self.packet_size == 19:
+            logger.info(f"  Checksum errors: {self.checksum_error_count} ({self.checksum})")
         logger.info(f"  Output file: {self.output_file}")
         logger.info("="*60)
+        
+        if self.gap_index:
+            self.analyze_gaps()
+        
+        return {
+            'parsed': self.parsed_count,
+            'errors': self.error_count,
+            'checksum_errors': self.checksum_error_count,
+        }
+    
+    def _apply_binary_header(self) -> Optional[int]:
+        """
+        Take the packet size from a binary capture header.
+        
+        Returns:
+            Byte offset of the first packet for binary captures, else None
+        """
+        from raw_capture import BinaryCaptureReader, is_binary_capture
+        
+        if not is_binary_capture(self.input_file):
+            return None
+        with BinaryCaptureReader(self.input_file) as reader:
+            header, data_offset = reader.header, reader.data_offset
+        if header['packet_size'] != self.packet_size:
+            logger.info(f"Using packet size {header['packet_size']} from binary capture header")
+            self._set_packet_size(header['packet_size'])
+        return data_offset
+    
+    def _load_checkpoint(self) -> Optional[Dict]:
+        """
+        Load the incremental parsing checkpoint.
+        
+        Returns:
+            Checkpoint dictionary, or None to start from the beginning
+        """
+        if not self.checkpoint_file.exists():
+            return None
+        with open(self.checkpoint_file, 'r') as f:
+            checkpoint = json.load(f)
+        
+        settings = {
+            'packet_size': self.packet_size,
+            'output_type': self.output_type,
+            'checksum': self.checksum,
+        }
+        for key, value in settings.items():
+            if checkpoint.get(key) != value:
+                raise ValueError(
+                    f"Checkpoint {self.checkpoint_file} was written with {key}="
+                    f"{checkpoint.get(key)!r}, not {value!r}; delete it to parse from the start"
+                )
+        
+        if self.input_file.stat().st_size < checkpoint['byte_offset']:
+            logger.warning(f"{self.input_file} is shorter than the checkpoint offset "
+                           f"(truncated or replaced); parsing from the start")
+            return None
+        output_size = self.output_file.stat().st_size if self.output_file.exists() else -1
+        if output_size < checkpoint['output_bytes']:
+            logger.warning(f"{self.output_file} is shorter than recorded in the checkpoint; "
+                           f"parsing from the start")
+            return None
+        if output_size > checkpoint['output_bytes']:
+            # Rows written after the last checkpoint are parsed again
+            os.truncate(self.output_file, checkpoint['output_bytes'])
+        return checkpoint
+    
+    def _save_checkpoint(self, checkpoint: Dict) -> None:
+        """Write the checkpoint atomically (temporary file + rename)."""
+        temp_file = self.checkpoint_file.with_name(self.checkpoint_file.name + ".tmp")
+        with open(temp_file, 'w') as f:
+            json.dump(checkpoint, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_file, self.checkpoint_file)
+    
+    def _complete_lines_end(self, start: int) -> int:
+        """
+        Find the end of the last complete (newline-terminated) line.
+        
+        A line still being written by the collector is left for the next run.
+        
+        Args:
+            start: Byte offset to search from
+        
+        Returns:
+            Byte offset just past the last newline, or start if there is none
+        """
+        block_size = 1 << 16
+        with open(self.input_file, 'rb') as f:
+            position = f.seek(0, os.SEEK_END)
+            while position > start:
+                block_start = max(start, position - block_size)
+                f.seek(block_start)
+                block = f.read(position - block_start)
+                newline = block.rfind(b'\n')
+                if newline >= 0:
+                    return block_start + newline + 1
+                position = block_start
+        return start
+    
+    def parse_incremental(self) -> Dict:
+        """
+        Parse only data appended to the input since the last run.
+        
+        Progress is kept in a sidecar checkpoint (<output>.checkpoint.json)
+        holding the byte offset, line number, totals and packet counter
+        state. New rows are appended to the CSV output, so each run costs
+        time proportional to the new data only. Incomplete trailing lines
+        or packets are left for the next run.
+        
+        Returns:
+            Dictionary with parsed, error and checksum error counts of this run
+        """
+        if self.output_format != "csv":
+            raise ValueError("Incremental parsing appends rows and requires --format csv")
+        if not self.input_file.exists():
+            raise FileNotFoundError(f"Input file not found: {self.input_file}")
+        
+        from gap_analysis import GAP_INDEX_FIELDS, GapAnalyzer
+        from output_writers import CsvOutputWriter
+        
+        data_offset = self._apply_binary_header()
+        checkpoint = self._load_checkpoint()
+        resume = checkpoint is not None
+        if not resume:
+            checkpoint = {
+                'version': CHECKPOINT_VERSION,
+                'input_file': str(self.input_file),
+                'packet_size': self.packet_size,
+                'output_type': self.output_type,
+                'checksum': self.checksum,
+                'byte_offset': data_offset or 0,
+                'line_number': 0,
+                'output_bytes': 0,
+                'parsed': 0,
+                'errors': 0,
+                'checksum_errors': 0,
+                'counter': None,
+            }
+        
+        start = checkpoint['byte_offset']
+        if data_offset is None:
+            stop = self._complete_lines_end(start)
+            packets = self._iter_input_packets(start, stop)
+        else:
+            size = self.packet_size
+            first = (start - data_offset) // size
+            last = (self.input_file.stat().st_size - data_offset) // size
+            stop = data_offset + last * size
+            packets = self._iter_input_packets(first, last)
+        
+        analyzer = GapAnalyzer(self.packet_size)
+        if checkpoint['counter']:
+            analyzer.set_state(checkpoint['counter'])
+        self.gap_report = analyzer.report()
+        self.parsed_count = checkpoint['parsed']
+        self.error_count = checkpoint['errors']
+        self.checksum_error_count = checkpoint['checksum_errors']
+        
+        result = {'parsed': 0, 'errors': 0, 'checksum_errors': 0}
+        if stop <= start and resume:
+            return result
+        
+        line_base = checkpoint['line_number']
+        packets = ((line_base + line_num, packet) for line_num, packet in packets)
+        counts: List[int] = []
+        with CsvOutputWriter(self.output_file, self.get_fieldnames(),
+                             mode='a' if resume else 'w') as writer:
+            parsed = self._parse_packets(packets, writer, counts=counts)
+        
+        gaps = analyzer.update(counts)
+        if len(gaps['lost']):
+            logger.warning(f"Counter gaps: {int(gaps['lost'].sum())} lost samples "
+                           f"in {len(gaps['lost'])} gaps")
+        if self.gap_index:
+            gap_path = self.output_file.with_name(f"{self.output_file.stem}_gaps.csv")
+            with open(gap_path, 'a' if resume else 'w', newline='') as f:
+                gap_writer = csv.writer(f)
+                if not resume:
+                    gap_writer.writerow(GAP_INDEX_FIELDS)
+                gap_writer.writerows(zip(*(gaps[name].tolist() for name in GAP_INDEX_FIELDS)))
+        self.gap_report = analyzer.report()
+        
+        for key in result:
+            result[key] = parsed[key]
+            checkpoint[key] += parsed[key]
+        checkpoint.update({
+            'byte_offset': stop,
+            'line_number': max(line_base, parsed['lines']),
+            'output_bytes': self.output_file.stat().st_size,
+            'counter': analyzer.get_state(),
+            'updated': time.time(),
+        })
+        self._save_checkpoint(checkpoint)
+        
+        self.parsed_count = checkpoint['parsed']
+        self.error_count = checkpoint['errors']
+        self.checksum_error_count = checkpoint['checksum_errors']
+        logger.info(f"Parsed {result['parsed']} new packets ({result['errors']} errors), "
+                    f"{self.parsed_count} total, offset {stop}")
+        return result
+    
+    def follow(self, interval: float = FOLLOW_INTERVAL,
+               idle_timeout: Optional[float] = None) -> Dict:
+        """
+        Keep parsing data appended to the input, like ``tail -f``.
+        
+        Args:
+            interval: Seconds between polls of the input file
+            idle_timeout: Stop after this many seconds without new data
+                          (None = run until interrupted)
+        
+        Returns:
+            Dictionary with total parsed, error and checksum error counts
+        """
+        logger.info(f"Following {self.input_file} -> {self.output_file} (Ctrl+C to stop)")
+        last_data_time = time.time()
+        try:
+            while True:
+                if any(self.parse_incremental().values()):
+                    last_data_time = time.time()
+                elif idle_timeout is not None and time.time() - last_data_time >= idle_timeout:
+                    break
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            logger.info("\nFollow stopped by user")
+        
+        return {
+            'parsed': self.parsed_count,
+            'errors': self.error_count,
+            'checksum_errors': self.checksum_error_count,
+        }
+    
+    def analyze_gaps(self) -> Dict:
+        """
+        Detect lost samples from packet counters and write the gap index
+        next to the parsed output.
+        
+        Returns:
+            Gap report (see gap_analysis.GapAnalyzer.report)
+        """
+        from gap_analysis import analyze_capture, format_report
+        
+        gap_path = self.output_file.with_name(f"{self.output_file.stem}_gaps.csv")
+        self.gap_report = analyze_capture(self.input_file, self.packet_size, gap_index_path=gap_path,
+                                          drop_bad_checksum=self.checksum == "drop")
+        logger.info(f"Gap analysis:\n{format_report(self.gap_report)}")
+        logger.info(f"  Gap index: {gap_path}")
+        return self.gap_report
+
+
+def _parse_chunk(task: Dict) -> Dict:
+    """
+    Parse one input range into a part file (process pool worker).
+    
+    Args:
+        task: Dictionary with input_file, part_file, packet_size,
+              output_type, output_format, start and stop
+    
+    Returns:
+        Result of VibrationDataParser._parse_packets()
+    """
+    from output_writers import CsvOutputWriter, NpzOutputWriter
+    
+    parser = VibrationDataParser(
+        task['input_file'], task['part_file'],
+        task['packet_size'], task['output_type'],
+        checksum=task['checksum']
+    )
+    fieldnames = parser.get_fieldnames()
+    if task['output_format'] == "csv":
+        writer = CsvOutputWriter(task['part_file'], fieldnames, header=False)
+    else:
+        writer = NpzOutputWriter(task['part_file'], fieldnames)
+    with writer:
+        return parser._parse_packets(
+            parser._iter_input_packets(task['start'], task['stop']),
+            writer, log_progress=False
+        )
 
 
 # ============================================================================
@@ -380,19 +1078,31 @@ Examples:
   
   # Specify output file
   python parse_vibration_data.py input.csv --output parsed_data.csv
+  
+  # Save parsed data as compressed NumPy column chunks
+  python parse_vibration_data.py input.csv --format npz
+  
+  # Parse a large file with 8 worker processes
+  python parse_vibration_data.py input.csv --workers 8
+  
+  # Parse only what the collector appended since the last run
+  python parse_vibration_data.py input.csv --incremental
+  
+  # Keep parsing a capture that is still being written
+  python parse_vibration_data.py input.csv --follow
         """
     )
     
     parser.add_argument(
         'input_file',
-        help='Input CSV file with raw vibration data'
+        help='Input file with raw vibration data (hex CSV or binary capture)'
     )
     
     parser.add_argument(
         '--output',
         type=str,
         default=None,
-        help='Output CSV file (default: auto-generated from input filename)'
+        help='Output file (default: auto-generated from input filename)'
     )
     
     parser.add_argument(
@@ -411,6 +1121,57 @@ Examples:
         help='Output type: displacement or velocity (default: displacement)'
     )
     
+    parser.add_argument(
+        '--format',
+        type=str,
+        default='csv',
+        choices=['csv', 'npz', 'parquet'],
+        help='Parsed data format; npz/parquet store typed compressed columns '
+             '(parquet requires pyarrow) (default: csv)'
+    )
+    
+    parser.add_argument(
+        '--checksum',
+        type=str,
+        default='drop',
+        choices=['drop', 'flag', 'off'],
+        help='19-byte packets with a bad CHECKSUM: drop from output, flag with a '
+             'checksum_ok column, or off (default: drop)'
+    )
+    
+    parser.add_argument(
+        '--gap-index',
+        action='store_true',
+        help='Detect dropped packets from counters and write <output>_gaps.csv'
+    )
+    
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='Number of parser processes, 0 = one per CPU core (default: 1)'
+    )
+    
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help='Parse only data appended since the last run (checkpoint in '
+             '<output>.checkpoint.json, csv output only)'
+    )
+    
+    parser.add_argument(
+        '--follow',
+        action='store_true',
+        help='Keep parsing data appended to the input until interrupted (implies --incremental)'
+    )
+    
+    parser.add_argument(
+        '--interval',
+        type=float,
+        default=FOLLOW_INTERVAL,
+        help=f'Seconds between polls in follow mode (default: {FOLLOW_INTERVAL})'
+    )
+    
     parser.add_argument(
         '--verbose',
         action='store_true',
@@ -427,10 +1188,19 @@ Examples:
             input_file=args.input_file,
             output_file=args.output,
             packet_size=args.packet_size,
-            output_type=args.output_type
+            output_type=args.output_type,
+            workers=args.workers,
+            output_format=args.format,
+            gap_index=args.gap_index,
+            checksum=args.checksum
         )
         
-        parser_obj.parse_file()
+        if args.follow:
+            parser_obj.follow(args.interval)
+        elif args.incremental:
+            parser_obj.parse_incremental()
+        else:
+            parser_obj.parse_file()
         
     except Exception as e:
         logger.error(f"Error: {e}", exc_info=True)
@@ -0,0 +1,438 @@
+#!/usr/bin/env python3
+"""
+Binary Raw Capture Format
+
+This module writes and reads raw vibration packets in a compact binary
+format: a small self-describing header followed by the packets exactly as
+received from the sensor (13 or 19 bytes each, back to back).
+
+File layout:
+    MAGIC (8 bytes)  b"VIBRAW01"
+    LENGTH (4 bytes) little-endian length of the JSON header
+    HEADER           UTF-8 JSON (packet size, baud, output type, sensor
+                     identity, start time), space-padded so packet data
+                     starts on a 16-byte boundary
+    DATA             raw packets
+
+The reader memory-maps the file and exposes the packets as a zero-copy
+NumPy view. Converters to and from the hex CSV format keep archived
+collections usable.
+
+Author: Jnana Phani A (https://phani.zenithtek.in)
+Organization: Zenith Tek (https://zenithtek.in)
+"""
+
+import argparse
+import json
+import logging
+import mmap
+import os
+import struct
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import BinaryIO, Dict, Optional, Sequence, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from parse_vibration_data import format_packet_as_csv, parse_csv_line_to_bytes
+except ImportError:
+    print("Error: Could not import parse_vibration_data module")
+    sys.exit(1)
+
+logger = logging.getLogger(__name__)
+
+# Constants
+MAGIC = b"VIBRAW01"
+FORMAT_VERSION = 1
+HEADER_ALIGNMENT = 16
+BINARY_EXTENSION = ".bin"
+
+# Default baud rate for each packet size
+PACKET_SIZE_BAUD = {
+    13: 460800,
+    19: 921600,
+}
+
+
+def is_binary_capture(path: Union[str, Path]) -> bool:
+    """Check if a file is a binary raw capture.
+
+    Args:
+        path: File path
+
+    Returns:
+        True if the file starts with the binary capture magic
+    """
+    try:
+        with open(path, 'rb') as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def _encode_header(header: Dict) -> bytes:
+    payload = json.dumps(header, sort_keys=True).encode('utf-8')
+    prefix_len = len(MAGIC) + 4
+    padding = -(prefix_len + len(payload)) % HEADER_ALIGNMENT
+    payload += b' ' * padding
+    return MAGIC + struct.pack('<I', len(payload)) + payload
+
+
+def _decode_header(prefix: bytes) -> Tuple[Dict, int]:
+    """Decode header from the start of a file.
+
+    Returns:
+        Tuple of (header dict, data offset)
+    """
+    if prefix[:len(MAGIC)] != MAGIC:
+        raise ValueError("Not a binary raw capture (bad magic)")
+    (length,) = struct.unpack_from('<I', prefix, len(MAGIC))
+    start = len(MAGIC) + 4
+    if len(prefix) < start + length:
+        raise ValueError("Incomplete binary raw capture (header truncated)")
+    header = json.loads(prefix[start:start + length].decode('utf-8'))
+    if header.get('format_version', 0) > FORMAT_VERSION:
+        raise ValueError(f"Unsupported capture format version: {header['format_version']}")
+    return header, start + length
+
+
+def read_stream_header(stream: BinaryIO) -> Dict:
+    """Read the header from a binary capture stream.
+
+    Leaves the stream positioned at the first packet, so it also works for
+    non-seekable streams (gzip, zip members).
+
+    Args:
+        stream: Binary file-like object at the start of the capture
+
+    Returns:
+        Header dictionary
+    """
+    prefix = stream.read(len(MAGIC) + 4)
+    if len(prefix) < len(MAGIC) + 4:
+        raise ValueError("Not a binary raw capture (file too short)")
+    (length,) = struct.unpack_from('<I', prefix, len(MAGIC))
+    header, _ = _decode_header(prefix + stream.read(length))
+    return header
+
+
+def read_header(path: Union[str, Path]) -> Dict:
+    """Read the header of a binary raw capture.
+
+    Args:
+        path: File path
+
+    Returns:
+        Header dictionary
+    """
+    with open(path, 'rb') as f:
+        return read_stream_header(f)
+
+
+class BinaryCaptureWriter:
+    """Write raw packets to a binary capture file."""
+
+    def __init__(self, path: Union[str, Path], packet_size: int = 13,
+                 baud: Optional[int] = None, output_type: str = "displacement",
+                 sensor: Optional[Dict[str, str]] = None,
+                 start_time: Optional[datetime] = None, buffering: int = -1):
+        """Initialize writer.
+
+        Args:
+            path: Output file path
+            packet_size: Packet size (13 or 19 bytes)
+            baud: Baud rate (default: derived from packet size)
+            output_type: "displacement" or "velocity"
+            sensor: Sensor identity (e.g. port, product_id, serial_number)
+            start_time: Capture start time (default: now)
+            buffering: Write buffer size in bytes (-1: default)
+        """
+        if packet_size not in PACKET_SIZE_BAUD:
+            raise ValueError(f"Invalid packet size: {packet_size}. Use 13 or 19")
+
+        self.path = Path(path)
+        self.packet_size = packet_size
+        start_time = start_time or datetime.now()
+        self.header = {
+            'format_version': FORMAT_VERSION,
+            'packet_size': packet_size,
+            'baud': baud or PACKET_SIZE_BAUD[packet_size],
+            'output_type': output_type.lower(),
+            'sensor': dict(sensor or {}),
+            'start_time': start_time.isoformat(timespec='milliseconds'),
+            'start_timestamp': start_time.timestamp(),
+        }
+        self.packet_count = 0
+        self.buffering = buffering
+        self._file = None
+
+    def open(self) -> "BinaryCaptureWriter":
+        """Create the file and write the header."""
+        self._file = open(self.path, 'wb', buffering=self.buffering)
+        self._file.write(_encode_header(self.header))
+        return self
+
+    def close(self) -> None:
+        """Close the file."""
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> "BinaryCaptureWriter":
+        return self.open()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def write_packet(self, packet: Sequence[int]) -> None:
+        """Write one packet.
+
+        Args:
+            packet: Packet bytes
+        """
+        self._file.write(bytes(packet))
+        self.packet_count += 1
+
+    def write_frames(self, data: Union[bytes, bytearray, memoryview]) -> None:
+        """Write a buffer of back-to-back packets.
+
+        Args:
+            data: Packet bytes (length must be a multiple of packet size)
+        """
+        if len(data) % self.packet_size:
+            raise ValueError(f"Buffer length {len(data)} is not a multiple of {self.packet_size}")
+        self._file.write(data)
+        self.packet_count += len(data) // self.packet_size
+
+    def flush(self) -> None:
+        """Flush buffered packets to the OS."""
+        self._file.flush()
+
+    def fileno(self) -> int:
+        """File descriptor (e.g. for os.fsync)."""
+        return self._file.fileno()
+
+
+class BinaryCaptureReader:
+    """Memory-mapped reader for binary capture files."""
+
+    def __init__(self, path: Union[str, Path]):
+        """Initialize reader.
+
+        Args:
+            path: Capture file path
+        """
+        self.path = Path(path)
+        self.header: Dict = {}
+        self.packet_size = 0
+        self.data_offset = 0
+        self._file = None
+        self._mmap = None
+
+    def open(self) -> "BinaryCaptureReader":
+        """Open and memory-map the capture file.
+
+        Raises:
+            ValueError: If the file is empty, too short or not a binary capture
+        """
+        self._file = open(self.path, 'rb')
+        try:
+            size = os.fstat(self._file.fileno()).st_size
+            # An empty file cannot be mapped (e.g. capture stopped before the header)
+            if size < len(MAGIC) + 4:
+                raise ValueError(f"Empty or incomplete capture file: {self.path} ({size} bytes)")
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self.header, self.data_offset = _decode_header(self._mmap)
+        except Exception:
+            self.close()
+            raise
+        self.packet_size = int(self.header['packet_size'])
+        return self
+
+    def close(self) -> None:
+        """Unmap and close the capture file.
+
+        NumPy views returned by frames must be released first; otherwise
+        the mapping stays alive until they are garbage collected.
+        """
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                logger.debug("Capture views still in use; leaving mapping to the GC")
+            self._mmap = None
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> "BinaryCaptureReader":
+        return self.open()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    @property
+    def packet_count(self) -> int:
+        """Number of complete packets in the file."""
+        return (len(self._mmap) - self.data_offset) // self.packet_size
+
+    @property
+    def frames(self):
+        """Zero-copy (N, packet_size) uint8 view of all packets."""
+        if np is None:
+            raise ImportError("numpy is not installed. Install it with: pip install numpy")
+        count = self.packet_count
+        data = np.frombuffer(self._mmap, dtype=np.uint8,
+                             count=count * self.packet_size, offset=self.data_offset)
+        return data.reshape(count, self.packet_size)
+
+    def iter_packets(self, start: int = 0, stop: Optional[int] = None):
+        """Iterate packets as bytes without NumPy.
+
+        Args:
+            start: Index of the first packet
+            stop: Index after the last packet (default: end of file)
+        """
+        count = self.packet_count if stop is None else min(stop, self.packet_count)
+        size = self.packet_size
+        for offset in range(self.data_offset + start * size, self.data_offset + count * size, size):
+            yield self._mmap[offset:offset + size]
+
+
+# ============================================================================
+# Converters
+# ============================================================================
+
+def csv_to_binary(csv_path: Union[str, Path], binary_path: Optional[Union[str, Path]] = None,
+                  packet_size: int = 13, baud: Optional[int] = None,
+                  output_type: str = "displacement",
+                  sensor: Optional[Dict[str, str]] = None) -> Tuple[Path, int, int]:
+    """Convert a hex CSV raw capture to the binary format.
+
+    Lines that do not decode to a packet are skipped.
+
+    Args:
+        csv_path: Input hex CSV file
+        binary_path: Output file (default: input path with .bin extension)
+        packet_size: Packet size (13 or 19 bytes)
+        baud: Baud rate recorded in the header
+        output_type: Output type recorded in the header
+        sensor: Sensor identity recorded in the header
+
+    Returns:
+        Tuple of (output path, packets written, lines skipped)
+    """
+    csv_path = Path(csv_path)
+    binary_path = Path(binary_path) if binary_path else csv_path.with_suffix(BINARY_EXTENSION)
+    skipped = 0
+
+    start_time = datetime.fromtimestamp(csv_path.stat().st_mtime)
+    with open(csv_path, 'r') as infile, \
+         BinaryCaptureWriter(binary_path, packet_size, baud, output_type,
+                             sensor, start_time) as writer:
+        for line in infile:
+            packet = parse_csv_line_to_bytes(line, packet_size)
+            if packet is None:
+                skipped += 1
+                continue
+            writer.write_packet(packet)
+
+    return binary_path, writer.packet_count, skipped
+
+
+def binary_to_csv(binary_path: Union[str, Path],
+                  csv_path: Optional[Union[str, Path]] = None) -> Tuple[Path, int]:
+    """Convert a binary raw capture to the hex CSV format.
+
+    Args:
+        binary_path: Input binary capture
+        csv_path: Output file (default: input path with .csv extension)
+
+    Returns:
+        Tuple of (output path, packets written)
+    """
+    binary_path = Path(binary_path)
+    csv_path = Path(csv_path) if csv_path else binary_path.with_suffix('.csv')
+    count = 0
+
+    with BinaryCaptureReader(binary_path) as reader, open(csv_path, 'w') as outfile:
+        for packet in reader.iter_packets():
+            outfile.write(f"{format_packet_as_csv(packet, reader.packet_size)}\n")
+            count += 1
+
+    return csv_path, count
+
+
+# ============================================================================
+# Main Function
+# ============================================================================
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(
+        description="Convert raw vibration captures between hex CSV and binary formats",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Convert an archived hex CSV capture to binary
+  python raw_capture.py to-binary vibration_raw_Port_3_2025-12-03_12-20-23.304.csv
+
+  # Convert 19-byte packets
+  python raw_capture.py to-binary input.csv --packet-size 19
+
+  # Convert a binary capture back to hex CSV
+  python raw_capture.py to-csv input.bin --output input.csv
+
+  # Show the header of a binary capture
+  python raw_capture.py info input.bin
+        """
+    )
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    to_binary = subparsers.add_parser('to-binary', help='Convert hex CSV to binary')
+    to_binary.add_argument('input_file', help='Input hex CSV file')
+    to_binary.add_argument('--output', type=str, default=None,
+                           help='Output file (default: input with .bin extension)')
+    to_binary.add_argument('--packet-size', type=int, default=13, choices=[13, 19],
+                           help='Packet size in bytes (default: 13)')
+    to_binary.add_argument('--output-type', type=str, default='displacement',
+                           choices=['displacement', 'velocity'],
+                           help='Output type recorded in header (default: displacement)')
+
+    to_csv = subparsers.add_parser('to-csv', help='Convert binary to hex CSV')
+    to_csv.add_argument('input_file', help='Input binary capture')
+    to_csv.add_argument('--output', type=str, default=None,
+                        help='Output file (default: input with .csv extension)')
+
+    info = subparsers.add_parser('info', help='Show binary capture header')
+    info.add_argument('input_file', help='Input binary capture')
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    try:
+        if args.command == 'to-binary':
+            path, count, skipped = csv_to_binary(
+                args.input_file, args.output, args.packet_size,
+                output_type=args.output_type
+            )
+            logger.info(f"Wrote {count} packets to {path} ({skipped} lines skipped)")
+        elif args.command == 'to-csv':
+            path, count = binary_to_csv(args.input_file, args.output)
+            logger.info(f"Wrote {count} packets to {path}")
+        else:
+            with BinaryCaptureReader(args.input_file) as reader:
+                print(json.dumps(reader.header, indent=2, sort_keys=True))
+                print(f"packets: {reader.packet_count}")
+    except Exception as e:
+        logger.error(f"Error: {e}", exc_info=True)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -11,15 +11,15 @@ Organization: Zenith Tek (https://zenithtek.in)
 import logging
 import sys
 import time
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
 
 # Import sensor communication module
 try:
-    from sensor_comm import SensorCommunication
+    from sensor_comm import RegisterAccess, SensorCommunication
 except ImportError:
     # Try relative import if in package
     try:
-        from .sensor_comm import SensorCommunication
+        from .sensor_comm import RegisterAccess, SensorCommunication
     except ImportError:
         print("Error: Could not import sensor_comm module")
         sys.exit(1)
@@ -32,7 +32,24 @@ ORGANIZATION = "Zenith Tek (https://zenithtek.in)"
 
 # Constants
 FLASH_BACKUP_TIMEOUT = 5.0
-BACKUP_POLL_INTERVAL = 0.1
+BACKUP_POLL_INTERVAL = 0.01
+# Status bits are polled; these are the datasheet maxima plus margin
+OUTPUT_STAT_TIMEOUT = 0.3
+MODE_SWITCH_TIMEOUT = 0.5
+# Software reset, datasheet maximum plus margin
+SOFT_RESET_TIMEOUT = 3.0
+
+# OUTPUT_SEL values for SIG_CTRL register (bits [7:4])
+OUTPUT_SEL: Dict[str, int] = {
+    "velocity": 0x00,
+    "displacement": 0x40,
+}
+
+# Registers compared before configuring: DIAG_STAT (window 0), SIG_CTRL and UART_CTRL (window 1)
+SNAPSHOT_REGISTERS: Dict[int, Tuple[int, ...]] = {
+    0x00: (0x04,),
+    0x01: (0x00, 0x08),
+}
 
 PROD_ID_REGISTERS = (0x6A, 0x6C, 0x6E, 0x70)
 SERIAL_REGISTERS = (0x74, 0x76, 0x78, 0x7A)
@@ -47,6 +64,26 @@ class SensorConfigurator:
 
     def __init__(self, comm: SensorCommunication):
         self.comm = comm
+        self.registers = RegisterAccess(comm)
+        self._timings: List[Tuple[str, float]] = []
+
+    def collect_timings(self) -> Dict[str, float]:
+        """Return and clear the step timings (seconds) of the last operation."""
+        timings = dict(self._timings)
+        self._timings.clear()
+        return timings
+
+    def _timed(self, name: str, step: Callable, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return step(*args, **kwargs)
+        finally:
+            self._timings.append((name, time.perf_counter() - start))
+
+    def _log_timings(self, operation: str) -> None:
+        total = sum(seconds for _, seconds in self._timings)
+        steps = ", ".join(f"{name} {seconds * 1000:.0f} ms" for name, seconds in self._timings)
+        logger.info("%s took %.3f s (%s)", operation, total, steps)
 
     def _write_commands(self, commands: List[List[int]]) -> None:
         self.comm.send_commands(commands)
@@ -60,47 +97,32 @@ class SensorConfigurator:
             [0, 0xFF, 0xFF, 0x0D],
         ]
         )
+        # The sensor may have been rebooting; select the window again
+        self.registers.invalidate()
         logger.debug("Sensor reset commands sent")
 
     def _wait_until_ready(self, timeout: float = 3.0) -> bool:
-        start = time.time()
-        while time.time() - start < timeout:
-            try:
-                result = self.comm.send_commands(
-                    [
-                        [0, 0xFE, 0x01, 0x0D],
-                        [4, 0x0A, 0x00, 0x0D],
-                    ]
-                )
-                if len(result) >= 4:
-                    glob_cmd = (result[-3] << 8) | result[-2]
-                    if (glob_cmd & 0x0400) == 0:
-                        return True
-            except TimeoutError:
-                logger.debug("Waiting for sensor ready... (timeout)")
-            except Exception:
-                logger.debug("Transient error while waiting for ready", exc_info=True)
-            time.sleep(0.05)
+        # GLOB_CMD NOT_READY (bit 10) clears once internal initialization is done
+        if self.registers.wait_for_bits(0x0A, 0x01, 0x0400, timeout=timeout):
+            return True
         logger.warning("Timed out waiting for sensor ready state")
         return False
 
     def _read_word(self, address: int, window: int) -> Optional[int]:
         try:
-            result = self.comm.send_commands(
-                [
-                    [0, 0xFE, window & 0xFF, 0x0D],
-                    [4, address & 0xFF, 0x00, 0x0D],
-                ]
-            )
-            if len(result) < 4:
-                return None
-            msb = result[-3]
-            lsb = result[-2]
-            return (msb << 8) | lsb
+            return self.registers.read_word(address, window)
         except Exception:
             logger.debug("Failed to read register 0x%02X", address, exc_info=True)
             return None
 
+    def _read_words(self, addresses: Sequence[int], window: int) -> Optional[List[int]]:
+        """Read several registers of one window in one pipelined transaction."""
+        try:
+            return self.registers.read_words(addresses, window)
+        except Exception:
+            logger.debug("Failed to read registers %s", addresses, exc_info=True)
+            return None
+
     @staticmethod
     def _decode_ascii_words(words: List[int], little_endian: bool = True) -> str:
         chars: List[str] = []
@@ -116,13 +138,12 @@ class SensorConfigurator:
     def detect_identity(self) -> Optional[dict]:
         logger.info("Reading product and serial number registers")
 
-        product_words = []
-        for reg in PROD_ID_REGISTERS:
-            word = self._read_word(reg, 0x01)
-            if word is None:
-                logger.error("Failed to read product ID register 0x%02X", reg)
-                return None
-            product_words.append(word)
+        words = self._read_words(PROD_ID_REGISTERS + SERIAL_REGISTERS, 0x01)
+        if words is None:
+            logger.error("Failed to read product ID and serial number registers")
+            return None
+        product_words = words[:len(PROD_ID_REGISTERS)]
+        serial_words = words[len(PROD_ID_REGISTERS):]
         logger.info(
             "Product ID raw words: %s",
             " ".join(f"0x{word:04X}" for word in product_words),
@@ -130,20 +151,13 @@ class SensorConfigurator:
         product_id_raw = self._decode_ascii_words(product_words, little_endian=True)
         product_id = PRODUCT_ID_ALIASES.get(product_id_raw, product_id_raw)
 
-        serial_words = []
-        for reg in SERIAL_REGISTERS:
-            word = self._read_word(reg, 0x01)
-            if word is None:
-                logger.error("Failed to read serial register 0x%02X", reg)
-                return None
-            serial_words.append(word)
         logger.info(
             "Serial number raw words: %s",
             " ".join(f"0x{word:04X}" for word in serial_words),
         )
         serial_number = self._decode_ascii_words(serial_words, little_endian=True)
 
-        self._write_commands([[0, 0xFE, 0x00, 0x0D]])
+        self.registers.select_window(0x00)
         return {
             "product_id": product_id or "",
             "product_id_raw": product_id_raw or "",
@@ -177,49 +191,21 @@ class SensorConfigurator:
             
             logger.info("Setting output type to %s...", output_name)
             
-            # Set Window 1
-            self._write_commands([[0, 0xFE, 0x01, 0x0D]])
-            time.sleep(0.01)
-            
-            # Write OUTPUT_SEL to SIG_CTRL register (low byte)
-            self._write_commands([[0, 0x80, output_sel, 0x0D]])
+            # Write OUTPUT_SEL to SIG_CTRL register (low byte, window 1)
+            self.registers.write_byte(0x00, output_sel, 0x01)
             logger.info("SIG_CTRL register set (OUTPUT_SEL = 0x%02X)", output_sel)
             
-            # Wait for output mode setting to complete (~118ms according to datasheet)
-            time.sleep(0.12)
-            
-            # Verify OUTPUT_STAT bit [0] returns to 0 (setting complete)
-            verify_commands = [
-                [0, 0xFE, 0x01, 0x0D],
-                [4, 0x00, 0x00, 0x0D],  # Read SIG_CTRL
-            ]
-            result = self.comm.send_commands(verify_commands)
-            
-            if len(result) >= 4:
-                sig_ctrl_low = result[2]  # LSByte
-                output_stat = sig_ctrl_low & 0x01
-                if output_stat != 0:
-                    logger.warning("OUTPUT_STAT still in progress, waiting longer...")
-                    # Wait a bit more and check again
-                    time.sleep(0.1)
-                    result = self.comm.send_commands(verify_commands)
-                    if len(result) >= 4:
-                        sig_ctrl_low = result[2]
-                        output_stat = sig_ctrl_low & 0x01
+            # OUTPUT_STAT bit [0] of SIG_CTRL returns to 0 when the setting
+            # completes (~118ms according to datasheet)
+            if not self.registers.wait_for_bits(0x00, 0x01, 0x01, timeout=OUTPUT_STAT_TIMEOUT):
+                logger.warning("OUTPUT_STAT still in progress after %.1f s", OUTPUT_STAT_TIMEOUT)
             
             # Check for hardware errors in DIAG_STAT1
-            diag_commands = [
-                [0, 0xFE, 0x00, 0x0D],
-                [4, 0x04, 0x00, 0x0D],  # Read DIAG_STAT1
-            ]
-            diag_result = self.comm.send_commands(diag_commands)
-            
-            if len(diag_result) >= 4:
-                diag_msb = diag_result[1]  # MSByte
-                hard_err = (diag_msb >> 5) & 0x07  # Bits [7:5]
-                if hard_err != 0:
-                    logger.error("Hardware error detected (HARD_ERR=0x%X)", hard_err)
-                    return False
+            diag_stat = self.registers.read_word(0x04, 0x00)  # Read DIAG_STAT1
+            hard_err = (diag_stat >> 13) & 0x07  # MSByte bits [7:5]
+            if hard_err != 0:
+                logger.error("Hardware error detected (HARD_ERR=0x%X)", hard_err)
+                return False
             
             logger.info("Output type set to %s successfully", output_name)
             return True
@@ -237,11 +223,7 @@ class SensorConfigurator:
             True if successful, False otherwise
         """
         try:
-            commands = [
-                [0, 0xFE, 0x01, 0x0D],
-                [0, 0x88, 0x03, 0x0D],
-            ]
-            self._write_commands(commands)
+            self.registers.write_byte(0x08, 0x03, 0x01)
             logger.info("UART_CTRL register set to 0x03 (AUTO_START=1, UART_AUTO=1)")
             return True
         except Exception as e:
@@ -261,86 +243,159 @@ class SensorConfigurator:
         """
         try:
             # Step 1: Write FLASH_BACKUP command
-            commands = [
-                [0, 0xFE, 0x01, 0x0D],  # Window 1
-                [0, 0x8A, 0x08, 0x0D],  # GLOB_CMD: FLASH_BACKUP=1 (bit [3])
-            ]
-            self.comm.send_commands(commands)
+            self.registers.write_byte(0x0A, 0x08, 0x01)  # GLOB_CMD: FLASH_BACKUP=1 (bit [3])
             logger.info("Flash backup command sent")
             
-            # Step 2: Wait for backup completion by polling GLOB_CMD
-            start_time = time.time()
-            while time.time() - start_time < FLASH_BACKUP_TIMEOUT:
-                # Read GLOB_CMD register
-                read_commands = [
-                    [0, 0xFE, 0x01, 0x0D],  # Window 1
-                    [4, 0x0A, 0x00, 0x0D],  # Read GLOB_CMD -> 4 bytes
-                ]
-                result = self.comm.send_commands(read_commands)
-                
-                # Check bit [3] of GLOB_CMD (FLASH_BACKUP status)
-                # Result format: [Addr, MSByte, LSByte, CR] for each read
-                if len(result) >= 4:
-                    # GLOB_CMD is 16-bit, bit [3] is in the lower byte
-                    glob_cmd_low = result[2]  # LSByte
-                    if (glob_cmd_low & 0b00001000) == 0:
-                        logger.info("Flash backup completed")
-                        break
-                time.sleep(BACKUP_POLL_INTERVAL)
-            else:
+            # Step 2: Wait for backup completion by polling GLOB_CMD bit [3] (FLASH_BACKUP status)
+            if not self.registers.wait_for_bits(0x0A, 0x01, 0b00001000, timeout=FLASH_BACKUP_TIMEOUT,
+                                                interval=BACKUP_POLL_INTERVAL):
                 logger.error("Flash backup timeout - backup may not have completed")
                 return False
+            logger.info("Flash backup completed")
             
-            # Step 3: Verify backup result by checking FLASH_BU_ERR
-            verify_commands = [
-                [0, 0xFE, 0x00, 0x0D],  # Window 0
-                [4, 0x04, 0x00, 0x0D],  # Read DIAG_STAT1 -> 4 bytes
-            ]
-            result = self.comm.send_commands(verify_commands)
-            
-            if len(result) >= 4:
-                # Check FLASH_BU_ERR (bit [0] of DIAG_STAT1)
-                diag_stat1_low = result[2]  # LSByte
-                if (diag_stat1_low & 0b00000001) == 0:
-                    logger.info("Flash backup verified successfully")
-                    return True
-                else:
-                    logger.error("Flash backup error detected (FLASH_BU_ERR=1)")
-                    return False
+            # Step 3: Verify backup result by checking FLASH_BU_ERR (bit [0] of DIAG_STAT1)
+            diag_stat1 = self.registers.read_word(0x04, 0x00)
+            if (diag_stat1 & 0b00000001) == 0:
+                logger.info("Flash backup verified successfully")
+                return True
             else:
-                logger.error("Failed to read DIAG_STAT1 for verification")
+                logger.error("Flash backup error detected (FLASH_BU_ERR=1)")
                 return False
                 
         except Exception as e:
             logger.error(f"Flash backup failed: {e}")
             return False
 
-    def configure(self, output_type: str = "velocity") -> bool:
+    def read_snapshot(self) -> Optional[Dict[Tuple[int, int], int]]:
+        """Read the registers configure() compares in one pipelined burst.
+        
+        Returns:
+            Register values keyed by (window, address), or None if the read failed
+        """
+        try:
+            snapshot = self.registers.read_snapshot(SNAPSHOT_REGISTERS)
+        except Exception:
+            logger.debug("Failed to read register snapshot", exc_info=True)
+            return None
+        logger.debug(
+            "Register snapshot: %s",
+            ", ".join(f"W{window}:0x{address:02X}=0x{value:04X}" for (window, address), value in snapshot.items()),
+        )
+        return snapshot
+
+    def _reload_from_flash(self) -> bool:
+        """Software reset so that the registers hold the flash contents.
+        
+        The UART reset spell leaves the registers as they are, so they can
+        differ from flash, e.g. after a flash backup that timed out. After
+        SOFT_RST the registers reload from flash; a sensor saved in Auto
+        Start comes back sampling and is switched to configuration mode.
+        
+        Returns:
+            True once the sensor is ready in configuration mode
+        """
+        self.registers.write_byte(0x0A, 0x80, 0x01)  # GLOB_CMD: SOFT_RST
+        # WINDOW_ID returns to 0 on reboot
+        self.registers.invalidate()
+        deadline = time.perf_counter() + SOFT_RESET_TIMEOUT
+        while True:
+            time.sleep(BACKUP_POLL_INTERVAL)
+            try:
+                # GLOB_CMD NOT_READY (bit 10) clears once the registers are loaded
+                if not self.registers.read_word(0x0A, 0x01) & 0x0400:
+                    break
+            except ValueError:
+                # Burst data garbles the response: rebooted into Auto Start
+                break
+            except TimeoutError:
+                pass
+            if time.perf_counter() >= deadline:
+                logger.warning("Sensor not ready %.1f s after software reset", SOFT_RESET_TIMEOUT)
+                return False
+
+        # MODE_CMD = configuration, then drop burst data still in flight
+        self.registers.write_byte(0x03, 0x02, 0x00)
+        time.sleep(BACKUP_POLL_INTERVAL)
+        self.comm.flush_input_buffer()
+        # MODE_STAT (bit 10) is set once the sensor is in configuration mode
+        if self.registers.wait_for_bits(0x02, 0x00, 0x0400, 0x0400, timeout=MODE_SWITCH_TIMEOUT):
+            return True
+        logger.warning("Sensor did not enter configuration mode after software reset")
+        return False
+
+    def plan_configuration(self, output_type: str = "velocity") -> Optional[List[Tuple[int, int, int]]]:
+        """Work out which register writes configure() needs.
+        
+        The sensor is software reset first so that the registers hold the
+        flash contents, then the target settings are compared with a
+        register snapshot; an empty plan means flash already has this
+        configuration.
+        
+        Args:
+            output_type: Output type, either "velocity" or "displacement"
+            
+        Returns:
+            (window, byte address, value) writes that differ, or None if the
+            snapshot could not be read or reports a hardware error
+        """
+        if not self._reload_from_flash():
+            return None
+        snapshot = self.read_snapshot()
+        if snapshot is None:
+            return None
+        hard_err = (snapshot[(0x00, 0x04)] >> 13) & 0x07  # DIAG_STAT1 HARD_ERR
+        if hard_err != 0:
+            logger.warning("Hardware error reported in snapshot (HARD_ERR=0x%X)", hard_err)
+            return None
+        targets = [
+            (0x01, 0x00, OUTPUT_SEL[output_type.lower()], 0xF0),  # SIG_CTRL(L): OUTPUT_SEL
+            (0x01, 0x08, 0x03, 0x03),  # UART_CTRL(L): AUTO_START, UART_AUTO
+        ]
+        return self.registers.plan_writes(snapshot, targets)
+
+    def configure(self, output_type: str = "velocity", force: bool = False) -> bool:
         """Configure sensor in UART Auto Start mode.
         
+        Only the registers whose flash contents differ from the requested
+        configuration are written, and the flash backup is skipped when
+        none do.
+        
         Args:
             output_type: Output type, either "velocity" or "displacement" (default: "velocity")
+            force: Write every register and back up to flash regardless
             
         Returns:
             True if successful, False otherwise
         """
+        self._timings.clear()
         try:
-            # Reset sensor first
-            self.reset_sensor()
-            time.sleep(0.1)
-            
-            # Set output type (velocity or displacement)
-            if not self.set_output_type(output_type):
+            if output_type.lower() not in OUTPUT_SEL:
+                logger.error("Invalid output type: %s. Use 'velocity' or 'displacement'", output_type)
                 return False
             
-            # Enable UART Auto Start
-            if not self.set_uart_auto_start():
-                return False
+            # Reset sensor first
+            self._timed("reset", self._reset_and_settle)
             
-            # Save to flash
-            if not self.flash_backup():
-                return False
+            # Compare with the flash contents; write everything if they cannot be read
+            writes = None if force else self._timed("plan", self.plan_configuration, output_type)
+            changed = {0x00, 0x08} if writes is None else {address for _, address, _ in writes}
             
+            if changed:
+                # Set output type (velocity or displacement)
+                if 0x00 in changed and not self._timed("output_type", self.set_output_type, output_type):
+                    return False
+                
+                # Enable UART Auto Start
+                if 0x08 in changed and not self._timed("uart_auto_start", self.set_uart_auto_start):
+                    return False
+                
+                # Save to flash
+                if not self._timed("flash_backup", self.flash_backup):
+                    return False
+            else:
+                logger.info("Registers already match the requested configuration; flash backup skipped")
+            
+            self._log_timings("Configuration")
             output_name = "Displacement" if output_type.lower() == "displacement" else "Velocity"
             logger.info("Sensor configured in UART Auto Start mode successfully")
             logger.info("Output type: %s", output_name)
@@ -352,14 +407,16 @@ class SensorConfigurator:
             logger.error(f"Configuration failed: {e}")
             return False
 
+    def _reset_and_settle(self) -> None:
+        self.reset_sensor()
+        # The reset spell has no status bit to poll
+        time.sleep(0.1)
+
     def software_reset(self) -> bool:
         try:
-            self._write_commands(
-                [
-                    [0, 0xFE, 0x01, 0x0D],
-                    [0, 0x8A, 0x80, 0x0D],
-                ]
-            )
+            self.registers.write_byte(0x0A, 0x80, 0x01)
+            # WINDOW_ID returns to 0 on reboot
+            self.registers.invalidate()
             logger.info("Software reset command issued; waiting for reboot")
             return self._wait_until_ready(timeout=7.0)
         except Exception as exc:
@@ -368,43 +425,18 @@ class SensorConfigurator:
 
     def flash_test(self) -> bool:
         try:
-            self._write_commands(
-                [
-                    [0, 0xFE, 0x01, 0x0D],
-                    [0, 0x83, 0x08, 0x0D],
-                ]
-            )
+            self.registers.write_byte(0x03, 0x08, 0x01)
             logger.info("Flash test command issued")
 
-            start = time.time()
-            while time.time() - start < FLASH_BACKUP_TIMEOUT:
-                result = self.comm.send_commands(
-                    [
-                        [0, 0xFE, 0x01, 0x0D],
-                        [4, 0x02, 0x00, 0x0D],
-                    ]
-                )
-                if len(result) >= 4:
-                    status = (result[-3] << 8) | result[-2]
-                    if (status & 0x0400) == 0:
-                        logger.debug("FLASH_TEST complete (MSC_CTRL=0x%04X)", status)
-                        break
-                time.sleep(BACKUP_POLL_INTERVAL)
-            else:
+            if not self.registers.wait_for_bits(0x02, 0x01, 0x0400, timeout=FLASH_BACKUP_TIMEOUT,
+                                                interval=BACKUP_POLL_INTERVAL):
                 logger.error("Flash test timeout")
                 return False
+            logger.debug("FLASH_TEST complete")
 
-            diag_result = self.comm.send_commands(
-                [
-                    [0, 0xFE, 0x00, 0x0D],
-                    [4, 0x04, 0x00, 0x0D],
-                ]
-            )
-            if len(diag_result) >= 4:
-                diag_low = diag_result[-2]
-                if diag_low & 0x04:
-                    logger.error("FLASH_ERR flag set after flash test")
-                    return False
+            if self.registers.read_word(0x04, 0x00) & 0x04:
+                logger.error("FLASH_ERR flag set after flash test")
+                return False
             self._wait_until_ready(timeout=2.0)
             logger.info("Flash test completed successfully")
             return True
@@ -415,37 +447,22 @@ class SensorConfigurator:
     def exit_auto_mode(self, persist_disable_auto: bool = False) -> bool:
         try:
             logger.info("Requesting vibration sensor to exit UART Auto Mode")
-            self._write_commands(
-                [
-                    [0, 0xFE, 0x00, 0x0D],
-                    [0, 0x83, 0x02, 0x0D],
-                ]
-            )
-            time.sleep(0.05)
-
-            result = self.comm.send_commands(
-                [
-                    [0, 0xFE, 0x00, 0x0D],
-                    [4, 0x02, 0x00, 0x0D],
-                ]
-            )
-
-            if len(result) < 4:
+            self.registers.write_byte(0x03, 0x02, 0x00)
+            # MODE_STAT (bit 10) is set once the sensor is in configuration mode
+            self.registers.wait_for_bits(0x02, 0x00, 0x0400, 0x0400, timeout=MODE_SWITCH_TIMEOUT)
+
+            try:
+                mode_register = self.registers.read_word(0x02, 0x00)
+            except ValueError:
                 logger.error("MODE_CTRL read response incomplete")
                 return False
 
-            mode_register = (result[-3] << 8) | result[-2]
             if (mode_register & 0x0400) == 0:
                 logger.error("Sensor did not report configuration mode (MODE_CTRL=0x%04X)", mode_register)
                 return False
             logger.info("Sensor reports configuration mode (MODE_CTRL=0x%04X)", mode_register)
 
-            self._write_commands(
-                [
-                    [0, 0xFE, 0x01, 0x0D],
-                    [0, 0x88, 0x00, 0x0D],
-                ]
-            )
+            self.registers.write_byte(0x08, 0x00, 0x01)
             logger.info("UART_CTRL cleared (0x88 -> 0x00)")
 
             if persist_disable_auto:
@@ -454,7 +471,7 @@ class SensorConfigurator:
                     logger.error("Failed to persist UART auto disable state")
                     return False
 
-            self._write_commands([[0, 0xFE, 0x00, 0x0D]])
+            self.registers.select_window(0x00)
             return True
 
         except Exception as exc:
@@ -466,24 +483,25 @@ class SensorConfigurator:
             "Starting vibration sensor reset (exit auto -> flash test -> software reset, persist disable=%s)",
             persist_disable_auto,
         )
+        self._timings.clear()
         try:
             if persist_disable_auto:
-                if not self.exit_auto_mode(persist_disable_auto=True):
+                if not self._timed("exit_auto", self.exit_auto_mode, persist_disable_auto=True):
                     return False
             else:
-                self._write_commands([[0, 0xFE, 0x00, 0x0D]])
+                self.registers.select_window(0x00)
 
-            self.reset_sensor()
-            time.sleep(0.1)
+            self._timed("reset", self._reset_and_settle)
 
-            if not self.flash_test():
+            if not self._timed("flash_test", self.flash_test):
                 logger.warning("Flash test reported an error; continuing with reset")
 
-            if not self.software_reset():
+            # software_reset() returns once NOT_READY has cleared
+            if not self._timed("software_reset", self.software_reset):
                 return False
 
-            logger.info("Vibration sensor reset sequence completed. Allowing stabilization")
-            time.sleep(0.8)
+            logger.info("Vibration sensor reset sequence completed")
+            self._log_timings("Full reset")
             return True
         except Exception as exc:
             logger.error("Full reset sequence failed: %s", exc)
@@ -0,0 +1,924 @@
+"""
+Sensor simulator module.
+
+This module emulates an Epson sensor on a Linux pseudo-terminal, so that
+SensorCommunication, the configurators and the collectors can be
+benchmarked and soak-tested end to end without hardware. Simulated models:
+
+- M-A542VR1 vibration sensor: 13-byte or 19-byte bursts (BURST_CTRL
+  CHKSM_OUT), velocity 3000 Sps / displacement 300 Sps
+- M-A552AR1 accelerometer: FLAG/TEMP/ACC/COUNT/CHKSM bursts, 100-1000 Sps
+- M-G552PR80 IMU: FLAG/TEMP/GYRO/ACCL/GPIO/COUNT/CHKSM bursts (16 or
+  32-bit), 15.625-2000 Sps
+
+It implements the UART register protocol used by the configurators:
+
+- WINDOW_ID selection (WIN_CTRL 0x7E), 16-bit reads ([AD, 0x00, 0x0D] ->
+  [AD, MSB, LSB, 0x0D]) and byte writes ([0x80 | AD, DATA, 0x0D])
+- PROD_ID, VERSION and SERIAL_NUM identity registers
+- MODE_CTRL mode changes (MODE_CMD / MODE_STAT)
+- GLOB_CMD NOT_READY, SOFT_RST, FLASH_BACKUP and FLASH_RST, with the
+  power-on, reset recovery and flash backup times
+- DIAG_STAT FLASH_BU_ERR, OUTPUT_STAT, FILTER_STAT and the MSC_CTRL tests
+- register writes ignored in sampling mode, flash-backed registers
+  restored on reset
+
+In sampling mode with UART_AUTO set it streams burst packets at the
+output rate of the current settings, paced to the UART_CTRL baud rate
+(a pty itself has no line rate); bursts that do not fit the line are
+dropped and leave a counter gap, as on a real link. Streaming needs numpy.
+
+    with SensorSimulator("M-A542VR1", auto_start=True) as sim:
+        sim.wait_until_ready()
+        connection = Serial(sim.port, 460800)
+        ...
+
+Usage:
+    python sensor_simulator.py --model M-A542VR1 --auto-start --packet-size 19
+
+Author: Jnana Phani A (https://phani.zenithtek.in)
+Organization: Zenith Tek (https://zenithtek.in)
+"""
+
+import argparse
+import heapq
+import logging
+import os
+import select
+import sys
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import tty
+except ImportError:  # Windows: no pseudo-terminals
+    tty = None
+
+try:
+    from packet_decoder import checksum_19byte
+    from synthetic_packets import generate_frames
+except ImportError as e:
+    print(f"Error: Could not import capture modules: {e}")
+    sys.exit(1)
+
+logger = logging.getLogger(__name__)
+
+# Constants
+COMMAND_LENGTH = 3
+COMMAND_DELIMITER = 0x0D
+WRITE_FLAG = 0x80
+PACKET_HEADER = 0x80
+BITS_PER_BYTE = 10
+DEFAULT_SERIAL_NUMBER = "SIM00001"
+DEFAULT_RESPONSE_DELAY = 0.001  # USB-serial adapter latency per response
+STREAM_INTERVAL = 0.005         # Seconds of burst data per pty write
+PERIOD_SECONDS = 8              # Length of the precomputed signal period
+READ_CHUNK = 4096
+
+# Register addresses (Window 0)
+BURST = 0x00
+MODE_CTRL = 0x02
+DIAG_STAT = 0x04
+COUNT = 0x0A
+# Register addresses (Window 1)
+SIG_CTRL = 0x00
+MSC_CTRL = 0x02
+SMPL_CTRL = 0x04
+FILTER_CTRL = 0x06
+UART_CTRL = 0x08
+GLOB_CMD = 0x0A
+BURST_CTRL = 0x0C
+BURST_CTRL2 = 0x0E
+PROD_ID = 0x6A
+VERSION = 0x72
+SERIAL_NUM = 0x74
+WIN_CTRL = 0x7E
+
+# Register bits
+MODE_STAT_CONFIG = 0x0400
+MODE_CMD_SAMPLING = 0x01
+MODE_CMD_CONFIG = 0x02
+FLASH_BU_ERR = 0x0001
+NOT_READY = 0x0400
+SOFT_RST = 0x80
+FLASH_BACKUP = 0x08
+FLASH_RST = 0x04
+OUTPUT_STAT = 0x0001
+FILTER_STAT = 0x0020
+UART_AUTO = 0x0001
+AUTO_START = 0x0002
+FLASH_TEST = 0x0800
+SELF_TESTS = 0x0700  # ACC_TEST, TEMP_TEST, VDD_TEST
+
+# Busy times in seconds (M-A542VR1 datasheet, Table 1.4 Interface Specifications)
+DEFAULT_TIMINGS = {
+    'power_on': 0.9,
+    'reset': 0.97,
+    'flash_backup': 0.31,
+    'flash_reset': 2.3,
+    'flash_test': 0.005,
+    'self_test': 0.3,
+    'output_mode': 0.118,
+    'filter': 0.0,
+    'sampling_start': 0.005,
+    'sampling_stop': 0.001,
+}
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError("numpy is not installed. Install it with: pip install numpy")
+
+
+def ascii_words(text: str, count: int) -> List[int]:
+    """Encode text as identity register words (first character in the low byte)."""
+    data = text.encode('ascii')[:count * 2].ljust(count * 2, b'\x00')
+    return [data[i] | (data[i + 1] << 8) for i in range(0, count * 2, 2)]
+
+
+def _encode_fields(frames, offset: int, size: int, raw) -> None:
+    """Write signed raw values big-endian into a (N, packet) byte array."""
+    raw = np.asarray(raw, dtype=np.int64) & ((1 << (8 * size)) - 1)
+    for i in range(size):
+        frames[:, offset + i] = (raw >> (8 * (size - 1 - i))) & 0xFF
+
+
+class SensorProfile:
+    """Register map, burst format and timing of one sensor model.
+
+    Subclasses describe the burst layout for the current register values;
+    the protocol itself is shared by all models.
+
+    Attributes:
+        model: Model name (e.g. "M-A542VR1")
+        product_id: PROD_ID register string (e.g. "A342VD10")
+        defaults: Factory register values by window and address
+        backup_registers: Window 1 registers saved by FLASH_BACKUP
+        baud_rates: UART_CTRL BAUD_RATE code to baud rate
+        timings: Busy times in seconds
+    """
+
+    model = ""
+    product_id = ""
+    version = 0x0100
+    defaults: Dict[int, Dict[int, int]] = {}
+    backup_registers: Tuple[int, ...] = ()
+    baud_rates: Dict[int, int] = {}
+    timings: Dict[str, float] = DEFAULT_TIMINGS
+    has_filter = False
+    output_mode_register = False
+    # Read-only status bits of writable registers (not saved by FLASH_BACKUP)
+    status_bits = {SIG_CTRL: OUTPUT_STAT, FILTER_CTRL: FILTER_STAT}
+
+    def baud_rate(self, registers: Dict[int, Dict[int, int]]) -> Optional[int]:
+        """UART baud rate of the current settings (None for an invalid code)."""
+        return self.baud_rates.get((registers[1][UART_CTRL] >> 8) & 0x03)
+
+    def sample_rate(self, registers: Dict[int, Dict[int, int]]) -> float:
+        """Burst output rate in Sps."""
+        raise NotImplementedError
+
+    def layout(self, registers: Dict[int, Dict[int, int]]) -> List[Tuple[str, int]]:
+        """Burst fields between header and delimiter as (name, bytes)."""
+        raise NotImplementedError
+
+    def signal(self, name: str, size: int, t):
+        """Raw values of a burst field of size bytes at times t (seconds)."""
+        return np.zeros(len(t), dtype=np.int64)
+
+    def packet_size(self, registers: Dict[int, Dict[int, int]]) -> int:
+        """Burst packet size in bytes, header and delimiter included."""
+        return 2 + sum(size for _, size in self.layout(registers))
+
+    def period(self, registers: Dict[int, Dict[int, int]], seed: int = 0):
+        """
+        Build PERIOD_SECONDS of burst packets for the current settings.
+
+        The signal repeats seamlessly, so streaming cycles through the
+        period and only the counter and checksum are stamped per packet.
+
+        Returns:
+            (N, packet_size) uint8 array
+        """
+        _require_numpy()
+        rate = self.sample_rate(registers)
+        count = max(1, int(round(rate * PERIOD_SECONDS)))
+        t = np.arange(count) / rate
+        frames = np.zeros((count, self.packet_size(registers)), dtype=np.uint8)
+        frames[:, 0] = PACKET_HEADER
+        frames[:, -1] = COMMAND_DELIMITER
+        offset = 1
+        for name, size in self.layout(registers):
+            _encode_fields(frames, offset, size, self.signal(name, size, t))
+            offset += size
+        return frames
+
+    def stamp(self, frames, counters, registers: Dict[int, Dict[int, int]]) -> None:
+        """Write packet counters (and checksums) into burst packets in place."""
+        offset = 1
+        for name, size in self.layout(registers):
+            if name == 'count':
+                _encode_fields(frames, offset, size, counters)
+            elif name == 'checksum':
+                # 16-bit sum of the big-endian words between header and checksum
+                words = frames[:, 1:offset].astype(np.uint32)
+                total = (words[:, 0::2] << 8).sum(axis=1) + words[:, 1::2].sum(axis=1)
+                _encode_fields(frames, offset, size, total & 0xFFFF)
+            offset += size
+
+
+class VibrationProfile(SensorProfile):
+    """M-A542VR1 vibration sensor (packets as in packet_decoder)."""
+
+    model = "M-A542VR1"
+    product_id = "A342VD10"
+    defaults = {
+        0: {MODE_CTRL: MODE_STAT_CONFIG},
+        1: {SIG_CTRL: 0x8E00, MSC_CTRL: 0x0026, SMPL_CTRL: 0x0A07, UART_CTRL: 0x0101,
+            BURST_CTRL: 0x4700, 0x46: 0x0666, 0x48: 0x0666, 0x4A: 0x0666},
+    }
+    backup_registers = (SIG_CTRL, MSC_CTRL, SMPL_CTRL, UART_CTRL, BURST_CTRL, 0x46, 0x48, 0x4A)
+    baud_rates = {0b00: 921600, 0b01: 460800, 0b10: 230400, 0b11: 115200}
+    output_mode_register = True
+
+    def sample_rate(self, registers):
+        output_sel = (registers[1][SIG_CTRL] >> 4) & 0x0F
+        displacement = output_sel >= 0x04
+        if output_sel in (0x00, 0x04):
+            # RAW data rates are fixed
+            return 300.0 if displacement else 3000.0
+        # RMS / P-P: one value per DOUT_RATE_RMSPP x 0.1 s (velocity) or x 1 s
+        n = max(1, registers[1][SMPL_CTRL] >> 8)
+        return 1.0 / (n * (1.0 if displacement else 0.1))
+
+    def packet_size(self, registers):
+        return 19 if registers[1][BURST_CTRL] & 0x0001 else 13
+
+    def layout(self, registers):
+        if self.packet_size(registers) == 13:
+            return [('temp2', 2), ('x', 3), ('y', 3), ('z', 3)]
+        return [('flag', 2), ('temp', 2), ('x', 3), ('y', 3), ('z', 3), ('count', 2),
+                ('checksum', 2)]
+
+    def period(self, registers, seed=0):
+        rate = self.sample_rate(registers)
+        return generate_frames(max(1, int(round(rate * PERIOD_SECONDS))),
+                               self.packet_size(registers), seed, sample_rate=rate)
+
+    def stamp(self, frames, counters, registers):
+        if frames.shape[1] == 13:
+            frames[:, 2] = (frames[:, 2] & 0xFC) | (counters & 0b11)
+            return
+        frames[:, 14] = (counters >> 8) & 0xFF
+        frames[:, 15] = counters & 0xFF
+        # Upper axis bytes are added as 8 bits (datasheet Section 4.10)
+        checksum = checksum_19byte(frames)
+        frames[:, 16] = checksum >> 8
+        frames[:, 17] = checksum & 0xFF
+
+
+class AccelerometerProfile(SensorProfile):
+    """M-A552AR1 accelerometer."""
+
+    model = "M-A552AR1"
+    product_id = "A352AD10"
+    defaults = {
+        0: {MODE_CTRL: MODE_STAT_CONFIG},
+        1: {SIG_CTRL: 0x000E, MSC_CTRL: 0x0006, SMPL_CTRL: 0x0400, FILTER_CTRL: 0x0008,
+            UART_CTRL: 0x0000, BURST_CTRL: 0xC703},
+    }
+    backup_registers = (SIG_CTRL, MSC_CTRL, SMPL_CTRL, FILTER_CTRL, UART_CTRL, BURST_CTRL)
+    # Codes used by the accelerometer configurator (BAUD_RATE 10 = 230.4 kbps)
+    baud_rates = {0b00: 460800, 0b10: 230400}
+    timings = dict(DEFAULT_TIMINGS, filter=0.05)
+    has_filter = True
+    # SMPL_CTRL high byte to output rate
+    rates = {0x02: 1000.0, 0x03: 500.0, 0x04: 200.0, 0x05: 100.0}
+    # 32-bit scale factors: 0.06 ug/LSB, temperature -0.0037918 degC/LSB (16-bit)
+    acc_lsb_per_g = 1.0 / 0.06e-6
+    temp_lsb_per_degc = 65536 / -0.0037918
+
+    def sample_rate(self, registers):
+        return self.rates.get(registers[1][SMPL_CTRL] >> 8, 200.0)
+
+    def layout(self, registers):
+        burst = registers[1][BURST_CTRL]
+        fields = []
+        for bit, name, size in ((15, 'flag', 2), (14, 'temp', 4), (10, 'x', 4), (9, 'y', 4),
+                                (8, 'z', 4), (1, 'count', 2), (0, 'checksum', 2)):
+            if burst & (1 << bit):
+                fields.append((name, size))
+        return fields
+
+    def signal(self, name, size, t):
+        if name == 'temp':
+            return np.full(len(t), int((25.0 - 34.987) * self.temp_lsb_per_degc))
+        if name in ('x', 'y', 'z'):
+            gravity = 1.0 if name == 'z' else 0.0
+            frequency = {'x': 1.0, 'y': 2.0, 'z': 5.0}[name]
+            g = gravity + 0.01 * np.sin(2 * np.pi * frequency * t)
+            return np.round(g * self.acc_lsb_per_g).astype(np.int64)
+        return super().signal(name, size, t)
+
+
+class ImuProfile(SensorProfile):
+    """M-G552PR80 IMU."""
+
+    model = "M-G552PR80"
+    product_id = "G365PDF1"
+    defaults = {
+        0: {MODE_CTRL: MODE_STAT_CONFIG},
+        1: {SIG_CTRL: 0x00FE, MSC_CTRL: 0x0006, SMPL_CTRL: 0x0403, FILTER_CTRL: 0x0001,
+            UART_CTRL: 0x0000, BURST_CTRL: 0xF006, BURST_CTRL2: 0x0000},
+    }
+    backup_registers = (SIG_CTRL, MSC_CTRL, SMPL_CTRL, FILTER_CTRL, UART_CTRL, BURST_CTRL,
+                        BURST_CTRL2)
+    baud_rates = {0b00: 460800, 0b01: 230400, 0b10: 921600}
+    timings = dict(DEFAULT_TIMINGS, filter=0.01)
+    has_filter = True
+    # SMPL_CTRL high byte (DOUT_RATE) to output rate
+    rates = {0x00: 2000.0, 0x01: 1000.0, 0x02: 500.0, 0x03: 250.0, 0x04: 125.0, 0x05: 62.5,
+             0x06: 31.25, 0x07: 15.625, 0x08: 400.0, 0x09: 200.0, 0x0A: 100.0, 0x0B: 80.0,
+             0x0C: 50.0, 0x0D: 40.0, 0x0E: 25.0, 0x0F: 20.0}
+    # 16-bit scale factors: 0.0151515 dps/LSB, 0.4 mg/LSB, -0.0037918 degC/LSB
+    gyro_lsb_per_dps = 1.0 / 0.0151515
+    accl_lsb_per_g = 1.0 / 0.4e-3
+    temp_lsb_per_degc = 1.0 / -0.0037918
+
+    def sample_rate(self, registers):
+        return self.rates.get(registers[1][SMPL_CTRL] >> 8, 125.0)
+
+    def layout(self, registers):
+        burst, wide = registers[1][BURST_CTRL], registers[1][BURST_CTRL2]
+        fields = []
+        if burst & 0x8000:
+            fields.append(('flag', 2))
+        for bit, names in ((14, ('temp',)), (13, ('gx', 'gy', 'gz')), (12, ('ax', 'ay', 'az')),
+                           (11, ('dax', 'day', 'daz')), (10, ('dvx', 'dvy', 'dvz'))):
+            if burst & (1 << bit):
+                size = 4 if wide & (1 << bit) else 2
+                fields.extend((name, size) for name in names)
+        for bit, name in ((2, 'gpio'), (1, 'count'), (0, 'checksum')):
+            if burst & (1 << bit):
+                fields.append((name, 2))
+        return fields
+
+    def signal(self, name, size, t):
+        # 32-bit fields carry the 16-bit value in their upper half
+        scale = 65536 if size == 4 else 1
+        if name == 'temp':
+            return np.full(len(t), int((25.0 - 34.987) * self.temp_lsb_per_degc) * scale)
+        if name in ('gx', 'gy', 'gz'):
+            frequency = {'gx': 0.5, 'gy': 1.0, 'gz': 2.0}[name]
+            dps = np.sin(2 * np.pi * frequency * t)
+            return np.round(dps * self.gyro_lsb_per_dps * scale).astype(np.int64)
+        if name == 'az':
+            return np.full(len(t), int(round(self.accl_lsb_per_g * scale)))
+        return super().signal(name, size, t)
+
+
+PROFILES: Dict[str, SensorProfile] = {
+    profile.model: profile for profile in (VibrationProfile(), AccelerometerProfile(), ImuProfile())
+}
+
+
+class SensorSimulator:
+    """Emulate one sensor on a pseudo-terminal.
+
+    All protocol handling runs on one I/O thread. Busy bits are set when a
+    command is written and cleared by timed events, so polling loops see
+    the same sequence as with hardware; time_scale shortens every busy
+    time for fast tests.
+
+    Attributes:
+        profile: Simulated model
+        port: Slave device path to open with pyserial (or link, if given)
+        registers: Current register values by window and address
+        flash: Register values restored on power-on and reset
+        stats: Protocol and stream counters
+    """
+
+    def __init__(self, model: str = "M-A542VR1", serial_number: str = DEFAULT_SERIAL_NUMBER,
+                 registers: Optional[Dict[Tuple[int, int], int]] = None, auto_start: bool = False,
+                 time_scale: float = 1.0, response_delay: float = DEFAULT_RESPONSE_DELAY,
+                 seed: int = 0, link: Optional[str] = None):
+        """
+        Initialize simulator.
+
+        Args:
+            model: Model name (see PROFILES)
+            serial_number: SERIAL_NUM register string (8 characters)
+            registers: Flash-backed register values as {(window, address): value}
+            auto_start: Boot with UART_AUTO and AUTO_START set (streams on power-on)
+            time_scale: Factor applied to all busy times (e.g. 0.01 for tests)
+            response_delay: Seconds before each register read response
+            seed: Random seed of the burst signal
+            link: Optional symlink to create for the slave device
+        """
+        if model not in PROFILES:
+            raise ValueError(f"Unknown model: {model}. Use one of {', '.join(PROFILES)}")
+        if time_scale < 0:
+            raise ValueError(f"Invalid time scale: {time_scale}")
+        self.profile = PROFILES[model]
+        self.serial_number = serial_number
+        self.time_scale = time_scale
+        self.response_delay = response_delay
+        self.seed = seed
+        self.link = link
+
+        self.flash: Dict[int, int] = {address: self.profile.defaults[1][address]
+                                      for address in self.profile.backup_registers}
+        for (window, address), value in (registers or {}).items():
+            if window != 1 or address not in self.flash:
+                raise ValueError(f"Register 0x{address:02X} (window {window}) is not flash-backed")
+            self.flash[address] = value & 0xFFFF
+        if auto_start:
+            self.flash[UART_CTRL] |= UART_AUTO | AUTO_START
+        self.registers: Dict[int, Dict[int, int]] = {0: {}, 1: {}}
+
+        self.window = 0
+        self.sampling = False
+        self.ready = threading.Event()
+        self.stats = {
+            'commands': 0,
+            'reads': 0,
+            'writes': 0,
+            'ignored_writes': 0,
+            'invalid_bytes': 0,
+            'flash_backups': 0,
+            'resets': 0,
+            'packets_sent': 0,
+            'bytes_sent': 0,
+            'dropped_samples': 0,
+            'overrun_bytes': 0,
+        }
+        self._rx = bytearray()
+        self._events: List[Tuple[float, int, Callable[[], None]]] = []
+        self._event_seq = 0
+        self._outbox: Deque[Tuple[float, bytes]] = deque()
+        self._period = None
+        self._streaming = False
+        self._stream_start = 0.0
+        self._stream_rate = 0.0
+        self._stream_baud = 0
+        self._stream_sent = 0
+        self._next_tick = 0.0
+        self._line_bytes = 0
+        self.sample_count = 0
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._master: Optional[int] = None
+        self._slave: Optional[int] = None
+        self.port: Optional[str] = None
+
+    def __enter__(self) -> "SensorSimulator":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def start(self) -> "SensorSimulator":
+        """Create the pty, power the sensor on and start the I/O thread."""
+        if tty is None or not hasattr(os, 'openpty'):
+            raise RuntimeError("The sensor simulator needs a POSIX pseudo-terminal")
+        self._master, self._slave = os.openpty()
+        # Raw mode: no echo and no CR/LF translation of the 0x0D delimiter.
+        # The slave stays open so the master survives host reconnects.
+        tty.setraw(self._slave)
+        os.set_blocking(self._master, False)
+        self.port = os.ttyname(self._slave)
+        if self.link:
+            if os.path.islink(self.link):
+                os.unlink(self.link)
+            os.symlink(self.port, self.link)
+            self.port = self.link
+        self._stop.clear()
+        with self._lock:
+            self._power_on(self.profile.timings['power_on'])
+        self._thread = threading.Thread(target=self._run, name="sensor-simulator", daemon=True)
+        self._thread.start()
+        logger.debug(f"Simulating {self.profile.model} on {self.port}")
+        return self
+
+    def stop(self) -> None:
+        """Stop the I/O thread and remove the pty."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        for fd in (self._master, self._slave):
+            if fd is not None:
+                os.close(fd)
+        self._master = self._slave = None
+        if self.link and os.path.islink(self.link):
+            os.unlink(self.link)
+
+    def wait_until_ready(self, timeout: Optional[float] = None) -> bool:
+        """Wait until internal initialization (NOT_READY) has finished."""
+        return self.ready.wait(timeout)
+
+    def power_cycle(self) -> None:
+        """Simulate a power cycle: registers reload from flash."""
+        with self._lock:
+            self._power_on(self.profile.timings['power_on'])
+
+    def register(self, window: int, address: int) -> int:
+        """Current value of a 16-bit register."""
+        with self._lock:
+            return self._read_register(window, address & 0x7E)
+
+    # Protocol
+
+    def _delay(self, name: str) -> float:
+        return self.profile.timings[name] * self.time_scale
+
+    def _schedule(self, delay: float, callback: Callable[[], None]) -> None:
+        self._event_seq += 1
+        heapq.heappush(self._events, (time.monotonic() + delay, self._event_seq, callback))
+
+    def _power_on(self, duration: float) -> None:
+        self.ready.clear()
+        self._stop_sampling()
+        self._events.clear()
+        self.registers = {
+            0: dict(self.profile.defaults[0]),
+            1: {**self.profile.defaults[1], GLOB_CMD: NOT_READY},
+        }
+        self.window = 0
+        self._schedule(duration * self.time_scale, self._initialized)
+
+    def _initialized(self) -> None:
+        self.registers[1].update(self.flash)
+        self.registers[1][GLOB_CMD] = 0
+        uart = self.registers[1][UART_CTRL]
+        if uart & UART_AUTO and uart & AUTO_START:
+            self._enter_sampling()
+        self.ready.set()
+        logger.debug(f"{self.profile.model} ready ({'sampling' if self.sampling else 'configuration'} mode)")
+
+    def _receive(self, data: bytes) -> None:
+        self._rx += data
+        while len(self._rx) >= COMMAND_LENGTH:
+            if self._rx[2] != COMMAND_DELIMITER:
+                # Resynchronize on the next byte, like the sensor's UART parser
+                del self._rx[0]
+                self.stats['invalid_bytes'] += 1
+                continue
+            address, value = self._rx[0], self._rx[1]
+            del self._rx[:COMMAND_LENGTH]
+            self.stats['commands'] += 1
+            if address & WRITE_FLAG:
+                self._write(address & 0x7F, value)
+            else:
+                self._read(address & 0x7E)
+
+    def _read_register(self, window: int, address: int) -> int:
+        if address == WIN_CTRL:
+            return self.window
+        if not self.ready.is_set():
+            # Register values are undefined during initialization
+            return NOT_READY if (window, address) == (1, GLOB_CMD) else 0x0000
+        if window == 0 and address == COUNT:
+            return self.sample_count & 0xFFFF
+        if window == 1 and PROD_ID <= address < VERSION:
+            return ascii_words(self.profile.product_id, 4)[(address - PROD_ID) // 2]
+        if window == 1 and address == VERSION:
+            return self.profile.version
+        if window == 1 and SERIAL_NUM <= address < SERIAL_NUM + 8:
+            return ascii_words(self.serial_number, 4)[(address - SERIAL_NUM) // 2]
+        return self.registers.get(window, {}).get(address, 0x0000)
+
+    def _read(self, address: int) -> None:
+        self.stats['reads'] += 1
+        value = self._read_register(self.window, address)
+        self._respond(bytes((address, value >> 8, value & 0xFF, COMMAND_DELIMITER)))
+
+    def _respond(self, data: bytes) -> None:
+        due = time.monotonic() + self.response_delay
+        if self._outbox:
+            due = max(due, self._outbox[-1][0])
+        self._outbox.append((due, data))
+
+    def _set_byte(self, window: int, address: int, value: int) -> None:
+        word = self.registers[window].get(address & 0x7E, 0)
+        if address & 1:
+            word = (word & 0x00FF) | (value << 8)
+        else:
+            word = (word & 0xFF00) | value
+        self.registers[window][address & 0x7E] = word
+
+    def _write(self, address: int, value: int) -> None:
+        self.stats['writes'] += 1
+        if address == WIN_CTRL:
+            if value in (0, 1):
+                self.window = value
+            return
+        if address == WIN_CTRL + 1:
+            return  # 0xFF 0xFF 0x0D reset spell
+        window = self.window
+        if not self.ready.is_set():
+            self.stats['ignored_writes'] += 1
+            return
+        if window == 0 and address == BURST:
+            if self._period is not None and not self._streaming:
+                self._respond(self._burst_packets(1).tobytes())
+            return
+        if window == 0 and address == MODE_CTRL + 1:
+            self._mode_command(value & 0x03)
+            return
+        if window == 1 and address == GLOB_CMD:
+            self._global_command(value)
+            return
+        if self.sampling or window != 1 or (address & 0x7E) not in self.profile.backup_registers:
+            # Writes in sampling mode and to read-only registers are ignored
+            self.stats['ignored_writes'] += 1
+            return
+
+        if address == MSC_CTRL + 1:
+            self._self_test((value << 8) & (FLASH_TEST | SELF_TESTS))
+            return
+        if address == SIG_CTRL and self.profile.output_mode_register:
+            # OUTPUT_STAT is read-only: busy until the output mode is set
+            self._set_byte(1, address, value | OUTPUT_STAT)
+            self._schedule(self._delay('output_mode'),
+                           lambda: self._clear_bits(1, SIG_CTRL, OUTPUT_STAT))
+            return
+        if address == FILTER_CTRL and self.profile.has_filter:
+            self._set_byte(1, address, value | FILTER_STAT)
+            self._schedule(self._delay('filter'),
+                           lambda: self._clear_bits(1, FILTER_CTRL, FILTER_STAT))
+            return
+        if address == UART_CTRL + 1 and self.profile.baud_rates.get(value & 0x03) is None:
+            logger.warning(f"Unsupported BAUD_RATE code {value & 0x03}; keeping current baud rate")
+            self.stats['ignored_writes'] += 1
+            return
+        self._set_byte(1, address, value)
+
+    def _clear_bits(self, window: int, address: int, bits: int) -> None:
+        self.registers[window][address] &= ~bits & 0xFFFF
+
+    def _mode_command(self, command: int) -> None:
+        if command == MODE_CMD_SAMPLING and not self.sampling:
+            self._schedule(self._delay('sampling_start'), self._enter_sampling)
+        elif command == MODE_CMD_CONFIG and self.sampling:
+            self._stop_sampling()
+            self._schedule(self._delay('sampling_stop'),
+                           lambda: self.registers[0].__setitem__(MODE_CTRL, MODE_STAT_CONFIG))
+
+    def _enter_sampling(self) -> None:
+        self.sampling = True
+        self.registers[0][MODE_CTRL] = 0x0000
+        if np is None:
+            logger.warning("Burst output needs numpy; the simulator only answers register commands")
+            return
+        self._period = self.profile.period(self.registers, self.seed)
+        self._streaming = bool(self.registers[1][UART_CTRL] & UART_AUTO)
+        self._stream_rate = self.profile.sample_rate(self.registers)
+        self._stream_baud = self.profile.baud_rate(self.registers) or 0
+        self._stream_start = self._next_tick = time.monotonic()
+        self._stream_sent = 0
+        self._line_bytes = 0
+
+    def _stop_sampling(self) -> None:
+        self.sampling = False
+        self._streaming = False
+        self._period = None
+
+    def _global_command(self, value: int) -> None:
+        if value & SOFT_RST:
+            self.stats['resets'] += 1
+            self._power_on(self.profile.timings['reset'])
+            return
+        if self.sampling:
+            self.stats['ignored_writes'] += 1
+            return
+        if value & FLASH_BACKUP:
+            self.registers[1][GLOB_CMD] |= FLASH_BACKUP
+            self._schedule(self._delay('flash_backup'), self._flash_backup_done)
+        elif value & FLASH_RST:
+            self.registers[1][GLOB_CMD] |= FLASH_RST
+            self._schedule(self._delay('flash_reset'), self._flash_reset_done)
+
+    def _flash_backup_done(self) -> None:
+        for address in self.profile.backup_registers:
+            status = self.profile.status_bits.get(address, 0)
+            self.flash[address] = self.registers[1][address] & ~status & 0xFFFF
+        self.registers[0][DIAG_STAT] = self.registers[0].get(DIAG_STAT, 0) & ~FLASH_BU_ERR
+        self._clear_bits(1, GLOB_CMD, FLASH_BACKUP)
+        self.stats['flash_backups'] += 1
+
+    def _flash_reset_done(self) -> None:
+        for address in self.profile.backup_registers:
+            self.flash[address] = self.profile.defaults[1][address]
+            self.registers[1][address] = self.flash[address]
+        self._clear_bits(1, GLOB_CMD, FLASH_RST)
+
+    def _self_test(self, bits: int) -> None:
+        if not bits:
+            return
+        self.registers[1][MSC_CTRL] |= bits
+        duration = self._delay('flash_test' if bits & FLASH_TEST else 'self_test')
+        self._schedule(duration, lambda: self._clear_bits(1, MSC_CTRL, bits))
+
+    # Burst stream
+
+    def _burst_packets(self, count: int, skipped: int = 0):
+        frames = self._period
+        first = self.sample_count + skipped
+        indices = (first + np.arange(count)) % len(frames)
+        packets = frames[indices]
+        self.profile.stamp(packets, first + np.arange(count, dtype=np.int64), self.registers)
+        self.sample_count += skipped + count
+        return packets
+
+    def _stream(self, now: float) -> None:
+        if not self._streaming or now < self._next_tick:
+            return
+        self._next_tick = now + STREAM_INTERVAL
+        elapsed = now - self._stream_start
+        due = int(elapsed * self._stream_rate) - self._stream_sent
+        if due <= 0:
+            return
+        self._stream_sent += due
+        size = self._period.shape[1]
+        capacity = max(0, (int(elapsed * self._stream_baud / BITS_PER_BYTE) - self._line_bytes) // size)
+        count = min(due, capacity)
+        self.stats['dropped_samples'] += due - count
+        if count:
+            self._transmit(self._burst_packets(count, due - count).tobytes())
+            self.stats['packets_sent'] += count
+        else:
+            self.sample_count += due
+
+    def _transmit(self, data: bytes) -> None:
+        self._line_bytes += len(data)
+        try:
+            written = os.write(self._master, data)
+        except BlockingIOError:
+            written = 0  # host is not reading; the pty buffer is full
+        self.stats['bytes_sent'] += written
+        self.stats['overrun_bytes'] += len(data) - written
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            now = time.monotonic()
+            deadlines = [now + 0.05]
+            if self._events:
+                deadlines.append(self._events[0][0])
+            if self._outbox:
+                deadlines.append(self._outbox[0][0])
+            if self._streaming:
+                deadlines.append(self._next_tick)
+            timeout = max(0.0, min(deadlines) - now)
+            readable, _, _ = select.select([self._master], [], [], timeout)
+            with self._lock:
+                if readable:
+                    try:
+                        data = os.read(self._master, READ_CHUNK)
+                    except (BlockingIOError, OSError):
+                        data = b''
+                    self._receive(data)
+                now = time.monotonic()
+                while self._events and self._events[0][0] <= now:
+                    heapq.heappop(self._events)[2]()
+                while self._outbox and self._outbox[0][0] <= now:
+                    self._transmit(self._outbox.popleft()[1])
+                self._stream(now)
+
+
+def parse_register(text: str) -> Tuple[Tuple[int, int], int]:
+    """Parse a WINDOW:ADDRESS=VALUE register override (e.g. 1:0x0C=0xC703)."""
+    try:
+        location, value = text.split('=')
+        window, address = location.split(':')
+        return (int(window, 0), int(address, 0)), int(value, 0)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid register '{text}'. Use WINDOW:ADDRESS=VALUE")
+
+
+def vibration_preset(packet_size: int, output_type: str = "velocity") -> Dict[Tuple[int, int], int]:
+    """
+    M-A542VR1 register values for the collectors' packet formats.
+
+    Args:
+        packet_size: 13 (460800 baud, TEMP2, no checksum) or 19 (921600 baud,
+                     FLAG/TEMP1/COUNT/CHECKSUM)
+        output_type: "velocity" or "displacement" RAW output
+
+    Returns:
+        Register overrides for SensorSimulator
+    """
+    output_sel = 0x40 if output_type == "displacement" else 0x00
+    if packet_size == 19:
+        return {(1, SIG_CTRL): 0x8E02 | output_sel, (1, UART_CTRL): 0x0001,
+                (1, BURST_CTRL): 0xC703}
+    if packet_size == 13:
+        return {(1, SIG_CTRL): 0x8E00 | output_sel, (1, UART_CTRL): 0x0101,
+                (1, BURST_CTRL): 0x4700}
+    raise ValueError(f"Invalid packet size: {packet_size}. Use 13 or 19")
+
+
+def main():
+    """Main entry point for the sensor simulator."""
+    parser = argparse.ArgumentParser(
+        description='Simulate an Epson sensor on a pseudo-terminal',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python sensor_simulator.py --model M-A542VR1
+  python sensor_simulator.py --model M-A542VR1 --auto-start --packet-size 19 --link /tmp/ttySIM0
+  python sensor_simulator.py --model M-G552PR80 --register 1:0x04=0x0103 --duration 60
+  python sensor_simulator.py --model M-A552AR1 --time-scale 0.1
+
+Then point a collector or configurator at the printed device, e.g.:
+  python collect_raw_vibration_data.py /tmp/ttySIM0 --baud 921600 --duration 30
+        """
+    )
+    parser.add_argument('--model', choices=sorted(PROFILES), default="M-A542VR1",
+                        help='Sensor model (default: M-A542VR1)')
+    parser.add_argument('--serial-number', default=DEFAULT_SERIAL_NUMBER,
+                        help=f'SERIAL_NUM register string (default: {DEFAULT_SERIAL_NUMBER})')
+    parser.add_argument('--auto-start', action='store_true',
+                        help='Boot in UART Auto Start mode (streams without configuration)')
+    parser.add_argument('--packet-size', type=int, choices=[13, 19],
+                        help='M-A542VR1 only: preset 13-byte (460800) or 19-byte (921600) bursts')
+    parser.add_argument('--output-type', choices=['velocity', 'displacement'], default='velocity',
+                        help='M-A542VR1 only: RAW output type for --packet-size (default: velocity)')
+    parser.add_argument('--register', type=parse_register, action='append', default=[],
+                        metavar='W:ADDR=VALUE',
+                        help='Flash-backed register value (repeatable), e.g. 1:0x0C=0xC703')
+    parser.add_argument('--time-scale', type=float, default=1.0,
+                        help='Scale all busy times (default: 1.0 = datasheet times)')
+    parser.add_argument('--response-delay', type=float, default=DEFAULT_RESPONSE_DELAY,
+                        help=f'Seconds before each register response (default: {DEFAULT_RESPONSE_DELAY})')
+    parser.add_argument('--link', help='Create a symlink to the pty (e.g. /tmp/ttySIM0)')
+    parser.add_argument('--duration', type=float,
+                        help='Run for this many seconds (default: until Ctrl+C)')
+    parser.add_argument('--verbose', '-v', action='store_true', help='Enable verbose logging')
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
+    if not hasattr(os, 'openpty'):
+        logger.error("The sensor simulator needs a POSIX pseudo-terminal (Linux or macOS)")
+        return 1
+
+    registers: Dict[Tuple[int, int], int] = {}
+    if args.packet_size:
+        if args.model != "M-A542VR1":
+            logger.error("--packet-size is only available for the M-A542VR1")
+            return 1
+        registers.update(vibration_preset(args.packet_size, args.output_type))
+    registers.update(dict(args.register))
+
+    try:
+        simulator = SensorSimulator(args.model, args.serial_number, registers, args.auto_start,
+                                    args.time_scale, args.response_delay, link=args.link)
+    except ValueError as e:
+        logger.error(str(e))
+        return 1
+
+    with simulator:
+        simulator.wait_until_ready()
+        baud = simulator.profile.baud_rate(simulator.registers)
+        logger.info("=" * 60)
+        logger.info(f"Simulating {args.model} (serial {args.serial_number}) on {simulator.port}")
+        logger.info(f"UART baud rate: {baud}, burst packet: "
+                    f"{simulator.profile.packet_size(simulator.registers)} bytes at "
+                    f"{simulator.profile.sample_rate(simulator.registers):g} Sps")
+        logger.info(f"Mode: {'sampling (auto start)' if simulator.sampling else 'configuration'}")
+        logger.info("Press Ctrl+C to stop")
+        logger.info("=" * 60)
+        start = time.monotonic()
+        try:
+            while args.duration is None or time.monotonic() - start < args.duration:
+                time.sleep(0.2)
+        except KeyboardInterrupt:
+            logger.info("Stopping simulator...")
+
+    stats = simulator.stats
+    logger.info("=" * 60)
+    logger.info("Simulator summary:")
+    logger.info(f"  Commands: {stats['commands']} ({stats['reads']} reads, {stats['writes']} writes, "
+                f"{stats['ignored_writes']} ignored)")
+    logger.info(f"  Invalid bytes: {stats['invalid_bytes']}")
+    logger.info(f"  Flash backups: {stats['flash_backups']}, resets: {stats['resets']}")
+    logger.info(f"  Burst packets sent: {stats['packets_sent']} ({stats['bytes_sent']} bytes)")
+    logger.info(f"  Dropped samples (line full): {stats['dropped_samples']}")
+    logger.info(f"  Overrun bytes (host not reading): {stats['overrun_bytes']}")
+    logger.info("=" * 60)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,140 @@
+"""
+Serial reader module.
+
+This module reads the continuous burst stream from the sensor without
+spinning. Read modes:
+
+- blocking: read() sized to ~10 ms of data at the link rate, with a short
+  timeout; the driver wakes the thread when the chunk is complete
+  (portable, default)
+- select:   wait on the serial file descriptor with selectors, then read
+  what has arrived (POSIX only, falls back to blocking elsewhere)
+- poll:     check in_waiting and sleep 1 ms when empty (the original
+  collector loop, kept for comparison)
+
+Every mode returns within the timeout when no data arrives, so the reader
+thread notices a stop request.
+
+Author: Jnana Phani A (https://phani.zenithtek.in)
+Organization: Zenith Tek (https://zenithtek.in)
+"""
+
+import logging
+import selectors
+import time
+from typing import Dict
+
+logger = logging.getLogger(__name__)
+
+# Constants
+READ_MODES = ("blocking", "select", "poll")
+# Data per blocking read, in seconds at the link rate
+DEFAULT_CHUNK_SECONDS = 0.01
+# Longest wait for data before read() returns b''
+DEFAULT_READ_TIMEOUT = 0.05
+POLL_INTERVAL = 0.001
+# Bits on the wire per byte (8N1: start + 8 data + stop)
+BITS_PER_BYTE = 10
+
+
+class SerialReader:
+    """Read received bytes from a pyserial connection.
+
+    Attributes:
+        mode: Read mode in use (see READ_MODES)
+        chunk_size: Bytes requested per blocking read
+        reads / timeouts / bytes_read: Counters
+    """
+
+    def __init__(self, connection, baud: int, mode: str = "blocking",
+                 chunk_seconds: float = DEFAULT_CHUNK_SECONDS,
+                 timeout: float = DEFAULT_READ_TIMEOUT):
+        """
+        Initialize reader.
+
+        Args:
+            connection: Open pyserial Serial (or compatible) object
+            baud: Baud rate, used to size blocking reads
+            mode: "blocking", "select" or "poll"
+            chunk_seconds: Data per blocking read in seconds at the link rate
+            timeout: Longest wait for data in seconds
+        """
+        if mode not in READ_MODES:
+            raise ValueError(f"Unsupported read mode: {mode}. Use {', '.join(READ_MODES)}")
+        self.connection = connection
+        self.timeout = timeout
+        self.chunk_size = max(1, int(baud / BITS_PER_BYTE * chunk_seconds))
+        self.reads = 0
+        self.timeouts = 0
+        self.bytes_read = 0
+        self._selector = None
+        self._saved_timeout = connection.timeout
+
+        if mode == "select":
+            try:
+                selector = selectors.DefaultSelector()
+                selector.register(connection.fileno(), selectors.EVENT_READ)
+                self._selector = selector
+            except (AttributeError, OSError, ValueError) as e:
+                logger.warning(f"Select read mode not available ({e}); using blocking reads")
+                mode = "blocking"
+        if mode == "blocking":
+            connection.timeout = timeout
+        self.mode = mode
+        self._read = {
+            "blocking": self._read_blocking,
+            "select": self._read_select,
+            "poll": self._read_poll,
+        }[mode]
+
+    def read(self) -> bytes:
+        """
+        Read received bytes, waiting at most the timeout.
+
+        Returns:
+            Received bytes (b'' on timeout)
+        """
+        data = self._read()
+        self.reads += 1
+        if data:
+            self.bytes_read += len(data)
+        else:
+            self.timeouts += 1
+        return data
+
+    def close(self) -> None:
+        """Release the selector and restore the connection timeout."""
+        if self._selector is not None:
+            self._selector.close()
+            self._selector = None
+        self.connection.timeout = self._saved_timeout
+
+    def stats(self) -> Dict[str, object]:
+        """Get reader counters."""
+        return {
+            'mode': self.mode,
+            'reads': self.reads,
+            'timeouts': self.timeouts,
+            'bytes_read': self.bytes_read,
+        }
+
+    def _read_blocking(self) -> bytes:
+        # Drain a backlog in one call; otherwise block for one chunk
+        return self.connection.read(max(self.chunk_size, self.connection.in_waiting))
+
+    def _read_select(self) -> bytes:
+        waiting = self.connection.in_waiting
+        if not waiting:
+            if not self._selector.select(self.timeout):
+                return b''
+            waiting = self.connection.in_waiting
+            if not waiting:
+                return b''
+        return self.connection.read(waiting)
+
+    def _read_poll(self) -> bytes:
+        waiting = self.connection.in_waiting
+        if waiting:
+            return self.connection.read(waiting)
+        time.sleep(POLL_INTERVAL)
+        return b''
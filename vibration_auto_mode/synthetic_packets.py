@@ -0,0 +1,202 @@
+"""
+Synthetic packet generator module.
+
+This module builds deterministic M-A542VR1 burst streams (13-byte and
+19-byte packets) for tests and benchmarks without a sensor attached.
+Streams can be damaged in reproducible ways: noise bytes between packets,
+truncated (misaligned) packets and dropped packets that leave a gap in
+the packet counter.
+
+Author: Jnana Phani A (https://phani.zenithtek.in)
+Organization: Zenith Tek (https://zenithtek.in)
+"""
+
+import logging
+import sys
+from typing import Dict, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from packet_decoder import (
+        AXIS_OFFSETS,
+        PACKET_HEADER,
+        PACKET_TERMINATOR,
+        SUPPORTED_PACKET_SIZES,
+        TEMP1_SCALE,
+        TEMP2_SCALE,
+        TEMP_OFFSET,
+        checksum_19byte,
+    )
+except ImportError as e:
+    print(f"Error: Could not import packet_decoder module: {e}")
+    sys.exit(1)
+
+logger = logging.getLogger(__name__)
+
+# Signal model: per-axis sine amplitude (m or m/s) and frequency (Hz)
+AXIS_AMPLITUDES = (2.0e-5, 1.5e-5, 1.0e-5)
+AXIS_FREQUENCIES = (50.0, 120.0, 300.0)
+SIGNAL_NOISE = 1.0e-7
+DEFAULT_SAMPLE_RATE = 3000.0
+DEFAULT_TEMPERATURE = 25.0
+
+# ND / EA bytes of synthetic 19-byte packets
+ND_FLAGS = 0x7E
+EA_FLAGS = 0x00
+
+# Largest run of noise bytes inserted at one position
+MAX_NOISE_RUN = 8
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError("numpy is not installed. Install it with: pip install numpy")
+
+
+def encode_dec24(values):
+    """Encode values as 24-bit fields (inverse of to_dec24()).
+
+    Args:
+        values: Array of values in [-2, 2)
+
+    Returns:
+        (N, 3) uint8 array, most significant byte first
+    """
+    raw = np.round(np.asarray(values, dtype=np.float64) * 2**22).astype(np.int64) & 0xFFFFFF
+    return np.stack([(raw >> 16) & 0xFF, (raw >> 8) & 0xFF, raw & 0xFF], axis=1).astype(np.uint8)
+
+
+def generate_frames(count: int, packet_size: int = 13, seed: int = 0,
+                    start_count: int = 0, count_step: int = 1,
+                    sample_rate: float = DEFAULT_SAMPLE_RATE):
+    """Generate valid, back-to-back packets.
+
+    Axes carry sines plus noise; the packet counter advances by
+    ``count_step`` per packet (2-bit TEMP2_L counter or 16-bit COUNT).
+    19-byte packets carry a valid CHECKSUM.
+
+    Args:
+        count: Number of packets
+        packet_size: Packet size (13 or 19 bytes)
+        seed: Random seed (same seed, same packets)
+        start_count: Counter value of the first packet
+        count_step: Counter increment per packet
+        sample_rate: Sample rate of the signal model in Hz
+
+    Returns:
+        (count, packet_size) uint8 array
+    """
+    _require_numpy()
+    if packet_size not in SUPPORTED_PACKET_SIZES:
+        raise ValueError(f"Invalid packet size: {packet_size}. Use 13 or 19")
+    rng = np.random.default_rng(seed)
+    frames = np.zeros((count, packet_size), dtype=np.uint8)
+    frames[:, 0] = PACKET_HEADER
+    frames[:, -1] = PACKET_TERMINATOR
+
+    t = np.arange(count) / sample_rate
+    for axis, offset in enumerate(AXIS_OFFSETS[packet_size]):
+        signal = AXIS_AMPLITUDES[axis] * np.sin(2 * np.pi * AXIS_FREQUENCIES[axis] * t)
+        signal += rng.normal(0.0, SIGNAL_NOISE, count)
+        frames[:, offset:offset + 3] = encode_dec24(signal)
+
+    counter = start_count + np.arange(count, dtype=np.int64) * count_step
+    temperature = DEFAULT_TEMPERATURE + rng.normal(0.0, 0.05, count)
+    if packet_size == 13:
+        frames[:, 1] = np.round((temperature - TEMP_OFFSET) / TEMP2_SCALE).astype(np.int8).view(np.uint8)
+        frames[:, 2] = counter & 0b11
+    else:
+        temp1 = np.round((temperature - TEMP_OFFSET) / TEMP1_SCALE).astype(np.int16).view(np.uint16)
+        frames[:, 1] = ND_FLAGS
+        frames[:, 2] = EA_FLAGS
+        frames[:, 3] = temp1 >> 8
+        frames[:, 4] = temp1 & 0xFF
+        frames[:, 14] = (counter >> 8) & 0xFF
+        frames[:, 15] = counter & 0xFF
+        checksum = checksum_19byte(frames)
+        frames[:, 16] = checksum >> 8
+        frames[:, 17] = checksum & 0xFF
+    return frames
+
+
+def generate_stream(count: int, packet_size: int = 13, seed: int = 0,
+                    noise_rate: float = 0.0, misalign_rate: float = 0.0,
+                    drop_rate: float = 0.0, count_step: int = 1) -> Tuple[bytes, Dict[str, int]]:
+    """Generate a serial byte stream with optional damage.
+
+    Args:
+        count: Number of packets produced by the simulated sensor
+        packet_size: Packet size (13 or 19 bytes)
+        seed: Random seed (same arguments, same stream)
+        noise_rate: Probability of a run of 1-8 noise bytes before a packet
+                    (noise never contains the 0x80 header byte)
+        misalign_rate: Probability that a packet is truncated, shifting the
+                       framing of the bytes that follow
+        drop_rate: Probability that a packet is lost (counter gap)
+        count_step: Counter increment per packet
+
+    Returns:
+        Tuple of (stream bytes, stats) where stats counts generated, sent,
+        dropped and truncated packets and noise bytes
+    """
+    frames = generate_frames(count, packet_size, seed, count_step=count_step)
+    return damage_frames(frames, np.random.default_rng(seed + 1), noise_rate, misalign_rate, drop_rate)
+
+
+def damage_frames(frames, rng, noise_rate: float = 0.0, misalign_rate: float = 0.0,
+                  drop_rate: float = 0.0) -> Tuple[bytes, Dict[str, int]]:
+    """Serialize packets with random damage.
+
+    Used by generate_stream() and to damage replayed captures.
+
+    Args:
+        frames: (N, packet_size) uint8 array of packets
+        rng: numpy.random.Generator
+        noise_rate: Probability of a run of 1-8 noise bytes before a packet
+        misalign_rate: Probability that a packet is truncated
+        drop_rate: Probability that a packet is lost
+
+    Returns:
+        Tuple of (stream bytes, stats) as for generate_stream()
+    """
+    count, packet_size = frames.shape
+    kept = rng.random(count) >= drop_rate
+    sent = frames[kept]
+    noise = np.nonzero(rng.random(len(sent)) < noise_rate)[0]
+    truncated = np.nonzero(rng.random(len(sent)) < misalign_rate)[0]
+
+    stats = {
+        'generated': count,
+        'sent': int(len(sent)),
+        'dropped': int(count - len(sent)),
+        'truncated': int(len(truncated)),
+        'noise_bytes': 0,
+    }
+    if not len(noise) and not len(truncated):
+        return sent.tobytes(), stats
+
+    noise_set = set(noise.tolist())
+    truncated_set = set(truncated.tolist())
+    data = sent.tobytes()
+    out = bytearray()
+    position = 0
+    for index in sorted(noise_set | truncated_set):
+        start = index * packet_size
+        out += data[position:start]
+        if index in noise_set:
+            run = int(rng.integers(1, MAX_NOISE_RUN + 1))
+            junk = rng.integers(0, 255, run, dtype=np.uint8)
+            junk[junk >= PACKET_HEADER] += 1  # skip 0x80
+            out += junk.tobytes()
+            stats['noise_bytes'] += run
+        if index in truncated_set:
+            out += data[start:start + int(rng.integers(1, packet_size))]
+        else:
+            out += data[start:start + packet_size]
+        position = start + packet_size
+    out += data[position:]
+    return bytes(out), stats
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Tests for the threaded capture pipeline.
+
+Checks the queue overflow policies and backpressure, that the threaded
+pipeline writes the same files as the single-threaded collector loop, and
+that a failing stage stops the pipeline and is reported.
+"""
+
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from capture_pipeline import TIMED_OUT, CapturePipeline, StageQueue
+from collect_raw_vibration_data import RawVibrationDataCollector
+from synthetic_packets import generate_stream
+
+
+def _chunk_reader(data: bytes, chunk: int):
+    """Reader stage serving ``data`` in ``chunk``-byte reads, then b''."""
+    chunks = [data[i:i + chunk] for i in range(0, len(data), chunk)]
+    chunks.reverse()
+
+    def read():
+        if chunks:
+            return chunks.pop()
+        time.sleep(0.001)
+        return b''
+
+    return read, chunks
+
+
+def test_queue_overflow_policies():
+    queue = StageQueue("test", max_bytes=10, overflow="drop-newest")
+    assert queue.put(b'a' * 6, 6)
+    assert not queue.put(b'b' * 6, 6)
+    assert queue.put(b'c' * 4, 4)
+    assert (queue.dropped_count, queue.dropped_bytes, queue.peak_bytes) == (1, 6, 10)
+    assert queue.get() == b'a' * 6
+
+    queue = StageQueue("test", max_bytes=10, overflow="drop-oldest")
+    for item in (b'1111', b'2222', b'3333'):
+        queue.put(item, 4)
+    queue.close()
+    assert (queue.dropped_count, queue.dropped_bytes) == (1, 4)
+    assert [queue.get(), queue.get(), queue.get()] == [b'2222', b'3333', None]
+
+    # An item larger than the bound is accepted when the queue is empty
+    queue = StageQueue("test", max_bytes=10)
+    assert queue.put(b'x' * 20, 20)
+    assert queue.queued_bytes == 20
+
+
+def test_queue_block_applies_backpressure():
+    queue = StageQueue("test", max_bytes=8, overflow="block")
+    queue.put(b'a' * 8, 8)
+    done = threading.Event()
+
+    def producer():
+        queue.put(b'b' * 8, 8)
+        done.set()
+
+    thread = threading.Thread(target=producer)
+    thread.start()
+    assert not done.wait(0.05)
+    assert queue.get() == b'a' * 8
+    assert done.wait(1.0)
+    thread.join()
+    assert queue.get() == b'b' * 8
+    assert queue.blocked_seconds > 0
+    assert queue.dropped_count == 0
+    # Writer stages wait with a timeout so they can run idle work
+    assert queue.get(0.01) is TIMED_OUT
+    queue.close()
+    assert queue.get(0.01) is None
+
+
+def test_pipeline_matches_single_thread_loop():
+    data, _ = generate_stream(5000, 19, seed=11, noise_rate=0.01, misalign_rate=0.01)
+    outputs = []
+    for threaded in (False, True):
+        with tempfile.TemporaryDirectory() as tmp:
+            collector = RawVibrationDataCollector("test", 921600, tmp, checksum="flag")
+            raw_path, parsed_path = collector.setup_files(Path(tmp), Path(tmp))
+            read, pending = _chunk_reader(data, 1000)
+            try:
+                if threaded:
+                    # Small queues so backpressure is exercised
+                    pipeline = CapturePipeline(read, collector.frame_data, collector.write_batch,
+                                               queue_bytes=4096).start()
+                    while pending:
+                        time.sleep(0.01)
+                    pipeline.stop()
+                    pipeline.raise_error()
+                    assert pipeline.read_bytes == len(data)
+                    assert pipeline.read_queue.dropped_count == 0
+                else:
+                    while pending:
+                        collector.process_data(read())
+            finally:
+                collector.close()
+            outputs.append((raw_path.read_bytes(), parsed_path.read_bytes(),
+                            collector.raw_packet_count, collector.error_count))
+    assert outputs[0] == outputs[1]
+    assert outputs[0][2] > 0
+
+
+def test_failing_stage_stops_pipeline():
+    read, _ = _chunk_reader(bytes(100000), 100)
+
+    def parse(data):
+        return data, None
+
+    def write(frames, payload):
+        raise OSError("disk full")
+
+    pipeline = CapturePipeline(read, parse, write, queue_bytes=1000).start()
+    deadline = time.monotonic() + 2.0
+    while pipeline.running and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert not pipeline.running
+    pipeline.stop(timeout=2.0)
+    try:
+        pipeline.raise_error()
+    except RuntimeError as e:
+        assert "writer" in str(e) and "disk full" in str(e)
+    else:
+        raise AssertionError("stage failure not reported")
+
+
+def main():
+    """Run all tests."""
+    tests = [
+        test_queue_overflow_policies,
+        test_queue_block_applies_backpressure,
+        test_pipeline_matches_single_thread_loop,
+        test_failing_stage_stops_pipeline,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✓ PASS: {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ FAIL: {test.__name__}: {e}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Tests for capture replay.
+
+Replays the archived field capture flat-out and checks it arrives byte
+for byte, checks the paced rate and silent gaps of a binary capture, and
+checks that injected damage is reproducible and counted. Skipped without
+pyserial, numpy or a POSIX pty.
+"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from serial import Serial
+except ImportError:
+    Serial = None
+
+from testing_utils import skip
+
+FIELD_CAPTURE = (Path(__file__).parent / "vibration_collection_20251203_122023" / "raw_data"
+                 / "vibration_raw_Port_3_2025-12-03_12-20-23.304.csv")
+
+
+def _skip():
+    if Serial is None or np is None or not hasattr(os, 'openpty'):
+        skip("needs pyserial, numpy and a POSIX pty")
+        return True
+    return False
+
+
+def _receive(replay, baud=460800, timeout=10.0):
+    """Start the replay and read everything it sends."""
+    connection = Serial(replay.port, baud, timeout=0.05)
+    data = bytearray()
+    try:
+        start = time.perf_counter()
+        replay.start()
+        while time.perf_counter() - start < timeout:
+            chunk = connection.read(65536)
+            data += chunk
+            if not chunk and replay.finished.is_set():
+                break
+        elapsed = time.perf_counter() - start
+    finally:
+        connection.close()
+    return bytes(data), elapsed
+
+
+def _binary_capture(directory, frames, output_type="displacement"):
+    from raw_capture import BinaryCaptureWriter
+    path = Path(directory) / "capture.bin"
+    with BinaryCaptureWriter(path, frames.shape[1], output_type=output_type) as writer:
+        writer.write_frames(frames.tobytes())
+    return path
+
+
+def test_field_capture_flat_out():
+    if _skip():
+        return
+    from capture_replay import CaptureReplay
+    from capture_stream import iter_packets
+
+    expected = b''.join(batch.tobytes() for batch in iter_packets(FIELD_CAPTURE))
+    with CaptureReplay(FIELD_CAPTURE, speed=0, repeat=2) as replay:
+        assert replay.packet_size == 13 and replay.sample_rate == 300.0
+        data, _ = _receive(replay)
+    assert data == expected * 2
+    assert replay.stats['passes'] == 2 and replay.stats['packets_sent'] == 2 * len(expected) // 13
+
+
+def test_paced_rate_and_gaps():
+    if _skip():
+        return
+    from capture_replay import CaptureReplay
+    from synthetic_packets import generate_frames
+
+    frames = generate_frames(600, 13)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = _binary_capture(tmp, frames)
+        # 2 s of displacement data at 4x; a 0.1 s gap at 0.5, 1.0 and 1.5 s
+        with CaptureReplay(path, speed=4, gap_every=0.5, gap_seconds=0.1) as replay:
+            data, elapsed = _receive(replay)
+    kept = np.ones(600, dtype=bool)
+    for start in (150, 300, 450):
+        kept[start:start + 30] = False
+    assert data == frames[kept].tobytes()
+    assert replay.stats['gaps'] == 3 and replay.stats['gap_packets'] == 90
+    assert 0.45 < elapsed < 0.8, elapsed
+    assert replay.stats['max_lag_seconds'] < 0.1 and replay.stats['overrun_bytes'] == 0
+
+
+def test_damage_is_reproducible():
+    if _skip():
+        return
+    from capture_replay import CaptureReplay
+    from packet_framer import PacketFramer
+    from synthetic_packets import generate_frames
+
+    frames = generate_frames(5000, 19, seed=3)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = _binary_capture(tmp, frames, output_type="velocity")
+        streams = []
+        for _ in range(2):
+            with CaptureReplay(path, speed=0, noise_rate=0.01, drop_rate=0.01, seed=9) as replay:
+                data, _ = _receive(replay, baud=921600)
+                streams.append((data, dict(replay.stats)))
+    (first, stats), (second, _) = streams
+    assert first == second and len(first) == stats['bytes_sent']
+    assert stats['dropped_packets'] > 0 and stats['noise_bytes'] > 0
+    assert stats['packets_sent'] + stats['dropped_packets'] == 5000
+
+    framer = PacketFramer(19)
+    framer.feed(first)
+    received = sum(len(batch) for batch in framer.frames()) // 19
+    assert received == stats['packets_sent'] and framer.resync_bytes == stats['noise_bytes']
+
+
+def main():
+    """Run all tests."""
+    tests = [
+        test_field_capture_flat_out,
+        test_paced_rate_and_gaps,
+        test_damage_is_reproducible,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✓ PASS: {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ FAIL: {test.__name__}: {e}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Tests for capture segment rotation.
+
+Rotates a synthetic capture by size and checks the segment files, the
+manifest (packet ranges, counters, file sizes) and that PacketStream reads
+the segments back as the original stream.
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from capture_segments import RotationPolicy, read_segment_manifest, segment_files
+from collect_raw_vibration_data import RawVibrationDataCollector
+from synthetic_packets import generate_stream
+from testing_utils import skip
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def _capture(tmp, data, packet_size, raw_format, rotation, chunk=1900):
+    # The collector picks the packet size from the baud rate
+    baud = 921600 if packet_size == 19 else 460800
+    collector = RawVibrationDataCollector("test", baud, tmp, raw_format=raw_format,
+                                          rotation=rotation)
+    collector.setup_files(Path(tmp), Path(tmp))
+    try:
+        for start in range(0, len(data), chunk):
+            collector.process_data(data[start:start + chunk])
+    finally:
+        collector.close()
+    return collector
+
+
+def test_rotation_policy():
+    policy = RotationPolicy(max_bytes=100)
+    assert policy.enabled and not policy.due(99, 0) and policy.due(100, 0)
+    assert not RotationPolicy().enabled
+    for bad in ({'max_bytes': 0}, {'max_seconds': -1}):
+        try:
+            RotationPolicy(**bad)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"invalid policy accepted: {bad}")
+
+
+def test_size_rotation_manifest():
+    data, _ = generate_stream(5000, 19, seed=3)
+    with tempfile.TemporaryDirectory() as tmp:
+        collector = _capture(tmp, data, 19, "binary", RotationPolicy(max_bytes=19 * 1000))
+        manifest = read_segment_manifest(collector.segments.path)
+        segments = manifest['segments']
+        # Rotation happens between batches, so segments end on batch boundaries
+        assert len(segments) == 5
+        assert manifest['packet_count'] == 5000
+        assert all(segment['status'] == "closed" for segment in segments)
+        assert [segment['index'] for segment in segments] == [1, 2, 3, 4, 5]
+        assert segments[0]['raw_file'].endswith("_seg0001.bin")
+
+        first_packet = 0
+        for segment in segments:
+            assert segment['first_packet'] == first_packet
+            first = data[first_packet * 19:(first_packet + 1) * 19]
+            last_packet = first_packet + segment['packet_count'] - 1
+            last = data[last_packet * 19:(last_packet + 1) * 19]
+            assert segment['first_counter'] == (first[14] << 8) | first[15]
+            assert segment['last_counter'] == (last[14] << 8) | last[15]
+            raw_path = Path(tmp) / segment['raw_file']
+            assert segment['raw_bytes'] == raw_path.stat().st_size
+            parsed_path = Path(tmp) / segment['parsed_file']
+            assert len(parsed_path.read_text().splitlines()) - 1 == segment['packet_count']
+            first_packet += segment['packet_count']
+
+
+def test_stream_reads_segments_in_order():
+    if np is None:
+        return skip("needs numpy")
+    from capture_stream import PacketStream
+
+    for raw_format, packet_size in (("binary", 19), ("csv", 13)):
+        data, _ = generate_stream(3000, packet_size, seed=4)
+        with tempfile.TemporaryDirectory() as tmp:
+            rotation = RotationPolicy(max_bytes=packet_size * 700)
+            collector = _capture(tmp, data, packet_size, raw_format, rotation)
+            manifest_path = collector.segments.path
+            assert len(segment_files(manifest_path)) > 1
+            frames = np.concatenate(list(PacketStream(manifest_path, batch_size=500)))
+            assert frames.tobytes() == data
+
+
+def main():
+    """Run all tests."""
+    tests = [
+        test_rotation_policy,
+        test_size_rotation_manifest,
+        test_stream_reads_segments_in_order,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✓ PASS: {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ FAIL: {test.__name__}: {e}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
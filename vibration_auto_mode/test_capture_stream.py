@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Tests for the capture streaming API.
+
+Checks that iter_packets() / iter_samples() yield the same packets from
+hex CSV, binary, gzip and zip sources in bounded batches, and that
+iter_samples() applies the 19-byte checksum policies like the parser.
+"""
+
+import gzip
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import capture_stream
+from capture_stream import PacketStream, decode_csv_block, iter_packets, iter_samples
+from packet_decoder import decode_packets
+from parse_vibration_data import VibrationDataParser, parse_csv_line_to_bytes
+from raw_capture import BinaryCaptureWriter, csv_to_binary
+from synthetic_packets import generate_stream
+
+HERE = Path(__file__).parent
+ZIP_CAPTURE = HERE / "vibration_collection_20251203_123533.zip"
+CSV_CAPTURE = next(HERE.glob("vibration_collection_20251203_123533/raw_data/*.csv"))
+
+
+def _reference_bytes(path: Path) -> bytes:
+    packets = (parse_csv_line_to_bytes(line) for line in path.read_text().splitlines())
+    return b''.join(bytes(packet) for packet in packets if packet is not None)
+
+
+def _gzip(source: Path, target: Path) -> Path:
+    with open(source, 'rb') as f, gzip.open(target, 'wb') as out:
+        shutil.copyfileobj(f, out)
+    return target
+
+
+def test_all_sources_yield_same_packets():
+    expected = _reference_bytes(CSV_CAPTURE)
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        binary, _, _ = csv_to_binary(CSV_CAPTURE, tmp / "capture.bin")
+        sources = [
+            CSV_CAPTURE,
+            binary,
+            _gzip(CSV_CAPTURE, tmp / "capture.csv.gz"),
+            _gzip(binary, tmp / "capture.bin.gz"),
+            ZIP_CAPTURE,
+        ]
+        for source in sources:
+            stream = PacketStream(source, batch_size=1000)
+            batches = list(stream)
+            assert all(len(batch) <= 1000 for batch in batches), source
+            assert stream.packet_size == 13
+            assert stream.packet_count == len(expected) // 13
+            assert b''.join(batch.tobytes() for batch in batches) == expected, source
+            del batches
+
+
+def test_iter_samples_matches_decoder():
+    expected = decode_packets(_reference_bytes(CSV_CAPTURE), 13)
+    decoded = np.concatenate(list(iter_samples(CSV_CAPTURE, batch_size=4096)))
+    assert np.array_equal(decoded, expected)
+
+
+def test_iter_samples_checksum_policies():
+    data, _ = generate_stream(500, 19, seed=7)
+    frames = bytearray(data)
+    frames[19 * 123 + 6] ^= 0x01
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "capture.bin"
+        with BinaryCaptureWriter(path, 19) as writer:
+            writer.write_frames(frames)
+        dropped = np.concatenate(list(iter_samples(path, batch_size=100)))
+        assert len(dropped) == 499
+        flagged = np.concatenate(list(iter_samples(path, batch_size=100, checksum="flag")))
+        assert np.flatnonzero(~flagged['checksum_ok']).tolist() == [123]
+        unchecked = np.concatenate(list(iter_samples(path, checksum="off")))
+        assert 'checksum_ok' not in unchecked.dtype.names and len(unchecked) == 500
+
+        # Same rows as the parser with its default policy
+        output = Path(tmp) / "parsed.csv"
+        parser = VibrationDataParser(str(path), str(output), packet_size=19)
+        assert parser.parse_file()['parsed'] == 499
+        counts = [int(line.split(',')[7]) for line in output.read_text().splitlines()[1:]]
+        assert counts == dropped['count'].tolist()
+
+
+def test_undecodable_lines_counted():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "noisy.csv"
+        lines = CSV_CAPTURE.read_text().splitlines()[:100]
+        lines[10] = "garbage"
+        path.write_text("\n".join(lines) + "\n")
+        stream = PacketStream(path)
+        assert sum(len(batch) for batch in stream) == 99
+        assert stream.error_count == 1
+        assert len(next(iter_packets(path, batch_size=7))) == 7
+
+
+def test_csv_block_fast_path():
+    lines = CSV_CAPTURE.read_text().splitlines()[:2000]
+    expected = b''.join(bytes(parse_csv_line_to_bytes(line)) for line in lines)
+    for ending in ("\n", "\r\n"):
+        assert decode_csv_block("".join(line + ending for line in lines).encode(), 13) == expected
+    # Any deviation falls back to the line decoder
+    assert decode_csv_block(("\n".join(lines) + "\n").upper().encode(), 13) == expected
+    assert decode_csv_block(("\n".join(lines[:-1]) + "\n").encode() + b" ", 13) is None
+    lines[7] = lines[7].replace(",", " ", 1)
+    assert decode_csv_block(("\n".join(lines) + "\n").encode(), 13) is None
+
+    # Streams mixing good blocks, bad lines and CRLF endings match line-by-line parsing
+    lines[50] = "80,09,01,zz,fd967f,00c187,0d"
+    lines[90] = ""
+    text = "\n".join(lines[:1000]) + "\r\n" + "\r\n".join(lines[1000:])
+    saved = capture_stream.CSV_BLOCK_SIZE
+    capture_stream.CSV_BLOCK_SIZE = 4096
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "mixed.csv"
+            path.write_bytes(text.encode())
+            stream = PacketStream(path, batch_size=333)
+            data = b''.join(batch.tobytes() for batch in stream)
+    finally:
+        capture_stream.CSV_BLOCK_SIZE = saved
+    packets = [parse_csv_line_to_bytes(line) for line in text.splitlines()]
+    assert data == b''.join(bytes(packet) for packet in packets if packet is not None)
+    assert stream.error_count == packets.count(None) == 3
+
+
+def main():
+    """Run all tests."""
+    tests = [
+        test_all_sources_yield_same_packets,
+        test_iter_samples_matches_decoder,
+        test_iter_samples_checksum_policies,
+        test_undecodable_lines_counted,
+        test_csv_block_fast_path,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✓ PASS: {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ FAIL: {test.__name__}: {e}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Tests for capture telemetry.
+
+Runs a damaged synthetic stream through an instrumented capture pipeline
+and checks the published stats: byte and frame totals, resync bytes and
+bad frames counted apart, counter gaps, and the histograms.
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from capture_pipeline import CapturePipeline
+from capture_telemetry import CaptureTelemetry, Histogram, TelemetryPublisher, read_stats
+from collect_raw_vibration_data import RawVibrationDataCollector
+from synthetic_packets import generate_stream
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def test_histogram_buckets():
+    histogram = Histogram((1, 10, 100))
+    for value in (0.5, 1, 5, 10, 50, 1000):
+        histogram.observe(value)
+    snapshot = histogram.snapshot()
+    # Bounds are inclusive upper limits, counts are cumulative
+    assert snapshot['buckets'] == [[1, 2], [10, 4], [100, 5], ["+Inf", 6]]
+    assert snapshot['count'] == 6 and snapshot['sum'] == 1066.5 and snapshot['max'] == 1000
+    try:
+        Histogram((10, 1))
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("unsorted bounds accepted")
+
+
+def test_pipeline_stats_file():
+    data, truth = generate_stream(6000, 19, seed=5, noise_rate=0.01, misalign_rate=0.005,
+                                  drop_rate=0.01)
+    chunks = [data[i:i + 1000] for i in range(0, len(data), 1000)]
+
+    def read():
+        if chunks:
+            return chunks.pop(0)
+        time.sleep(0.001)
+        return b''
+
+    with tempfile.TemporaryDirectory() as tmp:
+        collector = RawVibrationDataCollector("test", 921600, tmp, raw_format="binary")
+        collector.setup_files(Path(tmp), Path(tmp))
+        telemetry = collector.telemetry
+        pipeline = CapturePipeline(telemetry.wrap_read(read), collector.frame_data,
+                                   telemetry.wrap_write(collector.write_batch))
+        telemetry.attach(pipeline=pipeline)
+        publisher = TelemetryPublisher(Path(tmp) / "stats.json", [telemetry], interval=60).start()
+        try:
+            assert read_stats(publisher.path)['status'] == "running"
+            pipeline.start()
+            while chunks:
+                time.sleep(0.01)
+            pipeline.stop()
+            pipeline.raise_error()
+        finally:
+            publisher.stop()
+            collector.close()
+
+        document = read_stats(publisher.path)
+        assert document['status'] == "stopped" and publisher.write_count == 2
+        stats, = document['captures']
+        assert stats['name'] == "porttest" and stats['labels']['baud'] == "921600"
+        assert stats['bytes_read'] == len(data)
+        assert stats['frames'] == collector.raw_packet_count
+        assert stats['resync_bytes'] == collector.framer.resync_bytes
+        assert stats['bad_frames'] == collector.framer.bad_frames
+        assert stats['resync_bytes'] + stats['bad_frames'] == collector.error_count > 0
+        assert stats['read_size_bytes']['count'] == stats['read_calls'] - stats['empty_reads']
+        assert stats['read_size_bytes']['buckets'][-1][1] == stats['read_size_bytes']['count']
+        assert stats['write_latency_seconds']['count'] == stats['batches_written'] > 0
+        assert stats['queues']['read']['put_bytes'] == len(data)
+        if np is not None:
+            assert stats['counter_gaps'] > 0
+            assert stats['lost_samples'] >= truth['dropped']
+
+
+def test_rates_between_snapshots():
+    telemetry = CaptureTelemetry("rate", 13)
+    read = telemetry.wrap_read(lambda: b'\x00' * 100)
+    first = telemetry.snapshot()
+    for _ in range(10):
+        read()
+    second = telemetry.snapshot()
+    assert first['bytes_read'] == 0 and second['bytes_read'] == 1000
+    assert second['bytes_per_second'] > 0
+    # Nothing read since the last snapshot
+    assert telemetry.snapshot()['bytes_per_second'] == 0
+
+
+def main():
+    """Run all tests."""
+    tests = [
+        test_histogram_buckets,
+        test_pipeline_stats_file,
+        test_rates_between_snapshots,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✓ PASS: {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ FAIL: {test.__name__}: {e}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Tests for multi-port collection.
+
+Streams synthetic packets into two pseudo-terminals at different baud
+rates and checks the shared collection directory: raw files with the
+sensor identity in their headers, manifest stats and the monotonic
+timebase. Skipped without pyserial or a POSIX pty.
+"""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from collect_multi_port import MANIFEST_NAME, MultiPortCollector, parse_port_spec
+from collect_raw_vibration_data import sensor_identity
+from raw_capture import BinaryCaptureReader
+from synthetic_packets import generate_stream
+from testing_utils import skip
+
+try:
+    import serial
+except ImportError:
+    serial = None
+
+
+def test_parse_port_spec():
+    assert parse_port_spec("COM4", 460800) == ("COM4", 460800)
+    assert parse_port_spec("/dev/ttyUSB1@921600", 460800) == ("/dev/ttyUSB1", 921600)
+    try:
+        parse_port_spec("COM4@fast", 460800)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("invalid baud accepted")
+    try:
+        MultiPortCollector([("COM4", 460800), ("COM4", 921600)])
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("duplicate port accepted")
+    try:
+        MultiPortCollector([("COM4", 460800), ("COM5", 460800)],
+                           sensor_identities=[sensor_identity(serial_number="P1PE0001")])
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("missing sensor identity accepted")
+
+
+def test_two_ports_one_collection():
+    if serial is None or not hasattr(os, 'openpty'):
+        return skip("needs pyserial and a POSIX pty")
+    streams = {13: generate_stream(3000, 13, seed=1)[0], 19: generate_stream(2000, 19, seed=2)[0]}
+    ptys = {size: os.openpty() for size in streams}
+    try:
+        ports = [(os.ttyname(ptys[13][1]), 460800), (os.ttyname(ptys[19][1]), 921600)]
+        with tempfile.TemporaryDirectory() as tmp:
+            identities = [sensor_identity(serial_number=f"P1PE000{size}") for size in streams]
+            collector = MultiPortCollector(ports, tmp, raw_format="binary", writers=1,
+                                           sensor_identities=identities)
+            collector.open()
+            try:
+                def feed():
+                    for size, data in streams.items():
+                        os.write(ptys[size][0], data[:len(data) // 2])
+                    for size, data in streams.items():
+                        os.write(ptys[size][0], data[len(data) // 2:])
+
+                feeder = threading.Timer(0.1, feed)
+                feeder.start()
+                collector.collect_data(duration=1.0, wait_init=0)
+                feeder.join()
+            finally:
+                collector.close()
+
+            collection = collector.collection_dir
+            manifest = json.loads((collection / MANIFEST_NAME).read_text())
+            assert manifest['status'] == "complete"
+            assert manifest['timebase']['clock'] == "host monotonic"
+            assert [port['packet_size'] for port in manifest['ports']] == [13, 19]
+            for entry in manifest['ports']:
+                size = entry['packet_size']
+                with BinaryCaptureReader(collection / entry['raw_file']) as reader:
+                    assert reader.frames.tobytes() == streams[size]
+                    assert reader.header['sensor'] == {'port': entry['port'], 'product_id': "M-A542VR1",
+                                                       'serial_number': f"P1PE000{size}"}
+                assert entry['stats']['raw_packets'] == len(streams[size]) // size
+                assert entry['stats']['errors'] == 0
+
+                lines = (collection / entry['timebase_file']).read_text().splitlines()
+                rows = [tuple(map(int, line.split(','))) for line in lines[1:]]
+                assert rows[-1][0] == entry['stats']['raw_packets'] - 1
+                assert all(a[0] < b[0] and a[1] <= b[1] for a, b in zip(rows, rows[1:]))
+                assert rows[0][1] >= manifest['timebase']['monotonic_ns']
+    finally:
+        for master, slave in ptys.values():
+            os.close(master)
+            os.close(slave)
+
+
+def main():
+    """Run all tests."""
+    tests = [
+        test_parse_port_spec,
+        test_two_ports_one_collection,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✓ PASS: {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ FAIL: {test.__name__}: {e}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Tests for the flight recorder.
+
+Feeds decoded samples with planted events in uneven batches and checks
+the ring, trigger positions across batch boundaries, the pre/post windows
+written per event, hold-off and the events index. Skipped without numpy.
+"""
+
+import csv
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from flight_recorder import (
+    EVENTS_INDEX_NAME,
+    FlightRecorder,
+    FlightRecorderCollector,
+    SampleRing,
+    Trigger,
+)
+from synthetic_packets import generate_stream
+from testing_utils import skip
+
+
+def _samples(count, packet_size=19):
+    from packet_decoder import packet_dtype
+    samples = np.zeros(count, dtype=packet_dtype(packet_size))
+    samples['temperature'] = 25.0
+    samples['count'] = np.arange(count)
+    return samples
+
+
+def _feed(recorder, samples, sizes=(7, 130, 1, 64)):
+    position = 0
+    step = 0
+    while position < len(samples):
+        size = sizes[step % len(sizes)]
+        recorder.feed(samples[position:position + size])
+        position += size
+        step += 1
+
+
+def test_sample_ring():
+    if np is None:
+        return skip("needs numpy")
+    ring = SampleRing(np.dtype('i8'), 5)
+    ring.extend(np.arange(3))
+    assert ring.last(10).tolist() == [0, 1, 2]
+    ring.extend(np.arange(3, 7))
+    assert ring.last(5).tolist() == [2, 3, 4, 5, 6] and ring.last(2).tolist() == [5, 6]
+    ring.extend(np.arange(100, 120))
+    assert ring.last(5).tolist() == [115, 116, 117, 118, 119] and len(ring) == 5
+    assert Trigger.parse("rms:xz:0.5").axes == ("x", "z")
+    assert Trigger.parse("temperature:3").name == "temperature"
+    for spec in ("rms", "noise:1", "amplitude:w:1", "temperature:x:2"):
+        try:
+            Trigger.parse(spec)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"invalid trigger accepted: {spec}")
+
+
+def test_rms_trigger_independent_of_batching():
+    if np is None:
+        return skip("needs numpy")
+    samples = _samples(3000)
+    # 0.5 mm sine burst on z from sample 2000: window RMS crosses 0.3 mm mid-burst
+    samples['z'][2000:] = 0.0005 * np.sin(np.arange(1000) * 0.3)
+    trigger = Trigger("rms", 0.3, axes="z", window=0.1)
+    expected = trigger.find(samples, samples[:0], 300)
+    assert expected is not None and 2000 < expected[0] < 2100
+
+    for sizes in ((3000,), (1, 999, 1000, 1000), (17,)):
+        with tempfile.TemporaryDirectory() as tmp:
+            recorder = FlightRecorder(tmp, 19, [trigger], pre_seconds=1, post_seconds=1)
+            _feed(recorder, samples, sizes)
+            assert recorder.events[0]['trigger_sample'] == expected[0], sizes
+            assert recorder.events[0]['field'] == "z"
+
+
+def test_event_windows_and_index():
+    if np is None:
+        return skip("needs numpy")
+    samples = _samples(6000, 13)
+    samples['x'][1000] = 0.002                 # 2 mm spike
+    samples['temperature'][4000:] = 30.0       # 5 degC jump
+    triggers = [Trigger("amplitude", 1.0), Trigger("temperature", 3.0, window=0.5)]
+    with tempfile.TemporaryDirectory() as tmp:
+        recorder = FlightRecorder(tmp, 13, triggers, pre_seconds=2, post_seconds=1)
+        _feed(recorder, samples)
+        recorder.close()
+
+        index = json.loads((Path(tmp) / EVENTS_INDEX_NAME).read_text())
+        events = index['events']
+        assert [(e['trigger'], e['field'], e['trigger_sample']) for e in events] == [
+            ("amplitude", "x", 1000), ("temperature", "temperature", 4000)]
+        assert index['samples_seen'] == 6000
+        for event in events:
+            assert event['complete'] and event['pre_samples'] == 600 and event['post_samples'] == 300
+            with open(Path(tmp) / event['file'], newline='') as f:
+                rows = list(csv.DictReader(f))
+            assert len(rows) == 900
+            assert int(rows[0]['sample_index']) == event['trigger_sample'] - 600
+            assert [int(row['count']) for row in rows] == list(range(event['first_sample'],
+                                                                    event['first_sample'] + 900))
+            trigger_row = rows[600]
+            assert float(trigger_row['time_s']) == 0.0
+        assert float(rows[599]['temperature']) == 25.0 and float(rows[600]['temperature']) == 30.0
+
+
+def test_holdoff_limits_and_close():
+    if np is None:
+        return skip("needs numpy")
+    samples = _samples(2900)
+    samples['y'][::100] = -0.001               # spike every 100 samples
+    with tempfile.TemporaryDirectory() as tmp:
+        recorder = FlightRecorder(tmp, 19, [Trigger("amplitude", 0.5, axes="y")],
+                                  pre_seconds=0.1, post_seconds=2, holdoff_seconds=1)
+        _feed(recorder, samples)
+        # Event at 0, re-armed at 0 + 600 + 300, next spike at 900, ...
+        assert [e['trigger_sample'] for e in recorder.events] == [0, 900, 1800]
+        assert recorder.events[0]['pre_samples'] == 0 and recorder.events[1]['pre_samples'] == 30
+        assert recorder.triggered
+        recorder.close()
+        assert [e['trigger_sample'] for e in recorder.events][-1] == 2700
+        assert not recorder.events[-1]['complete'] and recorder.events[-1]['post_samples'] == 200
+
+    with tempfile.TemporaryDirectory() as tmp:
+        recorder = FlightRecorder(tmp, 19, [Trigger("amplitude", 0.5, axes="y")],
+                                  pre_seconds=0.1, post_seconds=0.1, max_events=2)
+        _feed(recorder, samples)
+        assert len(recorder.events) == 2 and recorder.sample_count == 2900
+
+
+def test_collector_decodes_stream():
+    if np is None:
+        return skip("needs numpy")
+    data, stats = generate_stream(2000, 19, seed=7, noise_rate=0.01)
+    with tempfile.TemporaryDirectory() as tmp:
+        collector = FlightRecorderCollector(
+            "test", 921600, {'triggers': [Trigger("temperature", 1000.0)]}, output_base_dir=tmp
+        )
+        collector.setup_output_directory()
+        for start in range(0, len(data), 4096):
+            batch = collector.frame_data(data[start:start + 4096])
+            if batch is not None:
+                collector.write_batch(*batch)
+        assert collector.recorder.sample_count == 2000 - collector.checksum_error_count
+        assert collector.framer.resync_bytes == stats['noise_bytes']
+        assert not collector.recorder.events
+
+
+def main():
+    """Run all tests."""
+    tests = [
+        test_sample_ring,
+        test_rms_trigger_independent_of_batching,
+        test_event_windows_and_index,
+        test_holdoff_limits_and_close,
+        test_collector_decodes_stream,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✓ PASS: {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ FAIL: {test.__name__}: {e}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Tests for the flush policy and flush marker.
+
+Checks byte, time and fsync thresholds, that the time limit also holds
+while the link is idle, and that the marker written during and after a
+capture matches what is actually in the files, and that columnar parsed
+formats, which the flush policy cannot make readable, are warned about.
+"""
+
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from capture_pipeline import CapturePipeline
+from capture_segments import RotationPolicy
+import collect_raw_vibration_data
+from collect_raw_vibration_data import RawVibrationDataCollector
+from flush_policy import FlushController, FlushPolicy, read_flush_marker
+from synthetic_packets import generate_stream
+
+
+class _Output:
+    """Flushable output without a file descriptor."""
+
+    def __init__(self):
+        self.flushes = 0
+
+    def flush(self):
+        self.flushes += 1
+
+
+def test_flush_thresholds():
+    output = _Output()
+    controller = FlushController(FlushPolicy(interval=None, max_bytes=100), [output])
+    assert [controller.written(40) for _ in range(5)] == [False, False, True, False, False]
+    assert output.flushes == 1
+
+    # Interval 0: every write is due
+    controller = FlushController(FlushPolicy(interval=0, max_bytes=None), [output])
+    assert controller.written(1) and controller.written(1)
+
+    # Neither limit: only explicit flushes
+    controller = FlushController(FlushPolicy(interval=None, max_bytes=None), [output])
+    assert not any(controller.written(1 << 20) for _ in range(10))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with open(Path(tmp) / "data", 'w') as f:
+            controller = FlushController(FlushPolicy(interval=None, max_bytes=1, fsync_interval=0), [f])
+            f.write("x")
+            controller.written(1)
+            controller.close()
+            assert controller.fsync_count == 2
+            controller = FlushController(FlushPolicy(interval=None, max_bytes=1), [f])
+            controller.written(1)
+            controller.close()
+            assert controller.fsync_count == 0
+
+
+def test_idle_link_flushes_on_time():
+    data, _ = generate_stream(100, 19, seed=3)
+    with tempfile.TemporaryDirectory() as tmp:
+        policy = FlushPolicy(interval=0.2, max_bytes=None)
+        collector = RawVibrationDataCollector("test", 921600, tmp, raw_format="binary",
+                                              flush_policy=policy)
+        raw_path, _ = collector.setup_files(Path(tmp), Path(tmp))
+        chunks = [data]
+
+        def read():
+            if chunks:
+                return chunks.pop()
+            time.sleep(0.01)  # read timeout: nothing more arrives
+            return b''
+
+        pipeline = CapturePipeline(read, collector.frame_data, collector.write_batch,
+                                   idle=collector.flush_idle).start()
+        try:
+            # One write, then silence well past the interval
+            time.sleep(0.6)
+            assert collector.raw_packet_count == 100
+            # Header plus all packets reached the file
+            assert raw_path.stat().st_size > len(data)
+            marker = read_flush_marker(raw_path)
+            assert marker is not None and not marker['closed']
+            assert marker['raw_packets'] == 100
+            assert marker['file_sizes'][raw_path.name] == raw_path.stat().st_size
+            # Nothing new to flush while idle
+            flushes = collector.flusher.flush_count
+            time.sleep(0.3)
+            assert collector.flusher.flush_count == flushes
+        finally:
+            pipeline.stop()
+            collector.close()
+        pipeline.raise_error()
+
+
+def test_idle_flush_after_rotation():
+    data, _ = generate_stream(300, 19, seed=4)
+    with tempfile.TemporaryDirectory() as tmp:
+        policy = FlushPolicy(interval=0.2, max_bytes=None)
+        collector = RawVibrationDataCollector("test", 921600, tmp, raw_format="binary",
+                                              flush_policy=policy,
+                                              rotation=RotationPolicy(max_bytes=19 * 200))
+        first_path, _ = collector.setup_files(Path(tmp), Path(tmp))
+        try:
+            collector.process_data(data[:19 * 200])
+            # Starts the second segment, whose packets stay buffered
+            collector.process_data(data[19 * 200:])
+            raw_path = collector.raw_file.path
+            assert raw_path != first_path
+            time.sleep(0.3)
+            collector.flush_idle()
+            marker = read_flush_marker(raw_path)
+            assert marker is not None and not marker['closed']
+            assert marker['raw_packets'] == 300
+            assert marker['file_sizes'][raw_path.name] == raw_path.stat().st_size
+            assert raw_path.stat().st_size > 19 * 100
+        finally:
+            collector.close()
+
+
+def test_marker_matches_flushed_files():
+    data, _ = generate_stream(4000, 19, seed=2)
+    with tempfile.TemporaryDirectory() as tmp:
+        policy = FlushPolicy(interval=None, max_bytes=19 * 500)
+        collector = RawVibrationDataCollector("test", 921600, tmp, raw_format="binary",
+                                              flush_policy=policy)
+        raw_path, parsed_path = collector.setup_files(Path(tmp), Path(tmp))
+        try:
+            captured = data[:19 * 1234]
+            for start in range(0, len(captured), 1000):
+                collector.process_data(captured[start:start + 1000])
+            # Mid-capture: the marker describes what already reached the files
+            marker = read_flush_marker(raw_path)
+            assert marker is not None and not marker['closed']
+            assert 0 < marker['raw_packets'] < collector.raw_packet_count
+            assert marker['file_sizes'][raw_path.name] <= raw_path.stat().st_size
+            with open(raw_path, 'rb') as f:
+                f.seek(marker['file_sizes'][raw_path.name] - 19)
+                assert f.read(19) == data[(marker['raw_packets'] - 1) * 19:marker['raw_packets'] * 19]
+            assert len(parsed_path.read_text().splitlines()) - 1 == marker['parsed_rows']
+        finally:
+            collector.close()
+
+        marker = read_flush_marker(raw_path)
+        assert marker['closed']
+        assert marker['raw_packets'] == collector.raw_packet_count == 1234
+        assert marker['file_sizes'] == {raw_path.name: raw_path.stat().st_size,
+                                        parsed_path.name: parsed_path.stat().st_size}
+
+
+def test_columnar_parsed_format_warns():
+    class Records(logging.Handler):
+        def __init__(self):
+            super().__init__(logging.WARNING)
+            self.messages = []
+
+        def emit(self, record):
+            self.messages.append(record.getMessage())
+
+    handler = Records()
+    collect_raw_vibration_data.logger.addHandler(handler)
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            RawVibrationDataCollector("test", 460800, tmp, parsed_format="csv")
+            assert handler.messages == []
+            RawVibrationDataCollector("test", 460800, tmp, parsed_format="npz")
+    finally:
+        collect_raw_vibration_data.logger.removeHandler(handler)
+    assert len(handler.messages) == 1 and "re-parse the raw file" in handler.messages[0]
+
+
+def main():
+    """Run all tests."""
+    tests = [
+        test_flush_thresholds,
+        test_idle_link_flushes_on_time,
+        test_idle_flush_after_rotation,
+        test_marker_matches_flushed_files,
+        test_columnar_parsed_format_warns,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✓ PASS: {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ FAIL: {test.__name__}: {e}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Tests for counter gap analysis.
+
+Checks rollover handling for the 2-bit and 16-bit counters, that results
+do not depend on batch boundaries, and the gap index written by the parser.
+"""
+
+import csv
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from gap_analysis import GapAnalyzer, analyze_capture
+from parse_vibration_data import VibrationDataParser
+
+CSV_CAPTURE = next(Path(__file__).parent.glob("vibration_collection_20251203_123533/raw_data/*.csv"))
+
+
+def _counts_with_drops(total, drops, modulus, step=1):
+    """Counter sequence of ``total`` samples with samples removed at ``drops``."""
+    counts = (np.arange(total) * step) % modulus
+    return np.delete(counts, drops)
+
+
+def test_two_bit_counter_rollover():
+    counts = _counts_with_drops(40, [5, 6, 7, 20], 4)
+    analyzer = GapAnalyzer(13)
+    gaps = analyzer.update(counts)
+    assert gaps['sample_index'].tolist() == [5, 17]
+    assert gaps['lost'].tolist() == [3, 1]
+    report = analyzer.report()
+    assert report['lost_samples'] == 4
+    assert report['longest_gap'] == 3
+    assert report['longest_gap_index'] == 5
+    assert report['expected_samples'] == 40
+
+
+def test_sixteen_bit_counter_across_batches():
+    drops = [100, 65530, 65531, 65540, 70000]
+    counts = _counts_with_drops(140000, drops, 65536, step=2)
+    whole = GapAnalyzer(19)
+    whole.update(counts)
+    batched = GapAnalyzer(19)
+    index = []
+    for start in range(0, len(counts), 4999):
+        index.extend(batched.update(counts[start:start + 4999])['sample_index'].tolist())
+    assert batched.report() == whole.report()
+    assert whole.report()['counter_step'] == 2
+    assert whole.report()['lost_samples'] == len(drops)
+    assert index == [100, 65529, 65537, 69996]
+
+
+def test_parser_writes_gap_index():
+    lines = CSV_CAPTURE.read_text().splitlines()[:1000]
+    del lines[500]
+    with tempfile.TemporaryDirectory() as tmp:
+        raw = Path(tmp) / "capture_raw.csv"
+        raw.write_text("\n".join(lines) + "\n")
+        parser = VibrationDataParser(str(raw), gap_index=True)
+        parser.parse_file()
+        with open(Path(tmp) / "capture_parsed_gaps.csv", newline='') as f:
+            gaps = list(csv.DictReader(f))
+        # The capture already has one lost sample before row 334
+        assert parser.gap_report['lost_samples'] == 2
+        assert [row['sample_index'] for row in gaps] == ['334', '500']
+        assert analyze_capture(raw) == parser.gap_report
+
+
+def main():
+    """Run all tests."""
+    tests = [
+        test_two_bit_counter_rollover,
+        test_sixteen_bit_counter_across_batches,
+        test_parser_writes_gap_index,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✓ PASS: {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ FAIL: {test.__name__}: {e}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
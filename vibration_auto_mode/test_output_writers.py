@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Tests for the parsed data output writers.
+
+Checks that the columnar writers hold the same values as the CSV output,
+that row groups stay bounded, and that the parallel parser stitches
+columnar output in order.
+"""
+
+import csv
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import parse_vibration_data
+from output_writers import NpzOutputWriter, iter_npz_groups, load_npz_columns, pq
+from parse_vibration_data import VibrationDataParser, get_fieldnames
+from testing_utils import skip
+
+CAPTURE_FILES = sorted(Path(__file__).parent.glob("vibration_collection_*/raw_data/*.csv"))
+
+
+def _read_csv_columns(path: Path):
+    with open(path, newline='') as f:
+        rows = list(csv.DictReader(f))
+    return {name: np.array([float(row[name]) for row in rows]) for name in rows[0]}
+
+
+def test_npz_matches_csv():
+    saved = parse_vibration_data.MIN_CHUNK_BYTES
+    parse_vibration_data.MIN_CHUNK_BYTES = 4096
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            source = CAPTURE_FILES[0]
+            VibrationDataParser(str(source), str(tmp / "parsed.csv")).parse_file()
+            expected = _read_csv_columns(tmp / "parsed.csv")
+
+            for workers in (1, 3):
+                output = tmp / f"parsed_{workers}.npz"
+                VibrationDataParser(str(source), str(output), workers=workers,
+                                    output_format="npz").parse_file()
+                columns = load_npz_columns(output)
+                assert list(columns) == list(expected)
+                assert columns['count'].dtype == np.uint16
+                assert columns['flag'].dtype == np.uint8
+                for name, values in expected.items():
+                    assert np.array_equal(columns[name].astype(float), values), name
+                assert output.stat().st_size < (tmp / "parsed.csv").stat().st_size / 2
+    finally:
+        parse_vibration_data.MIN_CHUNK_BYTES = saved
+
+
+def test_row_groups_bounded():
+    fieldnames = get_fieldnames(13, "displacement")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "groups.npz"
+        with NpzOutputWriter(path, fieldnames, row_group_size=1000) as writer:
+            for i in range(2500):
+                writer.write_row({name: i % 4 for name in fieldnames})
+            writer.write_columns({name: np.arange(1500) % 4 for name in fieldnames})
+        sizes = [len(group['count']) for group in iter_npz_groups(path)]
+        assert sizes == [1000, 1000, 1000, 1000]
+        assert 'x_mm' not in next(iter_npz_groups(path))
+
+
+def test_parquet_matches_npz():
+    if pq is None:
+        return skip("needs pyarrow")
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        for fmt in ("npz", "parquet"):
+            VibrationDataParser(str(CAPTURE_FILES[0]), str(tmp / f"parsed.{fmt}"),
+                                output_format=fmt).parse_file()
+        table = pq.read_table(tmp / "parsed.parquet")
+        columns = load_npz_columns(tmp / "parsed.npz", derived=False)
+        assert table.column_names == list(columns)
+        for name, values in columns.items():
+            assert np.array_equal(table.column(name).to_numpy(), values), name
+
+
+def main():
+    """Run all tests."""
+    tests = [
+        test_npz_matches_csv,
+        test_row_groups_bounded,
+        test_parquet_matches_npz,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✓ PASS: {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ FAIL: {test.__name__}: {e}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Tests for the vectorized packet decoder.
+
+Checks that decode_packets() is bit-identical to the per-packet reference
+parsers on the captures under vibration_collection_* and on synthetic
+19-byte packets, and the 19-byte checksum policies of the parser.
+"""
+
+import csv
+import random
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import packet_decoder
+import parse_vibration_data
+from packet_decoder import checksum_mask, decode_packets, frames_from_buffer, to_columns
+from parse_vibration_data import (
+    VibrationDataParser,
+    calculate_checksum_19byte,
+    format_packet_as_csv,
+    parse_csv_line_to_bytes,
+    parse_packet_13byte,
+    parse_packet_19byte,
+    verify_checksum_19byte,
+)
+
+CAPTURE_FILES = sorted(Path(__file__).parent.glob("vibration_collection_*/raw_data/*.csv"))
+
+
+def _load_capture(path: Path, packet_size: int = 13):
+    packets = []
+    with open(path, 'r') as f:
+        for line in f:
+            packet = parse_csv_line_to_bytes(line, packet_size)
+            if packet is not None:
+                packets.append(packet)
+    return packets
+
+
+def _assert_bit_identical(packets, packet_size, output_type):
+    parse_func = parse_packet_13byte if packet_size == 13 else parse_packet_19byte
+    reference = [parse_func(packet, output_type) for packet in packets]
+    reference = [row for row in reference if row is not None]
+
+    buffer = b''.join(bytes(packet) for packet in packets)
+    columns = to_columns(decode_packets(buffer, packet_size), output_type)
+
+    assert list(columns) == list(reference[0])
+    for name, values in columns.items():
+        expected = np.array([row[name] for row in reference], dtype=values.dtype)
+        assert values.tobytes() == expected.tobytes(), f"column {name} differs"
+
+
+def test_capture_files_bit_identical():
+    assert CAPTURE_FILES, "no vibration_collection_* captures found"
+    for path in CAPTURE_FILES:
+        packets = _load_capture(path)
+        for output_type in ("displacement", "velocity"):
+            _assert_bit_identical(packets, 13, output_type)
+
+
+def test_synthetic_19byte_bit_identical():
+    rng = random.Random(19)
+    packets = [
+        [0x80] + [rng.randrange(256) for _ in range(17)] + [0x0D]
+        for _ in range(2000)
+    ]
+    for output_type in ("displacement", "velocity"):
+        _assert_bit_identical(packets, 19, output_type)
+
+
+def test_invalid_frames_dropped():
+    good = bytes([0x80, 0x09, 0x01, 0x01, 0x7F, 0xEF, 0xFD, 0x96, 0x7F, 0x00, 0xC1, 0x87, 0x0D])
+    bad = bytes([0x81]) + good[1:]
+    decoded = decode_packets(good + bad + good + b'\x80\x01', 13)
+    assert len(decoded) == 2
+    assert len(decode_packets(good + bad, 13, drop_invalid=False)) == 2
+
+
+def _checksummed_packets(count, seed=19):
+    rng = random.Random(seed)
+    packets = []
+    for _ in range(count):
+        packet = [0x80] + [rng.randrange(256) for _ in range(17)] + [0x0D]
+        checksum = calculate_checksum_19byte(packet)
+        packet[16:18] = [checksum >> 8, checksum & 0xFF]
+        packets.append(packet)
+    return packets
+
+
+def test_checksum_datasheet_example():
+    # Datasheet Section 4.10, Example 1: "8E00 0700 FF FFD8 00 007E 00 0296 1730"
+    body = bytes.fromhex("8E000700FFFFD800007E0002961730")
+    packet = [0x80] + list(body) + [0xB0, 0x1B, 0x0D]
+    assert calculate_checksum_19byte(packet) == 0xB01B
+    assert verify_checksum_19byte(packet)
+    frames = frames_from_buffer(bytes(packet), 19)
+    assert checksum_mask(frames).tolist() == [True]
+
+
+def test_checksum_vectorized_matches_reference():
+    packets = _checksummed_packets(2000)
+    # Flip one bit in ND..CHECKSUM_L of every 7th packet
+    for i, packet in enumerate(packets[::7]):
+        packet[1 + i % 17] ^= 0x10
+    frames = frames_from_buffer(b''.join(bytes(packet) for packet in packets), 19)
+    expected = [verify_checksum_19byte(packet) for packet in packets]
+    assert checksum_mask(frames).tolist() == expected
+    assert expected.count(False) == len(packets[::7])
+
+
+def test_checksum_policies():
+    packets = _checksummed_packets(100)
+    packets[10][6] ^= 0x01
+    packets[20][-1] = 0x00  # framing error, not a checksum error
+    with tempfile.TemporaryDirectory() as tmp:
+        raw = Path(tmp) / "capture_raw.csv"
+        raw.write_text("".join(format_packet_as_csv(p, 19) + "\n" for p in packets))
+        results = {}
+        for policy in ("drop", "flag", "off"):
+            output = Path(tmp) / f"parsed_{policy}.csv"
+            parser = VibrationDataParser(str(raw), str(output), packet_size=19, checksum=policy)
+            results[policy] = parser.parse_file()
+            with open(output, newline='') as f:
+                rows = list(csv.DictReader(f))
+            assert len(rows) == results[policy]['parsed']
+            if policy == "flag":
+                assert [row['checksum_ok'] for row in rows].count('False') == 1
+        assert results['drop'] == {'parsed': 98, 'errors': 1, 'checksum_errors': 1}
+        assert results['flag'] == {'parsed': 99, 'errors': 1, 'checksum_errors': 1}
+        assert results['off'] == {'parsed': 99, 'errors': 1, 'checksum_errors': 0}
+
+
+def test_bulk_checksum_matches_per_packet():
+    packets = _checksummed_packets(100)
+    for i in (0, 6, 7, 55, 99):
+        packets[i][3] ^= 0x40
+    packets[40] = None  # undecodable line
+    numbered = list(enumerate(packets, 1))
+    parser = VibrationDataParser("unused.csv", packet_size=19)
+    saved = parse_vibration_data.CHECKSUM_BATCH_SIZE, packet_decoder.np
+    parse_vibration_data.CHECKSUM_BATCH_SIZE = 7
+    try:
+        bulk = list(parser._check_packets(numbered))
+        packet_decoder.np = None
+        fallback = list(parser._check_packets(numbered))
+    finally:
+        parse_vibration_data.CHECKSUM_BATCH_SIZE, packet_decoder.np = saved
+    assert bulk == fallback
+    assert [line_num for line_num, _, ok in bulk if not ok] == [1, 7, 8, 41, 56, 100]
+
+
+def main():
+    """Run all tests."""
+    tests = [
+        test_capture_files_bit_identical,
+        test_synthetic_19byte_bit_identical,
+        test_invalid_frames_dropped,
+        test_checksum_datasheet_example,
+        test_checksum_vectorized_matches_reference,
+        test_checksum_policies,
+        test_bulk_checksum_matches_per_packet,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✓ PASS: {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ FAIL: {test.__name__}: {e}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Tests for the packet framer.
+
+Checks that PacketFramer returns the same frames and error counts as the
+original per-byte deque loop of the collectors for any read chunking,
+and that both collectors produce the same raw files as before.
+"""
+
+import random
+import sys
+import tempfile
+from collections import deque
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from collect_displacement_data import DisplacementDataCollector
+from collect_raw_vibration_data import RawVibrationDataCollector
+from packet_framer import PacketFramer
+from synthetic_packets import generate_stream
+
+
+def _reference_frames(chunks, packet_size):
+    """The collectors' original deque framing loop."""
+    buffer = deque()
+    frames = []
+    errors = 0
+    for chunk in chunks:
+        buffer.extend(chunk)
+        while len(buffer) >= packet_size:
+            if buffer[0] != 0x80:
+                buffer.popleft()
+                errors += 1
+                continue
+            packet = [buffer.popleft() for _ in range(packet_size)]
+            if packet[-1] == 0x0D:
+                frames.append(packet)
+            else:
+                errors += 1
+    return frames, errors, len(buffer)
+
+
+def _random_chunks(data, seed):
+    rng = random.Random(seed)
+    chunks = []
+    position = 0
+    while position < len(data):
+        size = rng.choice([1, 2, 5, 13, 19, 100, 4096])
+        chunks.append(data[position:position + size])
+        position += size
+    # Trailing junk with stray headers and terminators
+    chunks.append(bytes([0x80, 0x01, 0x0D, 0x80, 0x0D]) * 7)
+    return chunks
+
+
+def test_matches_reference_loop():
+    for packet_size in (13, 19):
+        for seed in range(10):
+            data, _ = generate_stream(3000, packet_size, seed, noise_rate=0.05,
+                                      misalign_rate=0.03, drop_rate=0.01)
+            chunks = _random_chunks(data, seed)
+            framer = PacketFramer(packet_size, capacity=64)
+            frames = []
+            for chunk in chunks:
+                framer.feed(chunk)
+                for batch in framer.frames():
+                    assert len(batch) % packet_size == 0
+                    batch = bytes(batch)
+                    frames.extend(list(batch[i:i + packet_size])
+                                  for i in range(0, len(batch), packet_size))
+            expected, errors, buffered = _reference_frames(chunks, packet_size)
+            assert frames == expected
+            assert framer.error_count == errors
+            assert framer.frame_count == len(expected)
+            assert framer.buffered == buffered
+
+
+def test_reserve_and_commit():
+    data, _ = generate_stream(1000, 13, seed=1, noise_rate=0.1)
+    framer = PacketFramer(13, capacity=16)
+    received = bytearray()
+    for start in range(0, len(data), 700):
+        chunk = data[start:start + 700]
+        view = framer.reserve(len(chunk))
+        view[:len(chunk)] = chunk
+        framer.commit(len(chunk))
+        for batch in framer.frames():
+            received += batch
+    expected, errors, _ = _reference_frames([data], 13)
+    assert bytes(received) == b''.join(bytes(frame) for frame in expected)
+    assert framer.error_count == errors
+
+
+def test_collectors_write_same_raw_files():
+    data, _ = generate_stream(2000, 19, seed=2, noise_rate=0.02, misalign_rate=0.01)
+    chunks = _random_chunks(data, 2)
+    expected, errors, _ = _reference_frames(chunks, 19)
+    with tempfile.TemporaryDirectory() as tmp:
+        raw = RawVibrationDataCollector("test", 921600, tmp, checksum="off")
+        _, parsed_path = raw.setup_files(Path(tmp), Path(tmp))
+        displacement = DisplacementDataCollector("test", 921600, tmp)
+        displacement_path = displacement.setup_files("displacement")
+        try:
+            for chunk in chunks:
+                raw.process_data(chunk)
+                displacement.process_data(chunk)
+        finally:
+            raw.close()
+            displacement.close()
+
+        assert raw.error_count == displacement.error_count == errors
+        assert raw.raw_packet_count == displacement.raw_packet_count == len(expected)
+        assert raw.parsed_packet_count == len(expected)
+        lines = displacement_path.read_text().splitlines()
+        assert lines == [' '.join(f'{b:02X}' for b in frame) for frame in expected]
+        raw_lines = next(Path(tmp).glob("vibration_raw_*.csv")).read_text().splitlines()
+        assert raw_lines == [raw.format_packet_as_csv(frame) for frame in expected]
+        assert len(parsed_path.read_text().splitlines()) == len(expected) + 1
+
+
+def main():
+    """Run all tests."""
+    tests = [
+        test_matches_reference_loop,
+        test_reserve_and_commit,
+        test_collectors_write_same_raw_files,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✓ PASS: {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ FAIL: {test.__name__}: {e}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Tests for VibrationDataParser.
+
+Checks that multi-process parsing stitches output identical to the serial
+path, with the same parsed and error counts, that incremental parsing of
+a growing capture produces the same output as one full parse, and that
+the fast hex line decoder matches the tolerant one.
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import parse_vibration_data
+from parse_vibration_data import (
+    VibrationDataParser,
+    _parse_csv_line_tolerant,
+    parse_csv_line_to_bytes,
+)
+from raw_capture import csv_to_binary
+
+CAPTURE_FILES = sorted(Path(__file__).parent.glob("vibration_collection_*/raw_data/*.csv"))
+
+
+def _make_noisy_capture(path: Path) -> None:
+    lines = CAPTURE_FILES[0].read_text().splitlines()
+    for i in range(0, len(lines), 997):
+        lines[i] = "80,09,01,zz,fd967f,00c187,0d"
+    for i in range(5, len(lines), 1499):
+        lines[i] = lines[i][:-2] + "0e"
+    path.write_text("\n".join(lines) + "\n")
+
+
+def _parse(input_file: Path, output_file: Path, workers: int):
+    parser = VibrationDataParser(str(input_file), str(output_file), workers=workers)
+    return parser.parse_file()
+
+
+def test_parallel_matches_serial():
+    saved = parse_vibration_data.MIN_CHUNK_BYTES
+    parse_vibration_data.MIN_CHUNK_BYTES = 4096
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            raw = tmp / "noisy_raw.csv"
+            _make_noisy_capture(raw)
+            binary, _, _ = csv_to_binary(raw, tmp / "noisy_raw.bin")
+
+            serial = _parse(raw, tmp / "serial.csv", workers=1)
+            assert serial['errors'] > 0
+            for source in (raw, binary):
+                parallel = _parse(source, tmp / "parallel.csv", workers=3)
+                if source == raw:
+                    assert parallel == serial
+                assert (tmp / "parallel.csv").read_bytes() == (tmp / "serial.csv").read_bytes()
+            assert not list(tmp.glob(".*.part*"))
+    finally:
+        parse_vibration_data.MIN_CHUNK_BYTES = saved
+
+
+def test_fast_line_decoder_matches_tolerant():
+    lines = CAPTURE_FILES[0].read_text().splitlines()[:500]
+    lines += [line.upper() + "\r\n" for line in lines[:20]]
+    lines += [
+        "80,09,01,7fef,fd967f,00c187,0d",          # different field widths
+        "80,09,01,7f,ef,fd967f,00c187,0d",         # same bytes, more fields
+        "80,09,01,7fe f,fd967f,00c187,0d",
+        "80,09, 017fef,fd967f,00c187,0d",
+        " 80,09,01,7fef96,fd967f,00c187,0d ",
+        "80,09,01,7fef96,fd967f,00c187,0d,ff",
+        "80,09,01,7fef96,fd967f,00c187,0g",
+        "80;09;01;7fef96;fd967f;00c187;0d",
+        "80,09,01,7fef96,fd967f,00c187",
+        "",
+    ]
+    for packet_size in (13, 19):
+        for line in lines:
+            assert parse_csv_line_to_bytes(line, packet_size) == \
+                _parse_csv_line_tolerant(line, packet_size), line
+    line = "80,7e,00,f2,5a,000010,00007d,00011f,0001,0341,0d"
+    expected = _parse_csv_line_tolerant(line, 19)
+    assert expected is not None
+    assert parse_csv_line_to_bytes(line, 19) == expected
+
+
+def _grow_and_parse(source: Path, target: Path, output: Path, splits) -> None:
+    """Append ``source`` to ``target`` in pieces, parsing incrementally after each."""
+    data = source.read_bytes()
+    target.write_bytes(b"")
+    previous = 0
+    for split in list(splits) + [len(data)]:
+        with open(target, 'ab') as f:
+            f.write(data[previous:split])
+        previous = split
+        VibrationDataParser(str(target), str(output), gap_index=True).parse_incremental()
+
+
+def test_incremental_matches_full():
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        raw = tmp / "noisy_raw.csv"
+        _make_noisy_capture(raw)
+        binary, _, _ = csv_to_binary(raw, tmp / "noisy_raw.bin")
+        full = VibrationDataParser(str(raw), str(tmp / "full.csv"), gap_index=True)
+        expected = full.parse_file()
+
+        # Splits fall inside lines and packets; partial data waits for the next run
+        size = raw.stat().st_size
+        _grow_and_parse(raw, tmp / "growing_raw.csv", tmp / "incremental.csv",
+                        [0, 1000, 1001, size // 3 + 7, size // 2])
+        assert (tmp / "incremental.csv").read_bytes() == (tmp / "full.csv").read_bytes()
+        assert (tmp / "incremental_gaps.csv").read_bytes() == (tmp / "full_gaps.csv").read_bytes()
+
+        # Rows written after the last checkpoint (e.g. a crash) are not duplicated
+        parser = VibrationDataParser(str(tmp / "growing_raw.csv"), str(tmp / "incremental.csv"))
+        with open(tmp / "incremental.csv", 'a') as f:
+            f.write("partial,row\n")
+        assert parser.parse_incremental() == {'parsed': 0, 'errors': 0, 'checksum_errors': 0}
+        assert parser.parsed_count == expected['parsed']
+        assert parser.error_count == expected['errors']
+        assert parser.gap_report == full.gap_report
+        assert (tmp / "incremental.csv").read_bytes() == (tmp / "full.csv").read_bytes()
+
+        # Binary captures resume on packet boundaries (splits are past the header)
+        size = binary.stat().st_size
+        _grow_and_parse(binary, tmp / "growing_raw.bin", tmp / "binary.csv",
+                        [size - 13 * 15000 + 5, size // 2 + 5])
+        VibrationDataParser(str(binary), str(tmp / "binary_full.csv")).parse_file()
+        assert (tmp / "binary.csv").read_bytes() == (tmp / "binary_full.csv").read_bytes()
+
+
+def main():
+    """Run all tests."""
+    tests = [
+        test_parallel_matches_serial,
+        test_incremental_matches_full,
+        test_fast_line_decoder_matches_tolerant,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✓ PASS: {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ FAIL: {test.__name__}: {e}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
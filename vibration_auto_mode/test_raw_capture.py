@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Tests for the binary raw capture format.
+
+Checks hex CSV <-> binary round trips on the captures under
+vibration_collection_*, the memory-mapped frame view (and a clear error
+for empty or truncated files), and that the parser produces identical
+output from either raw format.
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from packet_decoder import decode_packets
+from parse_vibration_data import VibrationDataParser, format_packet_as_csv, parse_csv_line_to_bytes
+from raw_capture import (
+    BinaryCaptureReader,
+    BinaryCaptureWriter,
+    binary_to_csv,
+    csv_to_binary,
+    is_binary_capture,
+)
+
+CAPTURE_FILES = sorted(Path(__file__).parent.glob("vibration_collection_*/raw_data/*.csv"))
+
+
+def test_format_packet_as_csv_inverse():
+    for line in ("80,09,01,017fef,fd967f,00c187,0d",
+                 "80,01,00,ff,f0,000001,7fffff,800000,1234,abcd,0d"):
+        packet_size = 13 if line.count(',') == 6 else 19
+        packet = parse_csv_line_to_bytes(line, packet_size)
+        assert format_packet_as_csv(packet, packet_size) == line
+
+
+def test_csv_binary_round_trip():
+    assert CAPTURE_FILES, "no vibration_collection_* captures found"
+    with tempfile.TemporaryDirectory() as tmp:
+        for path in CAPTURE_FILES:
+            binary_path, count, skipped = csv_to_binary(path, Path(tmp) / "capture.bin")
+            assert is_binary_capture(binary_path)
+            assert not is_binary_capture(path)
+
+            csv_path, written = binary_to_csv(binary_path, Path(tmp) / "capture.csv")
+            assert written == count
+            original = [line for line in path.read_text().splitlines()
+                        if parse_csv_line_to_bytes(line) is not None]
+            assert csv_path.read_text().splitlines() == original
+            assert len(original) + skipped == len(path.read_text().splitlines())
+
+
+def test_reader_frames_zero_copy():
+    packets = [bytes([0x80, 0x07, i % 4, 0xFF, 0xFF, 0xEB, 0, 0, 0x28, 0xFF, 0xFF, 0xE9, 0x0D])
+               for i in range(100)]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "capture.bin"
+        with BinaryCaptureWriter(path, 13, sensor={'port': 'COM3'}) as writer:
+            writer.write_frames(b''.join(packets[:50]))
+            for packet in packets[50:]:
+                writer.write_packet(packet)
+        with open(path, 'ab') as f:
+            f.write(b'\x80\x07')  # truncated trailing packet is ignored
+
+        reader = BinaryCaptureReader(path).open()
+        assert reader.header['sensor'] == {'port': 'COM3'}
+        assert reader.header['baud'] == 460800
+        assert reader.packet_count == 100
+        frames = reader.frames
+        assert frames.shape == (100, 13)
+        assert frames.base is not None and not frames.flags.owndata
+        decoded = decode_packets(b''.join(packets), 13)
+        assert np.array_equal(decode_packets(frames.tobytes(), 13), decoded)
+        del frames
+        reader.close()
+
+
+def test_reader_rejects_empty_file():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "capture.bin"
+        with BinaryCaptureWriter(path, 13) as writer:
+            writer.write_packet(bytes(13))
+        complete = path.read_bytes()
+        # Empty (capture stopped before the header) and truncated header
+        for content in (b'', complete[:20]):
+            path.write_bytes(content)
+            reader = BinaryCaptureReader(path)
+            try:
+                reader.open()
+            except ValueError as e:
+                assert "incomplete" in str(e).lower()
+            else:
+                raise AssertionError("open() accepted an incomplete file")
+            assert reader._file is None
+
+
+def test_parser_reads_binary_capture():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = CAPTURE_FILES[0]
+        binary_path, _, _ = csv_to_binary(path, Path(tmp) / "capture_raw.bin")
+        from_csv = Path(tmp) / "from_csv.csv"
+        from_binary = Path(tmp) / "from_binary.csv"
+        VibrationDataParser(str(path), str(from_csv)).parse_file()
+        VibrationDataParser(str(binary_path), str(from_binary), packet_size=19).parse_file()
+        assert from_csv.read_text() == from_binary.read_text()
+
+
+def main():
+    """Run all tests."""
+    tests = [
+        test_format_packet_as_csv_inverse,
+        test_csv_binary_round_trip,
+        test_reader_frames_zero_copy,
+        test_reader_rejects_empty_file,
+        test_parser_reads_binary_capture,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✓ PASS: {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ FAIL: {test.__name__}: {e}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+Tests for sensor communication.
+
+Checks that pipelined command batches coalesce writes, bound the reads in
+flight and split the responses per command exactly like sequential
+sends, that register access only selects a window when it changes,
+that pipelined identity detection against the sensor simulator saves
+the per-read round trips, and that status polling returns as soon as
+the sensor is done and reports the configure step timings, and that a
+register snapshot lets configure() skip writes and the flash backup
+when the flash already matches (but not when only the registers do), and that the transport shared with the
+helper's sensor packages counts commands, bytes, round trips, timeouts
+and retries. Simulator tests are skipped without pyserial or a POSIX pty.
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from testing_utils import skip
+
+try:
+    from serial import Serial
+except ImportError:
+    Serial = None
+
+
+class FakeSensor:
+    """Serial stand-in that answers register reads like the sensor."""
+
+    def __init__(self):
+        self.writes = []
+        self.is_open = True
+        self._pending = bytearray()
+
+    def write(self, data):
+        self.writes.append(bytes(data))
+        for i in range(0, len(data), 3):
+            address, value = data[i], data[i + 1]
+            if not address & 0x80:
+                self._pending += bytes((address, value ^ 0x5A, address, 0x0D))
+
+    def flush(self):
+        pass
+
+    def read(self, size):
+        data = bytes(self._pending[:size])
+        del self._pending[:size]
+        return data
+
+    def reset_input_buffer(self):
+        self._pending.clear()
+
+
+def _comm(pipelined=True, pipeline_depth=2):
+    from sensor_comm import SensorCommunication
+    comm = SensorCommunication("fake", 460800, pipelined=pipelined, pipeline_depth=pipeline_depth)
+    comm.connection = FakeSensor()
+    return comm
+
+
+COMMANDS = [
+    [0, 0xFE, 0x01, 0x0D],
+    [0, 0x85, 0x04, 0x0D],
+    [4, 0x6A, 0x00, 0x0D],
+    [4, 0x6C, 0x00, 0x0D],
+    [0, 0xFE, 0x00, 0x0D],
+    [4, 0x04, 0x00, 0x0D],
+]
+
+
+def test_pipelined_batches_and_responses():
+    if Serial is None:
+        return skip("needs pyserial")
+    comm = _comm()
+    responses = comm.transact(COMMANDS)
+    assert responses == [[], [], [0x6A, 0x5A, 0x6A, 0x0D], [0x6C, 0x5A, 0x6C, 0x0D],
+                         [], [0x04, 0x5A, 0x04, 0x0D]]
+    # Depth 2: the writes ride along with the reads, two reads per write()
+    assert comm.connection.writes == [bytes.fromhex("fe010d 85040d 6a000d 6c000d"),
+                                      bytes.fromhex("fe000d 04000d")]
+
+    sequential = _comm(pipelined=False)
+    assert sequential.send_commands(COMMANDS) == _comm().send_commands(COMMANDS)
+    assert len(sequential.connection.writes) == len(COMMANDS)
+    assert b''.join(sequential.connection.writes) == b''.join(comm.connection.writes)
+
+    writes_only = _comm()
+    assert writes_only.send_commands([[0, 0xFF, 0xFF, 0x0D]] * 3) == []
+    assert writes_only.connection.writes == [bytes.fromhex("ffff0d") * 3]
+
+
+def test_register_access_elides_window_writes():
+    if Serial is None:
+        return skip("needs pyserial")
+    from sensor_comm import RegisterAccess
+
+    comm = _comm(pipeline_depth=8)
+    registers = RegisterAccess(comm)
+    assert registers.read_word(0x0A, 1) == 0x5A0A
+    assert registers.read_words([0x6A, 0x6C], 1) == [0x5A6A, 0x5A6C]
+    registers.write_byte(0x03, 0x02, 0)
+    registers.select_window(0)
+    assert comm.connection.writes == [bytes.fromhex("fe010d 0a000d"), bytes.fromhex("6a000d 6c000d"),
+                                      bytes.fromhex("fe000d 83020d")]
+
+    # A stray byte shifts the response; the window is selected again after it
+    comm.connection._pending += b'\x00'
+    try:
+        registers.read_word(0x04, 0)
+        assert False, "expected ValueError"
+    except ValueError:
+        pass
+    assert registers.window is None
+    comm.connection._pending.clear()
+    registers.read_word(0x04, 0)
+    assert comm.connection.writes[-1] == bytes.fromhex("fe000d 04000d")
+
+
+def test_pipelined_identity_saves_round_trips():
+    if Serial is None or not hasattr(os, 'openpty'):
+        return skip("needs pyserial and a POSIX pty")
+    from sensor_comm import SensorCommunication
+    from sensor_config import SensorConfigurator
+    from sensor_simulator import SensorSimulator
+
+    timings = {}
+    # 5 ms per response, as through a USB-serial adapter
+    with SensorSimulator("M-A542VR1", serial_number="P1PE0001", response_delay=0.005) as sim:
+        assert sim.wait_until_ready(3)
+        for pipelined in (False, True):
+            comm = SensorCommunication(sim.port, 460800, timeout=1.0, pipelined=pipelined)
+            comm.open()
+            try:
+                start = time.perf_counter()
+                identity = SensorConfigurator(comm).detect_identity()
+                timings[pipelined] = time.perf_counter() - start
+            finally:
+                comm.close()
+            assert identity['product_id'] == "M-A542VR1" and identity['serial_number'] == "P1PE0001"
+    # Eight reads: one batch instead of eight round trips
+    assert timings[True] * 3 < timings[False], timings
+
+
+def test_status_polling_and_step_timings():
+    if Serial is None or not hasattr(os, 'openpty'):
+        return skip("needs pyserial and a POSIX pty")
+    from sensor_comm import RegisterAccess, SensorCommunication
+    from sensor_config import SensorConfigurator
+    from sensor_simulator import FLASH_BACKUP, GLOB_CMD, SensorSimulator
+
+    # Datasheet timings: flash backup 310 ms, output mode 118 ms
+    with SensorSimulator("M-A542VR1", response_delay=0.0) as sim:
+        assert sim.wait_until_ready(3)
+        comm = SensorCommunication(sim.port, 460800, timeout=1.0)
+        comm.open()
+        try:
+            registers = RegisterAccess(comm)
+            registers.write_byte(GLOB_CMD, FLASH_BACKUP, 1)
+            start = time.perf_counter()
+            assert registers.wait_for_bits(GLOB_CMD, 1, FLASH_BACKUP, timeout=5.0)
+            assert 0.25 < time.perf_counter() - start < 0.5
+            start = time.perf_counter()
+            assert not registers.wait_for_bits(GLOB_CMD, 1, FLASH_BACKUP, FLASH_BACKUP, timeout=0.1)
+            assert 0.1 <= time.perf_counter() - start < 0.3
+
+            configurator = SensorConfigurator(comm)
+            assert configurator.configure("displacement")
+            timings = configurator.collect_timings()
+        finally:
+            comm.close()
+    assert list(timings) == ["reset", "plan", "output_type", "uart_auto_start", "flash_backup"]
+    # Each wait ends on its status bit, not on a fixed worst-case sleep
+    assert 0.1 < timings["output_type"] < 0.25, timings
+    assert 0.3 < timings["flash_backup"] < 0.45, timings
+    assert configurator.collect_timings() == {}
+
+
+def test_register_snapshot_and_plan():
+    if Serial is None:
+        return skip("needs pyserial")
+    from sensor_comm import RegisterAccess
+
+    comm = _comm(pipeline_depth=8)
+    registers = RegisterAccess(comm)
+    snapshot = registers.read_snapshot({0x00: (0x04,), 0x01: (0x00, 0x08)})
+    assert snapshot == {(0, 0x04): 0x5A04, (1, 0x00): 0x5A00, (1, 0x08): 0x5A08}
+    # One burst, window frames only where the window changes
+    assert comm.connection.writes == [bytes.fromhex("fe000d 04000d fe010d 00000d 08000d")]
+    assert registers.window == 1
+
+    targets = [
+        (1, 0x00, 0x5F, 0xF0),  # low byte 0x00: OUTPUT_SEL differs
+        (1, 0x01, 0x5A, 0xFF),  # high byte matches
+        (1, 0x08, 0x0C, 0x03),  # masked-out bits differ only
+        (1, 0x0C, 0x01, 0xFF),  # not in the snapshot
+    ]
+    assert registers.plan_writes(snapshot, targets) == [(1, 0x00, 0x5F), (1, 0x0C, 0x01)]
+
+
+def test_configure_skips_matching_registers():
+    if Serial is None or not hasattr(os, 'openpty'):
+        return skip("needs pyserial and a POSIX pty")
+    from sensor_comm import SensorCommunication
+    from sensor_config import SensorConfigurator
+    from sensor_simulator import SensorSimulator
+
+    with SensorSimulator("M-A542VR1", time_scale=0.05) as sim:
+        assert sim.wait_until_ready(3)
+        comm = SensorCommunication(sim.port, 460800, timeout=1.0)
+        comm.open()
+        try:
+            configurator = SensorConfigurator(comm)
+            assert configurator.configure("displacement")
+            assert sim.stats['flash_backups'] == 1
+            configurator.collect_timings()
+
+            assert configurator.configure("displacement")
+            assert list(configurator.collect_timings()) == ["reset", "plan"]
+            assert sim.stats['flash_backups'] == 1
+
+            # Only SIG_CTRL differs
+            assert configurator.configure("velocity")
+            assert list(configurator.collect_timings()) == ["reset", "plan", "output_type", "flash_backup"]
+            assert sim.stats['flash_backups'] == 2
+
+            assert configurator.configure("velocity", force=True)
+            assert "plan" not in configurator.collect_timings()
+            assert sim.stats['flash_backups'] == 3
+        finally:
+            comm.close()
+
+
+def test_configure_persists_register_only_settings():
+    if Serial is None or not hasattr(os, 'openpty'):
+        return skip("needs pyserial and a POSIX pty")
+    from sensor_comm import RegisterAccess, SensorCommunication
+    from sensor_config import SensorConfigurator
+    from sensor_simulator import SIG_CTRL, UART_CTRL, SensorSimulator
+
+    with SensorSimulator("M-A542VR1", time_scale=0.05) as sim:
+        assert sim.wait_until_ready(3)
+        comm = SensorCommunication(sim.port, 460800, timeout=1.0)
+        comm.open()
+        try:
+            # Configured registers without a flash backup, as after one that timed out
+            registers = RegisterAccess(comm)
+            registers.write_bytes([(SIG_CTRL, 0x40), (UART_CTRL, 0x03)], 1)
+            registers.read_word(SIG_CTRL, 1)
+            assert sim.register(1, UART_CTRL) & 0x03 == 0x03 and not sim.flash[UART_CTRL] & 0x02  # AUTO_START
+
+            assert SensorConfigurator(comm).configure("displacement")
+            assert sim.stats['flash_backups'] == 1
+        finally:
+            comm.close()
+        assert sim.flash[UART_CTRL] & 0x03 == 0x03 and sim.flash[SIG_CTRL] & 0xF0 == 0x40
+        sim.power_cycle()
+        assert sim.wait_until_ready(3) and sim.sampling
+
+
+def test_shared_transport_metrics():
+    if Serial is None:
+        return skip("needs pyserial")
+    from sensor_comm import RegisterAccess, SensorCommunication
+    # sensor_comm puts the repository root on sys.path
+    from helper_app.legacy.accelerometer import sensor_comm as accelerometer_comm
+
+    # Every sensor package uses the same transport
+    assert accelerometer_comm.SensorCommunication is SensorCommunication
+
+    comm = _comm()
+    comm.transact(COMMANDS)
+    metrics = comm.metrics.snapshot()
+    assert (metrics['commands'], metrics['round_trips']) == (6, 2)
+    assert (metrics['bytes_out'], metrics['bytes_in']) == (18, 12)
+    assert metrics['latency_seconds']['count'] == 2
+    assert metrics['latency_seconds']['buckets'][-1] == ["+Inf", 2]
+
+    comm.metrics.reset()
+    try:
+        comm.read_bytes(4)
+        assert False, "expected TimeoutError"
+    except TimeoutError:
+        pass
+    # A garbled status read is flushed and retried
+    registers = RegisterAccess(comm)
+    comm.connection._pending += b'\x00'
+    assert registers.wait_for_bits(0x0A, 1, 0x0400, 0x0000, timeout=1.0, interval=0.0)
+    metrics = comm.metrics.snapshot()
+    assert (metrics['timeouts'], metrics['retries'], metrics['round_trips']) == (1, 1, 2)
+    assert "1 timeouts, 1 retries" in comm.metrics.summary()
+
+
+def main():
+    """Run all tests."""
+    tests = [
+        test_pipelined_batches_and_responses,
+        test_register_access_elides_window_writes,
+        test_pipelined_identity_saves_round_trips,
+        test_status_polling_and_step_timings,
+        test_register_snapshot_and_plan,
+        test_configure_skips_matching_registers,
+        test_configure_persists_register_only_settings,
+        test_shared_transport_metrics,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✓ PASS: {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ FAIL: {test.__name__}: {e}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Tests for the sensor simulator.
+
+Drives the simulator through SensorCommunication and the vibration
+configurator on a pseudo-terminal: identity, configure with flash backup,
+auto start after a power cycle, burst rate, counters and checksums, and
+the busy and ignored-write behaviour of the register protocol. Skipped
+without pyserial, numpy or a POSIX pty.
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from serial import Serial
+except ImportError:
+    Serial = None
+
+from sensor_simulator import (
+    FLASH_BACKUP,
+    GLOB_CMD,
+    NOT_READY,
+    PROFILES,
+    UART_CTRL,
+    SensorSimulator,
+    vibration_preset,
+)
+from testing_utils import skip
+
+
+def _skip(needs_numpy=True):
+    if Serial is None or not hasattr(os, 'openpty') or (needs_numpy and np is None):
+        skip("needs pyserial, numpy and a POSIX pty")
+        return True
+    return False
+
+
+def _read_for(connection, seconds):
+    data = bytearray()
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        data += connection.read(4096)
+    return bytes(data), time.perf_counter() - start
+
+
+def test_configure_and_auto_start():
+    if _skip():
+        return
+    from packet_framer import PacketFramer
+    from sensor_comm import SensorCommunication
+    from sensor_config import SensorConfigurator
+
+    with SensorSimulator("M-A542VR1", serial_number="T0000042", time_scale=0.05) as sim:
+        assert sim.wait_until_ready(2)
+        comm = SensorCommunication(sim.port, 460800, timeout=1.0)
+        comm.open()
+        try:
+            configurator = SensorConfigurator(comm)
+            identity = configurator.detect_identity()
+            assert identity['product_id'] == "M-A542VR1" and identity['serial_number'] == "T0000042"
+            assert configurator.configure("displacement")
+        finally:
+            comm.close()
+        assert sim.stats['flash_backups'] == 1 and sim.stats['ignored_writes'] == 0
+        assert sim.flash[UART_CTRL] & 0x03 == 0x03 and sim.flash[0x00] & 0xF1 == 0x40
+        assert not sim.sampling
+
+        # Auto start after a power cycle: 13-byte displacement bursts at 300 Sps
+        sim.power_cycle()
+        assert sim.wait_until_ready(2) and sim.sampling
+        connection = Serial(sim.port, 460800, timeout=0.05)
+        try:
+            connection.reset_input_buffer()
+            data, elapsed = _read_for(connection, 0.5)
+        finally:
+            connection.close()
+        framer = PacketFramer(13)
+        framer.feed(data)
+        packets = sum(len(batch) for batch in framer.frames()) // 13
+        assert framer.error_count == 0
+        assert abs(packets / elapsed - 300) < 60, packets / elapsed
+
+
+def test_stream_rate_counters_and_exit():
+    if _skip():
+        return
+    from packet_decoder import checksum_mask, frames_from_buffer
+    from packet_framer import PacketFramer
+    from sensor_comm import SensorCommunication
+    from sensor_config import SensorConfigurator
+
+    with SensorSimulator("M-A542VR1", registers=vibration_preset(19), auto_start=True,
+                         time_scale=0.05) as sim:
+        assert sim.wait_until_ready(2) and sim.sampling
+        connection = Serial(sim.port, 921600, timeout=0.05)
+        try:
+            connection.reset_input_buffer()
+            data, elapsed = _read_for(connection, 1.0)
+        finally:
+            connection.close()
+        framer = PacketFramer(19)
+        framer.feed(data)
+        frames = frames_from_buffer(b''.join(bytes(frame) for frame in framer.frames()), 19)
+        counters = (frames[:, 14].astype(np.int64) << 8) | frames[:, 15]
+        assert framer.resync_bytes == 0 and checksum_mask(frames).all()
+        assert (np.diff(counters) % 65536 == 1).all()
+        assert abs(len(frames) / elapsed - 3000) < 300, len(frames) / elapsed
+        assert sim.stats['dropped_samples'] == 0
+
+        comm = SensorCommunication(sim.port, 921600, timeout=1.0)
+        comm.open()
+        try:
+            assert SensorConfigurator(comm).exit_auto_mode()
+            # Drain packets queued before the stop and any late register response
+            time.sleep(0.05)
+            comm.connection.reset_input_buffer()
+            time.sleep(0.05)
+            assert comm.connection.in_waiting == 0
+        finally:
+            comm.close()
+        assert not sim.sampling and sim.flash[UART_CTRL] & 0x03 == 0x03
+
+
+def test_busy_bits_and_ignored_writes():
+    if _skip(needs_numpy=False):
+        return
+    from sensor_comm import SensorCommunication
+
+    # UART_AUTO off: sampling mode without the burst stream interleaving responses
+    with SensorSimulator("M-A542VR1", registers={(1, UART_CTRL): 0x0100}, time_scale=0.5,
+                         response_delay=0.0) as sim:
+        assert sim.wait_until_ready(2)
+        comm = SensorCommunication(sim.port, 460800, timeout=1.0)
+        comm.open()
+        try:
+            def glob_cmd():
+                result = comm.send_commands([[0, 0xFE, 0x01, 0x0D], [4, GLOB_CMD, 0x00, 0x0D]])
+                return (result[1] << 8) | result[2]
+
+            comm.send_commands([[0, 0xFE, 0x01, 0x0D], [0, 0x8A, 0x08, 0x0D]])
+            assert glob_cmd() & FLASH_BACKUP
+            time.sleep(0.31 * 0.5 + 0.05)
+            assert not glob_cmd() & FLASH_BACKUP and sim.stats['flash_backups'] == 1
+
+            # Sampling mode (manual): register writes are ignored
+            comm.send_commands([[0, 0xFE, 0x00, 0x0D], [0, 0x83, 0x01, 0x0D]])
+            time.sleep(0.02)
+            comm.send_commands([[0, 0xFE, 0x01, 0x0D], [0, 0x88, 0x00, 0x0D]])
+            glob_cmd()  # round trip: the write has been processed
+            assert sim.register(1, UART_CTRL) == 0x0100 and sim.stats['ignored_writes'] == 1
+
+            # SOFT_RST is accepted in sampling mode and reports NOT_READY
+            comm.send_commands([[0, 0xFE, 0x01, 0x0D], [0, 0x8A, 0x80, 0x0D]])
+            assert glob_cmd() & NOT_READY
+            assert sim.wait_until_ready(2) and not sim.sampling
+            assert not glob_cmd() & NOT_READY
+        finally:
+            comm.close()
+
+
+def test_profile_layouts():
+    if np is None:
+        return skip("needs numpy")
+    accelerometer = PROFILES["M-A552AR1"]
+    registers = {0: {}, 1: {**accelerometer.defaults[1], 0x0C: 0x4702}}
+    assert accelerometer.packet_size(registers) == 20  # TEMP, ACC XYZ (32-bit), COUNT
+
+    imu = PROFILES["M-G552PR80"]
+    registers = {0: {}, 1: {**imu.defaults[1], 0x0C: 0xF003, 0x0E: 0x7000}}
+    # FLAG, TEMP, GYRO XYZ, ACCL XYZ (32-bit), COUNT, CHECKSUM
+    assert imu.packet_size(registers) == 1 + 2 + 4 + 24 + 2 + 2 + 1
+    frames = imu.period(registers)[:4].copy()
+    imu.stamp(frames, np.arange(4), registers)
+    assert frames[:, -5:-3].tolist() == [[0, 0], [0, 1], [0, 2], [0, 3]]
+    words = frames[:, 1:-3].astype(np.int64)
+    checksum = ((words[:, 0::2] << 8) + words[:, 1::2]).sum(axis=1) & 0xFFFF
+    assert ((frames[:, -3].astype(np.int64) << 8) | frames[:, -2]).tolist() == checksum.tolist()
+    assert imu.sample_rate(registers) == 125.0 and imu.baud_rate(registers) == 460800
+
+
+def main():
+    """Run all tests."""
+    tests = [
+        test_configure_and_auto_start,
+        test_stream_rate_counters_and_exit,
+        test_busy_bits_and_ignored_writes,
+        test_profile_layouts,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✓ PASS: {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ FAIL: {test.__name__}: {e}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Tests for the serial reader modes.
+
+Runs each read mode against a pseudo-terminal: all bytes written arrive in
+order, an idle line returns b'' within the timeout, and the connection
+timeout is restored on close. Skipped without pyserial or a POSIX pty.
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from serial_reader import READ_MODES, SerialReader
+from synthetic_packets import generate_stream
+from testing_utils import skip
+
+try:
+    from serial import Serial
+except ImportError:
+    Serial = None
+
+
+def _open_pty():
+    master, slave = os.openpty()
+    connection = Serial(os.ttyname(slave), 921600, timeout=1.0)
+    os.close(slave)
+    return master, connection
+
+
+def test_read_modes_on_pty():
+    if Serial is None or not hasattr(os, 'openpty'):
+        return skip("needs pyserial and a POSIX pty")
+    data, _ = generate_stream(200, 19, seed=4)
+    for mode in READ_MODES:
+        master, connection = _open_pty()
+        try:
+            reader = SerialReader(connection, 921600, mode=mode, timeout=0.05)
+            assert reader.mode == mode
+            assert connection.timeout == (0.05 if mode == "blocking" else 1.0)
+
+            started = time.monotonic()
+            assert reader.read() == b''
+            assert time.monotonic() - started < 0.5
+            assert reader.timeouts == 1
+
+            received = b''
+            for start in range(0, len(data), 1000):
+                os.write(master, data[start:start + 1000])
+                deadline = time.monotonic() + 2.0
+                while len(received) < min(start + 1000, len(data)) and time.monotonic() < deadline:
+                    received += reader.read()
+            assert received == data, mode
+            assert reader.bytes_read == len(data)
+
+            reader.close()
+            assert connection.timeout == 1.0
+        finally:
+            connection.close()
+            os.close(master)
+
+
+def test_invalid_mode():
+    class _Connection:
+        timeout = 1.0
+
+    try:
+        SerialReader(_Connection(), 921600, mode="spin")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("invalid read mode accepted")
+    # Blocking reads are sized to ~10 ms of data at the link rate
+    assert SerialReader(_Connection(), 921600).chunk_size == 921
+
+
+def main():
+    """Run all tests."""
+    tests = [
+        test_read_modes_on_pty,
+        test_invalid_mode,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✓ PASS: {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ FAIL: {test.__name__}: {e}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Tests for the synthetic packet generator and the benchmark suite.
+
+Checks that generated streams are deterministic and valid, that injected
+damage is seen by gap analysis and by the collector framing loop, and that
+the benchmark suite runs end to end.
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from benchmark_suite import BenchmarkSuite, compare
+from collect_raw_vibration_data import RawVibrationDataCollector
+from gap_analysis import GapAnalyzer
+from packet_decoder import checksum_mask, decode_packets, valid_frame_mask
+from synthetic_packets import generate_frames, generate_stream
+
+
+def _frame(data: bytes, packet_size: int, chunk: int):
+    """Run the collector framing loop over ``data`` read in ``chunk``-byte pieces."""
+    with tempfile.TemporaryDirectory() as tmp:
+        collector = RawVibrationDataCollector("test", 460800 if packet_size == 13 else 921600, tmp)
+        collector.setup_files(Path(tmp), Path(tmp))
+        try:
+            for start in range(0, len(data), chunk):
+                collector.process_data(data[start:start + chunk])
+        finally:
+            collector.close()
+        return collector.raw_packet_count, collector.error_count
+
+
+def test_generator_deterministic_and_valid():
+    for packet_size in (13, 19):
+        frames = generate_frames(5000, packet_size, seed=7)
+        assert frames.tobytes() == generate_frames(5000, packet_size, seed=7).tobytes()
+        assert frames.tobytes() != generate_frames(5000, packet_size, seed=8).tobytes()
+        assert valid_frame_mask(frames).all()
+        if packet_size == 19:
+            assert checksum_mask(frames).all()
+        analyzer = GapAnalyzer(packet_size)
+        analyzer.update(decode_packets(frames.tobytes(), packet_size)['count'])
+        assert analyzer.report()['lost_samples'] == 0
+
+
+def test_dropped_frames_found_by_gap_analysis():
+    data, stats = generate_stream(20000, 19, seed=3, drop_rate=0.01, count_step=2)
+    assert stats['dropped'] > 0
+    analyzer = GapAnalyzer(19)
+    analyzer.update(decode_packets(data, 19)['count'])
+    assert analyzer.report()['counter_step'] == 2
+    assert analyzer.report()['lost_samples'] == stats['dropped']
+
+
+def test_collector_framing_on_damaged_stream():
+    data, stats = generate_stream(5000, 13, seed=5, noise_rate=0.02)
+    # Noise never contains 0x80, so every noise byte is one resync error
+    assert _frame(data, 13, 4096) == (stats['sent'], stats['noise_bytes'])
+    assert _frame(data, 13, 7) == (stats['sent'], stats['noise_bytes'])
+
+    data, stats = generate_stream(5000, 19, seed=5, noise_rate=0.01, misalign_rate=0.01)
+    saved, errors = _frame(data, 19, 4096)
+    assert stats['truncated'] > 0
+    assert saved <= stats['sent'] - stats['truncated']
+    assert errors >= stats['noise_bytes'] + stats['truncated']
+    assert _frame(data, 19, 1) == (saved, errors)
+
+
+def test_benchmark_suite_runs():
+    with tempfile.TemporaryDirectory() as tmp:
+        suite = BenchmarkSuite(packets=500, repeat=1, workdir=Path(tmp), serial_seconds=0.1)
+        results = suite.run()
+    for name in ("parse_packet_13byte", "decode_packets_19byte", "checksum_mask_19byte",
+                 "collect_framing_13byte_csv", "csv_parse_19byte", "write_csv_rows"):
+        assert results[name]['packets_per_s'] > 0, name
+    slower = {name: dict(result, packets_per_s=result['packets_per_s'] * 2)
+              for name, result in results.items()}
+    assert compare(results, results, 0.25) == []
+    # Idle serial read runs carry no throughput and are not compared
+    measured = [name for name, result in results.items() if result['packets_per_s'] > 0]
+    assert len(compare(results, slower, 0.25)) == len(measured)
+
+
+def main():
+    """Run all tests."""
+    tests = [
+        test_generator_deterministic_and_valid,
+        test_dropped_frames_found_by_gap_analysis,
+        test_collector_framing_on_damaged_stream,
+        test_benchmark_suite_runs,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✓ PASS: {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ FAIL: {test.__name__}: {e}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
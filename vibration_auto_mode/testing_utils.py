@@ -0,0 +1,22 @@
+"""
+Helpers shared by the test modules.
+
+The tests run under pytest and as plain scripts (python test_*.py).
+"""
+
+import sys
+
+
+def skip(reason: str) -> None:
+    """Skip the calling test.
+
+    Under pytest the test is reported as skipped; in a plain script run
+    the reason is printed and the caller returns.
+
+    Args:
+        reason: What the test needs, e.g. "needs pyserial"
+    """
+    if "pytest" in sys.modules:
+        import pytest
+        pytest.skip(reason)
+    print(f"  (skipped: {reason})")